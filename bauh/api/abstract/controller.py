@@ -260,6 +260,17 @@ class SoftwareManager(ABC):
         """
         pass
 
+    def get_history_page(self, pkg: SoftwarePackage, offset: int, limit: int) -> Optional[PackageHistory]:
+        """
+        returns a slice of the package history (newest entries first). Optional.
+        :param pkg:
+        :param offset: index of the first entry
+        :param limit: maximum number of entries
+        :return: the history entries within the slice with 'pkg_status_idx' relative to the full history and 'total'
+        filled. None if paging is not supported for the package ('get_history' will be called instead)
+        """
+        pass
+
     @abstractmethod
     def install(self, pkg: SoftwarePackage, root_password: Optional[str], disk_loader: Optional[DiskCacheLoader], watcher: ProcessWatcher) -> TransactionResult:
         """
@@ -353,6 +364,14 @@ class SoftwareManager(ABC):
         """
         pass
 
+    def get_deferrable_prepare_tasks(self, operation: str) -> Optional[Set[str]]:
+        """
+        :param operation: the operation's method name (e.g: 'read_installed', 'search', 'list_updates', 'list_suggestions')
+        :return: ids of the tasks registered during 'prepare' the given operation does not depend on. The operation
+        will be executed as soon as the remaining tasks are finished.
+        """
+        pass
+
     @abstractmethod
     def list_updates(self, internet_available: bool) -> List[PackageUpdate]:
         """
@@ -377,6 +396,12 @@ class SoftwareManager(ABC):
         """
         pass
 
+    def cancel_suggestions(self):
+        """
+        cancels the suggestions data still being loaded (e.g: the user has started a search). Optional.
+        """
+        pass
+
     def execute_custom_action(self, action: CustomSoftwareAction, pkg: SoftwarePackage, root_password: Optional[str], watcher: ProcessWatcher) -> bool:
         """
         At the moment the GUI implements this action. No need to implement it yourself.
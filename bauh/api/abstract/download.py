@@ -7,7 +7,7 @@ from bauh.api.abstract.handler import ProcessWatcher
 class FileDownloader(ABC):
 
     @abstractmethod
-    def download(self, file_url: str, watcher: Optional[ProcessWatcher], output_path: str, cwd: str, root_password: Optional[str] = None, substatus_prefix: str = None, display_file_size: bool = True, max_threads: int = None, known_size: int = None) -> bool:
+    def download(self, file_url: str, watcher: Optional[ProcessWatcher], output_path: str, cwd: str, root_password: Optional[str] = None, substatus_prefix: str = None, display_file_size: bool = True, max_threads: int = None, known_size: int = None, sha256: Optional[str] = None) -> bool:
         """
         :param file_url:
         :param watcher:
@@ -18,6 +18,7 @@ class FileDownloader(ABC):
         :param display_file_size: if the file size should be displayed on the substatus
         :param max_threads: maximum number of threads (only available for multi-threaded download)
         :param known_size: known file size
+        :param sha256: expected SHA-256 checksum of the file (verified if informed)
         :return: success / failure
         """
         pass
@@ -283,15 +283,17 @@ class PackageUpdate:
 
 class PackageHistory:
 
-    def __init__(self, pkg: SoftwarePackage, history: List[dict], pkg_status_idx: int):
+    def __init__(self, pkg: SoftwarePackage, history: List[dict], pkg_status_idx: int, total: Optional[int] = None):
         """
         :param pkg
         :param history: a list with the package history.
         :param pkg_status_idx: 'history' index in which the application is current found
+        :param total: total number of history entries (only for paged histories. See SoftwareManager.get_history_page)
         """
         self.pkg = pkg
         self.history = history
         self.pkg_status_idx = pkg_status_idx
+        self.total = total
 
     @classmethod
     def empyt(cls, pkg: SoftwarePackage):
@@ -24,7 +24,8 @@ def main(tray: bool = False):
 
     args = app_args.read()
 
-    logger = logs.new_logger(__app_name__, bool(args.logs))
+    logger = logs.new_logger(name=__app_name__, enabled=bool(args.logs or args.logs_file), stream=bool(args.logs),
+                             file_path=args.logs_file, json_format=args.logs_format == 'json')
 
     try:
         locale.setlocale(locale.LC_NUMERIC, '')
@@ -8,6 +8,9 @@ def read() -> Namespace:
     parser = argparse.ArgumentParser(prog=__app_name__, description="GUI for Linux software management")
     parser.add_argument('-v', '--version', action='version', version='%(prog)s {}'.format(__version__))
     parser.add_argument('--logs', action="store_true", help='It activates {} logs.'.format(__app_name__))
+    parser.add_argument('--logs-file', metavar='PATH', help='It also writes the logs to the given file (rotated every 5 MB)')
+    parser.add_argument('--logs-format', choices=('text', 'json'), default='text',
+                        help="Logs format: 'text' or 'json' (one JSON object per line). Default: %(default)s")
     parser.add_argument('--offline', action="store_true", help='It assumes the internet connection is off')
     parser.add_argument('--suggestions', action="store_true",
                         help='It forces loading software suggestions after the initialization process')
@@ -40,6 +40,11 @@ def main():
                                          i18n=i18n, http_client=http_client,
                                          check_ssl=app_config['download']['check_ssl'])
 
+    internet_checker = InternetChecker(offline=False,
+                                       host=app_config['internet']['check_host'],
+                                       expiration=app_config['internet']['check_expiration'],
+                                       logger=logger)
+
     context = ApplicationContext(i18n=i18n,
                                  http_client=http_client,
                                  download_icons=bool(app_config['download']['icons']),
@@ -51,7 +56,7 @@ def main():
                                  file_downloader=downloader,
                                  app_name=__app_name__,
                                  app_version=__version__,
-                                 internet_checker=InternetChecker(offline=False),
+                                 internet_checker=internet_checker,
                                  suggestions_mapping=None,  # TODO not needed at the moment
                                  root_user=user.is_root())
 
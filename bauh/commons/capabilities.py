@@ -0,0 +1,111 @@
+import os
+import shutil
+import time
+from threading import RLock
+from typing import Optional, Callable, Dict, Tuple, Any, TypeVar
+
+T = TypeVar('T')
+
+
+class CapabilityRegistry:
+    """
+    Caches the tools availability (binaries resolved from PATH), their probed capabilities (e.g: versions) and
+    services states. Nothing is probed twice while it does not change:
+    - resolved paths are kept while the PATH directories are not modified (binaries added, removed or renamed)
+    - probed values are kept while the resolved binary is the same file (path, inode, size and modification time)
+    - services states are kept for a given number of seconds
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._paths: Dict[str, Tuple[tuple, Optional[str]]] = {}  # name -> (PATH signature, resolved path)
+        self._values: Dict[Tuple[str, str], Tuple[tuple, Any]] = {}  # (name, key) -> (binary signature, value)
+        self._states: Dict[str, Tuple[float, Any]] = {}  # service -> (expiration, value)
+
+    @staticmethod
+    def _get_path_signature() -> tuple:
+        signature = []
+
+        for dir_path in os.getenv('PATH', '').split(os.pathsep):
+            if dir_path:
+                try:
+                    signature.append((dir_path, os.stat(dir_path).st_mtime_ns))
+                except OSError:
+                    signature.append((dir_path, None))
+
+        return tuple(signature)
+
+    @staticmethod
+    def _get_file_signature(file_path: str) -> Optional[tuple]:
+        try:
+            file_stat = os.stat(file_path)
+            return file_path, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns
+        except OSError:
+            return
+
+    def which(self, name: str) -> Optional[str]:
+        """
+        :return: the resolved path of the given binary (or None if it is not available)
+        """
+        path_signature = self._get_path_signature()
+
+        with self._lock:
+            cached = self._paths.get(name)
+
+            if cached and cached[0] == path_signature and (cached[1] is None or os.path.exists(cached[1])):
+                return cached[1]
+
+            resolved = shutil.which(name)
+            self._paths[name] = (path_signature, resolved)
+            return resolved
+
+    def is_available(self, name: str) -> bool:
+        return bool(self.which(name))
+
+    def probe(self, name: str, key: str, probe: Callable[[str], T]) -> Optional[T]:
+        """
+        :param name: binary name
+        :param key: capability identifier (e.g: 'version')
+        :param probe: function receiving the resolved binary path and returning the capability value
+        :return: the capability value (None if the binary is not available)
+        """
+        file_path = self.which(name)
+
+        if not file_path:
+            return
+
+        signature = self._get_file_signature(file_path)
+
+        with self._lock:
+            cached = self._values.get((name, key))
+
+            if cached and signature and cached[0] == signature:
+                return cached[1]
+
+            value = probe(file_path)
+            self._values[(name, key)] = (signature, value)
+            return value
+
+    def get_state(self, service: str, probe: Callable[[], T], max_age: float) -> T:
+        """
+        :param max_age: seconds the probed state should be kept
+        :return: the service state
+        """
+        with self._lock:
+            cached = self._states.get(service)
+
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            value = probe()
+            self._states[service] = (time.monotonic() + max_age, value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._paths.clear()
+            self._values.clear()
+            self._states.clear()
+
+
+registry = CapabilityRegistry()
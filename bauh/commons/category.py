@@ -2,7 +2,7 @@ import logging
 import os
 import time
 import traceback
-from datetime import datetime, timedelta
+from datetime import timedelta
 from pathlib import Path
 from threading import Thread
 from typing import Dict, List, Optional
@@ -11,6 +11,7 @@ import requests
 
 from bauh.api.abstract.controller import SoftwareManager
 from bauh.api.http import HttpClient
+from bauh.commons import freshness
 from bauh.commons.internet import InternetChecker
 from bauh.commons.util import map_timestamp_file
 
@@ -69,7 +70,7 @@ class CategoriesDownloader(Thread):
 
         return categories_map
 
-    def _cache_categories_to_disk(self, categories_str: str, timestamp: float):
+    def _cache_categories_to_disk(self, categories_str: str, timestamp: float, etag: Optional[str] = None):
         self.logger.info(self._msg('Caching downloaded categories to disk'))
 
         try:
@@ -79,26 +80,37 @@ class CategoriesDownloader(Thread):
                 f.write(categories_str)
 
             self.logger.info(self._msg("Categories cached to file '{}'".format(self.categories_path)))
-
-            categories_ts_path = map_timestamp_file(self.categories_path)
-            with open(categories_ts_path, 'w+') as f:
-                f.write(str(timestamp))
-
-            self.logger.info(self._msg("Categories timestamp ({}) cached to file '{}'".format(timestamp, categories_ts_path)))
         except Exception:
             self.logger.error(self._msg("Could not cache categories to the disk as '{}'".format(self.categories_path)))
             traceback.print_exc()
+            return
+
+        freshness.get_registry().register_run(self.job_id, timestamp=timestamp, etag=etag)
+        self.logger.info(self._msg("Categories timestamp ({}) registered".format(timestamp)))
+
+    @property
+    def job_id(self) -> str:
+        return '{}.categories'.format(self.id_)
 
     def download_categories(self) -> Dict[str, List[str]]:
         self.logger.info(self._msg('Downloading category definitions from {}'.format(self.url_categories_file)))
 
+        registry = freshness.get_registry()
+        etag = registry.get_etag(self.job_id) if os.path.exists(self.categories_path) else None
+
         try:
-            timestamp = datetime.utcnow().timestamp()
-            res = self.http_client.get(self.url_categories_file)
+            timestamp = time.time()
+            res = self.http_client.get(self.url_categories_file, headers={'If-None-Match': etag} if etag else None,
+                                       single_call=bool(etag))
         except requests.exceptions.ConnectionError:
             self.logger.error(self._msg('[{}] Could not download categories. The internet connection seems to be off.'.format(self.id_)))
             return {}
 
+        if res is not None and res.status_code == 304:
+            self.logger.info(self._msg('Categories file {} has not changed'.format(self.url_categories_file)))
+            registry.register_run(self.job_id, timestamp=timestamp, etag=etag)
+            return self._read_categories_from_disk()
+
         if not res:
             self.logger.info(self._msg('Could not download {}'.format(self.url_categories_file)))
             return {}
@@ -112,7 +124,7 @@ class CategoriesDownloader(Thread):
             return {}
 
         if categories:
-            self._cache_categories_to_disk(categories_str=res.text, timestamp=timestamp)
+            self._cache_categories_to_disk(categories_str=res.text, timestamp=timestamp, etag=res.headers.get('ETag'))
 
         return categories
 
@@ -129,31 +141,20 @@ class CategoriesDownloader(Thread):
             self.logger.warning(self._msg("Categories file '{}' does not exist. It should be downloaded.".format(self.categories_path)))
             return True
 
-        categories_ts_path = map_timestamp_file(self.categories_path)
-
-        if not os.path.exists(categories_ts_path):
-            self.logger.warning(self._msg("Categories timestamp file '{}' does not exist. The categories file should be re-downloaded.".format(categories_ts_path)))
-            return True
-
-        with open(categories_ts_path) as f:
-            timestamp_str = f.read()
-
-        try:
-            categories_timestamp = datetime.fromtimestamp(float(timestamp_str))
-        except Exception:
-            self.logger.error(self._msg("An exception occurred when trying to parse the categories file timestamp from '{}'. The categories file should be re-downloaded.".format(categories_ts_path)))
-            traceback.print_exc()
-            return True
-
-        should_download = (categories_timestamp + timedelta(hours=self.expiration) <= datetime.utcnow())
-
-        if should_download:
+        if freshness.get_registry().is_expired(self.job_id, period=timedelta(hours=self.expiration),
+                                               legacy_file=map_timestamp_file(self.categories_path)):
             self.logger.info(self._msg("Cached categories file '{}' has expired. A new one should be downloaded.".format(self.categories_path)))
             return True
         else:
             self.logger.info(self._msg("Cached categories file '{}' is up to date. No need to re-download it.".format(self.categories_path)))
             return False
 
+    def _refresh_categories(self):
+        categories = self.download_categories()
+
+        if categories:
+            self.manager.categories = categories
+
     def run(self):
         ti = time.time()
         if self.before:
@@ -165,7 +166,14 @@ class CategoriesDownloader(Thread):
             cached = self._read_categories_from_disk()
             self.manager.categories = cached
         else:
-            self.download_categories()
+            cached = self._read_categories_from_disk() if os.path.exists(self.categories_path) else None
+
+            if cached:
+                # the outdated categories are used while the new ones are downloaded in the background
+                self.manager.categories = cached
+                freshness.get_scheduler().trigger(self.job_id, self._refresh_categories)
+            else:
+                self._refresh_categories()
 
         if self.after:
             self.after()
@@ -0,0 +1,282 @@
+import fcntl
+import json
+import logging
+import os
+import time
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+from queue import PriorityQueue
+from threading import Lock, Thread, Event, current_thread
+from typing import Optional, Dict, Callable, Tuple
+
+from bauh.api.paths import CACHE_DIR
+
+FRESHNESS_FILE = f'{CACHE_DIR}/freshness.json'
+
+
+class FreshnessRegistry:
+    """
+    Persists the last execution state (timestamp and ETag) of timestamp-gated jobs (database synchronizations,
+    cached files downloads, indexes, etc) in a single file.
+    Legacy timestamp files (.ts) are only read when a job has no state registered yet.
+    """
+
+    def __init__(self, file_path: str = FRESHNESS_FILE, logger: Optional[logging.Logger] = None):
+        self.file_path = file_path
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self._lock = Lock()
+        self._state: Optional[Dict[str, dict]] = None
+        self._state_mtime: Optional[int] = None
+
+    def _read_file(self) -> Dict[str, dict]:
+        try:
+            with open(self.file_path) as f:
+                state = json.loads(f.read())
+
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            self.logger.error(f"Could not read the freshness state file '{self.file_path}'")
+            traceback.print_exc()
+            return {}
+
+    def _get_file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.file_path).st_mtime_ns
+        except OSError:
+            return
+
+    def _load(self) -> Dict[str, dict]:
+        file_mtime = self._get_file_mtime()
+
+        if self._state is None or file_mtime != self._state_mtime:  # e.g: written by another process
+            self._state = self._read_file()
+            self._state_mtime = file_mtime
+
+        return self._state
+
+    def _save(self, job_id: str, job_state: Optional[dict]):
+        """
+        re-reads the file and merges the job state (None removes it) under an exclusive file lock, so concurrent
+        processes do not overwrite each other's entries
+        """
+        try:
+            Path(os.path.dirname(self.file_path)).mkdir(parents=True, exist_ok=True)
+
+            with open(f'{self.file_path}.lock', 'a+') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                try:
+                    state = self._read_file()
+
+                    if job_state is None:
+                        state.pop(job_id, None)
+                    else:
+                        state[job_id] = job_state
+
+                    self._state = state
+                    tmp_path = f'{self.file_path}.tmp'
+
+                    with open(tmp_path, 'w+') as f:
+                        f.write(json.dumps(state, sort_keys=True, indent=2))
+
+                    os.replace(tmp_path, self.file_path)
+                    self._state_mtime = self._get_file_mtime()
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except OSError:
+            self.logger.error(f"Could not write to the freshness state file '{self.file_path}'")
+            traceback.print_exc()
+
+    def get_last_run(self, job_id: str, legacy_file: Optional[str] = None) -> Optional[float]:
+        with self._lock:
+            job_state = self._load().get(job_id)
+
+        if job_state and job_state.get('last_run') is not None:
+            return float(job_state['last_run'])
+
+        if legacy_file:
+            try:
+                with open(legacy_file) as f:
+                    return float(f.read().strip())
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError):
+                self.logger.warning(f"Could not parse the timestamp file '{legacy_file}'")
+
+    def get_etag(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            job_state = self._load().get(job_id)
+
+        return job_state.get('etag') if job_state else None
+
+    def register_run(self, job_id: str, timestamp: Optional[float] = None, etag: Optional[str] = None,
+                     legacy_file: Optional[str] = None):
+        """
+        :param legacy_file: if defined, the timestamp is also written to this file (for backwards compatibility)
+        """
+        final_ts = timestamp if timestamp is not None else time.time()
+
+        with self._lock:
+            job_state = {'last_run': final_ts}
+
+            if etag:
+                job_state['etag'] = etag
+
+            self._save(job_id, job_state)
+
+        if legacy_file:
+            try:
+                Path(os.path.dirname(legacy_file)).mkdir(parents=True, exist_ok=True)
+
+                with open(legacy_file, 'w+') as f:
+                    f.write(str(final_ts))
+            except OSError:
+                self.logger.error(f"Could not write to the timestamp file '{legacy_file}'")
+
+    def reset(self, job_id: str):
+        with self._lock:
+            if self._load().get(job_id) is not None:
+                self._save(job_id, None)
+
+    def is_expired(self, job_id: str, period: Optional[timedelta] = None, daily: bool = False,
+                   legacy_file: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """
+        :param period: the job expires after this period
+        :param daily: the job expires when the day changes
+        :return: if the job has never run, its state cannot be read or it has expired
+        """
+        last_run = self.get_last_run(job_id, legacy_file)
+
+        if last_run is None:
+            return True
+
+        current = now if now is not None else time.time()
+
+        if current < last_run:
+            return True
+
+        if period is not None and last_run + period.total_seconds() <= current:
+            return True
+
+        if daily and datetime.fromtimestamp(current).date() != datetime.fromtimestamp(last_run).date():
+            return True
+
+        return False
+
+
+class RefreshJob:
+
+    def __init__(self, id_: str, task: Callable[[], object], priority: int = 0):
+        """
+        :param task: the refresh routine
+        :param priority: lower values run first
+        """
+        self.id = id_
+        self.task = task
+        self.priority = priority
+        self.result = None
+        self.error: Optional[Exception] = None
+        self._done = Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+
+class RefreshScheduler:
+    """
+    Runs background refresh jobs respecting their priorities and a maximum number of concurrent jobs.
+    Triggering a job that is already pending or running returns the current instance instead of scheduling it again.
+    Only refreshes whose result is not awaited use it (e.g: categories). Refreshes reporting progress or whose result
+    is needed right away (AppImage databases and suggestions, web suggestions, Debian index) only register their
+    state on the FreshnessRegistry.
+    """
+
+    def __init__(self, max_workers: int = 2, logger: Optional[logging.Logger] = None):
+        self.max_workers = max_workers
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self._queue: PriorityQueue = PriorityQueue()
+        self._active: Dict[str, RefreshJob] = {}
+        self._lock = Lock()
+        self._workers = []
+        self._seq = 0
+
+    def trigger(self, job_id: str, task: Callable[[], object], priority: int = 0) -> Tuple[RefreshJob, bool]:
+        """
+        :return: the job instance and if it was scheduled by this call (False if coalesced with an active one)
+        """
+        with self._lock:
+            active = self._active.get(job_id)
+
+            if active:
+                self.logger.info(f"Refresh job '{job_id}' is already scheduled")
+                return active, False
+
+            job = RefreshJob(job_id, task, priority)
+            self._active[job_id] = job
+            self._seq += 1
+            self._queue.put((priority, self._seq, job))
+
+            if len(self._workers) < self.max_workers:
+                worker = Thread(target=self._work, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+
+            return job, True
+
+    def is_active(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._active
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if self._queue.empty():
+                    self._workers.remove(current_thread())
+                    return
+
+                job = self._queue.get()[2]
+
+            ti = time.time()
+            try:
+                job.result = job.task()
+            except Exception as e:
+                job.error = e
+                self.logger.error(f"Refresh job '{job.id}' failed")
+                traceback.print_exc()
+            finally:
+                with self._lock:
+                    self._active.pop(job.id, None)
+
+                job._done.set()
+                self.logger.info(f"Refresh job '{job.id}' finished. Took {time.time() - ti:.2f} seconds")
+
+
+_registry: Optional[FreshnessRegistry] = None
+_scheduler: Optional[RefreshScheduler] = None
+_instances_lock = Lock()
+
+
+def get_registry() -> FreshnessRegistry:
+    global _registry
+
+    with _instances_lock:
+        if _registry is None:
+            _registry = FreshnessRegistry()
+
+        return _registry
+
+
+def get_scheduler() -> RefreshScheduler:
+    global _scheduler
+
+    with _instances_lock:
+        if _scheduler is None:
+            _scheduler = RefreshScheduler()
+
+        return _scheduler
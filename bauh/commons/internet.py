@@ -1,17 +1,138 @@
+import logging
+import select
 import socket
+import time
+from threading import Lock, Thread, Event
+from typing import Optional
+
+DEFAULT_HOST = 'w3.org'
+
+# netlink multicast groups notifying link and address changes
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
 
 
 class InternetChecker:
+    """
+    Keeps the internet connection state cached. An expired state is returned while it is re-checked in the background,
+    so callers never block on a DNS lookup (except for the very first check).
+    """
 
-    def __init__(self, offline: bool):
+    def __init__(self, offline: bool, host: str = DEFAULT_HOST, expiration: float = 30, timeout: float = 5,
+                 logger: Optional[logging.Logger] = None):
+        """
+        :param host: the host name resolved to determine if there is connection
+        :param expiration: time in seconds the state is considered valid
+        :param timeout: maximum time in seconds to wait for the first check
+        """
         self.offline = offline
+        self.host = host if host else DEFAULT_HOST
+        self.expiration = expiration
+        self.timeout = timeout
+        self.logger = logger if logger else logging.getLogger(__name__)
+        self._available: Optional[bool] = None
+        self._checked_at: Optional[float] = None
+        self._lock = Lock()
+        self._checking: Optional[Event] = None
+        self._monitoring = False
+
+    def _resolve(self) -> bool:
+        try:
+            socket.gethostbyname(self.host)
+            return True
+        except Exception:
+            return False
+
+    def _check(self, done: Event):
+        available = self._resolve()
+
+        with self._lock:
+            if self._available is not None and available != self._available:
+                self.logger.info(f"Internet connection {'available' if available else 'unavailable'}")
+
+            self._available = available
+            self._checked_at = time.monotonic()
+            self._checking = None
+
+        done.set()
+
+    def refresh(self) -> Event:
+        """
+        checks the connection in the background (if there is no ongoing check)
+        :return: an event set when the check is finished
+        """
+        with self._lock:
+            if self._checking:
+                return self._checking
+
+            self._checking = Event()
+            checking = self._checking
+
+        Thread(target=self._check, args=(checking,), daemon=True).start()
+        return checking
 
     def is_available(self) -> bool:
         if self.offline:
             return False
 
+        with self._lock:
+            available, checked_at = self._available, self._checked_at
+
+        if available is None:
+            if not self.refresh().wait(self.timeout):
+                self.logger.warning(f"Internet check timed out (host: {self.host})")
+                return False
+
+            with self._lock:
+                return bool(self._available)
+
+        if self.expiration <= 0 or time.monotonic() - checked_at >= self.expiration:
+            self.refresh()
+
+        return available
+
+    def _new_netlink_socket(self) -> Optional[socket.socket]:
         try:
-            socket.gethostbyname("w3.org")
-            return True
-        except Exception:
-            return False
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+            return sock
+        except (AttributeError, OSError):
+            self.logger.info("Network changes cannot be monitored through netlink. Only periodic checks will be done.")
+
+    def _monitor(self, interval: float):
+        sock = self._new_netlink_socket()
+
+        try:
+            while True:
+                if sock:
+                    readable = select.select([sock], [], [], interval)[0]
+
+                    if readable:
+                        sock.recv(65536)  # the change itself does not matter
+                        time.sleep(1)  # waiting the network to settle (DHCP, routes, etc)
+                else:
+                    time.sleep(interval)
+
+                self.refresh()
+        finally:
+            if sock:
+                sock.close()
+
+    def start_monitoring(self, interval: Optional[float] = None):
+        """
+        re-checks the connection when the network interfaces change (if supported) or periodically
+        :param interval: time in seconds between periodic checks (default: the state expiration time)
+        """
+        if self.offline:
+            return
+
+        with self._lock:
+            if self._monitoring:
+                return
+
+            self._monitoring = True
+
+        final_interval = interval if interval and interval > 0 else max(self.expiration, 1)
+        Thread(target=self._monitor, args=(final_interval,), daemon=True).start()
+        self.refresh()
@@ -0,0 +1,79 @@
+import time
+from queue import Queue, Empty
+from threading import Thread
+from typing import Optional
+
+from bauh.api.abstract.handler import ProcessWatcher
+
+_STOP = object()
+
+
+class OutputHandlerThread(Thread):
+    """
+    Base thread for the parsers of processes outputs. Lines are consumed from a blocking queue until
+    'stop_working' is called (the lines already queued are parsed before it stops).
+    The substatus updates are deduplicated and rate-limited: when several updates happen within the minimum
+    interval, only the latest one is displayed.
+    """
+
+    def __init__(self, watcher: ProcessWatcher, min_interval: float = 0.05, daemon: Optional[bool] = None):
+        """
+        :param min_interval: minimum number of seconds between two substatus updates
+        """
+        super(OutputHandlerThread, self).__init__(daemon=daemon)
+        self.watcher = watcher
+        self._lines = Queue()
+        self._min_interval = min_interval
+        self._pending: Optional[str] = None
+        self._last_substatus: Optional[str] = None
+        self._last_update = 0.0
+        self._accepting = True
+
+    def handle(self, line: str):
+        if self._accepting:
+            self._lines.put(line)
+
+    def stop_working(self):
+        self._lines.put(_STOP)
+
+    def _handle(self, line: str) -> bool:
+        """
+        :return: if the next lines should still be handled
+        """
+        raise NotImplementedError()
+
+    def change_substatus(self, substatus: str):
+        self._pending = substatus
+
+        if time.monotonic() - self._last_update >= self._min_interval:
+            self.flush_substatus()
+
+    def flush_substatus(self):
+        if self._pending is not None:
+            if self._pending != self._last_substatus:
+                self.watcher.change_substatus(self._pending)
+                self._last_substatus = self._pending
+                self._last_update = time.monotonic()
+
+            self._pending = None
+
+    def _get_flush_timeout(self) -> Optional[float]:
+        if self._pending is not None:
+            return max(0.0, self._last_update + self._min_interval - time.monotonic())
+
+    def run(self):
+        while True:
+            try:
+                line = self._lines.get(timeout=self._get_flush_timeout())
+            except Empty:
+                self.flush_substatus()
+                continue
+
+            if line is _STOP:
+                break
+
+            if not self._handle(line):
+                self._accepting = False
+                break
+
+        self.flush_substatus()
@@ -1,5 +1,8 @@
+import traceback
+from concurrent.futures import ThreadPoolExecutor, Future, wait
 from logging import Logger
-from typing import Dict, Optional, Tuple
+from threading import Lock
+from typing import Dict, Optional, Tuple, Callable, Set, Iterable
 
 from bauh.api.abstract.model import SuggestionPriority
 
@@ -33,3 +36,59 @@ def parse(suggestions_str: str, logger: Optional[Logger] = None, type_: Optional
 
 def sort_by_priority(names_prios: Dict[str, SuggestionPriority]) -> Tuple[str, ...]:
     return tuple(pair[1] for pair in sorted(((names_prios[n], n) for n in names_prios), reverse=True))
+
+
+class SuggestionsDataLoader:
+    """
+    Loads the suggestions data on a bounded number of threads (shared by the successive suggestions requests).
+    Loads not started yet can be cancelled (e.g: when a search starts).
+    """
+
+    def __init__(self, name: str, max_workers: int = 4):
+        self._name = name
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
+        self._lock = Lock()
+
+    def _remove(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+
+    @staticmethod
+    def _load(fn: Callable, *args):
+        try:
+            return fn(*args)
+        except Exception:
+            traceback.print_exc()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                thread_name_prefix=f'{self._name}_suggestions')
+
+            future = self._pool.submit(self._load, fn, *args)
+            self._pending.add(future)
+
+        future.add_done_callback(self._remove)
+        return future
+
+    @staticmethod
+    def wait(futures: Iterable[Future], timeout: Optional[float] = None):
+        """
+        waits the given loads to finish (or to be cancelled)
+        """
+        futures = tuple(futures)
+
+        if futures:
+            wait(futures, timeout=timeout)
+
+    def cancel(self) -> int:
+        """
+        :return: the number of loads cancelled
+        """
+        with self._lock:
+            pending = tuple(self._pending)
+
+        return sum(1 for f in pending if f.cancel())
@@ -1,11 +1,11 @@
 import os
 import re
+import selectors
 import subprocess
 import sys
-import time
 from io import StringIO
 from subprocess import PIPE
-from typing import List, Tuple, Set, Dict, Optional, Iterable, Union, IO, Any
+from typing import List, Tuple, Set, Dict, Optional, Iterable, Union, IO, Any, Generator
 
 # default environment variables for subprocesses.
 from bauh.api.abstract.handler import ProcessWatcher
@@ -137,61 +137,43 @@ class ProcessHandler:
     def handle(self, process: SystemProcess, error_output: StringIO = None, output_handler=None) -> bool:
         self._notify_watcher(' '.join(process.subproc.args) + '\n')
 
-        already_succeeded = False
+        succeeded, failed = False, False
 
-        if not process.skip_stdout:
-            for output in process.subproc.stdout:
+        for output, from_stderr in read_output_lines(process.subproc, stdout=not process.skip_stdout):
+            try:
+                line = output.decode().strip()
+            except UnicodeDecodeError:
+                line = None
 
-                try:
-                    line = output.decode().strip()
-                except UnicodeDecodeError:
-                    line = None
-
-                if line:
-                    self._notify_watcher(line)
-
-                    if output_handler:
-                        output_handler(line)
-
-                    if process.success_phrases and [p in line for p in process.success_phrases]:
-                        already_succeeded = True
+            if not line:
+                continue
 
-                if not already_succeeded and process.output_delay:
-                    time.sleep(process.output_delay)
+            self._notify_watcher(line)
 
-            if already_succeeded:
-                return True
+            if output_handler:
+                output_handler(line)
 
-        for output in process.subproc.stderr:
-            if output:
-                try:
-                    line = output.decode().strip()
-                except UnicodeDecodeError:
-                    line = None
-
-                if line:
-                    self._notify_watcher(line)
-
-                    if output_handler:
-                        output_handler(line)
+            if not from_stderr:
+                if process.success_phrases and any(p in line for p in process.success_phrases):
+                    succeeded = True
 
-                    if error_output is not None:
-                        error_output.write(line)
+                continue
 
-                    if process.check_error_output:
-                        if process.wrong_error_phrase and process.wrong_error_phrase in line:
-                            continue
-                        else:
-                            return False
-                    elif process.skip_stdout and process.success_phrases and [p in line for p in process.success_phrases]:
-                        already_succeeded = True
+            if error_output is not None:
+                error_output.write(line)
 
-                if not already_succeeded and process.output_delay:
-                    time.sleep(process.output_delay)
+            if process.check_error_output:
+                if not process.wrong_error_phrase or process.wrong_error_phrase not in line:
+                    failed = True
+            elif process.skip_stdout and process.success_phrases and any(p in line for p in process.success_phrases):
+                succeeded = True
 
-        if already_succeeded:
+        if succeeded:
             return True
 
+        if failed:
+            return False
+
         return process.subproc.returncode is None or process.subproc.returncode == 0
 
     def handle_simple(self, proc: SimpleProcess, output_handler=None, notify_watcher: bool = True,
@@ -248,6 +230,41 @@ class ProcessHandler:
         return success, string_output
 
 
+def read_output_lines(proc: subprocess.Popen, stdout: bool = True, stderr: bool = True,
+                      chunk_size: int = 65536) -> Generator[Tuple[bytes, bool], None, None]:
+    """
+    reads the process stdout and stderr simultaneously (lines are yielded as soon as they arrive on any of them)
+    :return: a generator of lines (bytes without the line break) and if they come from stderr
+    """
+    selector = selectors.DefaultSelector()
+
+    for stream, from_stderr, read in ((proc.stdout, False, stdout), (proc.stderr, True, stderr)):
+        if read and stream is not None:
+            selector.register(stream, selectors.EVENT_READ, data=[from_stderr, b''])  # [origin, incomplete line]
+
+    try:
+        while selector.get_map():
+            for key, _ in selector.select():
+                from_stderr, incomplete = key.data
+                data = os.read(key.fd, chunk_size)
+
+                if not data:
+                    selector.unregister(key.fileobj)
+
+                    if incomplete:
+                        yield incomplete, from_stderr
+
+                    continue
+
+                lines = (incomplete + data).split(b'\n')
+                key.data[1] = lines.pop()
+
+                for line in lines:
+                    yield line, from_stderr
+    finally:
+        selector.close()
+
+
 def run_cmd(cmd: str, expected_code: int = 0, ignore_return_code: bool = False, print_error: bool = True,
             cwd: str = '.', global_interpreter: bool = USE_GLOBAL_INTERPRETER, extra_paths: Set[str] = None,
             custom_user: Optional[str] = None, lang: Optional[str] = DEFAULT_LANG) -> Optional[str]:
@@ -5,6 +5,7 @@ import re
 import shutil
 import sqlite3
 import subprocess
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
@@ -22,17 +23,18 @@ from bauh.api.abstract.model import SoftwarePackage, PackageHistory, PackageUpda
 from bauh.api.abstract.view import MessageType, FormComponent, InputOption, SingleSelectComponent, \
     SelectViewType, TextInputComponent, PanelComponent, FileChooserComponent, ViewObserver
 from bauh.api.paths import DESKTOP_ENTRIES_DIR
-from bauh.commons import resource
+from bauh.commons import resource, capabilities
 from bauh.commons.boot import CreateConfigFile
 from bauh.commons.html import bold
 from bauh.commons.system import SystemProcess, new_subprocess, ProcessHandler, SimpleProcess
 from bauh.commons.version_util import normalize_version
+from bauh.commons.view_utils import get_human_size_str
 from bauh.gems.appimage import query, INSTALLATION_DIR, APPIMAGE_SHARED_DIR, ROOT_DIR, \
     APPIMAGE_CONFIG_DIR, UPDATES_IGNORED_FILE, util, get_default_manual_installation_file_dir, DATABASE_APPS_FILE, \
-    DATABASE_RELEASES_FILE, APPIMAGE_CACHE_DIR, get_icon_path, DOWNLOAD_DIR
+    DATABASE_RELEASES_FILE, APPIMAGE_CACHE_DIR, get_icon_path, DOWNLOAD_DIR, zsync
 from bauh.gems.appimage.config import AppImageConfigManager
 from bauh.gems.appimage.model import AppImage
-from bauh.gems.appimage.util import replace_desktop_entry_exec_command
+from bauh.gems.appimage.util import replace_desktop_entry_exec_command, get_desktop_entry_icon, get_link_target
 from bauh.gems.appimage.worker import DatabaseUpdater, SymlinksVerifier, AppImageSuggestionsDownloader
 
 RE_DESKTOP_ICON = re.compile(r'Icon\s*=\s*.+\n')
@@ -551,9 +553,64 @@ class AppImageManager(SoftwareManager, SettingsController):
 
     def _find_icon_file(self, folder: str) -> Optional[str]:
         for f in glob.glob(folder + ('/**' if not folder.endswith('/') else '**'), recursive=True):
-            if RE_ICON_ENDS_WITH.match(f):
+            if RE_ICON_ENDS_WITH.match(f) and os.path.isfile(f):  # ignoring symlinks whose targets were not extracted
                 return f
 
+    def _extract(self, file_path: str, out_dir: str, handler: ProcessHandler, pattern: Optional[str] = None) -> str:
+        cmd = [file_path, '--appimage-extract']
+
+        if pattern:
+            cmd.append(pattern)
+
+        return handler.handle_simple(SimpleProcess(cmd, cwd=out_dir))[1]
+
+    def _extract_metadata(self, file_path: str, out_dir: str, handler: ProcessHandler) -> str:
+        """
+        extracts only the root desktop entry and the icon it references (following symlinks) instead of the whole
+        AppImage content. Everything is extracted if the runtime does not support extraction patterns or if the
+        desktop entry or icon could not be found.
+        :return: the extraction output
+        """
+        output = self._extract(file_path, out_dir, handler, '*.desktop')
+
+        if 'Error: Failed to register AppImage in AppImageLauncherFS' in output:
+            return output
+
+        extracted_folder = f'{out_dir}/squashfs-root'
+        desktop_entry = self._find_desktop_file(extracted_folder) if os.path.isdir(extracted_folder) else None
+        icon_name = None
+
+        if desktop_entry:
+            try:
+                with open(f'{extracted_folder}/{desktop_entry}') as f:
+                    icon_name = get_desktop_entry_icon(f.read())
+            except OSError:
+                traceback.print_exc()
+
+        if icon_name:
+            output += self._extract(file_path, out_dir, handler, f'{icon_name}.*')
+
+            for icon_file in glob.glob(f'{glob.escape(extracted_folder)}/{glob.escape(icon_name)}.*'):
+                for _ in range(5):  # icons are usually links to the hicolor theme folder
+                    link_target = get_link_target(extracted_folder, icon_file)
+
+                    if not link_target or os.path.exists(icon_file):
+                        break
+
+                    output += self._extract(file_path, out_dir, handler, link_target)
+                    icon_file = f'{extracted_folder}/{link_target}'
+
+        if desktop_entry and self._find_icon_file(extracted_folder):
+            self.logger.info(f"Desktop entry and icon extracted from '{file_path}'")
+            return output
+
+        self.logger.info(f"Could not extract only the desktop entry and icon from '{file_path}'. Extracting everything")
+
+        if os.path.exists(extracted_folder):
+            shutil.rmtree(extracted_folder, ignore_errors=True)
+
+        return self._extract(file_path, out_dir, handler)
+
     def _download(self, pkg: AppImage, watcher: ProcessWatcher) -> Optional[Tuple[str, str]]:
         appimage_url = pkg.url_download_latest_version if pkg.update else pkg.url_download
 
@@ -576,6 +633,10 @@ class AppImageManager(SoftwareManager, SettingsController):
             return
 
         file_path = f'{DOWNLOAD_DIR}/{file_name}'
+
+        if pkg.update and self._download_delta(pkg=pkg, file_url=appimage_url, output_path=file_path, watcher=watcher):
+            return file_name, file_path
+
         downloaded = self.file_downloader.download(file_url=pkg.url_download, watcher=watcher,
                                                    output_path=file_path, cwd=str(Path.home()))
 
@@ -587,6 +648,103 @@ class AppImageManager(SoftwareManager, SettingsController):
 
         return file_name, file_path
 
+    def _download_delta(self, pkg: AppImage, file_url: str, output_path: str, watcher: ProcessWatcher) -> bool:
+        """
+        builds the new AppImage file reusing the blocks of the installed one. Only the missing ranges described by the
+        zsync control file (referenced by the update information embedded in the installed file) are downloaded.
+        :return: if the new file was built and verified
+        """
+        installed_file = None
+        if pkg.install_dir and os.path.isdir(pkg.install_dir):
+            installed_file = util.find_appimage_file(pkg.install_dir)
+
+        if not installed_file:
+            return False
+
+        update_info = zsync.read_update_info(installed_file)
+
+        if not update_info:
+            self.logger.info(f"No update information embedded in '{installed_file}'. The whole new file will be downloaded")
+            return False
+
+        control_url = zsync.get_control_url(update_info, file_url)
+
+        if not control_url:
+            self.logger.info(f"Update information not supported for delta updates: {update_info}")
+            return False
+
+        try:
+            res = self.http_client.get(control_url)
+        except Exception:
+            self.logger.error(f"Could not download the zsync file '{control_url}'")
+            traceback.print_exc()
+            return False
+
+        control = zsync.parse_control(res.content) if res else None
+
+        if not control:
+            self.logger.warning(f"Could not read the zsync file '{control_url}'. The whole new file will be downloaded")
+            return False
+
+        if not zsync.can_verify(control):
+            self.logger.warning(f"The zsync file '{control_url}' has no SHA-1 to verify the built file. "
+                                f"The whole new file will be downloaded")
+            return False
+
+        watcher.change_substatus(self.i18n['appimage.upgrade.delta.analysing'].format(bold(pkg.name)))
+        ti = time.time()
+
+        try:
+            found = zsync.map_local_blocks(control, installed_file, workers=os.cpu_count() or 1)
+        except Exception:
+            self.logger.error(f"Unexpected error while looking for the unchanged blocks of '{installed_file}'")
+            traceback.print_exc()
+            return False
+
+        missing_ranges = zsync.gen_missing_ranges(control, found)
+        missing_bytes = zsync.count_bytes(missing_ranges)
+        self.logger.info(f"{len(found)}/{control.blocks} blocks of '{pkg.name}' found locally "
+                         f"({time.time() - ti:.2f} seconds). Bytes to download: {missing_bytes}/{control.length}")
+
+        if missing_bytes >= control.length * 0.9:  # not worth it
+            return False
+
+        file_url = zsync.resolve_file_url(control, control_url) or file_url
+        watcher.change_substatus(self.i18n['appimage.upgrade.delta.downloading'].format(bold(pkg.name),
+                                                                                        get_human_size_str(missing_bytes)))
+        downloaded = 0
+
+        def fetch_range(first: int, last: int) -> Optional[bytes]:
+            nonlocal downloaded
+
+            try:
+                range_res = self.http_client.get(file_url, headers={'Range': f'bytes={first}-{last}'}, single_call=True)
+            except Exception:
+                traceback.print_exc()
+                return
+
+            if not range_res or range_res.status_code != 206:  # the server does not support ranges
+                return
+
+            downloaded += last - first + 1
+            watcher.change_progress(int(downloaded / missing_bytes * 100) if missing_bytes else 100)
+            return range_res.content
+
+        if zsync.build_file(control, installed_file, output_path, found, fetch_range, self.logger):
+            self.logger.info(f"New file of '{pkg.name}' built from the installed one: {output_path}")
+            return True
+
+        self.logger.warning(f"Could not build the new file of '{pkg.name}' from the installed one. "
+                            f"The whole new file will be downloaded")
+
+        if os.path.exists(output_path):
+            try:
+                os.remove(output_path)
+            except OSError:
+                traceback.print_exc()
+
+        return False
+
     def install(self, pkg: AppImage, root_password: Optional[str], disk_loader: Optional[DiskCacheLoader], watcher: ProcessWatcher) -> TransactionResult:
         return self._install(pkg=pkg, watcher=watcher)
 
@@ -654,8 +812,7 @@ class AppImageManager(SoftwareManager, SettingsController):
             watcher.change_substatus(self.i18n['appimage.install.extract'].format(bold(file_name)))
 
             try:
-                res, output = handler.handle_simple(
-                    SimpleProcess([install_file_path, '--appimage-extract'], cwd=out_dir))
+                output = self._extract_metadata(install_file_path, out_dir, handler)
 
                 if 'Error: Failed to register AppImage in AppImageLauncherFS' in output:
                     watcher.show_message(title=self.i18n['error'],
@@ -730,7 +887,7 @@ class AppImageManager(SoftwareManager, SettingsController):
         self.enabled = enabled
 
     def _is_sqlite3_available(self) -> bool:
-        return bool(shutil.which('sqlite3'))
+        return capabilities.registry.is_available('sqlite3')
 
     def can_work(self) -> Tuple[bool, Optional[str]]:
         if not self.context.is_system_x86_64():
@@ -744,6 +901,12 @@ class AppImageManager(SoftwareManager, SettingsController):
     def requires_root(self, action: SoftwareAction, pkg: AppImage) -> bool:
         return False
 
+    def get_deferrable_prepare_tasks(self, operation: str) -> Optional[Set[str]]:
+        if operation in ('read_installed', 'search', 'list_updates'):
+            return {'appim_symlink_check', 'appim.suggestions'}
+        elif operation == 'list_suggestions':
+            return {'appim_symlink_check'}
+
     def prepare(self, task_manager: TaskManager, root_password: Optional[str], internet_available: bool):
         create_config = CreateConfigFile(taskman=task_manager, configman=self.configman, i18n=self.i18n,
                                          task_icon_path=get_icon_path(), logger=self.logger)
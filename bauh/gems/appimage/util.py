@@ -3,6 +3,7 @@ import re
 from typing import Optional
 
 RE_DESKTOP_EXEC = re.compile(r'(\n?\s*\w*Exec\s*=(.+))')
+RE_DESKTOP_ICON_NAME = re.compile(r'^\s*Icon\s*=\s*(.+?)\s*$', flags=re.MULTILINE)
 RE_MANY_SPACES = re.compile(r'\s+')
 
 
@@ -46,3 +47,33 @@ def replace_desktop_entry_exec_command(desktop_entry: str, appname: str, file_pa
             final_entry = final_entry.replace(full_match, full_match.replace(exec_groups[1], ' '.join(words)))
 
     return final_entry
+
+
+def get_desktop_entry_icon(desktop_entry: str) -> Optional[str]:
+    """
+    :return: the icon name defined by the desktop entry (only when it is not a path)
+    """
+    icon = RE_DESKTOP_ICON_NAME.search(desktop_entry)
+
+    if icon and '/' not in icon.group(1):
+        return icon.group(1)
+
+
+def get_link_target(root_dir: str, file_path: str) -> Optional[str]:
+    """
+    :param root_dir: the extracted AppImage folder
+    :param file_path: an extracted symlink path
+    :return: the symlink target path relative to the extracted folder (if it points to something inside it)
+    """
+    if not os.path.islink(file_path):
+        return
+
+    target = os.readlink(file_path)
+
+    if os.path.isabs(target):
+        return
+
+    rel_path = os.path.normpath(os.path.join(os.path.relpath(os.path.dirname(file_path), root_dir), target))
+
+    if not rel_path.startswith('..'):
+        return rel_path
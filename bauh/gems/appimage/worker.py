@@ -5,7 +5,7 @@ import os
 import tarfile
 import time
 import traceback
-from datetime import datetime, timedelta
+from datetime import timedelta
 from pathlib import Path
 from threading import Thread
 from typing import Optional, Generator
@@ -14,6 +14,7 @@ import requests
 
 from bauh.api.abstract.handler import TaskManager, ProcessWatcher
 from bauh.api.http import HttpClient
+from bauh.commons import freshness
 from bauh.commons.boot import CreateConfigFile
 from bauh.commons.html import bold
 from bauh.gems.appimage import get_icon_path, INSTALLATION_DIR, SYMLINKS_DIR, util, DATABASES_TS_FILE, \
@@ -21,6 +22,9 @@ from bauh.gems.appimage import get_icon_path, INSTALLATION_DIR, SYMLINKS_DIR, ut
 from bauh.gems.appimage.model import AppImage
 from bauh.view.util.translation import I18n
 
+DATABASES_JOB_ID = 'appimage.databases'
+SUGGESTIONS_JOB_ID = 'appimage.suggestions'
+
 
 class DatabaseUpdater(Thread):
     COMPRESS_FILE_PATH = f'{APPIMAGE_CACHE_DIR}/db.tar.gz'
@@ -57,10 +61,6 @@ class DatabaseUpdater(Thread):
             self.logger.warning(f'No database files on {APPIMAGE_CACHE_DIR}')
             return True
 
-        if DATABASES_TS_FILE not in files:
-            self.logger.warning("No database timestamp file found ({})".format(DATABASES_TS_FILE))
-            return True
-
         if DATABASE_APPS_FILE not in files:
             self.logger.warning("Database file '{}' not found".format(DATABASE_APPS_FILE))
             return True
@@ -69,17 +69,8 @@ class DatabaseUpdater(Thread):
             self.logger.warning("Database file '{}' not found".format(DATABASE_RELEASES_FILE))
             return True
 
-        with open(DATABASES_TS_FILE) as f:
-            dbs_ts_str = f.read()
-
-        try:
-            dbs_timestamp = datetime.fromtimestamp(float(dbs_ts_str))
-        except Exception:
-            self.logger.error('Could not parse the databases timestamp: {}'.format(dbs_ts_str))
-            traceback.print_exc()
-            return True
-
-        update = dbs_timestamp + timedelta(minutes=db_exp) <= datetime.utcnow()
+        update = freshness.get_registry().is_expired(DATABASES_JOB_ID, period=timedelta(minutes=db_exp),
+                                                     legacy_file=DATABASES_TS_FILE)
         self.logger.info('Finished. Took {0:.2f} seconds'.format(time.time() - ti))
         return update
 
@@ -93,7 +84,7 @@ class DatabaseUpdater(Thread):
         self._update_task_progress(10, self.i18n['appimage.update_database.downloading'])
         self.logger.info('Retrieving AppImage databases')
 
-        database_timestamp = datetime.utcnow().timestamp()
+        database_timestamp = time.time()
         try:
             res = self.http_client.get(URL_COMPRESSED_DATABASES, session=False)
         except Exception as e:
@@ -139,10 +130,7 @@ class DatabaseUpdater(Thread):
 
         self._update_task_progress(95)
         self.logger.info("Saving database timestamp {}".format(database_timestamp))
-
-        with open(DATABASES_TS_FILE, 'w+') as f:
-            f.write(str(database_timestamp))
-
+        freshness.get_registry().register_run(DATABASES_JOB_ID, timestamp=database_timestamp)
         self.logger.info("Database timestamp saved")
 
         return True
@@ -348,22 +336,8 @@ class AppImageSuggestionsDownloader(Thread):
             self.logger.info(f"File {self.cached_file_path} not found. It must be downloaded")
             return True
 
-        if not os.path.exists(self.cached_ts_file_path):
-            self.logger.info(f"File {self.cached_ts_file_path}  not found. The suggestions file must be downloaded.")
-            return True
-
-        with open(self.cached_ts_file_path) as f:
-            timestamp_str = f.read()
-
-        try:
-            suggestions_timestamp = datetime.fromtimestamp(float(timestamp_str))
-        except Exception:
-            self.logger.error(f'Could not parse the cached AppImage suggestions timestamp: {timestamp_str}')
-            traceback.print_exc()
-            return True
-
-        update = suggestions_timestamp + timedelta(hours=exp_hours) <= datetime.utcnow()
-        return update
+        return freshness.get_registry().is_expired(SUGGESTIONS_JOB_ID, period=timedelta(hours=exp_hours),
+                                                   legacy_file=self.cached_ts_file_path)
 
     def read(self) -> Generator[str, None, None]:
         if not self._file_url:
@@ -372,7 +346,7 @@ class AppImageSuggestionsDownloader(Thread):
 
         self.logger.info("Checking if AppImage suggestions should be downloaded")
         if self.should_download(self.config):
-            suggestions_timestamp = datetime.utcnow().timestamp()
+            suggestions_timestamp = time.time()
             suggestions_str = self.download()
 
             Thread(target=self.cache_suggestions, args=(suggestions_str, suggestions_timestamp), daemon=True).start()
@@ -409,13 +383,9 @@ class AppImageSuggestionsDownloader(Thread):
                 self.logger.error(f"An exception happened while writing AppImage suggestions to {self.cached_file_path}")
                 traceback.print_exc()
 
-            try:
-                with open(self.cached_ts_file_path, 'w+') as f:
-                    f.write(str(timestamp))
-            except Exception:
-                self.logger.error(f"An exception happened while writing the cached AppImage suggestions timestamp "
-                                  f"to {self.cached_ts_file_path}")
-                traceback.print_exc()
+                return
+
+            freshness.get_registry().register_run(SUGGESTIONS_JOB_ID, timestamp=timestamp)
 
     def download(self) -> Optional[str]:
         if not self._file_url:
@@ -466,7 +436,7 @@ class AppImageSuggestionsDownloader(Thread):
 
             try:
                 if should_download:
-                    suggestions_timestamp = datetime.utcnow().timestamp()
+                    suggestions_timestamp = time.time()
                     suggestions_str = self.download()
                     self.taskman.update_progress(self.task_id, 70, None)
 
@@ -0,0 +1,380 @@
+import hashlib
+import mmap
+import multiprocessing
+import os
+import struct
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, compress, repeat
+from logging import Logger
+from operator import add, and_, mul, sub, lshift
+from typing import Optional, List, Dict, Tuple, Callable, Iterable
+from urllib.parse import urljoin
+
+UPDATE_INFO_SECTION = b'.upd_info'
+
+
+class ZsyncControl:
+    """
+    Data from a '.zsync' control file: the target file metadata and the checksums of its blocks
+    """
+
+    def __init__(self, length: int, blocksize: int, seq_matches: int, rsum_bytes: int, checksum_bytes: int,
+                 sha1: Optional[str], url: Optional[str], filename: Optional[str], rsums: List[int],
+                 checksums: List[bytes]):
+        self.length = length
+        self.blocksize = blocksize
+        self.seq_matches = seq_matches
+        self.rsum_bytes = rsum_bytes
+        self.checksum_bytes = checksum_bytes
+        self.sha1 = sha1
+        self.url = url
+        self.filename = filename
+        self.rsums = rsums
+        self.checksums = checksums
+
+    @property
+    def blocks(self) -> int:
+        return len(self.rsums)
+
+
+def read_update_info(file_path: str) -> Optional[str]:
+    """
+    :return: the update information embedded in the AppImage ELF section '.upd_info' (e.g: 'zsync|https://...')
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            ident = f.read(16)
+
+            if len(ident) < 16 or ident[:4] != b'\x7fELF' or ident[4] not in (1, 2):
+                return
+
+            is_64, order = ident[4] == 2, '<' if ident[5] == 1 else '>'
+
+            if is_64:
+                f.seek(0x28)
+                shoff, = struct.unpack(f'{order}Q', f.read(8))
+                f.seek(0x3A)
+            else:
+                f.seek(0x20)
+                shoff, = struct.unpack(f'{order}I', f.read(4))
+                f.seek(0x2E)
+
+            shentsize, shnum, shstrndx = struct.unpack(f'{order}HHH', f.read(6))
+
+            if not shoff or not shnum or shstrndx >= shnum:
+                return
+
+            f.seek(shoff)
+            headers_data = f.read(shentsize * shnum)
+
+            if len(headers_data) < shentsize * shnum:
+                return
+
+            sections = []
+            for idx in range(shnum):
+                header = headers_data[idx * shentsize:(idx + 1) * shentsize]
+
+                if is_64:
+                    name, _, _, _, offset, size = struct.unpack(f'{order}IIQQQQ', header[:40])
+                else:
+                    name, _, _, _, offset, size = struct.unpack(f'{order}IIIIII', header[:24])
+
+                sections.append((name, offset, size))
+
+            _, names_offset, names_size = sections[shstrndx]
+            f.seek(names_offset)
+            names = f.read(names_size)
+
+            for name, offset, size in sections:
+                if names[name:name + len(UPDATE_INFO_SECTION) + 1] == UPDATE_INFO_SECTION + b'\x00':
+                    f.seek(offset)
+                    info = f.read(size).split(b'\x00')[0].decode(errors='ignore').strip()
+                    return info if info else None
+    except (OSError, struct.error):
+        traceback.print_exc()
+
+
+def get_control_url(update_info: str, download_url: str) -> Optional[str]:
+    """
+    :param download_url: the URL of the new AppImage file
+    :return: the '.zsync' file URL defined by the update information
+    """
+    fields = update_info.split('|')
+
+    if fields[0] == 'zsync' and len(fields) > 1 and fields[1].strip():
+        return fields[1].strip()
+
+    if fields[0] == 'gh-releases-zsync' and download_url:
+        # the control files are published on the same release as the AppImage files
+        return f'{download_url}.zsync'
+
+
+def parse_control(content: bytes) -> Optional[ZsyncControl]:
+    header_end = content.find(b'\n\n')
+
+    if header_end < 0:
+        return
+
+    header = {}
+    for line in content[:header_end].decode(errors='ignore').split('\n'):
+        key, _, value = line.partition(':')
+
+        if value:
+            header[key.strip().lower()] = value.strip()
+
+    try:
+        length, blocksize = int(header['length']), int(header['blocksize'])
+        seq_matches, rsum_bytes, checksum_bytes = (int(v) for v in header['hash-lengths'].split(','))
+    except (KeyError, ValueError):
+        return
+
+    if length <= 0 or blocksize <= 0 or not 1 <= seq_matches <= 2 or not 1 <= rsum_bytes <= 4 \
+            or not 1 <= checksum_bytes <= 16:
+        return
+
+    blocks = (length + blocksize - 1) // blocksize
+    entry_size = rsum_bytes + checksum_bytes
+    data = content[header_end + 2:]
+
+    if len(data) < blocks * entry_size:
+        return
+
+    rsums, checksums = [], []
+    for idx in range(blocks):
+        entry = data[idx * entry_size: (idx + 1) * entry_size]
+        rsums.append(int.from_bytes(entry[:rsum_bytes], 'big'))
+        checksums.append(entry[rsum_bytes:])
+
+    return ZsyncControl(length=length, blocksize=blocksize, seq_matches=seq_matches, rsum_bytes=rsum_bytes,
+                        checksum_bytes=checksum_bytes, sha1=header.get('sha-1'), url=header.get('url'),
+                        filename=header.get('filename'), rsums=rsums, checksums=checksums)
+
+
+def calc_rsum(block: bytes) -> int:
+    """
+    :return: zsync's weak checksum of a block ('a' in the 16 high bits and 'b' in the 16 low bits)
+    """
+    a, b, size = 0, 0, len(block)
+    for idx, byte in enumerate(block):
+        a += byte
+        b += (size - idx) * byte
+
+    return ((a & 0xffff) << 16) | (b & 0xffff)
+
+
+def _check_md4() -> bool:
+    try:
+        hashlib.new('md4', b'')
+        return True
+    except ValueError:  # not provided by the OpenSSL version available (legacy algorithm)
+        return False
+
+
+MD4_AVAILABLE = _check_md4()
+
+
+def md4(data: bytes) -> bytes:
+    return hashlib.new('md4', data).digest()
+
+
+def _gen_window_keys(data: bytes, blocksize: int, mask: int) -> List[int]:
+    """
+    :return: the (masked) weak checksums of all windows of 'blocksize' bytes in 'data'. They are computed from prefix
+    sums (b = sum(S[q] - S[p]) for q in (p, p + blocksize]), so all loops run on the C level
+    """
+    sums = [0, *accumulate(data)]
+    sums_of_sums = [0, *accumulate(sums)]
+    b = map(sub, map(sub, sums_of_sums[blocksize + 1:], sums_of_sums[1:-blocksize]),
+            map(mul, sums[:-blocksize], repeat(blocksize)))
+
+    if mask <= 0xffff:  # only 'b' is considered
+        return list(map(and_, b, repeat(mask)))
+
+    a = map(sub, sums[blocksize:], sums[:-blocksize])
+    return list(map(and_, map(add, map(lshift, a, repeat(16)), map(and_, b, repeat(0xffff))), repeat(mask)))
+
+
+def _gen_lookup(control: ZsyncControl) -> Dict[int, List[int]]:
+    """
+    :return: the target blocks indexes by the keys of two sequential blocks (used to filter the local positions)
+    """
+    key_bits, lookup = control.rsum_bytes * 8, {}
+
+    for idx in range(control.blocks - 1):
+        lookup.setdefault((control.rsums[idx] << key_bits) | control.rsums[idx + 1], []).append(idx)
+
+    return lookup
+
+
+def _scan(control: ZsyncControl, lookup: Dict[int, List[int]], file_path: str, first_pos: int, last_pos: int,
+          chunk_size: int, min_sequence: int) -> Dict[int, int]:
+    bs, key_bits = control.blocksize, control.rsum_bytes * 8
+    mask, rsums, seq = (1 << key_bits) - 1, control.rsums, max(min_sequence, 2)
+    found: Dict[int, int] = {}
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for start in range(first_pos, last_pos + 1, chunk_size):
+            positions = min(chunk_size, last_pos + 1 - start)
+            keys = _gen_window_keys(data[start: start + positions + seq * bs - 1], bs, mask)
+            pair_keys = map(add, map(lshift, keys[:positions], repeat(key_bits)), keys[bs: bs + positions])
+
+            for pos in compress(range(positions), map(lookup.__contains__, pair_keys)):
+                offset = start + pos
+
+                for idx in lookup[(keys[pos] << key_bits) | keys[pos + bs]]:
+                    if idx in found and idx + 1 in found:
+                        continue
+
+                    matched = 2
+                    while matched < seq and idx + matched < control.blocks:
+                        key_pos = pos + matched * bs
+
+                        if key_pos >= len(keys) or keys[key_pos] != rsums[idx + matched]:
+                            break
+
+                        matched += 1
+
+                    if matched < seq and idx + matched < control.blocks:
+                        continue
+
+                    if MD4_AVAILABLE and not all(md4(data[offset + s * bs: offset + (s + 1) * bs])[:control.checksum_bytes] == control.checksums[idx + s]
+                                                 for s in range(matched) if idx + s not in found):
+                        continue
+
+                    for s in range(matched):
+                        found.setdefault(idx + s, offset + s * bs)
+
+                if len(found) == control.blocks:
+                    return found
+
+    return found
+
+
+def map_local_blocks(control: ZsyncControl, file_path: str, chunk_size: int = 256 * 1024, min_sequence: int = 3,
+                     workers: int = 1) -> Dict[int, int]:
+    """
+    finds the target blocks already available in a local file. A local block is only considered if it is part of a
+    sequence of at least 'min_sequence' blocks matching the weak checksums (or of the blocks remaining until the end
+    of the file). Their MD4 checksums are also compared if hashlib supports it, and the final file checksum
+    is verified by 'build_file'.
+    :param workers: number of processes scanning different parts of the file
+    :return: the offsets of the local file by target block index
+    """
+    lookup = _gen_lookup(control)
+
+    if not lookup:
+        return {}
+
+    last_pos = os.path.getsize(file_path) - 2 * control.blocksize
+
+    if last_pos < 0:
+        return {}
+
+    if workers <= 1 or last_pos < chunk_size * workers:
+        return _scan(control, lookup, file_path, 0, last_pos, chunk_size, min_sequence)
+
+    part_size = ((last_pos + 1) // workers // chunk_size + 1) * chunk_size
+    parts = [(first, min(first + part_size - 1, last_pos)) for first in range(0, last_pos + 1, part_size)]
+    found: Dict[int, int] = {}
+
+    # the scanning is CPU-bound, so it is split among processes ('spawn' avoids forking a multi-threaded process)
+    with ProcessPoolExecutor(max_workers=len(parts), mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [executor.submit(_scan, control, lookup, file_path, first, last, chunk_size, min_sequence)
+                   for first, last in parts]
+
+        for future in futures:  # earlier parts first
+            for idx, offset in future.result().items():
+                found.setdefault(idx, offset)
+
+    return found
+
+
+def gen_missing_ranges(control: ZsyncControl, found: Dict[int, int], max_gap: int = 4) -> List[Tuple[int, int]]:
+    """
+    :param max_gap: consecutive ranges separated by up to 'max_gap' available blocks are merged into one request
+    :return: the missing byte ranges (inclusive)
+    """
+    block_ranges = []
+
+    for idx in range(control.blocks):
+        if idx not in found:
+            if block_ranges and idx - block_ranges[-1][1] <= max_gap + 1:
+                block_ranges[-1][1] = idx
+            else:
+                block_ranges.append([idx, idx])
+
+    return [(first * control.blocksize, min((last + 1) * control.blocksize, control.length) - 1)
+            for first, last in block_ranges]
+
+
+def can_verify(control: ZsyncControl) -> bool:
+    """
+    :return: if a built file can be verified. The whole file SHA-1 is required: the blocks MD4 checksums are
+    truncated and only compared for the local blocks
+    """
+    return bool(control.sha1)
+
+
+def build_file(control: ZsyncControl, local_path: str, output_path: str, found: Dict[int, int],
+               fetch_range: Callable[[int, int], Optional[bytes]], logger: Logger) -> bool:
+    """
+    writes the target file combining the blocks available locally with the missing ranges
+    :param fetch_range: retrieves the bytes of the target file from the first to the last position (inclusive)
+    :return: if the file was built and its SHA-1 matches the expected one (False if no SHA-1 is defined)
+    """
+    if not can_verify(control):
+        logger.warning(f"No SHA-1 defined for '{output_path}': the file cannot be verified")
+        return False
+
+    bs = control.blocksize
+    ranges = gen_missing_ranges(control, found)
+    sha1 = hashlib.sha1()
+
+    def write(out, content: bytes):
+        out.write(content)
+        sha1.update(content)
+
+    try:
+        with open(local_path, 'rb') as local, open(output_path, 'wb+') as out:
+            local_data = mmap.mmap(local.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(local_path) else b''
+            pos = 0
+
+            try:
+                for first, last in (*ranges, (control.length, control.length)):
+                    while pos < first:  # local blocks
+                        idx = pos // bs
+                        end = min(pos + bs, control.length)
+                        write(out, local_data[found[idx]: found[idx] + end - pos])
+                        pos = end
+
+                    if first < control.length:
+                        content = fetch_range(first, last)
+
+                        if content is None or len(content) != last - first + 1:
+                            logger.warning(f"Could not retrieve the bytes {first}-{last}")
+                            return False
+
+                        write(out, content)
+                        pos = last + 1
+            finally:
+                if isinstance(local_data, mmap.mmap):
+                    local_data.close()
+    except OSError:
+        logger.error(f"Could not build file '{output_path}'")
+        traceback.print_exc()
+        return False
+
+    if sha1.hexdigest().lower() != control.sha1.lower():
+        logger.warning(f"The SHA-1 of '{output_path}' does not match the expected one")
+        return False
+
+    return True
+
+
+def resolve_file_url(control: ZsyncControl, control_url: str) -> Optional[str]:
+    return urljoin(control_url, control.url) if control.url else None
+
+
+def count_bytes(ranges: Iterable[Tuple[int, int]]) -> int:
+    return sum(last - first + 1 for first, last in ranges)
@@ -14,6 +14,7 @@ ARCH_CONFIG_DIR = f'{CONFIG_DIR}/arch'
 CUSTOM_MAKEPKG_FILE = f'{ARCH_CONFIG_DIR}/makepkg.conf'
 AUR_INDEX_FILE = f'{ARCH_CACHE_DIR}/aur/index.txt'
 AUR_INDEX_TS_FILE = f'{ARCH_CACHE_DIR}/aur/index.ts'
+AUR_SOURCES_DIR = f'{ARCH_CACHE_DIR}/aur/sources'
 CONFIG_FILE = f'{CONFIG_DIR}/arch.yml'
 UPDATES_IGNORED_FILE = f'{ARCH_CONFIG_DIR}/updates_ignored.txt'
 EDITABLE_PKGBUILDS_FILE = f'{ARCH_CONFIG_DIR}/aur/editable_pkgbuilds.txt'
@@ -4,7 +4,6 @@ import os
 import re
 import shutil
 import subprocess
-import tarfile
 import time
 import traceback
 from datetime import datetime
@@ -26,7 +25,6 @@ from bauh.api.abstract.view import MessageType, FormComponent, InputOption, Sing
     ViewComponent, PanelComponent, MultipleSelectComponent, TextInputComponent, TextInputType, \
     FileChooserComponent, TextComponent
 from bauh.api.exception import NoInternetException
-from bauh.api.paths import TEMP_DIR
 from bauh.commons import system
 from bauh.commons.boot import CreateConfigFile
 from bauh.commons.category import CategoriesDownloader
@@ -45,10 +43,13 @@ from bauh.gems.arch.confirmation import confirm_missing_deps
 from bauh.gems.arch.dependencies import DependenciesAnalyser
 from bauh.gems.arch.download import MultithreadedDownloadService, ArchDownloadException
 from bauh.gems.arch.exceptions import PackageNotFoundException, PackageInHoldException
+from bauh.gems.arch.graph import ReverseDependencyGraph, get_installed_graph
 from bauh.gems.arch.mapper import AURDataMapper
 from bauh.gems.arch.model import ArchPackage
 from bauh.gems.arch.output import TransactionStatusHandler
 from bauh.gems.arch.pacman import RE_DEP_OPERATORS
+from bauh.gems.arch.pkginfo import PkgInfoIndex
+from bauh.gems.arch.prefetch import SourcesPrefetcher
 from bauh.gems.arch.proc_util import write_as_user
 from bauh.gems.arch.suggestions import RepositorySuggestionsDownloader
 from bauh.gems.arch.updates import UpdatesSummarizer
@@ -81,7 +82,8 @@ class TransactionContext:
                  disk_loader: DiskCacheLoader = None, disk_cache_updater: Thread = None,
                  new_pkg: bool = False, custom_pkgbuild_path: str = None,
                  pkgs_to_build: Set[str] = None, last_modified: Optional[int] = None,
-                 commit: Optional[str] = None, update_aur_index: bool = False):
+                 commit: Optional[str] = None, update_aur_index: bool = False,
+                 sources_prefetcher: Optional[SourcesPrefetcher] = None):
         self.aur_supported = aur_supported
         self.name = name
         self.base = base
@@ -115,6 +117,7 @@ class TransactionContext:
         self.last_modified = last_modified
         self.commit = commit
         self.update_aur_index = update_aur_index
+        self.sources_prefetcher = sources_prefetcher
 
     @classmethod
     def gen_context_from(cls, pkg: ArchPackage, arch_config: dict, root_password: Optional[str], handler: ProcessHandler, aur_supported: Optional[bool] = None) -> "TransactionContext":
@@ -132,7 +135,8 @@ class TransactionContext:
 
     def clone_base(self):
         return TransactionContext(watcher=self.watcher, handler=self.handler, root_password=self.root_password,
-                                  arch_config=self.config, installed=set(), removed={}, aur_supported=self.aur_supported)
+                                  arch_config=self.config, installed=set(), removed={}, aur_supported=self.aur_supported,
+                                  sources_prefetcher=self.sources_prefetcher)
 
     def gen_dep_context(self, name: str, repository: str):
         dep_context = self.clone_base()
@@ -218,6 +222,7 @@ class ArchManager(SoftwareManager, SettingsController):
         self.disk_cache_updater = disk_cache_updater
         self.pkgbuilder_user: Optional[str] = f'{__app_name__}-aur' if context.root_user else None
         self._suggestions_downloader: Optional[RepositorySuggestionsDownloader] = None
+        self._pkginfo_index: Optional[PkgInfoIndex] = None
 
     def refresh_mirrors(self, root_password: Optional[str], watcher: ProcessWatcher) -> bool:
         handler = ProcessHandler(watcher)
@@ -1130,71 +1135,84 @@ class ArchManager(SoftwareManager, SettingsController):
         self._sync_databases(arch_config=arch_config, aur_supported=aur_supported,
                              root_password=root_password, handler=handler)
 
-        if repo_pkgs and self.check_action_allowed(repo_pkgs[0], watcher):
-            if not self._upgrade_repo_pkgs(to_upgrade=[p.name for p in repo_pkgs],
-                                           to_remove={r.pkg.name for r in requirements.to_remove} if requirements.to_remove else None,
-                                           handler=handler,
-                                           root_password=root_password,
-                                           multithread_download=self._multithreaded_download_enabled(arch_config),
-                                           pkgs_data=requirements.context['data'],
-                                           sizes=pkg_sizes):
+        prefetcher = self._new_sources_prefetcher() if aur_pkgs else None
+
+        try:
+            # the AUR source files are downloaded while the other packages are upgraded / built
+            if prefetcher and not self._prefetch_aur_sources(prefetcher, {p.get_base_name() for p in aur_pkgs}, handler):
+                watcher.change_substatus('')
                 return False
 
-        elif requirements.to_remove and not self._remove_transaction_packages({r.pkg.name for r in requirements.to_remove}, handler, root_password):
-            return False
+            if repo_pkgs and self.check_action_allowed(repo_pkgs[0], watcher):
+                if not self._upgrade_repo_pkgs(to_upgrade=[p.name for p in repo_pkgs],
+                                               to_remove={r.pkg.name for r in requirements.to_remove} if requirements.to_remove else None,
+                                               handler=handler,
+                                               root_password=root_password,
+                                               multithread_download=self._multithreaded_download_enabled(arch_config),
+                                               pkgs_data=requirements.context['data'],
+                                               sizes=pkg_sizes):
+                    return False
 
-        if aur_pkgs and self.check_action_allowed(aur_pkgs[0], watcher) and self.add_package_builder_user(handler):
-            watcher.change_status('{}...'.format(self.i18n['arch.upgrade.upgrade_aur_pkgs']))
+            elif requirements.to_remove and not self._remove_transaction_packages({r.pkg.name for r in requirements.to_remove}, handler, root_password):
+                return False
 
-            self.logger.info("Retrieving the 'last_modified' field for each package to upgrade")
-            pkgs_api_data = self.aur_client.get_info({p.name for p in aur_pkgs})
+            if aur_pkgs and self.check_action_allowed(aur_pkgs[0], watcher) and self.add_package_builder_user(handler):
+                watcher.change_status('{}...'.format(self.i18n['arch.upgrade.upgrade_aur_pkgs']))
 
-            if not pkgs_api_data:
-                self.logger.warning("Could not retrieve the 'last_modified' fields from the AUR API during the upgrade process")
+                self.logger.info("Retrieving the 'last_modified' field for each package to upgrade")
+                pkgs_api_data = self.aur_client.get_info({p.name for p in aur_pkgs})
 
-            any_upgraded = False
-            for pkg in aur_pkgs:
-                watcher.change_substatus("{} {} ({})...".format(self.i18n['manage_window.status.upgrading'], pkg.name, pkg.version))
+                if not pkgs_api_data:
+                    self.logger.warning("Could not retrieve the 'last_modified' fields from the AUR API during the upgrade process")
 
-                if pkgs_api_data:
-                    apidata = [p for p in pkgs_api_data if p.get('Name') == pkg.name]
+                any_upgraded = False
+                with cpu_manager.keep_performance_mode(root_password, self.logger):  # avoids switching the governors between builds
+                    for pkg in aur_pkgs:
+                        watcher.change_substatus("{} {} ({})...".format(self.i18n['manage_window.status.upgrading'], pkg.name, pkg.version))
 
-                    if not apidata:
-                        self.logger.warning("AUR API data from package '{}' could not be found".format(pkg.name))
-                    else:
-                        self.aur_mapper.fill_last_modified(pkg=pkg, api_data=apidata[0])
+                        if pkgs_api_data:
+                            apidata = [p for p in pkgs_api_data if p.get('Name') == pkg.name]
 
-                context = TransactionContext.gen_context_from(pkg=pkg, arch_config=arch_config,
-                                                              root_password=root_password, handler=handler, aur_supported=True)
-                context.change_progress = False
+                            if not apidata:
+                                self.logger.warning("AUR API data from package '{}' could not be found".format(pkg.name))
+                            else:
+                                self.aur_mapper.fill_last_modified(pkg=pkg, api_data=apidata[0])
 
-                try:
-                    if not self.install(pkg=pkg, root_password=root_password, watcher=watcher, disk_loader=None, context=context).success:
-                        if any_upgraded:
-                            self._update_aur_index(watcher)
+                        context = TransactionContext.gen_context_from(pkg=pkg, arch_config=arch_config,
+                                                                      root_password=root_password, handler=handler, aur_supported=True)
+                        context.change_progress = False
+                        context.sources_prefetcher = prefetcher
 
-                        watcher.print(self.i18n['arch.upgrade.fail'].format('"{}"'.format(pkg.name)))
-                        self.logger.error("Could not upgrade AUR package '{}'".format(pkg.name))
-                        watcher.change_substatus('')
-                        return False
-                    else:
-                        any_upgraded = True
-                        watcher.print(self.i18n['arch.upgrade.success'].format('"{}"'.format(pkg.name)))
-                except Exception:
-                    if any_upgraded:
-                        self._update_aur_index(watcher)
+                        try:
+                            if not self.install(pkg=pkg, root_password=root_password, watcher=watcher, disk_loader=None, context=context).success:
+                                if any_upgraded:
+                                    self._update_aur_index(watcher)
 
-                    watcher.print(self.i18n['arch.upgrade.fail'].format('"{}"'.format(pkg.name)))
-                    watcher.change_substatus('')
-                    self.logger.error("An error occurred when upgrading AUR package '{}'".format(pkg.name))
-                    traceback.print_exc()
-                    return False
+                                watcher.print(self.i18n['arch.upgrade.fail'].format('"{}"'.format(pkg.name)))
+                                self.logger.error("Could not upgrade AUR package '{}'".format(pkg.name))
+                                watcher.change_substatus('')
+                                return False
+                            else:
+                                any_upgraded = True
+                                watcher.print(self.i18n['arch.upgrade.success'].format('"{}"'.format(pkg.name)))
+                        except Exception:
+                            if any_upgraded:
+                                self._update_aur_index(watcher)
+
+                            watcher.print(self.i18n['arch.upgrade.fail'].format('"{}"'.format(pkg.name)))
+                            watcher.change_substatus('')
+                            self.logger.error("An error occurred when upgrading AUR package '{}'".format(pkg.name))
+                            traceback.print_exc()
+                            return False
 
-            if any_upgraded:
-                self._update_aur_index(watcher)
+                if any_upgraded:
+                    self._update_aur_index(watcher)
 
-        watcher.change_substatus('')
-        return True
+            watcher.change_substatus('')
+            return True
+        finally:
+            if prefetcher:
+                prefetcher.clean()
 
     def _uninstall_pkgs(self, pkgs: Collection[str], root_password: Optional[str],
                         handler: ProcessHandler, ignore_dependencies: bool = False,
@@ -1357,11 +1375,12 @@ class ArchManager(SoftwareManager, SettingsController):
         net_available = self.context.internet_checker.is_available() if disk_loader else True
 
         hard_requirements = set()
+        installed_graph = get_installed_graph(self.logger)
 
         if not skip_requirements:
             for n in names:
                 try:
-                    pkg_reqs = pacman.list_hard_requirements(name=n, logger=self.logger, assume_installed=actual_replacers)
+                    pkg_reqs = installed_graph.list_hard_requirements((n,), assume_installed=actual_replacers)
 
                     if pkg_reqs:
                         hard_requirements.update(pkg_reqs)
@@ -1384,11 +1403,12 @@ class ArchManager(SoftwareManager, SettingsController):
                 return False
 
         if not skip_requirements and remove_unneeded:
-            unnecessary_packages = pacman.list_post_uninstall_unneeded_packages(to_uninstall)
+            unnecessary_packages = installed_graph.list_post_uninstall_unneeded(to_uninstall)
             self.logger.info("Checking unnecessary optdeps")
 
             if context.config['suggest_optdep_uninstall']:
-                unnecessary_packages.update(self._list_opt_deps_with_no_hard_requirements(source_pkgs=to_uninstall))
+                unnecessary_packages.update(self._list_opt_deps_with_no_hard_requirements(source_pkgs=to_uninstall,
+                                                                                          installed_graph=installed_graph))
 
             self.logger.info("Packages no longer needed found: {}".format(len(unnecessary_packages)))
         else:
@@ -1429,9 +1449,11 @@ class ArchManager(SoftwareManager, SettingsController):
                     context.watcher.change_substatus(self.i18n['arch.checking_unnecessary_deps'])
                     unnecessary_requirements = set()
 
+                    installed_graph = get_installed_graph(self.logger)  # rebuilt since packages were removed
+
                     for pkg in unnecessary_to_uninstall:
                         try:
-                            pkg_reqs = pacman.list_hard_requirements(pkg)
+                            pkg_reqs = installed_graph.list_hard_requirements((pkg,))
 
                             if pkg_reqs:
                                 unnecessary_requirements.update(pkg_reqs)
@@ -1745,9 +1767,10 @@ class ArchManager(SoftwareManager, SettingsController):
             if os.path.exists(temp_dir):
                 shutil.rmtree(temp_dir)
 
-    def _get_history_repo_pkg(self, pkg: ArchPackage) -> PackageHistory:
-        data = PackageHistory(pkg=pkg, history=[], pkg_status_idx=-1)
-
+    def _list_repo_pkg_versions(self, pkg: ArchPackage) -> Tuple[List[str], Dict[str, str]]:
+        """
+        :return: the known versions (newest first) and the cached package files of each version
+        """
         versions = [pkg.latest_version]
         version_files = {}  # maps the version and tar file
 
@@ -1761,6 +1784,9 @@ class ArchManager(SoftwareManager, SettingsController):
                 reg = re.compile(r'{}-([\w.\-]+)-(x86_64|any|i686).pkg'.format(pkg.name))
 
                 for file_path in available_files:
+                    if file_path.endswith('.sig'):
+                        continue
+
                     found = reg.findall(os.path.basename(file_path))
 
                     if found:
@@ -1771,63 +1797,39 @@ class ArchManager(SoftwareManager, SettingsController):
                         version_files[ver] = file_path
 
         versions.sort(reverse=True)
-        extract_path = f'{TEMP_DIR}/arch/history'
+        return versions, version_files
 
-        try:
-            Path(extract_path).mkdir(parents=True, exist_ok=True)
-        except Exception:
-            self.logger.error("Could not create temp dir {} to extract previous versions data".format(extract_path))
-            traceback.print_exc()
-            return data
+    def _get_history_repo_pkg(self, pkg: ArchPackage, offset: int = 0, limit: Optional[int] = None) -> PackageHistory:
+        versions, version_files = self._list_repo_pkg_versions(pkg)
+        data = PackageHistory(pkg=pkg, history=[], pkg_status_idx=-1, total=len(versions))
+
+        if pkg.version in versions:
+            data.pkg_status_idx = versions.index(pkg.version)
+
+        page = versions[offset:offset + limit] if limit is not None else versions[offset:]
 
         try:
-            for idx, v in enumerate(versions):
+            for v in page:
                 cur_version = v.split('-')
                 cur_data = {'1_version': ''.join(cur_version[0:-1]),
                             '2_release': cur_version[-1],
                             '3_date': ''}
 
-                if pkg.version == v:
-                    data.pkg_status_idx = idx
-
                 version_file = version_files.get(v)
+                build_date = self.pkginfo_index.get_build_date(version_file) if version_file else None
 
-                if not version_file:
-                    if v == pkg.version:
-                        cur_data['3_date'] = pacman.get_build_date(pkg.name)
-                else:
-                    extracted_dir = '{}/{}'.format(extract_path, v)
-                    Path(extracted_dir).mkdir(parents=True, exist_ok=True)
-
-                    try:
-                        filext = version_file.split('.')[-1]
-                        run_cmd('tar -C {} -I {} -xvf {} .PKGINFO'.format(extracted_dir, 'zstd' if filext == 'zst' else filext, version_file))
-                    except tarfile.ReadError:
-                        if v == pkg.version:
-                            cur_data['3_date'] = pacman.get_build_date(pkg.name)
-                        else:
-                            self.logger.error("Could not read file {}. Skipping version {}".format(version_file, v))
-                            continue
-
-                    info_file = '{}/.PKGINFO'.format(extracted_dir)
-                    if os.path.isfile(info_file):
-                        with open(info_file) as f:
-                            for l in f.readlines():
-                                if l and l.startswith('builddate'):
-                                    cur_data['3_date'] = datetime.fromtimestamp(int(l.split('=')[1].strip()))
-                                    break
+                if build_date is not None:
+                    cur_data['3_date'] = datetime.fromtimestamp(build_date)
+                elif v == pkg.version:
+                    cur_data['3_date'] = pacman.get_build_date(pkg.name)
+                elif version_file:
+                    self.logger.warning("Could not read the build date of {} (version {})".format(version_file, v))
 
                 data.history.append(cur_data)
-            return data
 
+            return data
         finally:
-            if os.path.exists(extract_path):
-                try:
-                    self.logger.info("Removing temporary history dir {}".format(extract_path))
-                    shutil.rmtree(extract_path)
-                except Exception:
-                    self.logger.error("Could not remove temp path '{}'".format(extract_path))
-                    raise
+            self.pkginfo_index.save()
 
     def get_history(self, pkg: ArchPackage) -> PackageHistory:
         if pkg.repository == 'aur':
@@ -1835,6 +1837,17 @@ class ArchManager(SoftwareManager, SettingsController):
         else:
             return self._get_history_repo_pkg(pkg)
 
+    def get_history_page(self, pkg: ArchPackage, offset: int, limit: int) -> Optional[PackageHistory]:
+        if pkg.repository != 'aur':
+            return self._get_history_repo_pkg(pkg, offset=offset, limit=limit)
+
+    @property
+    def pkginfo_index(self) -> PkgInfoIndex:
+        if self._pkginfo_index is None:
+            self._pkginfo_index = PkgInfoIndex(self.logger)
+
+        return self._pkginfo_index
+
     def _request_conflict_resolution(self, pkg: str, conflicting_pkg: str, context: TransactionContext,
                                      skip_requirements: bool = False) -> bool:
 
@@ -1914,6 +1927,8 @@ class ArchManager(SoftwareManager, SettingsController):
                                                                                    file=False,
                                                                                    as_deps=True),
                                                          output_handler=status_handler.handle)
+            status_handler.stop_working()
+            status_handler.join()
 
             if installed:
                 pkg_map = {d[0]: ArchPackage(name=d[0], repository=d[1], maintainer=d[1],
@@ -1996,6 +2011,9 @@ class ArchManager(SoftwareManager, SettingsController):
                     else:
                         args.update({'file_url': fdata[0], 'output_path': fdata[0].split('/')[-1]})
 
+                    if os.path.exists(f"{project_dir}/{args['output_path']}"):  # already prefetched
+                        continue
+
                     if not self.context.file_downloader.download(**args):
                         watcher.print('Could not download source file {}'.format(args['file_url']))
                         return False
@@ -2077,6 +2095,14 @@ class ArchManager(SoftwareManager, SettingsController):
 
     def _build(self, context: TransactionContext) -> bool:
         self._edit_pkgbuild_and_update_context(context)
+
+        if context.sources_prefetcher:
+            retrieved = context.sources_prefetcher.retrieve(base=context.get_base_name(),
+                                                            project_dir=context.project_dir,
+                                                            user=self.pkgbuilder_user)
+            if retrieved:
+                self.logger.info(f"{retrieved} prefetched source file(s) of '{context.name}' retrieved")
+
         self._pre_download_source(context.name, context.project_dir, context.watcher)
         self._update_progress(context, 50)
 
@@ -2089,11 +2115,8 @@ class ArchManager(SoftwareManager, SettingsController):
         context.watcher.change_substatus(self.i18n['arch.building.package'].format(bold(context.name)))
         optimize = bool(context.config['optimize']) and cpu_manager.supports_performance_mode()
 
-        cpus_changed, cpu_prev_governors = False, None
-
-        if optimize:
-            cpus_changed, cpu_prev_governors = cpu_manager.set_all_cpus_to('performance', context.root_password,
-                                                                           self.logger)
+        if optimize:  # the governors are only switched back after the last build requiring them
+            cpu_manager.acquire_performance_mode(context.root_password, self.logger)
 
         pkgbuilt = False
 
@@ -2104,9 +2127,8 @@ class ArchManager(SoftwareManager, SettingsController):
                                              custom_pkgbuild=context.custom_pkgbuild_path,
                                              custom_user=self.pkgbuilder_user)
         finally:
-            if cpus_changed and cpu_prev_governors:
-                self.logger.info("Restoring CPU governors")
-                cpu_manager.set_cpus(cpu_prev_governors, context.root_password, self.logger, {'performance'})
+            if optimize:
+                cpu_manager.release_performance_mode(context.root_password, self.logger)
 
         self._update_progress(context, 65)
 
@@ -2212,10 +2234,33 @@ class ArchManager(SoftwareManager, SettingsController):
             context.watcher.print(self.i18n['action.cancelled'])
             return False
 
+        prefetcher = None
+        aur_deps = {d[0] for d in missing_deps if d[1] == 'aur'}
+
+        if aur_deps and not context.sources_prefetcher:
+            prefetcher = self._new_sources_prefetcher()
+            context.sources_prefetcher = prefetcher
+
         old_progress_behavior = context.change_progress
         context.change_progress = False
-        deps_not_installed = self._install_deps(context, missing_deps)
-        context.change_progress = old_progress_behavior
+
+        try:
+            if aur_deps:
+                bases = set()
+                for dep in aur_deps:
+                    dep_src = self.aur_client.get_src_info(dep)
+                    bases.add(dep_src['pkgbase'] if dep_src and dep_src.get('pkgbase') else dep)
+
+                if not self._prefetch_aur_sources(context.sources_prefetcher, bases, context.handler):
+                    return False
+
+            deps_not_installed = self._install_deps(context, missing_deps)
+        finally:
+            context.change_progress = old_progress_behavior
+
+            if prefetcher:
+                prefetcher.clean()
+                context.sources_prefetcher = None
 
         if deps_not_installed:
             message.show_deps_not_installed(context.watcher, context.name, deps_not_installed, self.i18n)
@@ -2437,6 +2482,8 @@ class ArchManager(SoftwareManager, SettingsController):
             output_handler.start()
             try:
                 success, _ = handler.handle_simple(pacman.download(root_password, *pkgnames), output_handler=output_handler.handle)
+                output_handler.stop_working()
+                output_handler.join()
 
                 if success:
                     return len(pkgnames)
@@ -2618,6 +2665,55 @@ class ArchManager(SoftwareManager, SettingsController):
         if context.change_progress:
             context.watcher.change_progress(val)
 
+    def _new_sources_prefetcher(self) -> SourcesPrefetcher:
+        return SourcesPrefetcher(http_client=self.http_client, logger=self.logger,
+                                 x86_64=self.context.is_system_x86_64())
+
+    def _prefetch_aur_sources(self, prefetcher: SourcesPrefetcher, bases: Collection[str], handler: ProcessHandler) -> bool:
+        """
+        starts downloading the source files of the given AUR package bases and receives all the PGP keys they require
+        :return: if the transaction can proceed
+        """
+        self.logger.info(f"Prefetching the source files of the AUR packages: {', '.join(sorted(bases))}")
+        return self._receive_pgp_keys(prefetcher.prefetch(bases), handler)
+
+    def _receive_pgp_keys(self, keys_by_base: Dict[str, Set[str]], handler: ProcessHandler) -> bool:
+        all_keys = {k for keys in keys_by_base.values() for k in keys if gpg.RE_KEY.match(k)}
+
+        if not all_keys:
+            return True
+
+        handler.watcher.change_substatus(self.i18n['arch.aur.install.verifying_pgp'])
+        missing = all_keys.difference(gpg.list_imported_keys(all_keys))
+
+        if not missing:
+            return True
+
+        bases = sorted(b for b, keys in keys_by_base.items() if keys.intersection(missing))
+        keys_str = ''.join('<br/><span style="font-weight:bold">  - {}</span>'.format(k) for k in sorted(missing))
+        msg_body = '{}:<br/>{}<br/><br/>{}'.format(self.i18n['arch.aur.install.pgp.body'].format(bold(', '.join(bases))),
+                                                   keys_str, self.i18n['ask.continue'])
+
+        if not handler.watcher.request_confirmation(title=self.i18n['arch.aur.install.pgp.title'], body=msg_body):
+            handler.watcher.print(self.i18n['action.cancelled'])
+            return False
+
+        keys_str = ', '.join(sorted(missing))
+        handler.watcher.change_substatus(self.i18n['arch.aur.install.unknown_key.status'].format(bold(keys_str)))
+        self.logger.info(f"Importing GPG keys: {keys_str}")
+
+        gpg_res = self.context.http_client.get(URL_GPG_SERVERS)
+        gpg_server = gpg_res.text.split('\n')[0] if gpg_res else None
+
+        if not handler.handle(gpg.receive_keys(sorted(missing), gpg_server)):
+            self.logger.error(f"An error occurred while importing the GPG keys: {keys_str}")
+            handler.watcher.show_message(title=self.i18n['error'].capitalize(),
+                                         body=self.i18n['arch.aur.install.unknown_key.receive_error'].format(bold(keys_str)),
+                                         type_=MessageType.ERROR)
+            return False
+
+        return True
+
     def _import_pgp_keys(self, pkgname: str, root_password: Optional[str], handler: ProcessHandler):
         srcinfo = self.aur_client.get_src_info(pkgname)
 
@@ -2726,7 +2822,8 @@ class ArchManager(SoftwareManager, SettingsController):
                              root_password=root_password, handler=handler)
 
         if pkg.repository == 'aur':
-            pkg_installed = self._install_from_aur(install_context)
+            with cpu_manager.keep_performance_mode(root_password, self.logger):  # dependencies may also be built
+                pkg_installed = self._install_from_aur(install_context)
         else:
             pkg_installed = self._install_from_repository(install_context)
 
@@ -2826,6 +2923,12 @@ class ArchManager(SoftwareManager, SettingsController):
         taskman.update_progress('arch_aur_cats', 100, None)
         taskman.finish_task('arch_aur_cats')
 
+    def get_deferrable_prepare_tasks(self, operation: str) -> Optional[Set[str]]:
+        if operation in ('read_installed', 'search', 'list_updates'):
+            return {'arch_make_optm', 'arch.suggs'}
+        elif operation == 'list_suggestions':
+            return {'arch_make_optm'}
+
     def prepare(self, task_manager: TaskManager, root_password: Optional[str], internet_available: bool):
         create_config = CreateConfigFile(taskman=task_manager, configman=self.configman, i18n=self.i18n,
                                          task_icon_path=get_icon_path(), logger=self.logger)
@@ -3623,7 +3726,8 @@ class ArchManager(SoftwareManager, SettingsController):
 
         return custom_pkgbuild_path
 
-    def _list_opt_deps_with_no_hard_requirements(self, source_pkgs: Set[str], installed_provided: Optional[Dict[str, Set[str]]] = None) -> Set[str]:
+    def _list_opt_deps_with_no_hard_requirements(self, source_pkgs: Set[str], installed_provided: Optional[Dict[str, Set[str]]] = None,
+                                                 installed_graph: Optional[ReverseDependencyGraph] = None) -> Set[str]:
         optdeps = set()
 
         for deps in pacman.map_optional_deps(names=source_pkgs, remote=False).values():
@@ -3643,11 +3747,13 @@ class ArchManager(SoftwareManager, SettingsController):
                             real_optdeps.add(p)
 
             if real_optdeps:
+                graph = installed_graph if installed_graph else get_installed_graph(self.logger)
+
                 for p in real_optdeps:
                     try:
-                        reqs = pacman.list_hard_requirements(p, self.logger)
+                        reqs = graph.list_hard_requirements((p,))
 
-                        if reqs is not None and (not reqs or reqs.issubset(source_pkgs)):
+                        if not reqs or reqs.issubset(source_pkgs):
                             res.add(p)
                     except PackageInHoldException:
                         self.logger.warning("There is a requirement in hold for opt dep '{}'".format(p))
@@ -1,23 +1,35 @@
 import multiprocessing
 import os
+import shlex
 import shutil
 import traceback
+from contextlib import contextmanager
 from logging import Logger
-from pathlib import Path
+from threading import Lock
 from typing import Optional, Set, Tuple, Dict
 
-from bauh.api.paths import TEMP_DIR
 from bauh.commons.system import new_root_subprocess
 
+PERFORMANCE_GOVERNOR = 'performance'
+
+_perf_lock = Lock()
+_perf_refs = 0  # builds currently requiring the performance mode
+_perf_holds = 0  # transactions postponing the governors restoration
+_perf_prev_governors: Optional[Dict[str, Set[int]]] = None
+
 
 def supports_performance_mode() -> bool:
     return os.path.exists('/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor')
 
 
+def get_governor_file(cpu_idx: int) -> str:
+    return f'/sys/devices/system/cpu/cpu{cpu_idx}/cpufreq/scaling_governor'
+
+
 def current_governors() -> Dict[str, Set[int]]:
     governors = {}
     for cpu in range(multiprocessing.cpu_count()):
-        with open(f'/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_governor') as f:
+        with open(get_governor_file(cpu)) as f:
             gov = f.read().strip()
             cpus = governors.get(gov, set())
             cpus.add(cpu)
@@ -26,39 +38,33 @@ def current_governors() -> Dict[str, Set[int]]:
     return governors
 
 
-def set_governor(governor: str, root_password: Optional[str], logger: Logger, cpu_idxs: Optional[Set[int]] = None):
-    new_gov_file = f'{TEMP_DIR}/bauh_scaling_governor'
-
-    try:
-        Path(TEMP_DIR).mkdir(exist_ok=True, parents=True)
-    except OSError:
-        logger.error(f"Could not create temporary directory for changing CPU governor: {TEMP_DIR}")
-        return
-
-    try:
-        with open(new_gov_file, 'w+') as f:
-            f.write(governor)
-    except OSError:
-        logger.error(f"Could not write new governor ({governor}) to {new_gov_file}")
-        return
-
-    for idx in (cpu_idxs if cpu_idxs else range(multiprocessing.cpu_count())):
-        _change_governor(idx, new_gov_file, root_password)
+def set_governor(governor: str, root_password: Optional[str], logger: Logger, cpu_idxs: Optional[Set[int]] = None) -> bool:
+    """
+    writes the governor to the 'scaling_governor' files of all given CPUs with a single privileged call
+    """
+    gov_files = ' '.join(shlex.quote(get_governor_file(idx))
+                         for idx in sorted(cpu_idxs if cpu_idxs else range(multiprocessing.cpu_count())))
 
-    if os.path.exists(new_gov_file):
-        try:
-            os.remove(new_gov_file)
-        except OSError:
-            logger.error(f"Could not remove temporary governor file ({new_gov_file})")
+    if not gov_files:
+        return True
 
+    tee = shutil.which('tee') or 'tee'
+    cmd = f'printf %s {shlex.quote(governor)} | {tee} {gov_files} > /dev/null'
 
-def _change_governor(cpu_idx: int, new_gov_file_path: str, root_password: Optional[str]):
     try:
-        gov_file = f'/sys/devices/system/cpu/cpu{cpu_idx}/cpufreq/scaling_governor'
-        replace = new_root_subprocess((shutil.which('cp'), new_gov_file_path, gov_file), root_password=root_password)
-        replace.wait()
+        proc = new_root_subprocess(('sh', '-c', cmd), root_password=root_password)
+        _, stderr = proc.communicate()
     except Exception:
         traceback.print_exc()
+        return False
+
+    if proc.returncode != 0:
+        if logger:
+            error = stderr.decode().strip() if stderr else ''
+            logger.error(f"Could not change CPUs governors to '{governor}'{': ' + error if error else ''}")
+        return False
+
+    return True
 
 
 def set_all_cpus_to(governor: str, root_password: Optional[str], logger: Logger) \
@@ -84,9 +90,79 @@ def set_all_cpus_to(governor: str, root_password: Optional[str], logger: Logger)
 def set_cpus(governors: Dict[str, Set[int]], root_password: Optional[str], logger: Logger,
              ignore_governors: Optional[Set[str]] = None):
 
+    current = current_governors()
+
     for gov, cpus in governors.items():
         if not ignore_governors or gov not in ignore_governors:
-            if logger:
-                logger.info(f"Changing CPUs {cpus} governors to '{gov}'")
+            to_change = cpus.difference(current.get(gov, ()))
+
+            if to_change:
+                if logger:
+                    logger.info(f"Changing CPUs {to_change} governors to '{gov}'")
+
+                set_governor(governor=gov, root_password=root_password, logger=logger, cpu_idxs=to_change)
+
+
+def _restore_governors(root_password: Optional[str], logger: Logger):
+    global _perf_prev_governors
+
+    if _perf_prev_governors:
+        if logger:
+            logger.info("Restoring CPU governors")
+
+        set_cpus(_perf_prev_governors, root_password, logger, {PERFORMANCE_GOVERNOR})
+
+    _perf_prev_governors = None
+
+
+def acquire_performance_mode(root_password: Optional[str], logger: Logger):
+    """
+    changes all CPUs to the 'performance' governor if no other build has already done it
+    """
+    global _perf_refs, _perf_prev_governors
+
+    with _perf_lock:
+        _perf_refs += 1
+
+        if _perf_prev_governors is None:
+            try:
+                cpus_changed, prev_governors = set_all_cpus_to(PERFORMANCE_GOVERNOR, root_password, logger)
+            except Exception:
+                traceback.print_exc()
+                cpus_changed, prev_governors = False, None
+
+            _perf_prev_governors = prev_governors if cpus_changed and prev_governors else {}
+
+
+def release_performance_mode(root_password: Optional[str], logger: Logger):
+    """
+    restores the previous CPUs governors if no other build or transaction still requires the 'performance' mode
+    """
+    global _perf_refs
+
+    with _perf_lock:
+        _perf_refs = max(_perf_refs - 1, 0)
+
+        if _perf_refs == 0 and _perf_holds == 0:
+            _restore_governors(root_password, logger)
+
+
+@contextmanager
+def keep_performance_mode(root_password: Optional[str], logger: Logger):
+    """
+    postpones the governors restoration until the end of the block, so consecutive builds of the same
+    transaction do not switch the governors back and forth. It does not change the governors by itself.
+    """
+    global _perf_holds
+
+    with _perf_lock:
+        _perf_holds += 1
+
+    try:
+        yield
+    finally:
+        with _perf_lock:
+            _perf_holds -= 1
 
-            set_governor(governor=gov, root_password=root_password, logger=logger, cpu_idxs=cpus)
+            if _perf_holds == 0 and _perf_refs == 0:
+                _restore_governors(root_password, logger)
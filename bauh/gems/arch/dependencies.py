@@ -1,5 +1,6 @@
 import re
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from threading import Thread
 from typing import Set, List, Tuple, Dict, Iterable, Optional, Generator, Pattern
@@ -9,17 +10,34 @@ from bauh.commons.version_util import match_required_version
 from bauh.gems.arch import pacman, message, sorting, confirmation
 from bauh.gems.arch.aur import AURClient
 from bauh.gems.arch.exceptions import PackageNotFoundException
+from bauh.gems.arch.graph import get_installed_graph
 from bauh.view.util.translation import I18n
 
 
+class DependencyQueryCache:
+    """
+    Memoizes the remote queries done while resolving the dependencies of a single transaction
+    """
+
+    def __init__(self):
+        self.aur_data: Dict[str, Optional[dict]] = {}  # None: not found
+        self.aur_searches: Dict[str, Optional[List[str]]] = {}  # names found for a given term
+        self.repo_data: Dict[str, dict] = {}
+        self.repo_matches: Dict[str, Optional[str]] = {}
+
+
 class DependenciesAnalyser:
 
     _re_dep_operator: Optional[Pattern] = None
 
-    def __init__(self, aur_client: AURClient, i18n: I18n, logger: Logger):
+    def __init__(self, aur_client: AURClient, i18n: I18n, logger: Logger, max_workers: int = 4):
+        """
+        :param max_workers: maximum number of concurrent queries (e.g: AUR searches)
+        """
         self.aur_client = aur_client
         self.i18n = i18n
         self._log = logger
+        self.max_workers = max_workers
 
     @classmethod
     def re_dep_operator(cls) -> Pattern:
@@ -28,125 +46,192 @@ class DependenciesAnalyser:
 
         return cls._re_dep_operator
 
-    def _fill_repository(self, name: str, output: List[Tuple[str, str]]):
+    def _get_aur_data(self, names: Iterable[str], query_cache: DependencyQueryCache) -> Dict[str, dict]:
+        """
+        :return: the AUR data of the given names (not found names are not returned). Names not cached yet are
+        retrieved with a single request.
+        """
+        names = [*names]
+        to_fetch = {n for n in names if n not in query_cache.aur_data}
 
-        repository = pacman.read_repository_from_info(name)
+        if to_fetch:
+            fetched = dict(self.aur_client.gen_updates_data(to_fetch))
 
-        if repository:
-            output.append((name, repository))
-            return
+            for name in to_fetch:
+                query_cache.aur_data[name] = fetched.get(name)
 
-        guess = pacman.guess_repository(name)
+        res = {}
+        for name in names:
+            data = query_cache.aur_data.get(name)
 
-        if guess:
-            output.append(guess)
-            return
+            if data:
+                res[name] = data
 
-        aur_info = self.aur_client.get_src_info(name)
+        return res
 
-        if aur_info:
-            output.append((name, 'aur'))
-            return
+    def _search_aur(self, name: str, query_cache: DependencyQueryCache) -> Optional[List[str]]:
+        if name not in query_cache.aur_searches:
+            aur_search = self.aur_client.search(name)
+            results = aur_search.get('results') if aur_search else None
+            query_cache.aur_searches[name] = [r['Name'] for r in results] if results else None
+
+        return query_cache.aur_searches[name]
+
+    def _find_one_repo_match(self, name: str, query_cache: DependencyQueryCache) -> Optional[str]:
+        if name not in query_cache.repo_matches:
+            query_cache.repo_matches[name] = pacman.find_one_match(name)
 
-        output.append((name, ''))
+        return query_cache.repo_matches[name]
 
-    def get_missing_packages(self, names: Set[str], repository: Optional[str] = None, in_analysis: Optional[Set[str]] = None) -> \
-            List[Tuple[str, str]]:
+    def _prefetch_aur_data(self, dep_names: Set[str], aur_index: Iterable[str], exact_match: bool,
+                           query_cache: DependencyQueryCache):
         """
-        :param names:
-        :param repository:
-        :param in_analysis: global set storing all names in analysis to avoid repeated recursion
-        :return:
+        retrieves at once the AUR data possibly required to resolve the dependencies of a whole level: exact
+        matches are requested in a single call, and searches run concurrently (bounded by 'max_workers')
         """
-        global_in_analysis = in_analysis if in_analysis else set()
+        exact = {n for n in dep_names if exact_match and n in aur_index}
+        to_search = sorted(n for n in dep_names if n not in exact and n not in query_cache.aur_searches)
 
-        missing_names = pacman.check_missing({n for n in names if n not in in_analysis})
+        if to_search:
+            with ThreadPoolExecutor(max_workers=min(len(to_search), self.max_workers)) as pool:
+                for _ in pool.map(lambda n: self._search_aur(n, query_cache), to_search):
+                    pass
 
-        if missing_names:
-            missing_root = []
-            threads = []
+        to_fetch = {*exact}
+        for name in dep_names:
+            found = query_cache.aur_searches.get(name)
 
-            if not repository:
-                for name in missing_names:
-                    t = Thread(target=self._fill_repository, args=(name, missing_root), daemon=True)
-                    t.start()
-                    threads.append(t)
+            if found:
+                to_fetch.update(found)
 
-                for t in threads:
-                    t.join()
+        if to_fetch:
+            self._get_aur_data(to_fetch, query_cache)
 
-                threads.clear()
+    def _map_missing_repositories(self, names: Set[str], query_cache: DependencyQueryCache) -> List[Tuple[str, str]]:
+        """
+        :return: the repository of each name (or of its provider). An empty repository means it was not found.
+        """
+        found = {n: r for n, r in pacman.map_repositories(names).items() if n in names}
+        not_found = {n for n in names if n not in found}
 
-                # checking if there is any unknown dependency:
-                for rdep in missing_root:
-                    if not rdep[1]:
-                        return missing_root
-                    else:
-                        global_in_analysis.add(rdep[0])
-            else:
-                for missing in missing_names:
-                    missing_root.append((missing, repository))
-                    global_in_analysis.add(missing)
+        if not_found:
+            for name in self._get_aur_data(not_found, query_cache):
+                found[name] = 'aur'
 
-            missing_sub = []
-            for rdep in missing_root:
-                subdeps = self.aur_client.get_required_dependencies(rdep[0]) if rdep[1] == 'aur' else pacman.read_dependencies(rdep[0])
-                subdeps_not_analysis = {sd for sd in subdeps if sd not in global_in_analysis}
+        res = [(n, found[n]) for n in sorted(found)]
+        to_guess = sorted(n for n in names if n not in found)
 
-                if subdeps_not_analysis:
-                    missing_subdeps = self.get_missing_packages(subdeps_not_analysis, in_analysis=global_in_analysis)
+        if to_guess:
+            with ThreadPoolExecutor(max_workers=min(len(to_guess), self.max_workers)) as pool:
+                for name, guess in zip(to_guess, pool.map(pacman.guess_repository, to_guess)):
+                    res.append(guess if guess else (name, ''))
 
-                    # checking if there is any unknown:
-                    if missing_subdeps:
-                        for subdep in missing_subdeps:
-                            if not subdep[0]:
-                                return [*missing_subdeps, *missing_root]
+        return res
 
-                            if subdep[0] not in missing_names:
-                                missing_sub.append(subdep)
-            return [*missing_sub, *missing_root]
+    def _read_dependencies(self, pkgs: Iterable[Tuple[str, str]], query_cache: DependencyQueryCache) -> Set[str]:
+        """
+        reads the dependencies of the given packages with a single query per origin (repositories and AUR)
+        :param pkgs: (name, repository)
+        :return: the dependencies names (without version expressions)
+        """
+        repo_pkgs, aur_pkgs = set(), set()
 
-    def get_missing_subdeps_of(self, names: Set[str], repository: str) -> List[Tuple[str, str]]:
-        missing = []
-        already_added = {*names}
-        in_analyses = {*names}
+        for name, repo in pkgs:
+            (aur_pkgs if repo == 'aur' else repo_pkgs).add(name)
 
-        for name in names:
-            subdeps = self.aur_client.get_required_dependencies(name) if repository == 'aur' else pacman.read_dependencies(name)
+        deps = set()
+        not_found = set()
 
-            if subdeps:
-                missing_subdeps = self.get_missing_packages(subdeps, in_analysis=in_analyses)
+        if repo_pkgs:
+            to_query = {n for n in repo_pkgs if n not in query_cache.repo_data}
 
-                if missing_subdeps:
-                    for subdep in missing_subdeps:  # checking if there is any unknown:
-                        if subdep[0] not in already_added:
-                            missing.append(subdep)
+            if to_query:
+                query_cache.repo_data.update(pacman.map_updates_data(to_query) or {})
 
-                        if not subdep[0]:
-                            return missing
-        return missing
+            for name in repo_pkgs:
+                data = query_cache.repo_data.get(name)
 
-    def get_missing_subdeps(self, name: str, repository: str, srcinfo: dict = None) -> List[Tuple[str, str]]:
-        missing = []
-        already_added = {name}
-        in_analyses = {name}
+                if data is None:
+                    not_found.add(name)
+                elif data['d']:
+                    deps.update(data['d'])
 
-        if repository == 'aur':
-            subdeps = self.aur_client.get_required_dependencies(name) if not srcinfo else self.aur_client.extract_required_dependencies(srcinfo)
-        else:
-            subdeps = pacman.read_dependencies(name)
+        if aur_pkgs:
+            aur_data = self._get_aur_data(aur_pkgs, query_cache)
+
+            for name in aur_pkgs:
+                data = aur_data.get(name)
+
+                if data is None:
+                    not_found.add(name)
+                elif data['d']:
+                    deps.update(data['d'])
+
+        if not_found:
+            raise PackageNotFoundException(', '.join(sorted(not_found)))
+
+        return {self.re_dep_operator().split(d)[0].strip() for d in deps}
+
+    def get_missing_packages(self, names: Set[str], repository: Optional[str] = None,
+                             in_analysis: Optional[Set[str]] = None,
+                             query_cache: Optional[DependencyQueryCache] = None) -> List[Tuple[str, str]]:
+        """
+        maps the missing dependencies level by level (breadth-first). Each level is resolved with a single
+        query per origin (installed packages, repositories and AUR).
+        :param names:
+        :param repository: the repository of the given names (if already known)
+        :param in_analysis: global set storing all names in analysis to avoid repeated checking
+        :param query_cache: remote queries already done during the current transaction
+        :return: the missing dependencies (deepest levels first). An empty repository means the dependency was not found.
+        """
+        global_in_analysis = in_analysis if in_analysis is not None else set()
+        cache = query_cache if query_cache else DependencyQueryCache()
+
+        levels = []
+        level_repository = repository
+        frontier = {n for n in names if n not in global_in_analysis}
+
+        while frontier:
+            global_in_analysis.update(frontier)
+            missing_names = pacman.check_missing(frontier)
+
+            if not missing_names:
+                break
+
+            if level_repository:
+                missing_level = [(n, level_repository) for n in sorted(missing_names)]
+            else:
+                missing_level = self._map_missing_repositories(missing_names, cache)
+
+            levels.append(missing_level)
+
+            if any(not repo for _, repo in missing_level):  # there is an unknown dependency
+                break
+
+            global_in_analysis.update(name for name, _ in missing_level)  # providers found
+
+            frontier = {d for d in self._read_dependencies(missing_level, cache) if d not in global_in_analysis}
+            level_repository = None
+
+        return [dep for level in reversed(levels) for dep in level]
+
+    def get_missing_subdeps_of(self, names: Set[str], repository: str) -> List[Tuple[str, str]]:
+        query_cache = DependencyQueryCache()
+        subdeps = self._read_dependencies(((n, repository) for n in names), query_cache)
 
         if subdeps:
-            missing_subdeps = self.get_missing_packages(subdeps, in_analysis=in_analyses)
+            return [d for d in self.get_missing_packages(subdeps, in_analysis={*names}, query_cache=query_cache)
+                    if d[0] not in names]
 
-            if missing_subdeps:
-                for subdep in missing_subdeps:  # checking if there is any unknown:
-                    if subdep[0] not in already_added:
-                        missing.append(subdep)
+        return []
 
-                    if not subdep[0]:
-                        return missing
-        return missing
+    def get_missing_subdeps(self, name: str, repository: str, srcinfo: dict = None) -> List[Tuple[str, str]]:
+        if repository == 'aur' and srcinfo:
+            subdeps = {self.re_dep_operator().split(d)[0].strip()
+                       for d in self.aur_client.extract_required_dependencies(srcinfo)}
+            return [d for d in self.get_missing_packages(subdeps, in_analysis={name}) if d[0] != name]
+
+        return self.get_missing_subdeps_of({name}, repository)
 
     def map_known_missing_deps(self, known_deps: Dict[str, str], watcher: ProcessWatcher, check_subdeps: bool = True) -> Optional[List[Tuple[str, str]]]:
         sorted_deps = []  # it will hold the proper order to install the missing dependencies
@@ -187,7 +272,8 @@ class DependenciesAnalyser:
         return sorted_deps
 
     def _find_repo_providers(self, dep_name: str, dep_exp: str, remote_provided_map: Dict[str, Set[str]],
-                             deps_data: Dict[str, dict], remote_repo_map: Dict[str, str]) -> Generator[Tuple[str, str, Optional[dict]], None, None]:
+                             deps_data: Dict[str, dict], remote_repo_map: Dict[str, str],
+                             query_cache: DependencyQueryCache) -> Generator[Tuple[str, str, Optional[dict]], None, None]:
         if dep_name == dep_exp:
             providers = remote_provided_map.get(dep_name)
 
@@ -196,7 +282,7 @@ class DependenciesAnalyser:
                     yield pkgname, remote_repo_map.get(pkgname), None
 
             else:  # try to find the package through the pacman's search mechanism
-                match = pacman.find_one_match(dep_name)
+                match = self._find_one_repo_match(dep_name, query_cache)
 
                 if match:
                     yield match, remote_repo_map.get(match), None
@@ -211,7 +297,7 @@ class DependenciesAnalyser:
                 providers = remote_provided_map.get(dep_name)
 
                 if not providers:  # try to find the package through the pacman's search mechanism
-                    match = pacman.find_one_match(dep_name)
+                    match = self._find_one_repo_match(dep_name, query_cache)
 
                     if match:
                         providers = {match}
@@ -254,57 +340,60 @@ class DependenciesAnalyser:
                                     yield p, remote_repo_map.get(p), info
                                     break
 
-    def _find_aur_providers(self, dep_name: str, dep_exp: str, aur_index: Iterable[str], exact_match: bool) -> Generator[Tuple[str, dict], None, None]:
+    def _find_aur_providers(self, dep_name: str, dep_exp: str, aur_index: Iterable[str], exact_match: bool,
+                            query_cache: DependencyQueryCache) -> Generator[Tuple[str, dict], None, None]:
         if exact_match and dep_name in aur_index:
+            dep_data = self._get_aur_data((dep_name,), query_cache).get(dep_name)
+
             if dep_name == dep_exp:
-                yield from self.aur_client.gen_updates_data((dep_name,))
-                return
-            else:
-                for _, dep_data in self.aur_client.gen_updates_data((dep_name,)):
-                    split_informed_dep = self.re_dep_operator().split(dep_exp)
-                    version_required = split_informed_dep[2]
-                    exp_op = split_informed_dep[1].strip()
+                if dep_data:
+                    yield dep_name, dep_data
 
-                    if match_required_version(dep_data['v'], exp_op, version_required):
-                        yield dep_name, dep_data
-                        return
+                return
+            elif dep_data:
+                split_informed_dep = self.re_dep_operator().split(dep_exp)
+                version_required = split_informed_dep[2]
+                exp_op = split_informed_dep[1].strip()
 
-        aur_search = self.aur_client.search(dep_name)
+                if match_required_version(dep_data['v'], exp_op, version_required):
+                    yield dep_name, dep_data
+                    return
 
-        if aur_search:
-            aur_results = aur_search.get('results')
+        aur_results = self._search_aur(dep_name, query_cache)
 
-            if aur_results:
-                if dep_name == dep_exp:
-                    version_required, exp_op = None, None
-                else:
-                    split_informed_dep = self.re_dep_operator().split(dep_exp)
-                    version_required = split_informed_dep[2]
-                    exp_op = split_informed_dep[1] if split_informed_dep[1] != '=' else '=='
-
-                for pkgname, pkgdata in self.aur_client.gen_updates_data((aur_res['Name'] for aur_res in aur_results)):
-                    if pkgname == dep_name or (dep_name in pkgdata['p']):
-                        try:
-                            if not version_required or match_required_version(pkgdata['v'], exp_op,
-                                                                              version_required):
-                                yield pkgname, pkgdata
-                        except Exception:
-                            self._log.warning(f"Could not compare AUR package '{pkgname}' version '{pkgdata['v']}' "
-                                              f"with the dependency expression '{dep_exp}'")
-                            traceback.print_exc()
+        if aur_results:
+            if dep_name == dep_exp:
+                version_required, exp_op = None, None
+            else:
+                split_informed_dep = self.re_dep_operator().split(dep_exp)
+                version_required = split_informed_dep[2]
+                exp_op = split_informed_dep[1] if split_informed_dep[1] != '=' else '=='
+
+            for pkgname, pkgdata in self._get_aur_data(aur_results, query_cache).items():
+                if pkgname == dep_name or (dep_name in pkgdata['p']):
+                    try:
+                        if not version_required or match_required_version(pkgdata['v'], exp_op,
+                                                                          version_required):
+                            yield pkgname, pkgdata
+                    except Exception:
+                        self._log.warning(f"Could not compare AUR package '{pkgname}' version '{pkgdata['v']}' "
+                                          f"with the dependency expression '{dep_exp}'")
+                        traceback.print_exc()
 
     def _fill_missing_dep(self, dep_name: str, dep_exp: str, aur_index: Iterable[str],
                           missing_deps: Set[Tuple[str, str]],
                           remote_provided_map: Dict[str, Set[str]], remote_repo_map: Dict[str, str],
                           repo_deps: Set[str], aur_deps: Set[str], deps_data: Dict[str, dict], watcher: ProcessWatcher,
-                          automatch_providers: bool, prefer_repository_provider: bool, dependent: Optional[str] = None):
+                          automatch_providers: bool, prefer_repository_provider: bool,
+                          query_cache: DependencyQueryCache, dependent: Optional[str] = None):
 
         repo_matches = None
 
         for pkgname, repo, data in self._find_repo_providers(dep_name=dep_name, dep_exp=dep_exp,
                                                              remote_repo_map=remote_repo_map,
                                                              remote_provided_map=remote_provided_map,
-                                                             deps_data=deps_data):
+                                                             deps_data=deps_data,
+                                                             query_cache=query_cache):
             if automatch_providers and pkgname == dep_name:
                 missing_deps.add((pkgname, repo))
                 repo_deps.add(pkgname)
@@ -333,7 +422,8 @@ class DependenciesAnalyser:
 
         if aur_index:
             for pkgname, pkgdata in self._find_aur_providers(dep_name=dep_name, dep_exp=dep_exp, aur_index=aur_index,
-                                                             exact_match=automatch_providers):
+                                                             exact_match=automatch_providers,
+                                                             query_cache=query_cache):
                 if automatch_providers and pkgname == dep_name:
                     missing_deps.add((pkgname, 'aur'))
                     aur_deps.add(pkgname)
@@ -391,22 +481,24 @@ class DependenciesAnalyser:
         else:
             raise PackageNotFoundException(dep_exp)
 
-    def _fill_aur_updates_data(self, pkgnames: Iterable[str], output_data: dict):
-        if pkgnames:
-            for pkgname, pkgdata in self.aur_client.gen_updates_data(pkgnames):
-                output_data[pkgname] = pkgdata
-
     def map_missing_deps(self, pkgs_data: Dict[str, dict], provided_map: Dict[str, Set[str]],
                          remote_provided_map: Dict[str, Set[str]], remote_repo_map: Dict[str, str],
                          aur_index: Iterable[str], deps_checked: Set[str], deps_data: Dict[str, dict],
                          sort: bool, watcher: ProcessWatcher, choose_providers: bool = True,
-                         automatch_providers: bool = False, prefer_repository_provider: bool = False) -> Optional[List[Tuple[str, str]]]:
+                         automatch_providers: bool = False, prefer_repository_provider: bool = False,
+                         query_cache: Optional[DependencyQueryCache] = None) -> Optional[List[Tuple[str, str]]]:
+        """
+        :param query_cache: remote queries already done during the current transaction (a new one is created if
+        not defined)
+        """
         sorted_deps = []  # it will hold the proper order to install the missing dependencies
 
         missing_deps, repo_missing, aur_missing = set(), set(), set()
+        cache = query_cache if query_cache else DependencyQueryCache()
 
         deps_checked.update(pkgs_data.keys())
 
+        to_fill = []  # dependencies of the current level not satisfied by the installed packages
         for p, data in pkgs_data.items():
             if data['d']:
                 for dep in data['d']:
@@ -420,15 +512,7 @@ class DependenciesAnalyser:
                             deps_checked.add(dep_name)
 
                             if dep_name not in provided_map:
-                                self._fill_missing_dep(dep_name=dep_name, dep_exp=dep, aur_index=aur_index,
-                                                       missing_deps=missing_deps,
-                                                       remote_provided_map=remote_provided_map,
-                                                       remote_repo_map=remote_repo_map,
-                                                       repo_deps=repo_missing, aur_deps=aur_missing, watcher=watcher,
-                                                       deps_data=deps_data,
-                                                       automatch_providers=automatch_providers,
-                                                       prefer_repository_provider=prefer_repository_provider,
-                                                       dependent=p)
+                                to_fill.append((dep_name, dep, p))
                             else:
                                 version_pattern = '{}='.format(dep_name)
                                 version_found = [p for p in provided_map if p.startswith(version_pattern)]
@@ -439,30 +523,30 @@ class DependenciesAnalyser:
                                     op = dep_split[1].strip()
 
                                     if not match_required_version(version_found, op, version_required):
-                                        self._fill_missing_dep(dep_name=dep_name, dep_exp=dep, aur_index=aur_index,
-                                                               missing_deps=missing_deps,
-                                                               remote_provided_map=remote_provided_map,
-                                                               remote_repo_map=remote_repo_map,
-                                                               repo_deps=repo_missing, aur_deps=aur_missing,
-                                                               watcher=watcher,
-                                                               deps_data=deps_data,
-                                                               automatch_providers=automatch_providers,
-                                                               prefer_repository_provider=prefer_repository_provider,
-                                                               dependent=p)
+                                        to_fill.append((dep_name, dep, p))
                                 else:
-                                    self._fill_missing_dep(dep_name=dep_name, dep_exp=dep, aur_index=aur_index,
-                                                           missing_deps=missing_deps,
-                                                           remote_provided_map=remote_provided_map,
-                                                           remote_repo_map=remote_repo_map,
-                                                           repo_deps=repo_missing, aur_deps=aur_missing,
-                                                           watcher=watcher,
-                                                           deps_data=deps_data,
-                                                           automatch_providers=automatch_providers,
-                                                           prefer_repository_provider=prefer_repository_provider,
-                                                           dependent=p)
+                                    to_fill.append((dep_name, dep, p))
+
+        if to_fill and aur_index:
+            not_in_repos = {dep_name for dep_name, _, _ in to_fill if dep_name not in remote_provided_map}
+
+            if not_in_repos:
+                self._prefetch_aur_data(not_in_repos, aur_index, automatch_providers, cache)
+
+        for dep_name, dep, dependent in to_fill:
+            self._fill_missing_dep(dep_name=dep_name, dep_exp=dep, aur_index=aur_index,
+                                   missing_deps=missing_deps,
+                                   remote_provided_map=remote_provided_map,
+                                   remote_repo_map=remote_repo_map,
+                                   repo_deps=repo_missing, aur_deps=aur_missing, watcher=watcher,
+                                   deps_data=deps_data,
+                                   automatch_providers=automatch_providers,
+                                   prefer_repository_provider=prefer_repository_provider,
+                                   query_cache=cache,
+                                   dependent=dependent)
 
         if missing_deps:
-            self._fill_single_providers_data(missing_deps, repo_missing, aur_missing, deps_data)
+            self._fill_single_providers_data(missing_deps, repo_missing, aur_missing, deps_data, cache)
 
             missing_subdeps = self.map_missing_deps(pkgs_data={**deps_data}, provided_map=provided_map,
                                                     aur_index=aur_index, deps_checked=deps_checked, sort=False,
@@ -471,7 +555,8 @@ class DependenciesAnalyser:
                                                     remote_repo_map=remote_repo_map,
                                                     automatch_providers=automatch_providers,
                                                     choose_providers=False,
-                                                    prefer_repository_provider=prefer_repository_provider)
+                                                    prefer_repository_provider=prefer_repository_provider,
+                                                    query_cache=cache)
 
             if missing_subdeps:
                 missing_deps.update(missing_subdeps)
@@ -487,11 +572,13 @@ class DependenciesAnalyser:
                                             watcher=watcher, sort=sort, already_checked=deps_checked,
                                             aur_idx=aur_index, deps_data=deps_data,
                                             automatch_providers=automatch_providers,
-                                            prefer_repository_provider=prefer_repository_provider)
+                                            prefer_repository_provider=prefer_repository_provider,
+                                            query_cache=cache)
 
         return sorted_deps
 
-    def _fill_single_providers_data(self, all_missing_deps: Iterable[Tuple[str, str]], repo_missing_deps: Iterable[str], aur_missing_deps: Iterable[str], deps_data: Dict[str, dict]):
+    def _fill_single_providers_data(self, all_missing_deps: Iterable[Tuple[str, str]], repo_missing_deps: Iterable[str], aur_missing_deps: Iterable[str], deps_data: Dict[str, dict],
+                                    query_cache: DependencyQueryCache):
         """
             fills the missing data of the single dependency providers since they are already considered dependencies
             (when several providers are available for given a dependency, the user must choose first)
@@ -513,12 +600,11 @@ class DependenciesAnalyser:
 
                     aur_providers_no_data.add(dep_name)
 
-        aur_data_filler, aur_providers_data = None, None
+        aur_data_filler, aur_providers_data = None, dict()
 
         if aur_providers_no_data:
-            aur_providers_data = dict()
-            aur_data_filler = Thread(target=self._fill_aur_updates_data,
-                                     args=(aur_providers_no_data, aur_providers_data),
+            aur_data_filler = Thread(target=lambda: aur_providers_data.update(self._get_aur_data(aur_providers_no_data,
+                                                                                                query_cache)),
                                      daemon=True)
             aur_data_filler.start()
 
@@ -539,7 +625,8 @@ class DependenciesAnalyser:
                             already_checked: Set[str], remote_provided_map: Dict[str, Set[str]],
                             deps_data: Dict[str, dict], aur_idx: Iterable[str], sort: bool,
                             watcher: ProcessWatcher, automatch_providers: bool,
-                            prefer_repository_provider: bool) -> Optional[List[Tuple[str, str]]]:
+                            prefer_repository_provider: bool,
+                            query_cache: Optional[DependencyQueryCache] = None) -> Optional[List[Tuple[str, str]]]:
         """
         :param missing_deps:
         :param provided_map:
@@ -552,9 +639,11 @@ class DependenciesAnalyser:
         :param watcher:
         :param automatch_providers
         :param prefer_repository_provider
+        :param query_cache: remote queries already done during the current transaction
         :return: all deps sorted or None if the user declined the providers options
         """
 
+        cache = query_cache if query_cache else DependencyQueryCache()
         deps_providers = map_providers({data[0] for data in missing_deps if data[1] == '__several__'},
                                        remote_provided_map)
 
@@ -592,7 +681,7 @@ class DependenciesAnalyser:
                     provided_map.update(pacman.map_provided(remote=True, pkgs=repo_selected))
 
                 if aur_selected:
-                    for pkgname, pkgdata in self.aur_client.gen_updates_data(aur_selected):
+                    for pkgname, pkgdata in self._get_aur_data(aur_selected, cache).items():
                         providers_data[pkgname] = pkgdata
                         for provider in pkgdata['p']:  # adding the providers as "installed" packages
                             currently_provided = provided_map.get(provider, set())
@@ -610,7 +699,8 @@ class DependenciesAnalyser:
                                                        watcher=watcher,
                                                        choose_providers=True,
                                                        automatch_providers=automatch_providers,
-                                                       prefer_repository_provider=prefer_repository_provider)
+                                                       prefer_repository_provider=prefer_repository_provider,
+                                                       query_cache=cache)
 
                 if providers_deps is None:  # it means the user called off the installation process
                     return
@@ -638,7 +728,8 @@ class DependenciesAnalyser:
                                                 aur_idx=aur_idx, remote_provided_map=remote_provided_map,
                                                 deps_data=deps_data, sort=False, watcher=watcher,
                                                 automatch_providers=automatch_providers,
-                                                prefer_repository_provider=prefer_repository_provider):
+                                                prefer_repository_provider=prefer_repository_provider,
+                                                query_cache=cache):
                     return
 
                 if sort:
@@ -651,16 +742,7 @@ class DependenciesAnalyser:
         if pkgnames:
             to_ignore.update(pkgnames)
 
-        all_requirements = {r for reqs in pacman.map_required_by(pkgnames).values() for r in reqs if r not in to_ignore}
-
-        if all_requirements:
-            sub_requirements = self.map_all_required_by(all_requirements, to_ignore)
-
-            if sub_requirements:
-                all_requirements.update(sub_requirements)
-                return all_requirements
-
-        return all_requirements
+        return get_installed_graph(self._log).map_all_required_by(pkgnames, to_ignore)
 
 
 def map_providers(pkgs: Iterable[str], remote_provided_map: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
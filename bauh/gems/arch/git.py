@@ -1,14 +1,13 @@
-import shutil
 from io import StringIO
 from logging import Logger
 from typing import List, Tuple, Optional
 
-from bauh.commons import system
+from bauh.commons import system, capabilities
 from bauh.commons.system import SimpleProcess
 
 
 def is_installed() -> bool:
-    return bool(shutil.which('git'))
+    return capabilities.registry.is_available('git')
 
 
 def list_commits(proj_dir: str, limit: int = -1, logger: Optional[Logger] = None) -> Optional[List[Tuple[str, int]]]:
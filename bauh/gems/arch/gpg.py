@@ -1,6 +1,9 @@
-from typing import Optional
+import re
+from typing import Optional, Iterable, Set
 
-from bauh.commons.system import SystemProcess, new_subprocess
+from bauh.commons.system import SystemProcess, new_subprocess, run_cmd
+
+RE_KEY = re.compile(r'^[0-9A-Fa-f]{8,40}$')
 
 
 def receive_key(key: str, server: Optional[str] = None) -> SystemProcess:
@@ -12,3 +15,36 @@ def receive_key(key: str, server: Optional[str] = None) -> SystemProcess:
     cmd.extend(['--recv-key', key])
 
     return SystemProcess(new_subprocess(cmd), check_error_output=False)
+
+
+def receive_keys(keys: Iterable[str], server: Optional[str] = None) -> SystemProcess:
+    cmd = ['gpg']
+
+    if server:
+        cmd.extend(['--keyserver', server])
+
+    cmd.append('--recv-keys')
+    cmd.extend(keys)
+
+    return SystemProcess(new_subprocess(cmd), check_error_output=False)
+
+
+def list_imported_keys(keys: Iterable[str]) -> Set[str]:
+    """
+    :return: the given keys already imported to the keyring (a single 'gpg' call). Invalid keys are ignored
+    """
+    keys = {k for k in keys if RE_KEY.match(k)}
+
+    if not keys:
+        return set()
+
+    output = run_cmd('gpg --list-keys --with-colons {}'.format(' '.join(sorted(keys))), ignore_return_code=True,
+                     print_error=False)
+
+    if not output:
+        return set()
+
+    fingerprints = [line.split(':')[9].upper() for line in output.split('\n')
+                    if line.startswith('fpr:') and len(line.split(':')) > 9]
+
+    return {k for k in keys if any(fpr.endswith(k.upper()) for fpr in fingerprints)}
@@ -0,0 +1,171 @@
+import logging
+import os
+import time
+from threading import Lock
+from typing import Dict, Set, Iterable, Optional
+
+from bauh.gems.arch import pacman
+from bauh.gems.arch.exceptions import PackageNotFoundException, PackageInHoldException
+
+LOCAL_DB_DIR = '/var/lib/pacman/local'
+
+
+class ReverseDependencyGraph:
+    """
+    In-memory dependency graph of the installed packages (provided names are considered). It answers the removal
+    impact questions previously delegated to 'pacman -Rc' and 'pacman -Rss' with a single traversal.
+    Version expressions are not considered: an installed provider is assumed to satisfy its dependents.
+    """
+
+    def __init__(self, pkgs_data: Dict[str, dict], hold: Optional[Set[str]] = None):
+        """
+        :param pkgs_data: the provided names ('p'), dependencies names ('d') and if it was explicitly installed ('e')
+        of each installed package
+        :param hold: packages that cannot be removed (pacman's 'HoldPkg')
+        """
+        self.hold = hold if hold else set()
+        self.explicit = {name for name, data in pkgs_data.items() if data.get('e')}
+        self._deps: Dict[str, Set[str]] = {}
+        self._providers: Dict[str, Set[str]] = {}  # provided name -> packages
+        self._dependents: Dict[str, Set[str]] = {}  # package -> packages depending on something it provides
+
+        for name, data in pkgs_data.items():
+            self._deps[name] = data['d'] if data.get('d') else set()
+
+            for provided in (name, *(data['p'] if data.get('p') else ())):
+                self._providers.setdefault(provided, set()).add(name)
+
+        for name, deps in self._deps.items():
+            for dep in deps:
+                for provider in self._providers.get(dep, ()):
+                    if provider != name:
+                        self._dependents.setdefault(provider, set()).add(name)
+
+    def __contains__(self, pkgname: str) -> bool:
+        return pkgname in self._deps
+
+    def get_dependents(self, pkgname: str) -> Set[str]:
+        return self._dependents.get(pkgname, set())
+
+    def map_all_required_by(self, pkgnames: Iterable[str], to_ignore: Optional[Set[str]] = None) -> Set[str]:
+        """
+        :return: all packages that transitively depend on the given ones (ignored packages are not traversed)
+        """
+        ignored = {*pkgnames, *(to_ignore if to_ignore else ())}
+        res = set()
+        to_check = [*pkgnames]
+
+        while to_check:
+            for dependent in self.get_dependents(to_check.pop()):
+                if dependent not in ignored and dependent not in res:
+                    res.add(dependent)
+                    to_check.append(dependent)
+
+        return res
+
+    def list_hard_requirements(self, names: Iterable[str], assume_installed: Optional[Iterable[str]] = None) -> Set[str]:
+        """
+        equivalent to 'pacman -Rc': the installed packages that would be broken (and must also be removed)
+        if the given packages were uninstalled
+        :param assume_installed: names considered provided even after the removal (e.g: by replacers)
+        :raises PackageNotFoundException: if a given package is not installed
+        :raises PackageInHoldException: if a package marked as 'HoldPkg' would have to be removed
+        """
+        targets = {*names}
+
+        for name in targets:
+            if name not in self._deps:
+                raise PackageNotFoundException(name)
+
+        assumed = {pacman.RE_DEP_OPERATORS.split(p)[0] for p in assume_installed} if assume_installed else set()
+        to_remove = {*targets}
+        to_check = [*targets]
+
+        while to_check:
+            for dependent in self.get_dependents(to_check.pop()):
+                if dependent not in to_remove:
+                    for dep in self._deps[dependent]:
+                        providers = self._providers.get(dep)
+
+                        if dep not in assumed and providers and providers.issubset(to_remove):
+                            to_remove.add(dependent)
+                            to_check.append(dependent)
+                            break
+
+        if self.hold and not self.hold.isdisjoint(to_remove):
+            raise PackageInHoldException()
+
+        return to_remove.difference(targets)
+
+    def _get_satisfiers(self, dep: str) -> Set[str]:
+        """
+        :return: the installed package a dependency is bound to. A virtual name provided by several packages
+        (e.g: 'sh' -> bash, dash) is not bound to any of them, so none is considered only required by the dependent
+        """
+        if dep in self._deps:
+            return {dep}
+
+        providers = self._providers.get(dep)
+        return providers if providers and len(providers) == 1 else set()
+
+    def list_post_uninstall_unneeded(self, names: Iterable[str]) -> Set[str]:
+        """
+        equivalent to 'pacman -Rss': the dependencies (recursively) not required by any remaining package
+        after the given packages are uninstalled. Explicitly installed packages are never returned
+        """
+        targets = {*names}
+        to_remove = {n for n in targets if n in self._deps}
+        candidates = set()
+
+        for name in to_remove:
+            for dep in self._deps[name]:
+                candidates.update(self._get_satisfiers(dep))
+
+        changed = True
+        while changed:
+            changed = False
+
+            for candidate in [*candidates]:
+                if candidate not in to_remove and candidate not in self.hold and candidate not in self.explicit \
+                        and self.get_dependents(candidate).issubset(to_remove):
+                    to_remove.add(candidate)
+                    candidates.discard(candidate)
+                    changed = True
+
+                    for dep in self._deps[candidate]:
+                        candidates.update(p for p in self._get_satisfiers(dep) if p not in to_remove)
+
+        return to_remove.difference(targets)
+
+
+_graph: Optional[ReverseDependencyGraph] = None
+_graph_db_state: Optional[int] = None
+_graph_lock = Lock()
+
+
+def _get_local_db_state() -> Optional[int]:
+    try:
+        return os.stat(LOCAL_DB_DIR).st_mtime_ns
+    except OSError:
+        return
+
+
+def get_installed_graph(logger: Optional[logging.Logger] = None) -> ReverseDependencyGraph:
+    """
+    :return: the installed packages graph. It is only rebuilt when the local database has changed.
+    """
+    global _graph, _graph_db_state
+
+    with _graph_lock:
+        db_state = _get_local_db_state()
+
+        if _graph is None or db_state is None or db_state != _graph_db_state:
+            ti = time.time()
+            _graph = ReverseDependencyGraph(pkgs_data=pacman.map_local_dependencies_data() or {},
+                                            hold=pacman.list_hold_packages())
+            _graph_db_state = db_state
+
+            if logger:
+                logger.info(f"Installed packages graph built in {time.time() - ti:.4f} seconds")
+
+        return _graph
@@ -1,18 +1,13 @@
-import logging
 import os
 import re
-import shutil
 import traceback
-from io import StringIO
 from threading import Thread
 from typing import List, Set, Tuple, Dict, Iterable, Optional, Any, Pattern, Collection
 
-from colorama import Fore
-
-from bauh.commons import system
+from bauh.commons import system, capabilities
 from bauh.commons.system import run_cmd, new_subprocess, new_root_subprocess, SystemProcess, SimpleProcess
 from bauh.commons.util import size_to_byte
-from bauh.gems.arch.exceptions import PackageNotFoundException, PackageInHoldException
+from bauh.gems.arch.exceptions import PackageNotFoundException
 
 RE_DEPS = re.compile(r'[\w\-_]+:[\s\w_\-.]+\s+\[\w+]')
 RE_OPTDEPS = re.compile(r'[\w._\-]+\s*:')
@@ -27,10 +22,11 @@ RE_AVAILABLE_MIRRORS = re.compile(r'.+\s+OK\s+.+\s+(\d+:\d+)\s+.+(http.+)')
 RE_PACMAN_SYNC_FIRST = re.compile(r'SyncFirst\s*=\s*(.+)')
 RE_DESKTOP_FILES = re.compile(r'\n?([\w\-_]+)\s+(/usr/share/.+\.desktop)')
 RE_IGNORED_PACKAGES: Optional[Pattern] = None
+RE_HOLD_PACKAGES: Optional[Pattern] = None
 
 
 def is_available() -> bool:
-    return bool(shutil.which('pacman'))
+    return capabilities.registry.is_available('pacman')
 
 
 def get_repositories(pkgs: Iterable[str]) -> dict:
@@ -494,7 +490,7 @@ def get_current_mirror_countries() -> List[str]:
 
 
 def is_mirrors_available() -> bool:
-    return bool(shutil.which('pacman-mirrors'))
+    return capabilities.registry.is_available('pacman-mirrors')
 
 
 def map_update_sizes(pkgs: List[str]) -> Dict[str, float]:  # bytes:
@@ -528,6 +524,75 @@ def upgrade_system(root_password: Optional[str]) -> SimpleProcess:
     return SimpleProcess(cmd=['pacman', '-Syyu', '--noconfirm'], root_password=root_password)
 
 
+def list_hold_packages(config_path: str = '/etc/pacman.conf') -> Set[str]:
+    hold = set()
+
+    try:
+        with open(config_path, 'r') as f:
+            file_content = f.read()
+
+        global RE_HOLD_PACKAGES
+
+        if not RE_HOLD_PACKAGES:
+            RE_HOLD_PACKAGES = re.compile(r'^\s*holdpkg\s*=\s*(.+)$', re.IGNORECASE | re.MULTILINE)
+
+        for names in RE_HOLD_PACKAGES.findall(file_content):
+            hold.update(n for n in names.split('#')[0].strip().split(' ') if n)
+    except (FileNotFoundError, OSError):
+        pass
+    except Exception:
+        traceback.print_exc()
+
+    return hold
+
+
+def map_local_dependencies_data() -> Optional[Dict[str, dict]]:
+    """
+    :return: the names provided ('p'), the dependencies ('d', without version expressions) and if it was explicitly
+    installed ('e') of every installed package (from a single 'pacman -Qi' call)
+    """
+    output = run_cmd('pacman -Qi', print_error=False)
+
+    if output is None:
+        return
+
+    res = {}
+    latest_name, latest_field = None, None
+
+    for l in output.split('\n'):
+        if l:
+            if l[0] != ' ':
+                line = l.strip()
+                field_sep_idx = line.find(':')
+
+                if field_sep_idx < 0:
+                    latest_field = None
+                    continue
+
+                field = line[0:field_sep_idx].strip()
+                val = line[field_sep_idx + 1:].strip()
+
+                if field == 'Name':
+                    latest_name = val
+                    res[latest_name] = {'p': {latest_name}, 'd': set(), 'e': False}
+                    latest_field = None
+                elif latest_name and field == 'Install Reason':
+                    res[latest_name]['e'] = val.startswith('Explicitly')
+                    latest_field = None
+                elif latest_name and field in ('Provides', 'Depends On'):
+                    latest_field = 'p' if field == 'Provides' else 'd'
+
+                    if val != 'None':
+                        res[latest_name][latest_field].update(RE_DEP_OPERATORS.split(w)[0] for w in val.split(' ') if w)
+                else:
+                    latest_field = None
+
+            elif latest_name and latest_field:
+                res[latest_name][latest_field].update(RE_DEP_OPERATORS.split(w)[0] for w in l.strip().split(' ') if w)
+
+    return res
+
+
 def _fill_provided_map(key: str, val: str, output: Dict[str, Set[str]]):
     current_val = output.get(key)
 
@@ -1006,52 +1071,6 @@ def is_snapd_installed() -> bool:
     return bool(run_cmd('pacman -Qq snapd', print_error=False))
 
 
-def list_hard_requirements(name: str, logger: Optional[logging.Logger] = None,
-                           assume_installed: Optional[Set[str]] = None) -> Optional[Set[str]]:
-    cmd = StringIO()
-    cmd.write(f'pacman -Rc {name} --print-format=%n ')
-
-    if assume_installed:
-        cmd.write(' '.join(f'--assume-installed={provider}' for provider in assume_installed))
-
-    code, output = system.execute(cmd.getvalue(), shell=True)
-
-    if code != 0:
-        if 'HoldPkg' in output:
-            raise PackageInHoldException()
-        elif 'target not found' in output:
-            raise PackageNotFoundException(name)
-        elif logger:
-            logger.error("Unexpected error while listing hard requirements of: {}".format(name))
-            print('{}{}{}'.format(Fore.RED, output, Fore.RESET))
-    elif output:
-        reqs = set()
-
-        for line in output.split('\n'):
-            if line:
-                line_strip = line.strip()
-
-                if line_strip and line_strip != name:
-                    reqs.add(line_strip)
-
-        return reqs
-
-
-def list_post_uninstall_unneeded_packages(names: Set[str]) -> Set[str]:
-    output = run_cmd('pacman -Rss {} --print-format=%n'.format(' '.join(names)), print_error=False)
-
-    reqs = set()
-    if output:
-        for line in output.split('\n'):
-            if line:
-                line_strip = line.strip()
-
-                if line_strip and line_strip not in names:
-                    reqs.add(line_strip)
-
-    return reqs
-
-
 def find_one_match(name: str) -> Optional[str]:
     output = run_cmd('pacman -Ssq {}'.format(name), print_error=False)
 
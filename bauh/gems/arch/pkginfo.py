@@ -0,0 +1,145 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+import subprocess
+import tarfile
+import traceback
+from logging import Logger
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Dict, List
+
+from bauh.gems.arch import ARCH_CACHE_DIR
+
+PKGINFO_INDEX_FILE = f'{ARCH_CACHE_DIR}/pkginfo_index.json'
+
+
+def read_pkginfo(file_path: str) -> Optional[Dict[str, str]]:
+    """
+    reads the '.PKGINFO' of a package file. Only the archive head is decompressed ('.PKGINFO' is one of the first
+    members). 'zst' files are decompressed by the 'zstd' binary (stopped as soon as the file is read).
+    :return: the '.PKGINFO' fields or None if it could not be read
+    """
+    ext = file_path.split('.')[-1]
+    proc = None
+
+    try:
+        if ext == 'zst':
+            proc = subprocess.Popen(('zstd', '-dcq', file_path), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            stream = proc.stdout
+        elif ext == 'xz':
+            stream = lzma.open(file_path)
+        elif ext == 'gz':
+            stream = gzip.open(file_path)
+        elif ext == 'bz2':
+            stream = bz2.open(file_path)
+        elif ext == 'tar':
+            stream = open(file_path, 'rb')
+        else:
+            return
+
+        try:
+            with tarfile.open(fileobj=stream, mode='r|') as tar:
+                for member in tar:
+                    if member.name == '.PKGINFO':
+                        info = {}
+                        for line in tar.extractfile(member).read().decode().split('\n'):
+                            if line and not line.startswith('#') and '=' in line:
+                                field, val = line.split('=', 1)
+                                info.setdefault(field.strip(), val.strip())
+
+                        return info
+        finally:
+            stream.close()
+    except (OSError, EOFError, tarfile.TarError, lzma.LZMAError, UnicodeDecodeError):
+        traceback.print_exc()
+    finally:
+        if proc:
+            proc.kill()
+            proc.wait()
+
+
+class PkgInfoIndex:
+    """
+    Persistent index of the build date of cached package files. Entries are identified by the file path,
+    size and modification time, so a file is only read again if it changes.
+    """
+
+    def __init__(self, logger: Logger, file_path: str = PKGINFO_INDEX_FILE):
+        self._log = logger
+        self._file_path = file_path
+        self._entries: Optional[Dict[str, List[int]]] = None  # path -> [size, mtime_ns, builddate]
+        self._changed = False
+        self._lock = Lock()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self._file_path) as f:
+                    entries = json.load(f)
+
+                self._entries = entries if isinstance(entries, dict) else {}
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError):
+                self._log.warning(f"Could not read the package files index '{self._file_path}'")
+                self._entries = {}
+
+    def get_build_date(self, file_path: str) -> Optional[int]:
+        """
+        :return: the build date (timestamp) of the given package file
+        """
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._load()
+            entry = self._entries.get(file_path)
+
+            if entry and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns:
+                return entry[2]
+
+        info = read_pkginfo(file_path)
+
+        try:
+            build_date = int(info['builddate']) if info and info.get('builddate') else None
+        except ValueError:
+            build_date = None
+
+        if build_date is None:
+            self._log.warning(f"Could not read the build date of '{file_path}'")
+            return
+
+        with self._lock:
+            self._entries[file_path] = [file_stat.st_size, file_stat.st_mtime_ns, build_date]
+            self._changed = True
+
+        return build_date
+
+    def save(self):
+        """
+        writes the index to disk (if changed). Entries of files no longer available are removed.
+        """
+        with self._lock:
+            if not self._changed:
+                return
+
+            entries = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+
+            try:
+                Path(os.path.dirname(self._file_path)).mkdir(parents=True, exist_ok=True)
+
+                temp_file = f'{self._file_path}.tmp'
+                with open(temp_file, 'w+') as f:
+                    json.dump(entries, f)
+
+                os.replace(temp_file, self._file_path)
+                self._entries = entries
+                self._changed = False
+            except OSError:
+                self._log.warning(f"Could not write the package files index '{self._file_path}'")
+                traceback.print_exc()
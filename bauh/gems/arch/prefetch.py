@@ -0,0 +1,305 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import traceback
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from logging import Logger
+from threading import Lock, Event
+from typing import List, Optional, Dict, Iterable, Set, Tuple
+
+from bauh.api.http import HttpClient
+from bauh.gems.arch import AUR_SOURCES_DIR
+from bauh.gems.arch.aur import URL_SRC_INFO
+
+RE_SRCINFO_FIELD = re.compile(r'^\s*(\w+)\s+=\s+(.+)$')
+RE_PREFETCH_PROTOCOLS = re.compile(r'^https?://.+')  # other protocols (e.g: 'file') are left to makepkg
+CHECKSUM_ALGORITHMS = (('b2sums', 'blake2b'), ('sha512sums', 'sha512'), ('sha384sums', 'sha384'),
+                       ('sha256sums', 'sha256'), ('sha224sums', 'sha224'), ('sha1sums', 'sha1'), ('md5sums', 'md5'))
+
+
+class SourceFile:
+
+    def __init__(self, name: str, url: str, algorithm: Optional[str] = None, checksum: Optional[str] = None):
+        """
+        :param algorithm: hashlib algorithm of the checksum (None if the file cannot be verified)
+        """
+        self.name = name
+        self.url = url
+        self.algorithm = algorithm
+        self.checksum = checksum
+
+    def __eq__(self, other):
+        if isinstance(other, SourceFile):
+            return self.__dict__ == other.__dict__
+
+        return False
+
+    def __hash__(self):
+        return hash((self.name, self.url, self.algorithm, self.checksum))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__} ({self.__dict__})'
+
+
+def map_srcinfo_fields(srcinfo: str) -> Dict[str, List[str]]:
+    """
+    :return: the fields of the '.SRCINFO' package base section keeping the values order (sources and checksums are
+    matched by position)
+    """
+    fields = {}
+
+    for line in srcinfo.split('\n'):
+        field = RE_SRCINFO_FIELD.match(line)
+
+        if field:
+            key, val = field.group(1), field.group(2).strip()
+
+            if key == 'pkgname':  # the sources can only be declared in the package base section
+                break
+
+            fields.setdefault(key, []).append(val)
+
+    return fields
+
+
+def map_sources(fields: Dict[str, List[str]], x86_64: bool) -> List[SourceFile]:
+    """
+    :return: the remote source files that can be downloaded without makepkg (no VCS or local sources)
+    """
+    sources = []
+
+    for suffix in ('', '_x86_64' if x86_64 else '_i686'):
+        urls = fields.get(f'source{suffix}')
+
+        if not urls:
+            continue
+
+        checksums, algorithm = None, None
+        for field, alg in CHECKSUM_ALGORITHMS:  # the strongest checksum available is used
+            field_sums = fields.get(f'{field}{suffix}')
+
+            if field_sums and len(field_sums) == len(urls):
+                checksums, algorithm = field_sums, alg
+                break
+
+        for idx, source in enumerate(urls):
+            source_data = source.split('::', 1)
+            url = source_data[-1]
+
+            if not RE_PREFETCH_PROTOCOLS.match(url):
+                continue
+
+            name = source_data[0] if len(source_data) > 1 else url.split('#')[0].split('?')[0].rstrip('/').split('/')[-1]
+
+            if not name or name in ('.', '..') or '/' in name:
+                continue
+
+            checksum = checksums[idx] if checksums else None
+
+            if checksum and checksum != 'SKIP':
+                sources.append(SourceFile(name=name, url=url, algorithm=algorithm, checksum=checksum.lower()))
+            else:
+                sources.append(SourceFile(name=name, url=url))
+
+    return sources
+
+
+def verify_checksum(file_path: str, source: SourceFile) -> bool:
+    if not source.algorithm:
+        return True
+
+    hash_ = hashlib.new(source.algorithm)
+
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hash_.update(chunk)
+
+    return hash_.hexdigest() == source.checksum
+
+
+class SourcesPrefetcher:
+    """
+    Downloads the source files of the AUR packages of a transaction concurrently (while the other packages are
+    being built) into a storage shared by the transaction. The files are checked against the '.SRCINFO' checksums,
+    and moved to the package project directory when its build starts (see 'retrieve'), so makepkg does not need to
+    download them. Files that could not be prefetched are just downloaded by makepkg.
+    """
+
+    def __init__(self, http_client: HttpClient, logger: Logger, x86_64: bool, storage_dir: str = AUR_SOURCES_DIR,
+                 max_workers: int = 4):
+        self._http_client = http_client
+        self._log = logger
+        self._x86_64 = x86_64
+        self._storage_dir = storage_dir
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._downloads: Dict[str, List[Tuple[SourceFile, Future]]] = {}  # package base -> downloads
+        self._transaction_dir: Optional[str] = None
+        self._lock = Lock()
+        self._abort = Event()
+
+    def _get_transaction_dir(self) -> str:
+        with self._lock:
+            if not self._transaction_dir:
+                os.makedirs(self._storage_dir, exist_ok=True)
+                self._transaction_dir = tempfile.mkdtemp(dir=self._storage_dir)
+
+            return self._transaction_dir
+
+    def _read_srcinfo(self, base: str) -> Optional[Dict[str, List[str]]]:
+        try:
+            res = self._http_client.get(URL_SRC_INFO + urllib.parse.quote(base))
+        except Exception:  # the prefetch is optional: makepkg downloads the sources anyway
+            res = None
+            traceback.print_exc()
+
+        if res and res.text:
+            return map_srcinfo_fields(res.text)
+
+        self._log.warning(f"Could not retrieve the .SRCINFO of '{base}' to prefetch its source files")
+
+    def _download(self, base: str, source: SourceFile) -> Optional[str]:
+        if self._abort.is_set():
+            return
+
+        base_dir = f'{self._get_transaction_dir()}/{base}'
+        file_path = f'{base_dir}/{source.name}'
+        part_path = f'{file_path}.part'
+
+        try:
+            os.makedirs(base_dir, exist_ok=True)
+
+            res = self._http_client.get(source.url, stream=True)
+
+            if not res or not (200 <= res.status_code < 300):
+                self._log.warning(f"Could not prefetch source file '{source.url}' ({base})")
+                return
+
+            try:
+                with open(part_path, 'wb') as f:
+                    for chunk in res.iter_content(chunk_size=1024 * 1024):
+                        if self._abort.is_set():
+                            break
+
+                        f.write(chunk)
+            finally:
+                res.close()
+
+            if self._abort.is_set():
+                self._log.info(f"Prefetching of source file '{source.name}' ({base}) aborted")
+                os.remove(part_path)
+                return
+
+            if not verify_checksum(part_path, source):
+                self._log.warning(f"Prefetched source file '{source.name}' ({base}) does not match the expected "
+                                  f"checksum. It will be downloaded again during the build")
+                os.remove(part_path)
+                return
+
+            os.replace(part_path, file_path)
+            self._log.info(f"Source file '{source.name}' ({base}) prefetched")
+            return file_path
+        except Exception:
+            self._log.warning(f"Could not prefetch source file '{source.url}' ({base})")
+            traceback.print_exc()
+
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+    def prefetch(self, bases: Iterable[str]) -> Dict[str, Set[str]]:
+        """
+        retrieves the '.SRCINFO' of the given package bases (concurrently) and starts downloading their source files
+        in background. Package bases already prefetched are ignored.
+        :return: the valid PGP keys of each package base
+        """
+        with self._lock:
+            to_prefetch = [b for b in {*bases} if b not in self._downloads]
+
+            for base in to_prefetch:
+                self._downloads[base] = []
+
+        keys = {}
+
+        for base, fields in zip(to_prefetch, self._executor.map(self._read_srcinfo, to_prefetch)):
+            if not fields:
+                continue
+
+            if fields.get('validpgpkeys'):
+                keys[base] = {*fields['validpgpkeys']}
+
+            downloads = [(s, self._executor.submit(self._download, base, s)) for s in map_sources(fields, self._x86_64)]
+
+            if downloads:
+                with self._lock:
+                    self._downloads[base].extend(downloads)
+
+                self._log.info(f"Prefetching {len(downloads)} source file(s) of '{base}'")
+
+        return keys
+
+    def retrieve(self, base: str, project_dir: str, user: Optional[str] = None) -> int:
+        """
+        waits the source files of the given package base to be prefetched and moves them to its project directory.
+        Only files still declared by the project '.SRCINFO' (same name, URL and checksum) are moved.
+        :param user: owner of the moved files
+        :return: the number of files moved
+        """
+        with self._lock:
+            downloads = self._downloads.get(base)
+
+        if not downloads:
+            return 0
+
+        wait([d[1] for d in downloads])
+
+        try:
+            with open(f'{project_dir}/.SRCINFO') as f:
+                declared = {*map_sources(map_srcinfo_fields(f.read()), self._x86_64)}
+        except OSError:
+            self._log.warning(f"Could not read the .SRCINFO of '{base}'. The prefetched source files will not be used")
+            return 0
+
+        moved = 0
+        for source, download in downloads:
+            file_path = download.result()
+
+            if not file_path or source not in declared:
+                continue
+
+            target_path = f'{project_dir}/{source.name}'
+
+            if os.path.exists(target_path):
+                continue
+
+            try:
+                shutil.move(file_path, target_path)
+
+                if user:
+                    shutil.chown(target_path, user=user)
+
+                moved += 1
+            except OSError:
+                self._log.warning(f"Could not move the prefetched source file '{file_path}' to '{project_dir}'")
+                traceback.print_exc()
+
+        return moved
+
+    def clean(self):
+        """
+        cancels the pending downloads, aborts the running ones and removes the files not retrieved
+        """
+        self._abort.set()
+
+        with self._lock:
+            downloads = [d[1] for downloads in self._downloads.values() for d in downloads]
+
+        for download in downloads:
+            download.cancel()
+
+        self._executor.shutdown(wait=True)
+
+        with self._lock:
+            if self._transaction_dir and os.path.exists(self._transaction_dir):
+                shutil.rmtree(self._transaction_dir, ignore_errors=True)
@@ -1,14 +1,13 @@
 import os
-import shutil
 from pathlib import Path
 from typing import Set
 
-from bauh.commons import system
+from bauh.commons import system, capabilities
 from bauh.gems.arch import IGNORED_REBUILD_CHECK_FILE
 
 
 def is_installed() -> bool:
-    return bool(shutil.which('checkrebuild'))
+    return capabilities.registry.is_available('checkrebuild')
 
 
 def list_required_rebuild() -> Set[str]:
@@ -3,7 +3,6 @@ import glob
 import logging
 import os
 import re
-import shutil
 import time
 import traceback
 from datetime import datetime, timedelta
@@ -15,6 +14,7 @@ import requests
 
 from bauh.api.abstract.context import ApplicationContext
 from bauh.api.abstract.handler import TaskManager
+from bauh.commons import capabilities
 from bauh.commons.boot import CreateConfigFile
 from bauh.commons.html import bold
 from bauh.commons.system import new_root_subprocess, ProcessHandler
@@ -264,7 +264,7 @@ class ArchCompilationOptimizer(Thread):
         self.taskman.register_task(self.task_id, self.i18n['arch.task.optimizing'].format(bold('makepkg.conf')), get_icon_path())
 
     def _is_ccache_installed(self) -> bool:
-        return bool(shutil.which('ccache'))
+        return capabilities.registry.is_available('ccache')
 
     def optimize(self):
         ti = time.time()
@@ -1,16 +1,14 @@
 import re
-import time
 from contextlib import contextmanager
 from enum import Enum
 from logging import Logger
 from math import ceil
-from queue import Queue
-from threading import Thread
 from typing import Iterable, Optional, Pattern, Dict, Set, Tuple, Generator, Collection
 
 from bauh.api.abstract.handler import ProcessWatcher
 from bauh.commons import system
 from bauh.commons.html import bold
+from bauh.commons.output import OutputHandlerThread
 from bauh.commons.system import SimpleProcess
 from bauh.commons.util import size_to_byte
 from bauh.gems.debian.common import strip_maintainer_email, strip_section
@@ -289,28 +287,19 @@ class Aptitude:
         return self._vars_fixes
 
 
-class AptitudeOutputHandler(Thread):
+class AptitudeOutputHandler(OutputHandlerThread):
 
     def __init__(self, i18n: I18n, targets: Iterable[str], re_download: Pattern, watcher: ProcessWatcher,
                  action: AptitudeAction):
-        super(AptitudeOutputHandler, self).__init__()
+        super(AptitudeOutputHandler, self).__init__(watcher=watcher)
         self._i18n = i18n
         self._re_download = re_download
-        self._watcher = watcher
         self._targets = set(targets) if targets is not None else None
         self._unpacking = 0
         self._removing = 0
         self._downloading = 0
-        self._to_process = Queue()
-        self._work = True
         self._action = action
 
-    def stop_working(self):
-        self._work = False
-
-    def handle(self, string: str):
-        self._to_process.put(string)
-
     @property
     def total_targets(self) -> int:
         return len(self._targets) if self._targets else 0
@@ -333,76 +322,69 @@ class AptitudeOutputHandler(Thread):
 
         return ''
 
-    def run(self):
-        while self._work:
-            time.sleep(0.001)
-
-            if self._to_process.empty():
-                continue
-
-            string = self._to_process.get()
-
-            if self.total_targets > 0 and self.total_targets == self._unpacking:
-                self._watcher.change_substatus(self._i18n['debian.output.finishing'])
-                continue
+    def _handle(self, string: str) -> bool:
+        if self.total_targets > 0 and self.total_targets == self._unpacking:
+            self.change_substatus(self._i18n['debian.output.finishing'])
+            return True
 
-            if string:
-                if self._action != AptitudeAction.REMOVE and string.startswith('Unpacking '):
-                    unpacking = string.split(' ')
+        if string:
+            if self._action != AptitudeAction.REMOVE and string.startswith('Unpacking '):
+                unpacking = string.split(' ')
 
-                    if len(unpacking) >= 2 and unpacking[1]:
-                        pkg = map_package_name(unpacking[1].strip())
+                if len(unpacking) >= 2 and unpacking[1]:
+                    pkg = map_package_name(unpacking[1].strip())
 
-                        if self._targets and pkg in self._targets:
-                            self._unpacking += 1
+                    if self._targets and pkg in self._targets:
+                        self._unpacking += 1
 
-                        msg = f"{self._get_progress(self._unpacking)}" \
-                              f"{self._i18n['debian.output.unpacking'].format(pkg=bold(pkg))}"
+                    msg = f"{self._get_progress(self._unpacking)}" \
+                          f"{self._i18n['debian.output.unpacking'].format(pkg=bold(pkg))}"
 
-                        self._watcher.change_substatus(msg)
+                    self.change_substatus(msg)
 
-                        continue
+                    return True
 
-                if self._action == AptitudeAction.REMOVE and string.startswith('Removing '):
-                    unpacking = string.split(' ')
+            if self._action == AptitudeAction.REMOVE and string.startswith('Removing '):
+                unpacking = string.split(' ')
 
-                    if len(unpacking) >= 2 and unpacking[1]:
-                        pkg = unpacking[1].strip()
+                if len(unpacking) >= 2 and unpacking[1]:
+                    pkg = unpacking[1].strip()
 
-                        if self._targets and pkg in self._targets:
-                            self._removing += 1
+                    if self._targets and pkg in self._targets:
+                        self._removing += 1
 
-                        msg = f"{self._get_progress(self._removing)}" \
-                              f"{self._i18n['debian.output.removing'].format(pkg=bold(pkg))}"
+                    msg = f"{self._get_progress(self._removing)}" \
+                          f"{self._i18n['debian.output.removing'].format(pkg=bold(pkg))}"
 
-                        self._watcher.change_substatus(msg)
+                    self.change_substatus(msg)
 
-                        continue
+                    return True
 
-                download = self._re_download.findall(string)
+            download = self._re_download.findall(string)
 
-                if download:
-                    data = download[0].split(' ')
+            if download:
+                data = download[0].split(' ')
 
-                    if len(data) >= 4:
-                        pkg = data[3].strip()
+                if len(data) >= 4:
+                    pkg = data[3].strip()
 
-                        if self._targets and pkg in self._targets:
-                            self._downloading += 1
+                    if self._targets and pkg in self._targets:
+                        self._downloading += 1
 
-                        msg = f"{self._get_progress(self._downloading)}" \
-                              f"{self._i18n['debian.output.downloading'].format(pkg=bold(pkg))}"
+                    msg = f"{self._get_progress(self._downloading)}" \
+                          f"{self._i18n['debian.output.downloading'].format(pkg=bold(pkg))}"
 
-                        self._watcher.change_substatus(msg)
+                    self.change_substatus(msg)
 
-                        continue
+                    return True
 
-                _processed = self.processed
-                if self._targets and _processed > 0:
-                    self._watcher.change_substatus(self._get_progress(_processed).strip())
-                    continue
+            _processed = self.processed
+            if self._targets and _processed > 0:
+                self.change_substatus(self._get_progress(_processed).strip())
+                return True
 
-            self._watcher.change_substatus(' ')
+        self.change_substatus(' ')
+        return True
 
 
 class AptitudeOutputHandlerFactory:
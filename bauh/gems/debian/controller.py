@@ -31,6 +31,7 @@ from bauh.gems.debian.index import ApplicationIndexer, ApplicationIndexError, Ap
 from bauh.gems.debian.model import DebianPackage, DebianApplication
 from bauh.gems.debian.suggestions import DebianSuggestionsDownloader
 from bauh.gems.debian.tasks import UpdateApplicationIndex, MapApplications, SynchronizePackages
+from bauh.gems.debian.transaction import TransactionPlanner
 
 
 class DebianPackageManager(SoftwareManager, SettingsController):
@@ -50,6 +51,7 @@ class DebianPackageManager(SoftwareManager, SettingsController):
         self._app_mapper: Optional[ApplicationsMapper] = None
         self._aptitude: Optional[Aptitude] = None
         self._output_handler: Optional[AptitudeOutputHandlerFactory] = None
+        self._planner: Optional[TransactionPlanner] = None
         self._known_sources_apps: Optional[Tuple[str, ...]] = None
         self._install_show_attrs: Optional[Set[str]] = None
         self._file_ignored_updates: Optional[str] = None
@@ -138,6 +140,8 @@ class DebianPackageManager(SoftwareManager, SettingsController):
             success, _ = handler.handle_simple(self.aptitude.upgrade(packages=to_upgrade,
                                                                      root_password=root_password),
                                                output_handler=handle)
+
+        self.planner.invalidate()
         return success
 
     def _fill_updates(self, output: Dict[str, str]):
@@ -152,7 +156,8 @@ class DebianPackageManager(SoftwareManager, SettingsController):
 
         watcher.change_substatus(self._i18n['debian.simulate_operation'])
 
-        transaction = self.aptitude.simulate_removal((pkg.name,), purge=purge_)
+        plan = self.planner.plan(AptitudeAction.REMOVE, (pkg.name,), purge=purge_)
+        transaction = plan.transaction if plan else None
 
         if not transaction or not transaction.to_remove:
             return TransactionResult.fail()
@@ -173,11 +178,8 @@ class DebianPackageManager(SoftwareManager, SettingsController):
             fill_updates = Thread(target=self._fill_updates, args=(updates,), daemon=True)
             fill_updates.start()
 
-            deps_data = self.aptitude.show((p.name for p in deps), attrs=('description', 'maintainer', 'section'))
-
-            if deps_data:
-                for p in deps:
-                    fill_show_data(p, deps_data.get(p.name))
+            for p in deps:
+                fill_show_data(p, plan.get_data(p.name, attrs=('description', 'maintainer', 'section')))
 
             if not self.view.confirm_removal(source_pkg=pkg.name, dependencies=deps, watcher=watcher):
                 return TransactionResult.fail()
@@ -201,6 +203,8 @@ class DebianPackageManager(SoftwareManager, SettingsController):
                                                                     purge=purge_),
                                                output_handler=handle)
 
+        self.planner.invalidate()
+
         if not removed:
             return TransactionResult.fail()
 
@@ -281,15 +285,10 @@ class DebianPackageManager(SoftwareManager, SettingsController):
     def get_upgrade_requirements(self, pkgs: List[DebianPackage], root_password: str, watcher: ProcessWatcher) \
             -> UpgradeRequirements:
 
-        transaction = self.aptitude.simulate_upgrade((p.name for p in pkgs))
-
-        if transaction:
-            size_to_query = (f'{p.name}={p.latest_version}' for p in (*transaction.to_upgrade,
-                                                                      *transaction.to_install,
-                                                                      *transaction.to_remove))
+        plan = self.planner.plan(AptitudeAction.UPGRADE, (p.name for p in pkgs))
 
-            update_extra_attrs = ('compressed size', *(('depends', 'predepends') if transaction.to_install else ()))
-            update_data = self.aptitude.show(pkgs=size_to_query, attrs=update_extra_attrs)
+        if plan:
+            transaction, update_data = plan.transaction, plan.packages_data
 
             to_install = None
             if transaction.to_install:
@@ -390,24 +389,18 @@ class DebianPackageManager(SoftwareManager, SettingsController):
                 watcher: ProcessWatcher) -> TransactionResult:
 
         watcher.change_substatus(self._i18n['debian.simulate_operation'])
-        transaction = self.aptitude.simulate_installation((pkg.name, ))
+        plan = self.planner.plan(AptitudeAction.INSTALL, (pkg.name,))
+        transaction = plan.transaction if plan else None
 
         if transaction is None or not transaction.to_install:
             return TransactionResult.fail()
 
         if transaction.to_remove or (transaction.to_install and len(transaction.to_install) > 1):
-            watcher.change_substatus(self._i18n['debian.transaction.get_data'])
-
             deps = tuple(p for p in transaction.to_install or () if p.name != pkg.name)
             removal = tuple(p for p in transaction.to_remove or ())
-            all_pkgs = [*deps, *removal]
 
-            pkgs_data = self.aptitude.show(pkgs=(f'{d.name}={d.version}' for d in all_pkgs),
-                                           attrs=self.install_show_attrs)
-
-            if pkgs_data:
-                for p in all_pkgs:
-                    fill_show_data(p, pkgs_data.get(p.name))
+            for p in (*deps, *removal):
+                fill_show_data(p, plan.get_data(p.name, attrs=self.install_show_attrs))
 
             if not self.view.confirm_transaction(to_install=deps, removal=removal, watcher=watcher):
                 return TransactionResult.fail()
@@ -421,6 +414,8 @@ class DebianPackageManager(SoftwareManager, SettingsController):
                                                                        root_password=root_password),
                                                  output_handler=handle)
 
+        self.planner.invalidate()
+
         if installed:
             self._refresh_apps_index(watcher)
 
@@ -498,6 +493,10 @@ class DebianPackageManager(SoftwareManager, SettingsController):
 
         return action != SoftwareAction.SEARCH
 
+    def get_deferrable_prepare_tasks(self, operation: str) -> Optional[Set[str]]:
+        if operation != 'list_suggestions':
+            return {'debian.suggs'}
+
     def prepare(self, task_manager: Optional[TaskManager], root_password: Optional[str],
                 internet_available: Optional[bool]):
 
@@ -850,6 +849,13 @@ class DebianPackageManager(SoftwareManager, SettingsController):
 
         return self._aptitude
 
+    @property
+    def planner(self) -> TransactionPlanner:
+        if self._planner is None:
+            self._planner = TransactionPlanner(aptitude=self.aptitude, logger=self._log)
+
+        return self._planner
+
     @property
     def output_handler(self) -> AptitudeOutputHandlerFactory:
         if self._output_handler is None:
@@ -1,18 +1,20 @@
 import json
 import os
 import re
-import traceback
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from datetime import timedelta
 from json import JSONDecodeError
 from logging import Logger
 from pathlib import Path
 from typing import Optional, Set, Generator, Iterable
 
-from bauh.commons import system
+from bauh.commons import system, freshness
+from bauh.commons.freshness import FreshnessRegistry
 from bauh.gems.debian import APP_INDEX_FILE
 from bauh.gems.debian.model import DebianApplication
 
+APP_INDEX_JOB_ID = 'debian.apps_index'
+
 
 class ApplicationIndexError(Exception):
 
@@ -22,8 +24,10 @@ class ApplicationIndexError(Exception):
 
 class ApplicationIndexer:
 
-    def __init__(self, logger: Logger, index_file_path: str = APP_INDEX_FILE):
+    def __init__(self, logger: Logger, index_file_path: str = APP_INDEX_FILE,
+                 registry: Optional[FreshnessRegistry] = None):
         self._log = logger
+        self._registry = registry if registry else freshness.get_registry()
         self._file_path = index_file_path
         self._file_timestamp_path = f'{self._file_path}.ts'
 
@@ -44,22 +48,8 @@ class ApplicationIndexer:
             self._log.info(f"Debian applications index not found. A new one must be generated ({self._file_path})")
             return True
 
-        try:
-            with open(self._file_timestamp_path) as f:
-                timestamp_str = f.read().strip()
-        except FileNotFoundError:
-            self._log.info(f"Debian applications index timestamp not found ({self._file_timestamp_path})")
-            return True
-
-        try:
-            timestamp = datetime.fromtimestamp(float(timestamp_str))
-        except Exception:
-            self._log.error(f'Could not parse the Debian applications index timestamp: {timestamp_str} '
-                            f'({self._file_timestamp_path})')
-            traceback.print_exc()
-            return True
-
-        expired = timestamp + timedelta(minutes=exp_minutes) <= datetime.utcnow()
+        expired = self._registry.is_expired(APP_INDEX_JOB_ID, period=timedelta(minutes=exp_minutes),
+                                            legacy_file=self._file_timestamp_path)
 
         if expired:
             self._log.info("Debian applications index has expired. A new one must be generated.")
@@ -122,17 +112,9 @@ class ApplicationIndexer:
             raise ApplicationIndexError()
 
         if update_timestamp:
-            index_timestamp = datetime.utcnow().timestamp()
-            try:
-                with open(self._file_timestamp_path, 'w+') as f:
-                    f.write(str(index_timestamp))
-
-                self._log.info("Debian applications index timestamp updated")
-
-            except OSError:
-                self._log.error(f"Could not write to the Debian applications index timestamp file: "
-                                f"{self._file_timestamp_path}")
-                raise ApplicationIndexError()
+            # the timestamp file is kept along with the index file for backwards compatibility
+            self._registry.register_run(APP_INDEX_JOB_ID, legacy_file=self._file_timestamp_path)
+            self._log.info("Debian applications index timestamp updated")
 
 
 class ApplicationsMapper:
@@ -1,11 +1,11 @@
 import time
-import traceback
-from datetime import datetime, timedelta
+from datetime import timedelta
 from logging import Logger
 from threading import Thread
 from typing import Optional, Set
 
 from bauh.api.abstract.handler import TaskManager, ProcessWatcher
+from bauh.commons import freshness
 from bauh.commons.html import bold
 from bauh.commons.system import ProcessHandler
 from bauh.gems.debian import DEBIAN_ICON_PATH, PACKAGE_SYNC_TIMESTAMP_FILE
@@ -14,6 +14,8 @@ from bauh.gems.debian.index import ApplicationIndexer, ApplicationsMapper
 from bauh.gems.debian.model import DebianApplication
 from bauh.view.util.translation import I18n
 
+PACKAGE_SYNC_JOB_ID = 'debian.sync_pkgs'
+
 
 class MapApplications(Thread):
 
@@ -141,22 +143,8 @@ class SynchronizePackages(Thread):
             logger.warning("Packages synchronization will always be done ('sync_pkgs.time' <= 0 )'")
             return True
 
-        try:
-            with open(PACKAGE_SYNC_TIMESTAMP_FILE) as f:
-                timestamp_str = f.read().strip()
-        except FileNotFoundError:
-            logger.info(f"No packages synchronization timestamp found ({PACKAGE_SYNC_TIMESTAMP_FILE})")
-            return True
-
-        try:
-            last_timestamp = datetime.fromtimestamp(float(timestamp_str))
-        except Exception:
-            logger.error(f'Could not parse the packages synchronization timestamp: {timestamp_str} '
-                         f'({PACKAGE_SYNC_TIMESTAMP_FILE})')
-            traceback.print_exc()
-            return True
-
-        expired = last_timestamp + timedelta(minutes=period) <= datetime.utcnow()
+        expired = freshness.get_registry().is_expired(PACKAGE_SYNC_JOB_ID, period=timedelta(minutes=period),
+                                                      legacy_file=PACKAGE_SYNC_TIMESTAMP_FILE)
 
         if expired:
             logger.info("Packages synchronization is outdated")
@@ -176,15 +164,8 @@ class SynchronizePackages(Thread):
         self._taskman.update_progress(self._id, 99, None)
 
         if updated:
-            index_timestamp = datetime.utcnow().timestamp()
             finish_msg = None
-            try:
-                with open(PACKAGE_SYNC_TIMESTAMP_FILE, 'w+') as f:
-                    f.write(str(index_timestamp))
-            except OSError:
-                finish_msg = self._i18n['error']
-                self._log.error(f"Could not write the packages synchronization timestamp to file "
-                                f"'{PACKAGE_SYNC_TIMESTAMP_FILE}'")
+            freshness.get_registry().register_run(PACKAGE_SYNC_JOB_ID)
         else:
             finish_msg = self._i18n['error']
 
@@ -0,0 +1,128 @@
+import os
+from collections import OrderedDict
+from functools import partial
+from logging import Logger
+from threading import Lock
+from typing import Optional, Dict, Iterable, Tuple, FrozenSet, Callable
+
+from bauh.gems.debian.aptitude import Aptitude, AptitudeAction
+from bauh.gems.debian.model import DebianTransaction
+
+STATE_PATHS = ('/var/lib/dpkg/status', '/var/lib/apt/extended_states', '/var/lib/apt/lists')
+SHOW_ATTRS = ('description', 'maintainer', 'section', 'compressed size', 'depends', 'predepends')
+
+
+class TransactionPlan:
+
+    def __init__(self, transaction: DebianTransaction,
+                 packages_data: Optional[Dict[str, Dict[str, object]]] = None,
+                 show: Optional[Callable[[], Optional[Dict[str, Dict[str, object]]]]] = None):
+        """
+        :param show: retrieves the packages data when they are required for the first time (if 'packages_data' is
+        not defined)
+        """
+        self.transaction = transaction
+        self._packages_data = packages_data
+        self._show = show
+        self._lock = Lock()
+
+    @property
+    def packages_data(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            if self._packages_data is None:
+                data = self._show() if self._show else None
+                self._packages_data = data if data else dict()
+
+            return self._packages_data
+
+    def get_data(self, pkg_name: str, attrs: Optional[Iterable[str]] = None) -> Optional[Dict[str, object]]:
+        """
+        :param attrs: the attributes to be returned (all if not defined)
+        """
+        data = self.packages_data.get(pkg_name)
+
+        if data and attrs is not None:
+            return {attr: data[attr] for attr in attrs if attr in data}
+
+        return data
+
+
+class TransactionPlanner:
+    """
+    Resolves the Debian transactions (simulations). The data of all packages involved is only retrieved (with a single
+    'show' call) when it is required (e.g: confirmation dialog, size summary). The plans are kept while the dpkg
+    status and the apt lists are not modified, so the same transaction is not resolved again for the confirmation,
+    the size summary and the execution.
+    """
+
+    def __init__(self, aptitude: Aptitude, logger: Logger, state_paths: Tuple[str, ...] = STATE_PATHS,
+                 max_plans: int = 8):
+        self._aptitude = aptitude
+        self._log = logger
+        self._state_paths = state_paths
+        self._max_plans = max_plans
+        self._plans: Dict[Tuple[AptitudeAction, FrozenSet[str], bool], Tuple[tuple, TransactionPlan]] = OrderedDict()
+        self._lock = Lock()
+
+    def _get_state_signature(self) -> tuple:
+        signature = []
+
+        for path in self._state_paths:
+            try:
+                signature.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+
+        return tuple(signature)
+
+    def _simulate(self, action: AptitudeAction, packages: Iterable[str], purge: bool) -> Optional[DebianTransaction]:
+        if action == AptitudeAction.INSTALL:
+            return self._aptitude.simulate_installation(packages)
+        elif action == AptitudeAction.UPGRADE:
+            return self._aptitude.simulate_upgrade(packages)
+        else:
+            return self._aptitude.simulate_removal(packages, purge=purge)
+
+    def _show(self, transaction: DebianTransaction) -> Optional[Dict[str, Dict[str, object]]]:
+        to_show = [*(f'{p.name}={p.latest_version}' for p in (*transaction.to_install, *transaction.to_upgrade)),
+                   *(p.name for p in transaction.to_remove)]
+
+        if to_show:
+            return self._aptitude.show(pkgs=to_show, attrs=SHOW_ATTRS)
+
+    def plan(self, action: AptitudeAction, packages: Iterable[str], purge: bool = False) \
+            -> Optional[TransactionPlan]:
+        """
+        :return: the transaction plan (None if the transaction could not be resolved)
+        """
+        names = frozenset(packages)
+        key = (action, names, purge and action == AptitudeAction.REMOVE)
+        signature = self._get_state_signature()
+
+        with self._lock:
+            cached = self._plans.get(key)
+
+            if cached and cached[0] == signature:
+                self._log.info(f"Reusing the Debian transaction plan ({action.name.lower()}) for: {', '.join(sorted(names))}")
+                self._plans.move_to_end(key)
+                return cached[1]
+
+        transaction = self._simulate(action, sorted(names), purge)
+
+        if transaction is None:
+            return
+
+        plan = TransactionPlan(transaction=transaction, show=partial(self._show, transaction))
+
+        with self._lock:
+            self._plans[key] = (signature, plan)
+            self._plans.move_to_end(key)
+
+            while len(self._plans) > self._max_plans:
+                self._plans.popitem(last=False)
+
+        return plan
+
+    def invalidate(self):
+        with self._lock:
+            self._plans.clear()
@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 
 from bauh.api import user
-from bauh.api.paths import CONFIG_DIR
+from bauh.api.paths import CONFIG_DIR, CACHE_DIR
 from bauh.commons import resource
 from bauh.commons.version_util import map_str_version
 
@@ -10,6 +10,10 @@ ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE = f'{CONFIG_DIR}/flatpak.yml'
 FLATPAK_CONFIG_DIR = f'{CONFIG_DIR}/flatpak'
 UPDATES_IGNORED_FILE = f'{FLATPAK_CONFIG_DIR}/updates_ignored.txt'
+FLATPAK_CACHE_DIR = f'{CACHE_DIR}/flatpak'
+HISTORY_CACHE_DIR = f'{FLATPAK_CACHE_DIR}/history'
+SYSTEM_INSTALLATION_DIR = os.getenv('FLATPAK_SYSTEM_DIR', '/var/lib/flatpak')
+USER_INSTALLATION_DIR = os.getenv('FLATPAK_USER_DIR', f'{Path.home()}/.local/share/flatpak')
 EXPORTS_PATH = '/usr/share/flatpak/exports/share' if user.is_root() else f'{Path.home()}/.local/share/flatpak/exports/share'
 VERSION_1_2 = map_str_version("1.2")
 VERSION_1_3 = map_str_version("1.3")
@@ -16,6 +16,7 @@ from bauh.api.abstract.model import PackageHistory, PackageUpdate, SoftwarePacka
     PackageStatus, CustomSoftwareAction, SuggestionPriority
 from bauh.api.abstract.view import MessageType, FormComponent, SingleSelectComponent, InputOption, SelectViewType, \
     PanelComponent, ViewComponentAlignment
+from bauh.api.exception import NoInternetException
 from bauh.commons import suggestions
 from bauh.commons.boot import CreateConfigFile
 from bauh.commons.html import strip_html, bold
@@ -25,6 +26,7 @@ from bauh.gems.flatpak import flatpak, CONFIG_FILE, UPDATES_IGNORED_FILE, FLATPA
     get_icon_path, VERSION_1_5, VERSION_1_2, VERSION_1_12
 from bauh.gems.flatpak.config import FlatpakConfigManager
 from bauh.gems.flatpak.constants import FLATHUB_API_URL
+from bauh.gems.flatpak.history import CommitHistoryCache
 from bauh.gems.flatpak.model import FlatpakApplication
 from bauh.gems.flatpak.worker import FlatpakAsyncDataLoader
 
@@ -43,6 +45,8 @@ class FlatpakManager(SoftwareManager, SettingsController):
         self.enabled = True
         self.http_client = context.http_client
         self.suggestions_cache = context.cache_factory.new(None)
+        self.history_cache = CommitHistoryCache(logger=context.logger)
+        self.suggestions_data_loader = suggestions.SuggestionsDataLoader('flatpak')  # 'flatpak search' calls
         self.logger = context.logger
         self.configman = FlatpakConfigManager()
         self._action_full_update: Optional[CustomSoftwareAction] = None
@@ -282,45 +286,126 @@ class FlatpakManager(SoftwareManager, SettingsController):
         super(FlatpakManager, self).clean_cache_for(pkg)
         self.api_cache.delete(pkg.id)
 
-    def upgrade(self, requirements: UpgradeRequirements, root_password: Optional[str], watcher: ProcessWatcher) -> bool:
-        flatpak_version = flatpak.get_version()
+    def _upgrade_single(self, req: UpgradeRequirement, flatpak_version: Tuple[str, ...],
+                        watcher: ProcessWatcher) -> bool:
+        watcher.change_status("{} {} ({})...".format(self.i18n['manage_window.status.upgrading'], req.pkg.name, req.pkg.version))
+        related, deps = False, False
+        ref = req.pkg.ref
 
-        if not self._make_exports_dir(watcher):
+        if req.pkg.partial and flatpak_version < VERSION_1_5:
+            related, deps = True, True
+            ref = req.pkg.base_ref
+
+        try:
+            if req.pkg.update_component:
+                self.logger.info(f"Installing {req.pkg}")
+                res, _ = ProcessHandler(watcher).handle_simple(flatpak.install(app_id=ref,
+                                                                               installation=req.pkg.installation,
+                                                                               origin=req.pkg.origin,
+                                                                               version=flatpak_version))
+
+            else:
+                self.logger.info(f"Updating {req.pkg}")
+                res, _ = ProcessHandler(watcher).handle_simple(flatpak.update(app_ref=ref,
+                                                                              installation=req.pkg.installation,
+                                                                              related=related,
+                                                                              deps=deps,
+                                                                              version=flatpak_version))
+
+            watcher.change_substatus('')
+            if not res:
+                self.logger.warning("Could not upgrade '{}'".format(req.pkg.id))
+                return False
+        except Exception:
+            watcher.change_substatus('')
+            self.logger.error("An error occurred while upgrading '{}'".format(req.pkg.id))
+            traceback.print_exc()
             return False
 
-        for req in requirements.to_upgrade:
-            watcher.change_status("{} {} ({})...".format(self.i18n['manage_window.status.upgrading'], req.pkg.name, req.pkg.version))
-            related, deps = False, False
-            ref = req.pkg.ref
+        return True
 
-            if req.pkg.partial and flatpak_version < VERSION_1_5:
-                related, deps = True, True
-                ref = req.pkg.base_ref
+    def _group_upgrades(self, to_upgrade: List[UpgradeRequirement],
+                        flatpak_version: Tuple[str, ...]) -> List[List[UpgradeRequirement]]:
+        """
+        groups the contiguous upgrades that can be done by the same transaction (same installation, operation,
+        origin for installations and flags for updates). Only contiguous upgrades are grouped, so the given order
+        (runtimes before applications) is kept between the groups
+        """
+        groups, last_key = [], None
+
+        for req in to_upgrade:
+            if req.pkg.update_component:
+                key = (req.pkg.installation, 'install', req.pkg.origin)
+            else:
+                key = (req.pkg.installation, 'update', bool(req.pkg.partial and flatpak_version < VERSION_1_5))
 
-            try:
-                if req.pkg.update_component:
-                    self.logger.info(f"Installing {req.pkg}")
-                    res, _ = ProcessHandler(watcher).handle_simple(flatpak.install(app_id=ref,
-                                                                                   installation=req.pkg.installation,
-                                                                                   origin=req.pkg.origin,
-                                                                                   version=flatpak_version))
+            if groups and key == last_key:
+                groups[-1].append(req)
+            else:
+                groups.append([req])
+                last_key = key
 
-                else:
-                    self.logger.info(f"Updating {req.pkg}")
-                    res, _ = ProcessHandler(watcher).handle_simple(flatpak.update(app_ref=ref,
-                                                                                  installation=req.pkg.installation,
-                                                                                  related=related,
-                                                                                  deps=deps,
-                                                                                  version=flatpak_version))
-
-                watcher.change_substatus('')
-                if not res:
-                    self.logger.warning("Could not upgrade '{}'".format(req.pkg.id))
+        return groups
+
+    def _upgrade_group(self, reqs: List[UpgradeRequirement], flatpak_version: Tuple[str, ...],
+                       watcher: ProcessWatcher) -> bool:
+        if len(reqs) == 1:
+            return self._upgrade_single(reqs[0], flatpak_version, watcher)
+
+        first = reqs[0].pkg
+        partial_legacy = not first.update_component and first.partial and flatpak_version < VERSION_1_5
+
+        reqs_by_ref = {}
+        for req in reqs:
+            reqs_by_ref.setdefault(req.pkg.base_ref if partial_legacy else req.pkg.ref, req)
+
+        refs = [*reqs_by_ref]
+
+        def notify_step(ref: str, number: int, total: int):
+            pkg = reqs_by_ref[ref].pkg
+            watcher.change_status(f"{self.i18n['manage_window.status.upgrading']} {pkg.name} ({pkg.version}) "
+                                  f"[{number}/{total}]...")
+
+        watcher.change_status(f"{self.i18n['manage_window.status.upgrading']} {first.name} (+{len(reqs) - 1})...")
+        output_handler = flatpak.TransactionOutputHandler(refs=refs, on_step=notify_step)
+
+        try:
+            if first.update_component:
+                self.logger.info(f"Installing {len(refs)} refs ({first.installation}): {', '.join(refs)}")
+                proc = flatpak.install_several(app_ids=refs, origin=first.origin, installation=first.installation,
+                                               version=flatpak_version)
+            else:
+                self.logger.info(f"Updating {len(refs)} refs ({first.installation}): {', '.join(refs)}")
+                proc = flatpak.update_several(app_refs=refs, installation=first.installation,
+                                              related=partial_legacy, deps=partial_legacy, version=flatpak_version)
+
+            success, _ = ProcessHandler(watcher).handle_simple(proc, output_handler=output_handler.handle)
+        except Exception:
+            self.logger.error(f"An error occurred while upgrading {len(refs)} refs ({first.installation})")
+            traceback.print_exc()
+            success = False
+
+        watcher.change_substatus('')
+        to_retry = output_handler.list_not_finished(success)
+
+        if to_retry:
+            self.logger.warning(f"Retrying individually {len(to_retry)} refs not upgraded by the transaction: "
+                                f"{', '.join(to_retry)}")
+
+            for ref in to_retry:
+                if not self._upgrade_single(reqs_by_ref[ref], flatpak_version, watcher):
                     return False
-            except Exception:
-                watcher.change_substatus('')
-                self.logger.error("An error occurred while upgrading '{}'".format(req.pkg.id))
-                traceback.print_exc()
+
+        return True
+
+    def upgrade(self, requirements: UpgradeRequirements, root_password: Optional[str], watcher: ProcessWatcher) -> bool:
+        flatpak_version = flatpak.get_version()
+
+        if not self._make_exports_dir(watcher):
+            return False
+
+        for reqs in self._group_upgrades(requirements.to_upgrade, flatpak_version):
+            if not self._upgrade_group(reqs, flatpak_version, watcher):
                 return False
 
         watcher.change_substatus('')
@@ -403,13 +488,26 @@ class FlatpakManager(SoftwareManager, SettingsController):
                 return {}
 
     def get_history(self, pkg: FlatpakApplication, full_commit_str: bool = False) -> PackageHistory:
-        pkg.commit = flatpak.get_commit(pkg.id, pkg.branch, pkg.installation)
+        pkg.commit = flatpak.get_deployed_commit(pkg.ref, pkg.installation, pkg.runtime)
+
+        if not pkg.commit:
+            pkg.commit = flatpak.get_commit(pkg.id, pkg.branch, pkg.installation)
+
         pkg_commit = pkg.commit if pkg.commit else None
 
         if pkg_commit and not full_commit_str:
             pkg_commit = pkg_commit[0:8]
 
-        commits = flatpak.get_app_commits_data(pkg.ref, pkg.origin, pkg.installation, full_str=full_commit_str)
+        commits = self.history_cache.get_commits(pkg.ref, pkg.origin, pkg.installation, current_commit=pkg.commit)
+
+        if not commits:
+            raise NoInternetException()
+
+        for commit in commits:
+            if not full_commit_str:
+                commit['commit'] = commit['commit'][0:8]
+
+            commit['date'] = flatpak.map_commit_date(commit['date'])
 
         status_idx = 0
         commit_found = False
@@ -656,7 +754,7 @@ class FlatpakManager(SoftwareManager, SettingsController):
         remote = self._get_search_remote()
 
         self.logger.info("Mapping Flatpak suggestions")
-        res, fill_suggestions = [], []
+        res, loads = [], []
         cached_count = 0
 
         for appid in suggestion_by_priority:
@@ -666,19 +764,22 @@ class FlatpakManager(SoftwareManager, SettingsController):
                 res.append(cached_instance)
                 cached_count += 1
             else:
-                fill = Thread(target=self._fill_suggestion, args=(appid, ids_prios[appid], flatpak_version,
-                                                                  remote, res), daemon=True)
-                fill.start()
-                fill_suggestions.append(fill)
+                loads.append(self.suggestions_data_loader.submit(self._fill_suggestion, appid, ids_prios[appid],
+                                                                 flatpak_version, remote, res))
 
-        for fill in fill_suggestions:
-            fill.join()
+        self.suggestions_data_loader.wait(loads)
 
         if cached_count > 0:
             self.logger.info(f"Returning {cached_count} cached Flatpak suggestions")
 
         return res
 
+    def cancel_suggestions(self):
+        cancelled = self.suggestions_data_loader.cancel()
+
+        if cancelled:
+            self.logger.info(f"Cancelled {cancelled} Flatpak suggestions loads")
+
     def is_default_enabled(self) -> bool:
         return True
 
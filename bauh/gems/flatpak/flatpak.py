@@ -4,20 +4,24 @@ import subprocess
 import traceback
 from datetime import datetime
 from threading import Thread
-from typing import List, Dict, Set, Iterable, Optional, Tuple
+from typing import List, Dict, Set, Iterable, Optional, Tuple, Callable
 
 from bauh.api.exception import NoInternetException
-from bauh.commons import system
+from bauh.commons import system, capabilities
 from bauh.commons.system import new_subprocess, run_cmd, SimpleProcess, ProcessHandler, DEFAULT_LANG
 from bauh.commons.util import size_to_byte
 from bauh.commons.version_util import map_str_version
-from bauh.gems.flatpak import EXPORTS_PATH, VERSION_1_3, VERSION_1_2, VERSION_1_5, VERSION_1_12
+from bauh.gems.flatpak import EXPORTS_PATH, VERSION_1_3, VERSION_1_2, VERSION_1_5, VERSION_1_12, \
+    SYSTEM_INSTALLATION_DIR, USER_INSTALLATION_DIR
 from bauh.gems.flatpak.constants import FLATHUB_URL
 
 RE_SEVERAL_SPACES = re.compile(r'\s+')
 RE_COMMIT = re.compile(r'(Latest commit|Commit)\s*:\s*(.+)')
+RE_COMMIT_HASH = re.compile(r'^[0-9a-f]{64}$')
 RE_REQUIRED_RUNTIME = re.compile(f'Required\s+runtime\s+.+\(([\w./]+)\)\s*.+\s+remote\s+([\w+./]+)')
 OPERATION_UPDATE_SYMBOLS = {'i', 'u'}
+RE_TRANSACTION_OPERATION = re.compile(r'^\s*(\d+)\.\s+(.+)$')  # e.g: 1.  org.xpto.App  stable  u  flathub  1 MB
+RE_TRANSACTION_STEP = re.compile(r'^\s*[^\W\d]+\s+(\d+)/(\d+)\b')  # e.g: Updating 1/3…
 
 
 def get_app_info_fields(app_id: str, branch: str, installation: str, fields: List[str] = [], check_runtime: bool = False):
@@ -71,11 +75,15 @@ def is_installed():
     return False if version is None else True
 
 
-def get_version() -> Optional[Tuple[str, ...]]:
-    res = run_cmd('flatpak --version', print_error=False)
+def _read_version(binary_path: str) -> Optional[Tuple[str, ...]]:
+    res = run_cmd(f'{binary_path} --version', print_error=False)
     return map_str_version(res.split(' ')[1].strip()) if res else None
 
 
+def get_version() -> Optional[Tuple[str, ...]]:
+    return capabilities.registry.probe('flatpak', 'version', _read_version)
+
+
 def get_app_info(app_id: str, branch: str, installation: str) -> Optional[str]:
     try:
         return run_cmd(f'flatpak info {app_id} {branch} --{installation}')
@@ -174,6 +182,23 @@ def update(app_ref: str, installation: str, version: Tuple[str, ...], related: b
                          lang=DEFAULT_LANG if version < VERSION_1_12 else None)
 
 
+def update_several(app_refs: Iterable[str], installation: str, version: Tuple[str, ...], related: bool = False,
+                   deps: bool = False) -> SimpleProcess:
+    """
+    updates several refs of the same installation with a single transaction
+    """
+    cmd = ['flatpak', 'update', '-y', *app_refs, f'--{installation}']
+
+    if not related:
+        cmd.append('--no-related')
+
+    if not deps:
+        cmd.append('--no-deps')
+
+    return SimpleProcess(cmd=cmd, extra_paths={EXPORTS_PATH}, shell=True,
+                         lang=DEFAULT_LANG if version < VERSION_1_12 else None)
+
+
 def full_update(version: VERSION_1_12) -> SimpleProcess:
     return SimpleProcess(cmd=('flatpak', 'update', '-y'), extra_paths={EXPORTS_PATH}, shell=True,
                          lang=DEFAULT_LANG if version < VERSION_1_12 else None)
@@ -296,12 +321,11 @@ def get_app_commits(app_ref: str, origin: str, installation: str, handler: Proce
         raise NoInternetException()
 
 
-def get_app_commits_data(app_ref: str, origin: str, installation: str, full_str: bool = True) -> List[dict]:
-    log = run_cmd(f'flatpak remote-info --log {origin} {app_ref} --{installation}')
-
-    if not log:
-        raise NoInternetException()
-
+def map_commits_log(log: str) -> List[Dict[str, str]]:
+    """
+    :return: the commits described by a 'remote-info' output (newest first) as dicts with the keys 'commit',
+    'subject' and 'date' (string values)
+    """
     res = re.findall(r'(Commit|Subject|Date):\s(.+)', log)
 
     commits = []
@@ -309,14 +333,7 @@ def get_app_commits_data(app_ref: str, origin: str, installation: str, full_str:
     commit = {}
 
     for idx, data in enumerate(res):
-        attr = data[0].strip().lower()
-        commit[attr] = data[1].strip()
-
-        if attr == 'commit':
-            commit[attr] = commit[attr] if full_str else commit[attr][0:8]
-
-        if attr == 'date':
-            commit[attr] = datetime.strptime(commit[attr], '%Y-%m-%d %H:%M:%S +0000')
+        commit[data[0].strip().lower()] = data[1].strip()
 
         if (idx + 1) % 3 == 0:
             commits.append(commit)
@@ -325,6 +342,69 @@ def get_app_commits_data(app_ref: str, origin: str, installation: str, full_str:
     return commits
 
 
+def map_commit_date(date: str) -> datetime:
+    return datetime.strptime(date, '%Y-%m-%d %H:%M:%S +0000')
+
+
+def get_app_commits_log(app_ref: str, origin: str, installation: str) -> Optional[List[Dict[str, str]]]:
+    """
+    :return: the full remote commits log (newest first) or None if it could not be retrieved
+    """
+    log = run_cmd(f'flatpak remote-info --log {origin} {app_ref} --{installation}')
+
+    if log:
+        return map_commits_log(log)
+
+
+def get_remote_commit(app_ref: str, origin: str, installation: str, commit: Optional[str] = None) \
+        -> Optional[Dict[str, str]]:
+    """
+    :param commit: a specific commit (if not defined, the latest remote commit is returned)
+    :return: a dict with the keys 'commit', 'parent' (if any), 'subject' and 'date' or None if it could
+    not be retrieved
+    """
+    info = run_cmd(f"flatpak remote-info {origin} {app_ref} --{installation}{f' --commit={commit}' if commit else ''}",
+                   print_error=False)
+
+    if info:
+        data = {attr.lower(): val.strip() for attr, val in re.findall(r'(Commit|Parent|Subject|Date):\s(.+)', info)}
+
+        if data.get('commit') and data.get('date'):
+            return data
+
+
+def get_deployed_commit(app_ref: str, installation: str, runtime: bool) -> Optional[str]:
+    """
+    reads the current commit from the local deployment ('active' link) instead of calling 'flatpak info'
+    """
+    installation_dir = SYSTEM_INSTALLATION_DIR if installation == 'system' else USER_INSTALLATION_DIR
+    ref = app_ref.split('/', 1)[1] if app_ref.startswith(('app/', 'runtime/')) else app_ref
+    active_path = f"{installation_dir}/{'runtime' if runtime else 'app'}/{ref}/active"
+
+    try:
+        commit = os.path.basename(os.readlink(active_path))
+    except OSError:
+        return
+
+    if RE_COMMIT_HASH.match(commit):
+        return commit
+
+
+def get_app_commits_data(app_ref: str, origin: str, installation: str, full_str: bool = True) -> List[dict]:
+    commits = get_app_commits_log(app_ref, origin, installation)
+
+    if not commits:
+        raise NoInternetException()
+
+    for commit in commits:
+        if not full_str:
+            commit['commit'] = commit['commit'][0:8]
+
+        commit['date'] = map_commit_date(commit['date'])
+
+    return commits
+
+
 def search(version: Tuple[str, ...], word: str, installation: str, app_id: bool = False) -> Optional[List[dict]]:
 
     res = run_cmd(f'flatpak search {word} --{installation}', lang=None)
@@ -415,6 +495,84 @@ def install(app_id: str, origin: str, installation: str, version: Tuple[str, ...
                          shell=True)
 
 
+def install_several(app_ids: Iterable[str], origin: str, installation: str, version: Tuple[str, ...]) -> SimpleProcess:
+    """
+    installs several refs from the same origin with a single transaction
+    """
+    return SimpleProcess(cmd=('flatpak', 'install', origin, *app_ids, '-y', f'--{installation}'),
+                         extra_paths={EXPORTS_PATH},
+                         lang=DEFAULT_LANG if version < VERSION_1_12 else None,
+                         wrong_error_phrases={'Warning'} if version < VERSION_1_12 else None,
+                         shell=True)
+
+
+class TransactionOutputHandler:
+    """
+    Follows the output of a transaction involving several refs: the operations listed by flatpak are mapped
+    to the transaction refs, so it is possible to know which ref is being processed and which ones were finished.
+    """
+
+    def __init__(self, refs: List[str], on_step: Optional[Callable[[str, int, int], None]] = None):
+        """
+        :param refs: the transaction refs (id/arch/branch)
+        :param on_step: called with the ref being processed, the operation number and the total of operations
+        """
+        self.refs = refs
+        self._on_step = on_step
+        self._ids: Dict[str, List[str]] = {}
+        self._operations: Dict[int, str] = {}  # operation number -> ref
+        self._current: Optional[int] = None
+        self._failed: Set[str] = set()
+
+        for ref in refs:
+            self._ids.setdefault(ref.split('/')[0], []).append(ref)
+
+    def handle(self, line: str):
+        step = RE_TRANSACTION_STEP.match(line)
+
+        if step:
+            self._current = int(step.group(1))
+            ref = self._operations.get(self._current)
+
+            if ref and self._on_step:
+                self._on_step(ref, self._current, int(step.group(2)))
+
+            return
+
+        operation = RE_TRANSACTION_OPERATION.match(line)
+
+        if operation:
+            number = int(operation.group(1))
+
+            if number not in self._operations:
+                for column in RE_SEVERAL_SPACES.split(operation.group(2)):
+                    refs = self._ids.get(column)
+
+                    if refs:
+                        self._operations[number] = refs.pop(0)
+                        break
+
+            return
+
+        if line.lower().startswith(('error', 'warning')):
+            for ref in self._operations.values():
+                if ref.split('/')[0] in line:
+                    self._failed.add(ref)
+
+    def list_not_finished(self, success: bool) -> List[str]:
+        """
+        :param success: if the transaction has succeeded
+        :return: the refs not known as successfully processed (all refs if the output could not be followed)
+        """
+        if success:
+            return []
+
+        finished = {ref for number, ref in self._operations.items()
+                    if self._current and number < self._current and ref not in self._failed}
+
+        return [ref for ref in self.refs if ref not in finished]
+
+
 def set_default_remotes(installation: str, root_password: Optional[str] = None) -> SimpleProcess:
     cmd = ('flatpak', 'remote-add', '--if-not-exists', 'flathub', f'{FLATHUB_URL}/repo/flathub.flatpakrepo',
            f'--{installation}')
@@ -0,0 +1,143 @@
+import json
+import os
+import time
+import traceback
+from logging import Logger
+from pathlib import Path
+from threading import Lock
+from typing import Optional, List, Dict
+
+from bauh.gems.flatpak import flatpak, HISTORY_CACHE_DIR
+
+
+class CommitHistoryCache:
+    """
+    Keeps the remote commits log of the installed Flatpaks on disk (by installation, origin and ref).
+    A cached log is refreshed incrementally: only the commits newer than the newest known one are retrieved
+    (the full log is only retrieved again if there are too many of them). The remote is not checked again during
+    'check_interval' seconds, and the cached log is used if the remote cannot be reached.
+    """
+
+    def __init__(self, logger: Logger, cache_dir: str = HISTORY_CACHE_DIR, check_interval: int = 1800,
+                 max_new_commits: int = 5):
+        """
+        :param check_interval: seconds a cached log is considered up-to-date
+        :param max_new_commits: maximum number of new commits retrieved one by one before retrieving the full log
+        """
+        self._log = logger
+        self._cache_dir = cache_dir
+        self._check_interval = check_interval
+        self._max_new_commits = max_new_commits
+        self._lock = Lock()
+
+    def get_file_path(self, ref: str, origin: str, installation: str) -> str:
+        return f"{self._cache_dir}/{installation}/{origin}/{ref.replace('/', '_')}.json"
+
+    def _read(self, file_path: str) -> Optional[dict]:
+        try:
+            with open(file_path) as f:
+                data = json.load(f)
+
+            if isinstance(data, dict) and data.get('commits'):
+                return data
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            self._log.warning(f"Could not read the cached Flatpak commits log '{file_path}'")
+            traceback.print_exc()
+
+    def _write(self, file_path: str, commits: List[Dict[str, str]]):
+        try:
+            Path(os.path.dirname(file_path)).mkdir(parents=True, exist_ok=True)
+
+            temp_file = f'{file_path}.tmp'
+            with open(temp_file, 'w+') as f:
+                json.dump({'checked': time.time(), 'commits': commits}, f)
+
+            os.replace(temp_file, file_path)
+        except OSError:
+            self._log.warning(f"Could not write the Flatpak commits log to '{file_path}'")
+            traceback.print_exc()
+
+    def _retrieve_new_commits(self, ref: str, origin: str, installation: str, latest: Dict[str, str],
+                              newest_known: str) -> Optional[List[Dict[str, str]]]:
+        """
+        :param latest: the latest remote commit
+        :return: the commits newer than the newest known one (an empty list if there is none). None if they could not
+        be retrieved (or there are more than 'max_new_commits' of them)
+        """
+        new_commits = []
+        commit = latest
+
+        while commit:
+            if commit['commit'] == newest_known:
+                return new_commits
+
+            if len(new_commits) == self._max_new_commits:
+                return
+
+            new_commits.append({'commit': commit['commit'], 'subject': commit.get('subject', ''),
+                                'date': commit['date']})
+
+            parent = commit.get('parent')
+
+            if parent == newest_known:
+                return new_commits
+
+            if not parent or parent == '-':
+                return
+
+            commit = flatpak.get_remote_commit(ref, origin, installation, commit=parent)
+
+    def get_commits(self, ref: str, origin: str, installation: str,
+                    current_commit: Optional[str] = None) -> Optional[List[Dict[str, str]]]:
+        """
+        :param current_commit: the installed commit. The remote is checked if it is not in the cached log
+        :return: the commits log (newest first) as dicts with the keys 'commit', 'subject' and 'date' (string values)
+        or None if it could not be retrieved
+        """
+        file_path = self.get_file_path(ref, origin, installation)
+
+        with self._lock:
+            cached = self._read(file_path)
+
+        if cached:
+            commits = cached['commits']
+            known = not current_commit or any(c['commit'] == current_commit for c in commits)
+
+            if known and time.time() - cached.get('checked', 0) < self._check_interval:
+                self._log.info(f"Flatpak commits log of '{ref}' ({origin}, {installation}) read from the cache")
+                return commits
+
+            latest = flatpak.get_remote_commit(ref, origin, installation)
+
+            if not latest:
+                self._log.warning(f"Could not check the latest commit of '{ref}' ({origin}, {installation}). "
+                                  f"Using the cached commits log")
+                return commits
+
+            new_commits = self._retrieve_new_commits(ref, origin, installation, latest, commits[0]['commit'])
+
+            if new_commits is not None:
+                self._log.info(f"Flatpak commits log of '{ref}' ({origin}, {installation}) refreshed: "
+                               f"{len(new_commits)} new commit(s)")
+                commits = [*new_commits, *commits]
+
+                with self._lock:
+                    self._write(file_path, commits)
+
+                return commits
+
+        commits = flatpak.get_app_commits_log(ref, origin, installation)
+
+        if commits:
+            if commits[0]['commit'] != '(null)':
+                with self._lock:
+                    self._write(file_path, commits)
+
+            return commits
+
+        if cached:
+            self._log.warning(f"Could not retrieve the Flatpak commits log of '{ref}' ({origin}, {installation}). "
+                              f"Using the cached one")
+            return cached['commits']
@@ -1,7 +1,5 @@
 import re
-import time
 import traceback
-from threading import Thread
 from typing import List, Set, Type, Optional, Tuple, Generator
 
 from bauh.api.abstract.controller import SoftwareManager, SearchResult, ApplicationContext, UpgradeRequirements, \
@@ -41,9 +39,18 @@ class SnapManager(SoftwareManager, SettingsController):
         self.ubuntu_distro = context.distro == 'ubuntu'
         self.categories = {}
         self.suggestions_cache = context.cache_factory.new()
+        self.suggestions_data_loader = suggestions.SuggestionsDataLoader('snap')
         self.info_path = None
         self.configman = SnapConfigManager()
         self._suggestions_url: Optional[str] = None
+        self._snapd_client: Optional[SnapdClient] = None
+
+    @property
+    def snapd_client(self) -> SnapdClient:
+        if self._snapd_client is None:
+            self._snapd_client = SnapdClient(self.logger)
+
+        return self._snapd_client
 
     def _fill_categories(self, app: SnapApplication):
         categories = self.categories.get(app.name.lower())
@@ -65,20 +72,16 @@ class SnapManager(SoftwareManager, SettingsController):
         if is_url or (not snap.is_installed() and not snapd.is_running()):
             return SearchResult([], [], 0)
 
-        snapd_client = SnapdClient(self.logger)
-        apps_found = snapd_client.query(words)
+        apps_found = self.snapd_client.query(words)
 
         res = SearchResult([], [], 0)
 
         if apps_found:
             installed = self.read_installed(disk_loader).installed
+            installed_by_id = {i.id: i for i in installed} if installed else dict()
 
             for app_json in apps_found:
-                already_installed = None
-
-                if installed:
-                    already_installed = [i for i in installed if i.id == app_json.get('id')]
-                    already_installed = already_installed[0] if already_installed else None
+                already_installed = installed_by_id.get(app_json.get('id'))
 
                 if already_installed:
                     res.installed.append(already_installed)
@@ -90,7 +93,7 @@ class SnapManager(SoftwareManager, SettingsController):
 
     def read_installed(self, disk_loader: DiskCacheLoader, limit: int = -1, only_apps: bool = False, pkg_types: Set[Type[SoftwarePackage]] = None, internet_available: bool = None) -> SearchResult:
         if snap.is_installed() and snapd.is_running():
-            snapd_client = SnapdClient(self.logger)
+            snapd_client = self.snapd_client
             app_names = {a['snap'] for a in snapd_client.list_only_apps()}
             installed = [self._map_to_app(app_json=appjson,
                                           installed=True,
@@ -108,7 +111,9 @@ class SnapManager(SoftwareManager, SettingsController):
             watcher.print("'snapd' seems not to be running")
             return False
 
-        return ProcessHandler(watcher).handle_simple(snap.downgrade_and_stream(pkg.name, root_password))[0]
+        res = ProcessHandler(watcher).handle_simple(snap.downgrade_and_stream(pkg.name, root_password))[0]
+        self.snapd_client.invalidate_cache()
+        return res
 
     def upgrade(self, requirements: UpgradeRequirements, root_password: Optional[str], watcher: ProcessWatcher) -> SystemProcess:
         raise Exception(f"'upgrade' is not supported by {SnapManager.__class__.__name__}")
@@ -116,6 +121,7 @@ class SnapManager(SoftwareManager, SettingsController):
     def uninstall(self, pkg: SnapApplication, root_password: Optional[str], watcher: ProcessWatcher, disk_loader: DiskCacheLoader) -> TransactionResult:
         if snap.is_installed() and snapd.is_running():
             uninstalled = ProcessHandler(watcher).handle_simple(snap.uninstall_and_stream(pkg.name, root_password))[0]
+            self.snapd_client.invalidate_cache()
 
             if uninstalled:
                 if self.suggestions_cache:
@@ -148,7 +154,7 @@ class SnapManager(SoftwareManager, SettingsController):
         }
 
         if pkg.installed:
-            commands = [*{c['name'] for c in SnapdClient(self.logger).list_commands(pkg.name)}]
+            commands = [*{c['name'] for c in self.snapd_client.list_commands(pkg.name)}]
             commands.sort()
             info['commands'] = commands
 
@@ -172,9 +178,9 @@ class SnapManager(SoftwareManager, SettingsController):
             watcher.print("'snapd' seems not to be running")
             return TransactionResult.fail()
 
-        installed_names = {s['name'] for s in SnapdClient(self.logger).list_all_snaps()}
+        client = self.snapd_client
+        installed_names = {s['name'] for s in client.list_all_snaps()}
 
-        client = SnapdClient(self.logger)
         snap_config = self.configman.get_config()
 
         try:
@@ -215,6 +221,8 @@ class SnapManager(SoftwareManager, SettingsController):
         return self._gen_installation_response(success=res, pkg=pkg, installed=installed_names, disk_loader=disk_loader)
 
     def _gen_installation_response(self, success: bool, pkg: SnapApplication, installed: Set[str], disk_loader: DiskCacheLoader):
+        self.snapd_client.invalidate_cache()
+
         if success:
             new_installed = []
             try:
@@ -247,7 +255,9 @@ class SnapManager(SoftwareManager, SettingsController):
         return action not in (SoftwareAction.PREPARE, SoftwareAction.SEARCH)
 
     def refresh(self, pkg: SnapApplication, root_password: Optional[str], watcher: ProcessWatcher) -> bool:
-        return ProcessHandler(watcher).handle_simple(snap.refresh_and_stream(pkg.name, root_password))[0]
+        res = ProcessHandler(watcher).handle_simple(snap.refresh_and_stream(pkg.name, root_password))[0]
+        self.snapd_client.invalidate_cache()
+        return res
 
     def change_channel(self, pkg: SnapApplication, root_password: Optional[str], watcher: ProcessWatcher) -> bool:
         if not self.context.internet_checker.is_available():
@@ -256,7 +266,7 @@ class SnapManager(SoftwareManager, SettingsController):
         try:
             channel = self._request_channel_installation(pkg=pkg,
                                                          snap_config=None,
-                                                         snapd_client=SnapdClient(self.logger),
+                                                         snapd_client=self.snapd_client,
                                                          watcher=watcher,
                                                          exclude_current=True)
 
@@ -265,9 +275,11 @@ class SnapManager(SoftwareManager, SettingsController):
                                      body=self.i18n['snap.action.channel.error.no_channel'])
                 return False
 
-            return ProcessHandler(watcher).handle_simple(snap.refresh_and_stream(app_name=pkg.name,
-                                                                                 root_password=root_password,
-                                                                                 channel=channel))[0]
+            res = ProcessHandler(watcher).handle_simple(snap.refresh_and_stream(app_name=pkg.name,
+                                                                                root_password=root_password,
+                                                                                channel=channel))[0]
+            self.snapd_client.invalidate_cache()
+            return res
         except Exception:
             return False
 
@@ -406,7 +418,7 @@ class SnapManager(SoftwareManager, SettingsController):
             return
 
         suggestion_by_priority = suggestions.sort_by_priority(ids_prios)
-        snapd_client = SnapdClient(self.logger)
+        snapd_client = self.snapd_client
 
         if filter_installed:
             installed = {s['name'].lower() for s in snapd_client.list_all_snaps()}
@@ -424,9 +436,7 @@ class SnapManager(SoftwareManager, SettingsController):
 
         self.logger.info("Mapping Snap suggestions")
 
-        instances, threads = [], []
-
-        res, cached_count = [], 0
+        res, cached_count, to_fill = [], 0, []
         for name in suggestion_by_priority:
             cached_sug = self.suggestions_cache.get(name)
 
@@ -434,24 +444,29 @@ class SnapManager(SoftwareManager, SettingsController):
                 res.append(cached_sug)
                 cached_count += 1
             else:
-                t = Thread(target=self._fill_suggestion, args=(name, ids_prios[name], snapd_client, res), daemon=True)
-                t.start()
-                threads.append(t)
-                time.sleep(0.001)  # to avoid being blocked
+                to_fill.append(name)
 
-        for t in threads:
-            t.join()
+        if to_fill:
+            loads = [self.suggestions_data_loader.submit(self._fill_suggestion, name, ids_prios[name], snapd_client, res)
+                     for name in to_fill]
+            self.suggestions_data_loader.wait(loads)
 
         if cached_count > 0:
             self.logger.info(f"Returning {cached_count} cached Snap suggestions")
 
         return res
 
+    def cancel_suggestions(self):
+        cancelled = self.suggestions_data_loader.cancel()
+
+        if cancelled:
+            self.logger.info(f"Cancelled {cancelled} Snap suggestions loads")
+
     def is_default_enabled(self) -> bool:
         return True
 
     def launch(self, pkg: SnapApplication):
-        commands = SnapdClient(self.logger).list_commands(pkg.name)
+        commands = self.snapd_client.list_commands(pkg.name)
 
         if commands:
             if len(commands) == 1:
@@ -1,14 +1,14 @@
 import os
-import shutil
 import subprocess
 from io import StringIO
 from typing import Tuple, Optional
 
+from bauh.commons import capabilities
 from bauh.commons.system import SimpleProcess
 
 
 def is_installed() -> bool:
-    return bool(shutil.which('snap'))
+    return capabilities.registry.is_available('snap')
 
 
 def uninstall_and_stream(app_name: str, root_password: Optional[str]) -> SimpleProcess:
@@ -1,16 +1,20 @@
 import socket
+import time
 import traceback
 from logging import Logger
-from typing import Optional, List
+from threading import Lock, BoundedSemaphore
+from typing import Optional, List, Dict, Tuple
 
 from requests import Session
 from requests.adapters import HTTPAdapter
 from urllib3.connection import HTTPConnection
 from urllib3.connectionpool import HTTPConnectionPool
 
+from bauh.commons import capabilities
 from bauh.commons.system import run_cmd
 
 URL_BASE = 'http://snapd/v2'
+SOCKET_PATH = '/run/snapd.socket'
 
 
 class SnapdConnection(HTTPConnection):
@@ -19,96 +23,125 @@ class SnapdConnection(HTTPConnection):
 
     def connect(self):
         self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.sock.connect("/run/snapd.socket")
+        self.sock.connect(SOCKET_PATH)
 
 
 class SnapdConnectionPool(HTTPConnectionPool):
-    def __init__(self):
-        super(SnapdConnectionPool, self).__init__('localhost')
+
+    def __init__(self, maxsize: int = 1):
+        super(SnapdConnectionPool, self).__init__('localhost', maxsize=maxsize, block=False)
 
     def _new_conn(self):
         return SnapdConnection()
 
 
 class SnapdAdapter(HTTPAdapter):
+    """
+    Keeps a single pool of keep-alive connections to the snapd socket (instead of a new pool per request)
+    """
+
+    def __init__(self, pool_size: int = 4):
+        super(SnapdAdapter, self).__init__()
+        self._snapd_pool = SnapdConnectionPool(maxsize=pool_size)
 
     def get_connection(self, url, proxies=None):
-        return SnapdConnectionPool()
+        return self._snapd_pool
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self._snapd_pool
+
+    def close(self):
+        super(SnapdAdapter, self).close()
+        self._snapd_pool.close()
 
 
 class SnapdClient:
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, max_concurrent_finds: int = 4, cache_ttl: float = 10):
+        """
+        :param max_concurrent_finds: maximum number of simultaneous '/find' requests
+        :param cache_ttl: time in seconds the '/snaps' and '/apps' responses are kept in memory
+        """
         self.logger = logger
+        self.max_concurrent_finds = max_concurrent_finds
+        self.cache_ttl = cache_ttl
+        self._find_lock = BoundedSemaphore(max_concurrent_finds)
+        self._cache: Dict[str, Tuple[float, List[dict]]] = dict()
+        self._cache_lock = Lock()
         self.session = self._new_session()
 
     def _new_session(self) -> Optional[Session]:
         try:
             session = Session()
-            session.mount("http://snapd/", SnapdAdapter())
+            session.mount("http://snapd/", SnapdAdapter(pool_size=self.max_concurrent_finds))
             return session
         except Exception:
             self.logger.error("Could not establish a connection to 'snapd.socker'")
             traceback.print_exc()
 
+    def _get_result(self, url: str, params: Optional[dict] = None) -> Optional[List[dict]]:
+        res = self.session.get(url=url, params=params)
+
+        if res.status_code == 200:
+            json_res = res.json()
+
+            if json_res['status-code'] == 200:
+                return json_res['result']
+
+    def _get_cached_result(self, url: str) -> List[dict]:
+        if self.cache_ttl > 0:
+            with self._cache_lock:
+                cached = self._cache.get(url)
+
+                if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                    return cached[1]
+
+                result = self._get_result(url)
+
+                if result is not None:
+                    self._cache[url] = (time.monotonic(), result)
+
+                return result if result is not None else []
+
+        result = self._get_result(url)
+        return result if result is not None else []
+
+    def invalidate_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
     def query(self, query: str) -> Optional[List[dict]]:
         final_query = query.strip()
 
         if final_query and self.session:
-            res = self.session.get(url=f'{URL_BASE}/find', params={'q': final_query})
-
-            if res.status_code == 200:
-                json_res = res.json()
-
-                if json_res['status-code'] == 200:
-                    return json_res['result']
+            with self._find_lock:
+                return self._get_result(url=f'{URL_BASE}/find', params={'q': final_query})
 
     def find_by_name(self, name: str) -> Optional[List[dict]]:
         if name and self.session:
-            res = self.session.get(f'{URL_BASE}/find?name={name}')
-
-            if res.status_code == 200:
-                json_res = res.json()
-
-                if json_res['status-code'] == 200:
-                    return json_res['result']
+            with self._find_lock:
+                return self._get_result(url=f'{URL_BASE}/find', params={'name': name})
 
     def list_all_snaps(self) -> List[dict]:
         if self.session:
-            res = self.session.get(f'{URL_BASE}/snaps')
-
-            if res.status_code == 200:
-                json_res = res.json()
-
-                if json_res['status-code'] == 200:
-                    return json_res['result']
+            return self._get_cached_result(f'{URL_BASE}/snaps')
 
         return []
 
     def list_only_apps(self) -> List[dict]:
         if self.session:
-            res = self.session.get(f'{URL_BASE}/apps')
+            return self._get_cached_result(f'{URL_BASE}/apps')
 
-            if res.status_code == 200:
-                json_res = res.json()
-
-                if json_res['status-code'] == 200:
-                    return json_res['result']
         return []
 
     def list_commands(self, name: str) -> List[dict]:
         if self.session:
-            res = self.session.get(f'{URL_BASE}/apps?names={name}')
-
-            if res.status_code == 200:
-                json_res = res.json()
+            return [r for r in self.list_only_apps() if r['snap'] == name]
 
-                if json_res['status-code'] == 200:
-                    return [r for r in json_res['result'] if r['snap'] == name]
         return []
 
 
-def is_running() -> bool:
+def _read_running_state() -> bool:
     status = run_cmd('systemctl is-active snapd.service snapd.socket', print_error=False)
     if not status:
         return False
@@ -118,3 +151,7 @@ def is_running() -> bool:
                 return True
 
         return False
+
+
+def is_running() -> bool:
+    return capabilities.registry.get_state('snapd', _read_running_state, max_age=30)
@@ -18,6 +18,7 @@ NPM_BIN_PATH = f'{NODE_DIR_PATH}/bin/npm'
 NODE_MODULES_PATH = f'{ENV_PATH}/node_modules'
 NATIVEFIER_BIN_PATH = f'{NODE_MODULES_PATH}/.bin/nativefier'
 ELECTRON_CACHE_DIR = f'{ENV_PATH}/electron'
+ELECTRON_STORE_DIR = f'{WEB_SHARED_DIR}/electron_store'
 URL_ENVIRONMENT_SETTINGS = f'https://raw.githubusercontent.com/vinifmor/bauh-files/master/web/env/v2/environment.yml'
 DESKTOP_ENTRY_PATH_PATTERN = f'{DESKTOP_ENTRIES_DIR}/{__app_name__}.web.' + '{name}.desktop'
 URL_FIX_PATTERN = "https://raw.githubusercontent.com/vinifmor/bauh-files/master/web/env/v2/fix/{domain}/{electron_branch}/fix.js"
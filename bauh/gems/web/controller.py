@@ -5,6 +5,7 @@ import os
 import re
 import shutil
 import subprocess
+import time
 import traceback
 from pathlib import Path
 from threading import Thread
@@ -27,11 +28,12 @@ from bauh.api.abstract.view import MessageType, MultipleSelectComponent, InputOp
     SelectViewType, TextInputComponent, FormComponent, FileChooserComponent, PanelComponent, ViewComponentAlignment
 from bauh.api.paths import DESKTOP_ENTRIES_DIR
 from bauh.commons import resource
+from bauh.commons.suggestions import SuggestionsDataLoader
 from bauh.commons.boot import CreateConfigFile
 from bauh.commons.html import bold
 from bauh.commons.system import ProcessHandler, get_dir_size, SimpleProcess
 from bauh.commons.view_utils import get_human_size_str
-from bauh.gems.web import INSTALLED_PATH, nativefier, DESKTOP_ENTRY_PATH_PATTERN, URL_FIX_PATTERN, ENV_PATH, \
+from bauh.gems.web import INSTALLED_PATH, nativefier, electron_store, DESKTOP_ENTRY_PATH_PATTERN, URL_FIX_PATTERN, ENV_PATH, \
     ROOT_DIR, TEMP_PATH, FIX_FILE_PATH, ELECTRON_CACHE_DIR, UA_CHROME, get_icon_path, URL_PROPS_PATTERN
 from bauh.gems.web.config import WebConfigManager
 from bauh.gems.web.environment import EnvironmentUpdater, EnvironmentComponent
@@ -72,6 +74,7 @@ class WebApplicationManager(SoftwareManager, SettingsController):
         self.logger = context.logger
         self.env_thread = None
         self.suggestions_loader: Optional[SuggestionsLoader] = None
+        self.suggestions_data_loader = SuggestionsDataLoader('web')  # suggested pages fetches
         self._suggestions_manager: Optional[SuggestionsManager] = None
         self.suggestions = {}
         self.configman = WebConfigManager()
@@ -423,6 +426,12 @@ class WebApplicationManager(SoftwareManager, SettingsController):
             traceback.print_exc()
             return TransactionResult.fail()
 
+        try:
+            electron_store.release_app(app_id=pkg.id, logger=self.logger)
+        except Exception:
+            self.logger.error(f"Could not release {pkg.name} Electron files from the store")
+            traceback.print_exc()
+
         self.logger.info("Checking if {} desktop entry file {} exists".format(pkg.name, pkg.desktop_entry))
         if os.path.exists(pkg.desktop_entry):
             try:
@@ -480,8 +489,11 @@ class WebApplicationManager(SoftwareManager, SettingsController):
             info['07_exec_file'] = pkg.get_exec_path()
             info['08_icon_path'] = pkg.get_disk_icon_path()
 
-            if os.path.exists(pkg.installation_dir):
-                info['09_size'] = get_human_size_str(get_dir_size(pkg.installation_dir))
+            if pkg.installation_size is not None:
+                info['09_size'] = get_human_size_str(pkg.installation_size)
+            elif os.path.exists(pkg.installation_dir):  # installed before the sizes were recorded
+                pkg.installation_size = get_dir_size(pkg.installation_dir)
+                info['09_size'] = get_human_size_str(pkg.installation_size)
 
             config_dir = pkg.get_config_dir()
 
@@ -864,6 +876,8 @@ class WebApplicationManager(SoftwareManager, SettingsController):
                 pkg.version = f.read().strip()
                 pkg.latest_version = pkg.version
 
+        self._link_electron_files(pkg=pkg, electron_version=electron_version, widevine=widevine_support)
+
         watcher.change_substatus(self.i18n['web.install.substatus.shortcut'])
 
         try:
@@ -901,6 +915,22 @@ class WebApplicationManager(SoftwareManager, SettingsController):
 
         return TransactionResult(success=True, installed=[pkg], removed=[])
 
+    def _link_electron_files(self, pkg: WebApplication, electron_version: str, widevine: bool):
+        store_key = electron_store.gen_key(version=pkg.version if pkg.version else electron_version,
+                                           x86_64=self.context.is_system_x86_64(), widevine=widevine)
+        self.logger.info(f"Linking {pkg.name} Electron files to the store (key: {store_key})")
+
+        try:
+            ti = time.time()
+            total_size, shared_size = electron_store.link_app(app_id=pkg.id, app_dir=pkg.installation_dir,
+                                                              key=store_key, logger=self.logger)
+            pkg.installation_size = total_size
+            self.logger.info(f"{pkg.name} Electron files linked in {time.time() - ti:.2f} seconds "
+                             f"({get_human_size_str(shared_size)} of {get_human_size_str(total_size)} shared)")
+        except Exception:
+            self.logger.error(f"Could not link {pkg.name} Electron files to the store")
+            traceback.print_exc()
+
     def install(self, pkg: WebApplication, root_password: Optional[str], disk_loader: DiskCacheLoader,
                 watcher: ProcessWatcher) -> TransactionResult:
         continue_install, install_options = self._ask_install_options(pkg, watcher, pre_validated=True)
@@ -968,6 +998,10 @@ class WebApplicationManager(SoftwareManager, SettingsController):
     def _assign_suggestions(self, suggestions: dict):
         self.suggestions = suggestions
 
+    def get_deferrable_prepare_tasks(self, operation: str) -> Optional[Set[str]]:
+        if operation in ('read_installed', 'list_updates'):
+            return {'web_sugs', 'web_idx_gen', 'web_read_settings'}
+
     def prepare(self, task_manager: TaskManager, root_password: Optional[str], internet_available: bool):
         create_config = CreateConfigFile(taskman=task_manager, configman=self.configman, i18n=self.i18n,
                                          task_icon_path=get_icon_path(), logger=self.logger)
@@ -1056,7 +1090,7 @@ class WebApplicationManager(SoftwareManager, SettingsController):
 
         app.status = PackageStatus.LOADING_DATA
 
-        Thread(target=self._fill_suggestion, args=(app,), daemon=True).start()
+        self.suggestions_data_loader.submit(self._fill_suggestion, app)
 
         return PackageSuggestion(priority=SuggestionPriority(suggestion['priority']), package=app)
 
@@ -1140,6 +1174,12 @@ class WebApplicationManager(SoftwareManager, SettingsController):
                               watcher: ProcessWatcher) -> bool:
         pass
 
+    def cancel_suggestions(self):
+        cancelled = self.suggestions_data_loader.cancel()
+
+        if cancelled:
+            self.logger.info(f"Cancelled {cancelled} Web suggestions loads")
+
     def is_default_enabled(self) -> bool:
         return True
 
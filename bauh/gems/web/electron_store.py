@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import traceback
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Set, Tuple
+
+from bauh.gems.web import ELECTRON_STORE_DIR
+
+APP_FILES_DIR = 'resources/app'  # application specific files (not shared)
+REFS_FILE = 'refs'
+OBJECTS_DIR = 'objects'
+
+_lock = Lock()
+
+
+def gen_key(version: str, x86_64: bool, widevine: bool = False) -> str:
+    """
+    :return: the store key of an Electron distribution (version and architecture)
+    """
+    return f"{version}-{'x64' if x86_64 else 'ia32'}{'-wvvmp' if widevine else ''}"
+
+
+def hash_file(file_path: str) -> str:
+    sha = hashlib.sha256()
+
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+
+    return sha.hexdigest()
+
+
+def read_refs(key_dir: str) -> Set[str]:
+    try:
+        with open(f'{key_dir}/{REFS_FILE}') as f:
+            return {line.strip() for line in f.readlines() if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def _write_refs(key_dir: str, refs: Set[str]):
+    temp_file = f'{key_dir}/{REFS_FILE}.tmp'
+
+    with open(temp_file, 'w+') as f:
+        f.write('\n'.join(sorted(refs)))
+
+    os.replace(temp_file, f'{key_dir}/{REFS_FILE}')
+
+
+def link_app(app_id: str, app_dir: str, key: str, logger: logging.Logger,
+             store_dir: str = ELECTRON_STORE_DIR) -> Tuple[int, int]:
+    """
+    replaces the Electron files of an installed application by hardlinks to identical files already stored
+    (the ones not stored yet are added to the store). Files are addressed by their content and permissions.
+    :return: the application directory size and how many of its bytes are shared with other applications
+    """
+    key_dir = f'{store_dir}/{key}'
+    objects_dir = f'{key_dir}/{OBJECTS_DIR}'
+    app_files_dir = os.path.join(app_dir, APP_FILES_DIR)
+    total_size, shared_size = 0, 0
+
+    with _lock:
+        Path(objects_dir).mkdir(parents=True, exist_ok=True)
+
+        for root, dirs, files in os.walk(app_dir):
+            if root == app_files_dir or root.startswith(app_files_dir + os.sep):
+                for name in files:
+                    file_path = os.path.join(root, name)
+
+                    if not os.path.islink(file_path):
+                        total_size += os.path.getsize(file_path)
+
+                continue
+
+            for name in files:
+                file_path = os.path.join(root, name)
+
+                try:
+                    file_stat = os.lstat(file_path)
+                except OSError:
+                    continue
+
+                if not stat.S_ISREG(file_stat.st_mode):
+                    continue
+
+                total_size += file_stat.st_size
+
+                if not file_stat.st_size:
+                    continue
+
+                try:
+                    object_path = f'{objects_dir}/{hash_file(file_path)}_{stat.S_IMODE(file_stat.st_mode):o}'
+
+                    try:
+                        object_stat = os.stat(object_path)
+                    except FileNotFoundError:
+                        os.link(file_path, object_path)
+                        continue
+
+                    if object_stat.st_ino != file_stat.st_ino or object_stat.st_dev != file_stat.st_dev:
+                        temp_path = f'{file_path}.bauh_link'
+                        os.link(object_path, temp_path)
+                        os.replace(temp_path, file_path)
+
+                    shared_size += file_stat.st_size
+                except OSError:
+                    logger.warning(f"Could not link file '{file_path}' to the Electron store")
+                    traceback.print_exc()
+
+        refs = read_refs(key_dir)
+        refs.add(app_id)
+        _write_refs(key_dir, refs)
+
+    return total_size, shared_size
+
+
+def release_app(app_id: str, logger: logging.Logger, store_dir: str = ELECTRON_STORE_DIR) -> Optional[str]:
+    """
+    removes the application reference from the store. Distributions no longer referenced are removed, and
+    so are the stored files not linked by any application anymore.
+    It should be called after the application files are removed.
+    :return: the key of the distribution referenced by the application
+    """
+    if not os.path.isdir(store_dir):
+        return
+
+    with _lock:
+        for key in os.listdir(store_dir):
+            key_dir = f'{store_dir}/{key}'
+            refs = read_refs(key_dir)
+
+            if app_id not in refs:
+                continue
+
+            refs.discard(app_id)
+
+            if not refs:
+                logger.info(f"Removing Electron distribution '{key}' from the store: no more applications using it")
+                shutil.rmtree(key_dir, ignore_errors=True)
+                return key
+
+            _write_refs(key_dir, refs)
+
+            objects_dir = f'{key_dir}/{OBJECTS_DIR}'
+            if os.path.isdir(objects_dir):
+                for name in os.listdir(objects_dir):
+                    object_path = f'{objects_dir}/{name}'
+
+                    try:
+                        if os.stat(object_path).st_nlink <= 1:
+                            os.remove(object_path)
+                    except OSError:
+                        logger.warning(f"Could not remove the unused Electron store file '{object_path}'")
+
+            return key
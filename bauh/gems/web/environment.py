@@ -48,11 +48,34 @@ class EnvironmentUpdater:
         self.task_read_settings_id = 'web_read_settings'
         self.taskman = taskman
 
+    def _get_nodejs_sha256(self, version_url: str) -> Optional[str]:
+        """
+        :return: the file checksum listed in the 'SHASUMS256.txt' published with the NodeJS release
+        """
+        file_name = version_url.split('/')[-1]
+        sums_url = f"{'/'.join(version_url.split('/')[0:-1])}/SHASUMS256.txt"
+
+        try:
+            res = self.http_client.get(sums_url)
+        except Exception:
+            res = None
+            traceback.print_exc()
+
+        if res and res.text:
+            for line in res.text.split('\n'):
+                line_split = line.strip().split()
+
+                if len(line_split) == 2 and line_split[1] == file_name:
+                    return line_split[0]
+
+        self.logger.warning(f"Could not retrieve the NodeJS checksum of '{file_name}' from '{sums_url}'")
+
     def _install_nodejs(self, version: str, version_url: str, watcher: ProcessWatcher) -> bool:
         self.logger.info(f"Downloading NodeJS {version}: {version_url}")
 
         tarf_path = f"{ENV_PATH}/{version_url.split('/')[-1]}"
-        downloaded = self.file_downloader.download(version_url, watcher=watcher, output_path=tarf_path, cwd=ENV_PATH)
+        downloaded = self.file_downloader.download(version_url, watcher=watcher, output_path=tarf_path, cwd=ENV_PATH,
+                                                   sha256=self._get_nodejs_sha256(version_url))
 
         if not downloaded:
             self.logger.error(f"Could not download '{version_url}'. Aborting...")
@@ -18,7 +18,7 @@ class WebApplication(SoftwarePackage):
                  installed: bool = False, version: Optional[str] = None, categories: Optional[List[str]] = None,
                  custom_icon: Optional[str] = None, preset_options: Optional[List[str]] = None, save_icon: bool = True,
                  options_set: Optional[List[str]] = None, package_name: Optional[str] = None, source_url: Optional[str] = None,
-                 user_agent: Optional[str] = None):
+                 user_agent: Optional[str] = None, installation_size: Optional[int] = None):
         super(WebApplication, self).__init__(id=id if id else url, name=name, description=description,
                                              icon_url=icon_url, installed=installed, version=version,
                                              categories=categories)
@@ -33,6 +33,7 @@ class WebApplication(SoftwarePackage):
         self.custom_icon = custom_icon
         self.set_custom_icon(custom_icon)
         self.user_agent = user_agent
+        self.installation_size = installation_size  # in bytes (recorded at installation time)
 
     def get_source_url(self):
         if self.source_url:
@@ -54,7 +55,7 @@ class WebApplication(SoftwarePackage):
     def _get_cached_attrs() -> tuple:
         return 'id', 'name', 'version', 'url', 'description', 'icon_url', 'installation_dir', \
                'desktop_entry', 'categories', 'custom_icon', 'options_set', 'save_icon', 'package_name', 'source_url', \
-               'user_agent'
+               'user_agent', 'installation_size'
 
     def can_be_downgraded(self):
         return False
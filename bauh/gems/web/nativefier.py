@@ -1,7 +1,7 @@
 import os
-import shutil
 from typing import List, Optional
 
+from bauh.commons import capabilities
 from bauh.commons.system import SimpleProcess, run_cmd
 from bauh.gems.web import NATIVEFIER_BIN_PATH, NODE_PATHS, ELECTRON_CACHE_DIR
 
@@ -26,7 +26,7 @@ def install(url: str, name: str, output_dir: str, electron_version: Optional[str
 
 
 def is_available() -> bool:
-    return bool(shutil.which('nativefier'))
+    return capabilities.registry.is_available('nativefier')
 
 
 def get_version() -> str:
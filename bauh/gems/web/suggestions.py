@@ -1,6 +1,6 @@
 import os
 import traceback
-from datetime import datetime, timedelta
+from datetime import timedelta
 from logging import Logger
 from pathlib import Path
 from typing import Optional
@@ -9,10 +9,13 @@ import requests
 import yaml
 
 from bauh.api.http import HttpClient
+from bauh.commons import freshness
 from bauh.commons.util import map_timestamp_file
 from bauh.gems.web import WEB_CACHE_DIR
 from bauh.view.util.translation import I18n
 
+SUGGESTIONS_JOB_ID = 'web.suggestions'
+
 
 class SuggestionsManager:
 
@@ -60,20 +63,8 @@ class SuggestionsManager:
             self.logger.info(f"No suggestions cached file found '{self._cached_file_path}'")
             return True
 
-        if not os.path.exists(self._cached_file_ts_path):
-            self.logger.info(f"No suggestions cache file timestamp found '{self._cached_file_ts_path}'")
-            return True
-
-        with open(self._cached_file_ts_path) as f:
-            timestamp_str = f.read()
-
-        try:
-            sugs_timestamp = datetime.fromtimestamp(float(timestamp_str))
-        except Exception:
-            self.logger.error(f"Could not parse the cached suggestions file timestamp: {timestamp_str}")
-            return True
-
-        expired = sugs_timestamp + timedelta(days=exp) <= datetime.utcnow()
+        expired = freshness.get_registry().is_expired(SUGGESTIONS_JOB_ID, period=timedelta(days=exp),
+                                                      legacy_file=self._cached_file_ts_path)
 
         if expired:
             self.logger.info("Cached suggestions file has expired.")
@@ -154,13 +145,5 @@ class SuggestionsManager:
 
         self.logger.info(f"{len(suggestions)} suggestions successfully cached to file '{self._cached_file_path}'")
 
-        try:
-            with open(self._cached_file_ts_path, 'w+') as f:
-                f.write(str(timestamp))
-        except Exception:
-            self.logger.error(f"Could not write to {self._cached_file_ts_path}")
-            traceback.print_exc()
-            return
-
-        self.logger.info(f"Suggestions cached file timestamp ({timestamp}) "
-                         f"successfully saved at '{self._cached_file_ts_path}'")
+        freshness.get_registry().register_run(SUGGESTIONS_JOB_ID, timestamp=timestamp)
+        self.logger.info(f"Suggestions cached file timestamp ({timestamp}) successfully registered")
@@ -1,7 +1,6 @@
 import logging
 import time
 import traceback
-from datetime import datetime
 from threading import Thread
 from typing import Optional
 
@@ -53,7 +52,7 @@ class SuggestionsLoader(Thread):
                 self.suggestions = self.manager.read_cached(check_file=False)
             else:
                 try:
-                    timestamp = datetime.utcnow().timestamp()
+                    timestamp = time.time()
                     self.suggestions = self.manager.download()
 
                     if self.suggestions:
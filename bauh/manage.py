@@ -35,6 +35,12 @@ def new_manage_panel(app_args: Namespace, app_config: dict, logger: logging.Logg
                                          i18n=i18n, http_client=http_client,
                                          check_ssl=app_config['download']['check_ssl'])
 
+    internet_checker = InternetChecker(offline=app_args.offline,
+                                       host=app_config['internet']['check_host'],
+                                       expiration=app_config['internet']['check_expiration'],
+                                       logger=logger)
+    internet_checker.start_monitoring()
+
     context = ApplicationContext(i18n=i18n,
                                  http_client=http_client,
                                  download_icons=bool(app_config['download']['icons']),
@@ -46,7 +52,7 @@ def new_manage_panel(app_args: Namespace, app_config: dict, logger: logging.Logg
                                  file_downloader=downloader,
                                  app_name=__app_name__,
                                  app_version=__version__,
-                                 internet_checker=InternetChecker(offline=app_args.offline),
+                                 internet_checker=internet_checker,
                                  suggestions_mapping=read_suggestions_mapping(),
                                  root_user=user.is_root())
 
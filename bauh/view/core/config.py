@@ -28,6 +28,10 @@ class CoreConfigManager(YAMLConfigManager):
                 'notifications': True,
                 'single_dependency_checking': False
             },
+            'internet': {
+                'check_host': 'w3.org',
+                'check_expiration': 30
+            },
             'suggestions': {
                 'enabled': True,
                 'by_type': 15
@@ -0,0 +1,81 @@
+import shutil
+import tempfile
+import traceback
+from collections import deque
+from threading import Lock
+from typing import List, Tuple, Optional, IO
+
+
+class ConsoleOutputBuffer:
+    """
+    Thread-safe buffer between the actions output and the console widget. The lines waiting to be displayed are
+    kept in a bounded ring buffer (the oldest ones are skipped if the console cannot keep up), while the full
+    output is written to a temporary file.
+    """
+
+    def __init__(self, max_pending: int = 2000):
+        """
+        :param max_pending: maximum number of lines waiting to be displayed
+        """
+        self._pending = deque(maxlen=max_pending)
+        self._skipped = 0
+        self._lines = 0
+        self._file: Optional[IO] = None
+        self._lock = Lock()
+
+    def append(self, line: str):
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._skipped += 1
+
+            self._pending.append(line)
+            self._lines += 1
+
+            try:
+                if self._file is None:
+                    self._file = tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace',
+                                                        prefix='bauh_console_')
+
+                self._file.write(line)
+                self._file.write('\n')
+            except OSError:
+                traceback.print_exc()
+
+    def drain(self) -> Tuple[List[str], int]:
+        """
+        :return: the lines waiting to be displayed and how many were skipped since the last call
+        """
+        with self._lock:
+            lines, skipped = [*self._pending], self._skipped
+            self._pending.clear()
+            self._skipped = 0
+            return lines, skipped
+
+    def has_output(self) -> bool:
+        return self._lines > 0
+
+    def save(self, file_path: str):
+        """
+        writes the full output to the given file
+        :raises OSError: if the file cannot be written
+        """
+        with self._lock:
+            with open(file_path, 'w+') as f:
+                if self._file is not None:
+                    self._file.flush()
+                    self._file.seek(0)
+                    shutil.copyfileobj(self._file, f)
+                    self._file.seek(0, 2)
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self._skipped = 0
+            self._lines = 0
+
+            if self._file is not None:
+                try:
+                    self._file.seek(0)
+                    self._file.truncate()
+                except OSError:
+                    traceback.print_exc()
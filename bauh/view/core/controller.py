@@ -1,6 +1,6 @@
-import shutil
 import time
 import traceback
+from functools import partial
 from subprocess import Popen, STDOUT
 from threading import Thread
 from typing import List, Set, Type, Tuple, Dict, Optional, Generator, Callable
@@ -13,17 +13,22 @@ from bauh.api.abstract.model import SoftwarePackage, PackageUpdate, PackageHisto
     CustomSoftwareAction
 from bauh.api.abstract.view import TabGroupComponent, MessageType
 from bauh.api.exception import NoInternetException
+from bauh.commons import capabilities
 from bauh.commons.boot import CreateConfigFile
 from bauh.commons.html import bold
 from bauh.commons.regex import RE_URL
 from bauh.commons.util import sanitize_command_input
 from bauh.view.core.config import CoreConfigManager
+from bauh.view.core.executor import ManagersExecutor
 from bauh.view.core.settings import GenericSettingsManager
+from bauh.view.core.tasks import PrepareTasksTracker, TrackedTaskManager
 from bauh.view.core.update import check_for_update
 from bauh.view.util import resource
 from bauh.view.util.resource import get_path
 from bauh.view.util.util import clean_app_files, restart_app
 
+PREPARE_WAIT_TIMEOUT = 300  # seconds an operation waits for the 'prepare' tasks it requires
+
 
 class GenericUpgradeRequirements(UpgradeRequirements):
 
@@ -44,7 +49,7 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
         self.managers = managers
         self.map = {t: m for m in self.managers for t in m.get_managed_types()}
         self._available_cache = {} if config['system']['single_dependency_checking'] else None
-        self.thread_prepare = None
+        self.prepare_tracker = PrepareTasksTracker()
         self.i18n = context.i18n
         self.disk_loader_factory = context.disk_loader_factory
         self.logger = context.logger
@@ -57,6 +62,7 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
         self._action_reset: Optional[CustomSoftwareAction] = None
         self._dynamic_extra_actions: Optional[Dict[CustomSoftwareAction, Callable[[dict], bool]]] = None
         self.force_suggestions = force_suggestions
+        self.executor = ManagersExecutor(max_workers=max(4, len(managers) * 2), logger=self.logger)
 
     @property
     def dynamic_extra_actions(self) -> Dict[CustomSoftwareAction, Callable[[dict], bool]]:
@@ -89,7 +95,7 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
         return self._action_reset
 
     def _is_timeshift_launcher_available(self) -> bool:
-        return bool(shutil.which('timeshift-launcher'))
+        return capabilities.registry.is_available('timeshift-launcher')
 
     def is_backups_action_available(self, app_config: dict) -> bool:
         return bool(app_config['backup']['enabled']) and self._is_timeshift_launcher_available()
@@ -140,56 +146,77 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
 
         return available
 
-    def _search(self, word: str, is_url: bool, man: SoftwareManager, disk_loader, res: SearchResult):
-        mti = time.time()
-        apps_found = man.search(words=word, disk_loader=disk_loader, is_url=is_url, limit=-1)
-        mtf = time.time()
-        self.logger.info(f'{man.__class__.__name__} took {mtf - mti:.8f} seconds')
-
-        res.installed.extend(apps_found.installed)
-        res.new.extend(apps_found.new)
+    def _search(self, word: str, is_url: bool, man: SoftwareManager, disk_loader: DiskCacheLoader) -> SearchResult:
+        self._wait_to_be_ready(man, 'search')
+        return man.search(words=word, disk_loader=disk_loader, is_url=is_url, limit=-1)
 
-    def search(self, words: str, disk_loader: DiskCacheLoader = None, limit: int = -1, is_url: bool = False) -> SearchResult:
-        ti = time.time()
-        self._wait_to_be_ready()
+    def search_stream(self, words: str) -> Generator[SearchResult, None, None]:
+        """
+        searches on all working managers, yielding each manager's result as soon as it is available.
+        A new search cancels the current one.
+        """
+        if not self.context.is_internet_available():
+            raise NoInternetException()
 
-        res = SearchResult.empty()
+        norm_query = sanitize_command_input(words).lower()
+        self.logger.info(f"Search query: {norm_query}")
+        self.cancel_suggestions()  # not displayed anymore
 
-        if self.context.is_internet_available():
-            norm_query = sanitize_command_input(words).lower()
-            self.logger.info(f"Search query: {norm_query}")
+        if norm_query:
+            is_url = bool(RE_URL.match(norm_query))
+            disk_loader = self.disk_loader_factory.new()
+            disk_loader.start()
 
-            if norm_query:
-                is_url = bool(RE_URL.match(norm_query))
-                disk_loader = self.disk_loader_factory.new()
-                disk_loader.start()
+            tasks = {man: partial(self._search, norm_query, is_url, man, disk_loader)
+                     for man in self.managers if self._can_work(man)}
 
-                threads = []
+            # the disk loader is only stopped when the managers still searching (timeout/cancel) finish
+            for _, man_res in self.executor.run('search', tasks, exclusive=True,
+                                                on_done=partial(self._stop_disk_loader, disk_loader)):
+                if man_res:
+                    yield man_res
 
-                for man in self.managers:
-                    if self._can_work(man):
-                        t = Thread(target=self._search, args=(norm_query, is_url, man, disk_loader, res), daemon=True)
-                        t.start()
-                        threads.append(t)
+    @staticmethod
+    def _stop_disk_loader(disk_loader: DiskCacheLoader):
+        disk_loader.stop_working()
+        disk_loader.join()
 
-                for t in threads:
-                    t.join()
+    def search(self, words: str, disk_loader: DiskCacheLoader = None, limit: int = -1, is_url: bool = False) -> SearchResult:
+        ti = time.time()
+        res = SearchResult.empty()
 
-                if disk_loader:
-                    disk_loader.stop_working()
-                    disk_loader.join()
-        else:
-            raise NoInternetException()
+        for man_res in self.search_stream(words):
+            res.installed.extend(man_res.installed)
+            res.new.extend(man_res.new)
 
         res.update_total()
         tf = time.time()
         self.logger.info(f'Took {tf - ti:.8f} seconds')
         return res
 
-    def _wait_to_be_ready(self):
-        if self.thread_prepare:
-            self.thread_prepare.join()
-            self.thread_prepare = None
+    def _wait_to_be_ready(self, man: SoftwareManager, operation: str):
+        if not self.prepare_tracker.is_ready(man, operation):
+            ti = time.time()
+            if self.prepare_tracker.wait(man, operation, PREPARE_WAIT_TIMEOUT):
+                self.logger.info(f"{man.__class__.__name__} waited {time.time() - ti:.4f} seconds for its "
+                                 f"'{operation}' requirements to be prepared")
+            else:
+                pending = self.prepare_tracker.get_pending(man, operation)
+                pending_str = ', '.join(sorted(pending)) if pending else '(tasks not registered yet)'
+                self.logger.warning(f"{man.__class__.__name__} stopped waiting for its '{operation}' requirements "
+                                    f"after {PREPARE_WAIT_TIMEOUT} seconds. Pending tasks: {pending_str}")
+
+    def is_prepared_for(self, operation: str) -> bool:
+        """
+        :return: if all working managers have finished the 'prepare' tasks required by the operation
+        """
+        return all(self.prepare_tracker.is_ready(man, operation) for man in self._already_prepared)
+
+    def skip_prepare(self):
+        """
+        operations will not wait for any pending 'prepare' task anymore
+        """
+        self.prepare_tracker.release()
 
     def set_enabled(self, enabled: bool):
         pass
@@ -200,65 +227,43 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
     def _get_package_lower_name(self, pkg: SoftwarePackage):
         return pkg.name.lower()
 
-    def _fill_read_installed(self, man: SoftwareManager, disk_loader: DiskCacheLoader, internet_available: bool,
-                             output: List[SearchResult]):
-        mti = time.time()
-        man_res = man.read_installed(disk_loader=disk_loader, pkg_types=None, internet_available=internet_available,
-                                     limit=-1, only_apps=False)
-        mtf = time.time()
-        self.logger.info(f'{man.__class__.__name__} took {mtf - mti:.4f} seconds')
-        output.append(man_res)
+    def _read_installed(self, man: SoftwareManager, disk_loader: DiskCacheLoader,
+                        internet_available: bool) -> SearchResult:
+        self._wait_to_be_ready(man, 'read_installed')
+        return man.read_installed(disk_loader=disk_loader, pkg_types=None, internet_available=internet_available,
+                                  limit=-1, only_apps=False)
 
     def read_installed(self, disk_loader: DiskCacheLoader = None, limit: int = -1, only_apps: bool = False, pkg_types: Set[Type[SoftwarePackage]] = None, internet_available: bool = None) -> SearchResult:
         ti = time.time()
-        self._wait_to_be_ready()
-
         res = SearchResult([], None, 0)
 
         disk_loader = None
 
         net_available = self.context.is_internet_available()
-        read_threads = list()
-        results = list()
 
         if not pkg_types:  # any type
-            for man in self.managers:
-                if self._can_work(man):
-                    if not disk_loader:
-                        disk_loader = self.disk_loader_factory.new()
-                        disk_loader.start()
-
-                    t = Thread(target=self._fill_read_installed,
-                               args=(man, disk_loader, net_available, results),
-                               daemon=True)
-                    t.start()
-                    read_threads.append(t)
+            to_read = [man for man in self.managers if self._can_work(man)]
         else:
-            man_already_used = []
+            to_read = []
 
             for t in pkg_types:
                 man = self.map.get(t)
-                if man and (man not in man_already_used) and self._can_work(man):
+                if man and (man not in to_read) and self._can_work(man):
+                    to_read.append(man)
 
-                    if not disk_loader:
-                        disk_loader = self.disk_loader_factory.new()
-                        disk_loader.start()
-
-                    t = Thread(target=self._fill_read_installed,
-                               args=(man, disk_loader, net_available, results),
-                               daemon=True)
-                    t.start()
-                    read_threads.append(t)
+        if to_read:
+            disk_loader = self.disk_loader_factory.new()
+            disk_loader.start()
 
-        for t in read_threads:
-            t.join()
+        tasks = {man: partial(self._read_installed, man, disk_loader, net_available) for man in to_read}
+        results = [r for _, r in self.executor.run('read_installed', tasks)]
 
         if disk_loader:
             disk_loader.stop_working()
             disk_loader.join()
 
         for result in results:
-            if result.installed:
+            if result and result.installed:
                 res.installed.extend(result.installed)
                 res.total += result.total
 
@@ -288,6 +293,7 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
         man = self._get_manager_for(app)
 
         if man and app.can_be_downgraded():
+            self._wait_to_be_ready(man, 'downgrade')
             mti = time.time()
             res = man.downgrade(app, root_password, handler)
             mtf = time.time()
@@ -304,6 +310,7 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
 
     def upgrade(self, requirements: GenericUpgradeRequirements, root_password: Optional[str], handler: ProcessWatcher) -> bool:
         for man, man_reqs in requirements.sub_requirements.items():
+            self._wait_to_be_ready(man, 'upgrade')
             res = man.upgrade(man_reqs, root_password, handler)
 
             if not res:
@@ -331,6 +338,7 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
         man = self._get_manager_for(pkg)
 
         if man:
+            self._wait_to_be_ready(man, 'uninstall')
             ti = time.time()
             disk_loader = self.disk_loader_factory.new()
             disk_loader.start()
@@ -352,6 +360,7 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
         man = self._get_manager_for(app)
 
         if man:
+            self._wait_to_be_ready(man, 'install')
             ti = time.time()
             disk_loader = self.disk_loader_factory.new()
             disk_loader.start()
@@ -385,6 +394,16 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
             self.logger.info(f'{man.__class__.__name__} took {mtf - mti:.2f} seconds')
             return history
 
+    def get_history_page(self, app: SoftwarePackage, offset: int, limit: int) -> Optional[PackageHistory]:
+        man = self._get_manager_for(app)
+
+        if man:
+            mti = time.time()
+            history = man.get_history_page(app, offset, limit)
+            mtf = time.time()
+            self.logger.info(f'{man.__class__.__name__} took {mtf - mti:.2f} seconds')
+            return history
+
     def get_managed_types(self) -> Set[Type[SoftwarePackage]]:
         available_types = set()
 
@@ -435,7 +454,8 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
             prepare_tasks = []
             for man in self.managers:
                 if man not in self._already_prepared and self._can_work(man):
-                    t = Thread(target=man.prepare, args=(taskman, root_password, internet_on), daemon=True)
+                    self.prepare_tracker.start_preparing(man)
+                    t = Thread(target=self._prepare, args=(man, taskman, root_password, internet_on), daemon=True)
                     t.start()
                     prepare_tasks.append(t)
                     self._already_prepared.append(man)
@@ -447,24 +467,32 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
         tf = time.time()
         self.logger.info(f'Finished ({tf - ti:.2f} seconds)')
 
+    def _prepare(self, man: SoftwareManager, taskman: TaskManager, root_password: Optional[str], internet_on: bool):
+        try:
+            man.prepare(TrackedTaskManager(taskman, self.prepare_tracker, man), root_password, internet_on)
+        finally:
+            self.prepare_tracker.set_prepared(man)
+
     def cache_available_managers(self):
         if self.managers:
             for man in self.managers:
                 self._can_work(man)
 
-    def list_updates(self, internet_available: bool = None) -> List[PackageUpdate]:
-        self._wait_to_be_ready()
+    def _list_updates(self, man: SoftwareManager, internet_available: bool) -> List[PackageUpdate]:
+        self._wait_to_be_ready(man, 'list_updates')
+        return man.list_updates(internet_available=internet_available)
 
+    def list_updates(self, internet_available: bool = None) -> List[PackageUpdate]:
         updates = []
 
         if self.managers:
             net_available = self.context.is_internet_available()
+            tasks = {man: partial(self._list_updates, man, net_available)
+                     for man in self.managers if self._can_work(man)}
 
-            for man in self.managers:
-                if self._can_work(man):
-                    man_updates = man.list_updates(internet_available=net_available)
-                    if man_updates:
-                        updates.extend(man_updates)
+            for _, man_updates in self.executor.run('list_updates', tasks):
+                if man_updates:
+                    updates.extend(man_updates)
 
         return updates
 
@@ -480,47 +508,59 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
                 warnings.append(updates_msg)
 
         if self.managers:
-            for man in self.managers:
-                if self._can_work(man):
-                    man_warnings = man.list_warnings(internet_available=int_available)
+            tasks = {man: partial(man.list_warnings, internet_available=int_available)
+                     for man in self.managers if self._can_work(man)}
 
-                    if man_warnings:
-                        warnings.extend(man_warnings)
+            for _, man_warnings in self.executor.run('list_warnings', tasks):
+                if man_warnings:
+                    warnings.extend(man_warnings)
 
         return warnings
 
-    def _fill_suggestions(self, suggestions: list, man: SoftwareManager, limit: int, filter_installed: bool):
-        if self._can_work(man):
-            mti = time.time()
-            man_sugs = man.list_suggestions(limit=limit, filter_installed=filter_installed)
-            mtf = time.time()
-            self.logger.info(f'{man.__class__.__name__} took {mtf - mti:.5f} seconds')
+    def _list_suggestions(self, man: SoftwareManager, limit: int,
+                          filter_installed: bool) -> Optional[List[PackageSuggestion]]:
+        self._wait_to_be_ready(man, 'list_suggestions')
+        man_sugs = man.list_suggestions(limit=limit, filter_installed=filter_installed)
 
-            if man_sugs:
-                if 0 < limit < len(man_sugs):
-                    man_sugs = man_sugs[0:limit]
+        if man_sugs and 0 < limit < len(man_sugs):
+            man_sugs = man_sugs[0:limit]
 
-                suggestions.extend(man_sugs)
+        return man_sugs
 
-    def list_suggestions(self, limit: int, filter_installed: bool) -> List[PackageSuggestion]:
+    def list_suggestions_stream(self, filter_installed: bool) -> Generator[List[PackageSuggestion], None, None]:
+        """
+        lists the suggestions of all working managers, yielding each manager's suggestions as soon as they are
+        available. A new suggestions request or a search cancels the current one.
+        """
         if self.force_suggestions or bool(self.config['suggestions']['enabled']):
             if self.managers and self.context.is_internet_available():
-                suggestions, threads = [], []
-                for man in self.managers:
-                    t = Thread(target=self._fill_suggestions,
-                               args=(suggestions, man, int(self.config['suggestions']['by_type']), filter_installed),
-                               daemon=True)
-                    t.start()
-                    threads.append(t)
+                by_type = int(self.config['suggestions']['by_type'])
+                tasks = {man: partial(self._list_suggestions, man, by_type, filter_installed)
+                         for man in self.managers if self._can_work(man)}
+
+                for _, man_sugs in self.executor.run('list_suggestions', tasks, exclusive=True):
+                    if man_sugs:
+                        yield man_sugs
+
+    def list_suggestions(self, limit: int, filter_installed: bool) -> List[PackageSuggestion]:
+        suggestions = []
+        for man_sugs in self.list_suggestions_stream(filter_installed):
+            suggestions.extend(man_sugs)
+
+        if suggestions:
+            suggestions.sort(key=lambda s: s.priority.value, reverse=True)
 
-                for t in threads:
-                    t.join()
+        return suggestions
 
-                if suggestions:
-                    suggestions.sort(key=lambda s: s.priority.value, reverse=True)
+    def cancel_suggestions(self):
+        self.executor.cancel('list_suggestions')
 
-                return suggestions
-        return []
+        for man in self.managers:
+            if self._can_work(man):
+                try:
+                    man.cancel_suggestions()
+                except Exception:
+                    traceback.print_exc()
 
     def execute_custom_action(self, action: CustomSoftwareAction, pkg: SoftwarePackage, root_password: Optional[str], watcher: ProcessWatcher):
         if action.requires_internet and not self.context.is_internet_available():
@@ -535,11 +575,10 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
         return True
 
     def launch(self, pkg: SoftwarePackage):
-        self._wait_to_be_ready()
-
         man = self._get_manager_for(pkg)
 
         if man:
+            self._wait_to_be_ready(man, 'launch')
             self.logger.info(f'Launching {pkg}')
             man.launch(pkg)
 
@@ -592,6 +631,7 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
 
         if by_manager:
             for man, pkgs in by_manager.items():
+                self._wait_to_be_ready(man, 'get_upgrade_requirements')
                 ti = time.time()
                 man_reqs = man.get_upgrade_requirements(pkgs, root_password, watcher)
                 tf = time.time()
@@ -657,25 +697,14 @@ class GenericSoftwareManager(SoftwareManager, SettingsController):
 
         yield self.action_reset
 
-    def _fill_sizes(self, man: SoftwareManager, pkgs: List[SoftwarePackage]):
-        ti = time.time()
-        man.fill_sizes(pkgs)
-        tf = time.time()
-        self.logger.info(f'{man.__class__.__name__} took {tf - ti:.2f} seconds')
-
     def fill_sizes(self, pkgs: List[SoftwarePackage]):
         by_manager = self._map_pkgs_by_manager(pkgs, pkg_filters=[lambda p: p.size is None])
 
         if by_manager:
-            threads = []
-            for man, man_pkgs in by_manager.items():
-                if man_pkgs:
-                    t = Thread(target=self._fill_sizes, args=(man, man_pkgs), daemon=True)
-                    t.start()
-                    threads.append(t)
+            tasks = {man: partial(man.fill_sizes, man_pkgs) for man, man_pkgs in by_manager.items() if man_pkgs}
 
-            for t in threads:
-                t.join()
+            for _ in self.executor.run('fill_sizes', tasks):
+                pass
 
     def ignore_update(self, pkg: SoftwarePackage):
         manager = self._get_manager_for(pkg)
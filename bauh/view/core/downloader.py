@@ -1,18 +1,21 @@
+import hashlib
+import json
 import os
 import re
-import shutil
 import time
 import traceback
-from io import StringIO, BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 from logging import Logger
-from math import floor
+from math import floor, ceil
 from pathlib import Path
-from threading import Thread
-from typing import Optional, Tuple
+from threading import Thread, Lock
+from typing import Optional, Tuple, List
 
 from bauh.api.abstract.download import FileDownloader
 from bauh.api.abstract.handler import ProcessWatcher
 from bauh.api.http import HttpClient
+from bauh.commons import capabilities
 from bauh.commons.html import bold
 from bauh.commons.system import ProcessHandler, SimpleProcess
 from bauh.commons.view_utils import get_human_size_str
@@ -21,14 +24,54 @@ from bauh.view.util.translation import I18n
 RE_HAS_EXTENSION = re.compile(r'.+\.\w+$')
 
 
+def verify_file(file_path: str, size: Optional[int], sha256: Optional[str], logger: Logger) -> bool:
+    """
+    :return: if the file has the expected size and SHA-256 checksum (only the informed ones are checked)
+    """
+    if size is not None and os.path.getsize(file_path) != size:
+        logger.error(f"File '{file_path}' size ({os.path.getsize(file_path)}) differs from the expected ({size})")
+        return False
+
+    if sha256:
+        file_hash = hashlib.sha256()
+
+        with open(file_path, 'rb') as f:
+            for data in iter(lambda: f.read(1024 * 1024), b''):
+                file_hash.update(data)
+
+        if file_hash.hexdigest().lower() != sha256.strip().lower():
+            logger.error(f"File '{file_path}' checksum differs from the expected")
+            return False
+
+    return True
+
+
 class SelfFileDownloader(FileDownloader):
+    """
+    Built-in downloader (used when no multi-threaded client is available). Files bigger than 'segment_min_size'
+    are downloaded as concurrent HTTP Range segments. The content is written to a '.part' file and the progress
+    of each segment to a sidecar state file, so an interrupted download is resumed by the next call (as long as
+    the remote file has not changed). Only the bytes already flushed to the disk are recorded as progress.
+    The '.part' file is only renamed to the output path after its size (and checksum, if informed) is verified.
+    """
 
     def __init__(self, logger: Logger, i18n: I18n, http_client: HttpClient,
-                 check_ssl: bool):
+                 check_ssl: bool, max_segments: int = 4, segment_min_size: int = 4 * 1024 * 1024,
+                 chunk_size: int = 256 * 1024, write_buffer: int = 1024 * 1024, max_attempts: int = 3):
+        """
+        :param max_segments: maximum number of concurrent segments (connections) per file
+        :param segment_min_size: minimum segment size in bytes
+        :param max_attempts: attempts per segment (an interrupted segment is resumed from where it stopped)
+        """
         self._logger = logger
         self._i18n = i18n
         self._client = http_client
         self._ssl = check_ssl
+        self._max_segments = max_segments
+        self._segment_min_size = segment_min_size
+        self._chunk_size = chunk_size
+        self._write_buffer = write_buffer
+        self._max_attempts = max_attempts
 
     def is_multithreaded(self) -> bool:
         return False
@@ -48,52 +91,226 @@ class SelfFileDownloader(FileDownloader):
     def get_supported_clients(self) -> Tuple[str, ...]:
         return tuple()
 
+    def _probe(self, file_url: str) -> Tuple[Optional[int], bool, Optional[str]]:
+        """
+        :return: the file size, if byte ranges are supported and the remote file version (ETag or Last-Modified)
+        """
+        res = self._client.get(url=file_url, ignore_ssl=not self._ssl, stream=True, headers={'Range': 'bytes=0-'})
+
+        if res is None:
+            raise Exception(f"Could not reach '{file_url}'")
+
+        try:
+            size = None
+            content_range = res.headers.get('content-range')
+
+            if res.status_code == 206 and content_range and '/' in content_range:
+                total = content_range.split('/')[-1].strip()
+                size = int(total) if total.isdigit() else None
+            elif res.headers.get('content-length', '').isdigit():
+                size = int(res.headers['content-length'])
+
+            return size, res.status_code == 206 and size is not None, \
+                res.headers.get('etag') or res.headers.get('last-modified')
+        finally:
+            res.close()
+
+    def _read_state(self, state_path: str, file_url: str, size: int, version: Optional[str],
+                    part_path: str) -> Optional[List[List[int]]]:
+        try:
+            with open(state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if state.get('url') == file_url and state.get('size') == size and state.get('version') == version \
+                and os.path.isfile(part_path) and os.path.getsize(part_path) == size:
+            return state.get('segments')
+
+    def _write_state(self, state_path: str, file_url: str, size: int, version: Optional[str],
+                     segments: List[List[int]]):
+        try:
+            with open(f'{state_path}.tmp', 'w+') as f:
+                json.dump({'url': file_url, 'size': size, 'version': version, 'segments': segments}, f)
+
+            os.replace(f'{state_path}.tmp', state_path)
+        except OSError:
+            self._logger.warning(f"Could not write the download state file '{state_path}'")
+
+    def _gen_segments(self, size: int, max_threads: Optional[int]) -> List[List[int]]:
+        """
+        :return: the segments as [first byte, last byte, downloaded bytes]
+        """
+        max_segments = min(self._max_segments, max_threads) if max_threads and max_threads > 0 else self._max_segments
+        number = max(1, min(max_segments, size // self._segment_min_size))
+        segment_size = ceil(size / number)
+        return [[first, min(first + segment_size, size) - 1, 0] for first in range(0, size, segment_size)]
+
+    @staticmethod
+    def _commit_segment_data(f, segment: List[int], written: int, lock: Lock, progress: List[int]):
+        """
+        flushes the written data to the disk before recording it as progress (the state file must not record
+        bytes that could be lost if the process is killed)
+        """
+        f.flush()
+        os.fsync(f.fileno())
+
+        with lock:
+            segment[2] += written
+            progress[0] += written
+
+    def _download_segment(self, file_url: str, part_path: str, segment: List[int], lock: Lock,
+                          progress: List[int]) -> bool:
+        attempt = 0
+
+        while True:
+            first = segment[0] + segment[2]
+
+            if first > segment[1]:
+                return True
+
+            attempt += 1
+
+            try:
+                res = self._client.get(url=file_url, ignore_ssl=not self._ssl, stream=True, single_call=True,
+                                       headers={'Range': f'bytes={first}-{segment[1]}'})
+
+                if res is None or res.status_code != 206:
+                    raise Exception(f"Unexpected response for range {first}-{segment[1]} "
+                                    f"(status: {res.status_code if res is not None else None})")
+
+                with open(part_path, 'r+b', buffering=self._write_buffer) as f:
+                    f.seek(first)
+                    pending = 0  # bytes written, but not flushed to the disk yet
+
+                    try:
+                        for data in res.iter_content(chunk_size=self._chunk_size):
+                            if data:
+                                data = data[0:segment[1] - segment[0] - segment[2] - pending + 1]
+                                f.write(data)
+                                pending += len(data)
+
+                                if pending >= self._write_buffer:
+                                    self._commit_segment_data(f, segment, pending, lock, progress)
+                                    pending = 0
+                    finally:
+                        if pending:
+                            self._commit_segment_data(f, segment, pending, lock, progress)
+
+                res.close()
+
+                if segment[0] + segment[2] <= segment[1]:
+                    raise Exception(f"Connection closed before the end of range {first}-{segment[1]}")
+            except Exception:
+                if attempt >= self._max_attempts:
+                    self._logger.error(f"Could not download the range {first}-{segment[1]} of '{file_url}'")
+                    traceback.print_exc()
+                    return False
+
+                self._logger.warning(f"Download of range {first}-{segment[1]} of '{file_url}' interrupted. "
+                                     f"Resuming (attempt {attempt + 1}/{self._max_attempts})")
+
+    def _download_single(self, file_url: str, part_path: str, progress: List[int]) -> bool:
+        res = self._client.get(url=file_url, ignore_ssl=not self._ssl, stream=True)
+
+        if res is None:
+            return False
+
+        with open(part_path, 'wb', buffering=self._write_buffer) as f:
+            for data in res.iter_content(chunk_size=self._chunk_size):
+                if data:
+                    f.write(data)
+                    progress[0] += len(data)
+
+        return True
+
     def download(self, file_url: str, watcher: Optional[ProcessWatcher], output_path: str, cwd: str,
                  root_password: Optional[str] = None, substatus_prefix: str = None, display_file_size: bool = True,
-                 max_threads: int = None, known_size: int = None) -> bool:
+                 max_threads: int = None, known_size: int = None, sha256: Optional[str] = None) -> bool:
+        file_name = file_url.split("/")[-1]
+        final_path = output_path if output_path else f"{cwd if cwd else '.'}/{file_name}"
+        part_path = f'{final_path}.part'
+        state_path = f'{part_path}.state'
+
         try:
-            res = self._client.get(url=file_url, ignore_ssl=not self._ssl, stream=True)
+            size, ranges, version = self._probe(file_url)
         except Exception:
+            self._logger.error(f"Could not retrieve the information of file '{file_url}'")
+            traceback.print_exc()
             return False
 
-        try:
-            content_length = int(res.headers.get("content-length", 0))
-        except Exception:
-            content_length = 0
-            self._logger.warning(f"Could not retrieve the content-length for file '{file_url}'")
+        if size is None and known_size:
+            size = known_size
+
+        segments = None
+        if ranges and size:
+            segments = self._read_state(state_path, file_url, size, version, part_path)
+
+            if segments:
+                self._logger.info(f"Resuming the download of '{file_url}' from '{part_path}'")
+            else:
+                segments = self._gen_segments(size, max_threads)
+
+                with open(part_path, 'wb') as f:
+                    f.truncate(size)
+
+                self._write_state(state_path, file_url, size, version, segments)
 
-        file_name = file_url.split("/")[-1]
         msg = StringIO()
         msg.write(f"{substatus_prefix} " if substatus_prefix else "")
         msg.write(f"{self._i18n['downloading']} {bold(file_name)}")
         base_msg = msg.getvalue()
+        total_size_str = get_human_size_str(size) if size and display_file_size else "?"
+
+        progress = [sum(s[2] for s in segments) if segments else 0]
+        lock, results = Lock(), []
+
+        def _download():
+            try:
+                if segments:
+                    with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+                        results.extend(executor.map(lambda seg: self._download_segment(file_url, part_path, seg,
+                                                                                       lock, progress),
+                                                    segments))
+                else:
+                    results.append(self._download_single(file_url, part_path, progress))
+            except Exception:
+                traceback.print_exc()
+                results.append(False)
 
-        byte_stream = BytesIO()
-        total_downloaded = 0
-        known_size = content_length and content_length > 0
-        total_size_str = get_human_size_str(content_length) if known_size > 0 else "?"
+        worker = Thread(target=_download, daemon=True)
+        worker.start()
 
-        try:
-            for data in res.iter_content(chunk_size=1024):
-                byte_stream.write(data)
-                total_downloaded += len(data)
-                perc = f"({(total_downloaded / content_length) * 100:.2f}%) " if known_size > 0 else ""
-                watcher.change_substatus(f"{perc}{base_msg} ({get_human_size_str(total_downloaded)} / {total_size_str})")
-        except Exception:
-            self._logger.error(f"Unexpected exception while downloading file from '{file_url}'")
-            traceback.print_exc()
+        while worker.is_alive():
+            worker.join(0.5)
+
+            if watcher:
+                perc = f"({(progress[0] / size) * 100:.2f}%) " if size else ""
+                watcher.change_substatus(f"{perc}{base_msg} ({get_human_size_str(progress[0])} / {total_size_str})")
+
+            if segments:
+                with lock:
+                    self._write_state(state_path, file_url, size, version, segments)
+
+        success = bool(results) and all(results)
+
+        if not success:
+            self._logger.error(f"Could not download '{file_url}'" +
+                               (f" (the progress is kept at '{part_path}')" if segments else ''))
             return False
 
-        self._logger.info(f"Writing downloaded file content to disk: {output_path}")
+        if not verify_file(part_path, size, sha256, self._logger):
+            for path in (part_path, state_path):
+                if os.path.exists(path):
+                    os.remove(path)
 
-        try:
-            with open(output_path, "wb+") as f:
-                f.write(byte_stream.getvalue())
-        except Exception:
-            self._logger.error(f"Unexpected exception when saving downloaded content to disk: {output_path}")
-            traceback.print_exc()
             return False
 
+        os.replace(part_path, final_path)
+
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
         return True
 
 
@@ -115,11 +332,11 @@ class AdaptableFileDownloader(FileDownloader):
 
     @staticmethod
     def is_aria2c_available() -> bool:
-        return bool(shutil.which('aria2c'))
+        return capabilities.registry.is_available('aria2c')
 
     @staticmethod
     def is_axel_available() -> bool:
-        return bool(shutil.which('axel'))
+        return capabilities.registry.is_available('axel')
 
     def _get_aria2c_process(self, url: str, output_path: str, cwd: str, root_password: Optional[str], threads: int) -> SimpleProcess:
         cmd = ['aria2c', url,
@@ -233,7 +450,7 @@ class AdaptableFileDownloader(FileDownloader):
         success, _ = handler.handle_simple(process)
         return start_time, success
 
-    def download(self, file_url: str, watcher: ProcessWatcher, output_path: str = None, cwd: str = None, root_password: Optional[str] = None, substatus_prefix: str = None, display_file_size: bool = True, max_threads: int = None, known_size: int = None) -> bool:
+    def download(self, file_url: str, watcher: ProcessWatcher, output_path: str = None, cwd: str = None, root_password: Optional[str] = None, substatus_prefix: str = None, display_file_size: bool = True, max_threads: int = None, known_size: int = None, sha256: Optional[str] = None) -> bool:
         self.logger.info(f'Downloading {file_url}')
         handler = ProcessHandler(watcher)
         file_name = file_url.split('/')[-1]
@@ -266,13 +483,16 @@ class AdaptableFileDownloader(FileDownloader):
                                                                   known_size=known_size, handler=handler,
                                                                   display_file_size=display_file_size,
                                                                   root_password=root_password)
+
+                if success and sha256 and output_path and not verify_file(output_path, None, sha256, self.logger):
+                    success = False
             else:
                 start_time = time.time()
                 success = self._self_downloader.download(file_url=file_url, watcher=watcher, output_path=output_path,
                                                          cwd=cwd, root_password=root_password,
                                                          substatus_prefix=substatus_prefix,
                                                          display_file_size=display_file_size, max_threads=max_threads,
-                                                         known_size=known_size)
+                                                         known_size=known_size, sha256=sha256)
         except Exception:
             traceback.print_exc()
             self._rm_bad_file(file_name, output_path, final_cwd, handler, root_password)
@@ -0,0 +1,235 @@
+import logging
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from threading import Lock
+from typing import Dict, Callable, Optional, Generator, Tuple, TypeVar, Iterable
+
+from bauh.api.abstract.controller import SoftwareManager
+
+T = TypeVar('T')
+
+# maximum time in seconds an operation waits for all managers (None: no limit). Operations whose results must not be
+# partial (e.g: 'list_updates', 'fill_sizes', 'read_installed') are not limited
+OPERATION_TIMEOUTS = {
+    'search': 60,
+    'list_suggestions': 60,
+    'list_warnings': 30
+}
+
+
+class ManagerMetrics:
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+        self.max_time = 0.0
+        self.failures = 0
+        self.timeouts = 0
+
+    def add_call(self, duration: float, failed: bool):
+        self.calls += 1
+        self.total_time += duration
+        self.last_time = duration
+        self.max_time = max(self.max_time, duration)
+
+        if failed:
+            self.failures += 1
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> dict:
+        return {'calls': self.calls, 'avg_time': self.avg_time, 'last_time': self.last_time,
+                'max_time': self.max_time, 'failures': self.failures, 'timeouts': self.timeouts}
+
+
+class Operation:
+
+    def __init__(self, name: str):
+        self.name = name
+        self._cancel_signal = Future()
+
+    def cancel(self):
+        if not self._cancel_signal.done():
+            self._cancel_signal.set_result(None)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_signal.done()
+
+
+class ManagersExecutor:
+    """
+    Runs an operation for several managers on a shared pool of threads, yielding each result as soon as it is ready.
+    """
+
+    def __init__(self, max_workers: int, logger: logging.Logger, timeouts: Optional[Dict[str, Optional[float]]] = None):
+        self.logger = logger
+        self.timeouts = timeouts if timeouts is not None else OPERATION_TIMEOUTS
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='managers')
+        self._lock = Lock()
+        self._exclusive: Dict[str, Operation] = {}
+        self._metrics: Dict[str, Dict[str, ManagerMetrics]] = {}
+
+    def _get_metrics(self, operation: str, man: SoftwareManager) -> ManagerMetrics:
+        op_metrics = self._metrics.setdefault(operation, {})
+        man_name = man.__class__.__name__
+        metrics = op_metrics.get(man_name)
+
+        if metrics is None:
+            metrics = ManagerMetrics()
+            op_metrics[man_name] = metrics
+
+        return metrics
+
+    def get_metrics(self) -> Dict[str, Dict[str, dict]]:
+        """
+        :return: the execution metrics by operation and manager name
+        """
+        with self._lock:
+            return {op: {man: m.to_dict() for man, m in op_metrics.items()}
+                    for op, op_metrics in self._metrics.items()}
+
+    def _start(self, name: str, exclusive: bool) -> Operation:
+        operation = Operation(name)
+
+        if exclusive:
+            with self._lock:
+                previous = self._exclusive.get(name)
+                self._exclusive[name] = operation
+
+            if previous:
+                self.logger.info(f"Cancelling the previous '{name}' operation")
+                previous.cancel()
+
+        return operation
+
+    def _finish(self, operation: Operation):
+        with self._lock:
+            if self._exclusive.get(operation.name) == operation:
+                del self._exclusive[operation.name]
+
+    def cancel(self, name: str):
+        """
+        cancels the current exclusive operation with the given name
+        """
+        with self._lock:
+            operation = self._exclusive.get(name)
+
+        if operation:
+            operation.cancel()
+
+    def _execute(self, operation: Operation, man: SoftwareManager, task: Callable[[], T]) -> T:
+        ti = time.time()
+        failed = False
+        try:
+            return task()
+        except Exception:
+            failed = True
+            raise
+        finally:
+            duration = time.time() - ti
+
+            with self._lock:
+                self._get_metrics(operation.name, man).add_call(duration, failed)
+
+            self.logger.info(f"{man.__class__.__name__} took {duration:.4f} seconds ({operation.name})")
+
+    def _call_when_done(self, futures: Iterable[Future], callback: Callable[[], None]):
+        not_done = [f for f in futures if not f.done()]
+
+        if not not_done:
+            callback()
+            return
+
+        remaining, lock = [len(not_done)], Lock()
+
+        def on_future_done(_: Future):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+
+            if last:
+                try:
+                    callback()
+                except Exception:
+                    traceback.print_exc()
+
+        for future in not_done:
+            future.add_done_callback(on_future_done)
+
+    def run(self, name: str, tasks: Dict[SoftwareManager, Callable[[], T]], exclusive: bool = False,
+            on_done: Optional[Callable[[], None]] = None) -> Generator[Tuple[SoftwareManager, T], None, None]:
+        """
+        :param name: the operation name (also used to define its timeout)
+        :param tasks: the task to be executed for each manager
+        :param exclusive: if a previous operation with the same name should be cancelled
+        :param on_done: called when all tasks have actually finished. If the operation timed out or was cancelled
+        while tasks were still running, it is called later by the thread finishing the last one
+        :return: a generator yielding (manager, result) as each task finishes. Failed tasks are not yielded.
+        """
+        operation = self._start(name, exclusive)
+
+        if not tasks:
+            self._finish(operation)
+
+            if on_done:
+                on_done()
+
+            return
+
+        futures = {}
+        for man, task in tasks.items():
+            futures[self._pool.submit(self._execute, operation, man, task)] = man
+
+        timeout = self.timeouts.get(name)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        pending = set(futures)
+
+        try:
+            while pending and not operation.cancelled:
+                remaining = max(deadline - time.monotonic(), 0) if deadline is not None else None
+                done, _ = wait((*pending, operation._cancel_signal), timeout=remaining, return_when=FIRST_COMPLETED)
+
+                if not done:  # timed out
+                    with self._lock:
+                        for future in pending:
+                            self._get_metrics(name, futures[future]).timeouts += 1
+
+                    late = ', '.join(sorted(futures[f].__class__.__name__ for f in pending))
+                    self.logger.warning(f"Operation '{name}' timed out ({timeout} seconds). Not waiting for: {late}")
+                    break
+
+                for future in done:
+                    if future in pending:
+                        pending.remove(future)
+
+                        if operation.cancelled:
+                            break
+
+                        man = futures[future]
+                        try:
+                            result = future.result()
+                        except Exception:
+                            self.logger.error(f"{man.__class__.__name__} failed to execute '{name}'")
+                            traceback.print_exc()
+                            continue
+
+                        yield man, result
+
+            if operation.cancelled and pending:
+                self.logger.info(f"Operation '{name}' cancelled")
+        finally:
+            for future in pending:
+                future.cancel()  # only those not started yet
+
+            self._finish(operation)
+
+            if on_done:
+                self._call_when_done(futures, on_done)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
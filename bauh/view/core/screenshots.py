@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import os
+import time
+import traceback
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from bauh.api.paths import CACHE_DIR
+
+SCREENSHOTS_CACHE_DIR = f'{CACHE_DIR}/screenshots'
+
+
+class ScreenshotsDiskCache:
+    """
+    Size-capped disk cache of already scaled screenshots keyed by their URLs.
+    The least recently used files are removed when the maximum size is exceeded.
+    """
+
+    def __init__(self, logger: logging.Logger, cache_dir: str = SCREENSHOTS_CACHE_DIR,
+                 max_size: int = 50 * 1024 * 1024):
+        """
+        :param max_size: maximum size of the cache directory in bytes
+        """
+        self.logger = logger
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._lock = Lock()
+
+    def get_path(self, url: str) -> str:
+        return f"{self.cache_dir}/{hashlib.sha256(url.encode()).hexdigest()}"
+
+    def get(self, url: str) -> Optional[bytes]:
+        file_path = self.get_path(url)
+
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+        except OSError:
+            self.logger.error(f"Could not read the cached screenshot '{file_path}'")
+            traceback.print_exc()
+            return
+
+        try:
+            os.utime(file_path)  # marks as recently used
+        except OSError:
+            pass
+
+        return content
+
+    def add(self, url: str, content: bytes) -> bool:
+        if not content or len(content) > self.max_size:
+            return False
+
+        file_path = self.get_path(url)
+
+        with self._lock:
+            try:
+                Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+                tmp_path = f'{file_path}.tmp'
+
+                with open(tmp_path, 'wb+') as f:
+                    f.write(content)
+
+                os.replace(tmp_path, file_path)
+            except OSError:
+                self.logger.error(f"Could not write the cached screenshot '{file_path}'")
+                traceback.print_exc()
+                return False
+
+            self._shrink()
+            return True
+
+    def _shrink(self):
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.is_file() and not e.name.endswith('.tmp')]
+        except OSError:
+            return
+
+        files, total_size = [], 0
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_size:
+            return
+
+        ti = time.time()
+        removed = 0
+        for _, size, path in sorted(files):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            total_size -= size
+            removed += 1
+
+            if total_size <= self.max_size:
+                break
+
+        self.logger.info(f"{removed} cached screenshots removed ({time.time() - ti:.4f} seconds)")
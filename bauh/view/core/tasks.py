@@ -0,0 +1,103 @@
+from threading import Condition
+from typing import Dict, Set, Optional
+
+from bauh.api.abstract.controller import SoftwareManager
+from bauh.api.abstract.handler import TaskManager
+
+
+class PrepareTasksTracker:
+    """
+    Keeps track of the 'prepare' tasks registered by each manager, so an operation only has to wait for the tasks
+    the manager declared as required (see SoftwareManager.get_deferrable_prepare_tasks)
+    """
+
+    def __init__(self):
+        self._condition = Condition()
+        self._tasks: Dict[SoftwareManager, Set[str]] = dict()
+        self._finished: Dict[SoftwareManager, Set[str]] = dict()
+        self._preparing: Set[SoftwareManager] = set()
+        self._released = False
+
+    def start_preparing(self, manager: SoftwareManager):
+        with self._condition:
+            self._preparing.add(manager)
+            self._tasks.setdefault(manager, set())
+
+    def set_prepared(self, manager: SoftwareManager):
+        with self._condition:
+            self._preparing.discard(manager)
+            self._condition.notify_all()
+
+    def register(self, manager: SoftwareManager, task_id: str):
+        with self._condition:
+            self._tasks.setdefault(manager, set()).add(task_id)
+
+    def finish(self, manager: SoftwareManager, task_id: str):
+        with self._condition:
+            self._finished.setdefault(manager, set()).add(task_id)
+            self._condition.notify_all()
+
+    def release(self):
+        """
+        stops all waiting (e.g: the user skipped the initialization)
+        """
+        with self._condition:
+            self._released = True
+            self._condition.notify_all()
+
+    def _get_pending(self, manager: SoftwareManager, operation: str) -> Optional[Set[str]]:
+        if manager in self._preparing:
+            return None  # the manager is still registering its tasks
+
+        tasks = self._tasks.get(manager)
+
+        if not tasks:
+            return set()
+
+        finished = self._finished.get(manager, set())
+        deferrable = manager.get_deferrable_prepare_tasks(operation)
+        return {t for t in tasks if t not in finished and (not deferrable or t not in deferrable)}
+
+    def is_ready(self, manager: SoftwareManager, operation: str) -> bool:
+        with self._condition:
+            return self._released or self._get_pending(manager, operation) == set()
+
+    def get_pending(self, manager: SoftwareManager, operation: str) -> Optional[Set[str]]:
+        """
+        :return: the ids of the tasks the operation is still waiting for (None if the manager is still registering them)
+        """
+        with self._condition:
+            return set() if self._released else self._get_pending(manager, operation)
+
+    def wait(self, manager: SoftwareManager, operation: str, timeout: Optional[float] = None) -> bool:
+        """
+        :return: if the manager is ready for the operation
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._released or
+                                            self._get_pending(manager, operation) == set(), timeout)
+
+
+class TrackedTaskManager(TaskManager):
+    """
+    Forwards a manager's 'prepare' tasks to the view while keeping their states on a PrepareTasksTracker
+    """
+
+    def __init__(self, taskman: TaskManager, tracker: PrepareTasksTracker, manager: SoftwareManager):
+        self._taskman = taskman
+        self._tracker = tracker
+        self._manager = manager
+
+    def register_task(self, id_: str, label: str, icon_path: str):
+        self._tracker.register(self._manager, id_)
+        self._taskman.register_task(id_, label, icon_path)
+
+    def update_progress(self, task_id: str, progress: float, substatus: Optional[str]):
+        self._taskman.update_progress(task_id, progress, substatus)
+
+    def update_output(self, task_id: str, output: str):
+        self._taskman.update_output(task_id, output)
+
+    def finish_task(self, task_id: str):
+        self._taskman.finish_task(task_id)
+        self._tracker.finish(self._manager, task_id)
@@ -1,15 +1,15 @@
 import re
-import shutil
 from typing import Optional, Generator
 
 from bauh import __app_name__
+from bauh.commons import capabilities
 from bauh.commons.system import SimpleProcess, new_root_subprocess
 
 RE_SNAPSHOTS = re.compile(r'\d+\s+>\s+([\w\-_]+)\s+.+<{}>'.format(__app_name__))
 
 
 def is_available() -> bool:
-    return bool(shutil.which('timeshift'))
+    return capabilities.registry.is_available('timeshift')
 
 
 def delete_all_snapshots(root_password: Optional[str]) -> SimpleProcess:
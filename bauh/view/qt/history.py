@@ -1,21 +1,51 @@
 import operator
+import traceback
 from functools import reduce
+from typing import Optional, List
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QCursor
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QIcon, QCursor, QCloseEvent, QShowEvent
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QHeaderView, QLabel
 
 from bauh.api.abstract.cache import MemoryCache
-from bauh.api.abstract.model import PackageHistory
+from bauh.api.abstract.controller import SoftwareManager
+from bauh.api.abstract.model import PackageHistory, SoftwarePackage
 from bauh.view.qt.view_model import PackageView
 from bauh.view.util.translation import I18n
 
 
+class LoadHistoryPage(QThread):
+
+    signal_finished = pyqtSignal(object)
+
+    def __init__(self, manager: SoftwareManager, pkg: SoftwarePackage, page_size: int):
+        super(LoadHistoryPage, self).__init__()
+        self.manager = manager
+        self.pkg = pkg
+        self.page_size = page_size
+        self.offset = 0
+
+    def run(self):
+        try:
+            history = self.manager.get_history_page(self.pkg, self.offset, self.page_size)
+        except Exception:
+            traceback.print_exc()
+            history = None
+
+        self.signal_finished.emit(history)
+
+
 class HistoryDialog(QDialog):
 
-    def __init__(self, history: PackageHistory, icon_cache: MemoryCache, i18n: I18n):
+    def __init__(self, history: PackageHistory, icon_cache: MemoryCache, i18n: I18n,
+                 manager: Optional[SoftwareManager] = None, page_size: int = 20):
+        """
+        :param manager: loads the next history pages while the table is scrolled (if the history is paged)
+        """
         super(HistoryDialog, self).__init__()
         self.setWindowFlags(Qt.CustomizeWindowHint | Qt.WindowMinMaxButtonsHint | Qt.WindowCloseButtonHint)
+        self.i18n = i18n
+        self.history = history
 
         view = PackageView(model=history.pkg, i18n=i18n)
 
@@ -29,29 +59,19 @@ class HistoryDialog(QDialog):
         table_history.setShowGrid(False)
         table_history.verticalHeader().setVisible(False)
         table_history.setAlternatingRowColors(True)
+        self.table_history = table_history
 
-        table_history.setColumnCount(len(history.history[0]))
-        table_history.setRowCount(len(history.history))
-        table_history.setHorizontalHeaderLabels([i18n.get(history.pkg.get_type().lower() + '.history.' + key, i18n.get(key, key)).capitalize() for key in sorted(history.history[0].keys())])
-
-        for row, data in enumerate(history.history):
-
-            current_status = history.pkg_status_idx == row
-
-            for col, key in enumerate(sorted(data.keys())):
-                item = QLabel()
-                item.setProperty('even', row % 2 == 0)
-                item.setText(' {}'.format(data[key]))
-
-                if current_status:
-                    item.setCursor(QCursor(Qt.WhatsThisCursor))
-                    item.setProperty('outdated', str(row != 0).lower())
-
-                    tip = '{}. {}.'.format(i18n['popup.history.selected.tooltip'], i18n['version.{}'.format('updated'if row == 0 else 'outdated')].capitalize())
-
-                    item.setToolTip(tip)
+        self.keys = sorted(history.history[0].keys())
+        table_history.setColumnCount(len(self.keys))
+        table_history.setHorizontalHeaderLabels([i18n.get(history.pkg.get_type().lower() + '.history.' + key, i18n.get(key, key)).capitalize() for key in self.keys])
+        self._add_rows(history.history)
 
-                table_history.setCellWidget(row, col, item)
+        self.thread_load_page = None
+        self._loading_page = False
+        if manager and history.total is not None and history.total > len(history.history):
+            self.thread_load_page = LoadHistoryPage(manager, history.pkg, page_size)
+            self.thread_load_page.signal_finished.connect(self._add_page)
+            table_history.verticalScrollBar().valueChanged.connect(self._load_next_page)
 
         layout.addWidget(table_history)
 
@@ -68,3 +88,57 @@ class HistoryDialog(QDialog):
         # if icon_data and icon_data.get('icon'):
         #     self.setWindowIcon(icon_data.get('icon'))
         self.setWindowIcon(QIcon(history.pkg.get_type_icon_path()))
+
+    def _add_rows(self, entries: List[dict]):
+        first_row = self.table_history.rowCount()
+        self.table_history.setRowCount(first_row + len(entries))
+
+        for row, data in enumerate(entries, start=first_row):
+
+            current_status = self.history.pkg_status_idx == row
+
+            for col, key in enumerate(self.keys):
+                item = QLabel()
+                item.setProperty('even', row % 2 == 0)
+                item.setText(' {}'.format(data.get(key, '')))
+
+                if current_status:
+                    item.setCursor(QCursor(Qt.WhatsThisCursor))
+                    item.setProperty('outdated', str(row != 0).lower())
+
+                    tip = '{}. {}.'.format(self.i18n['popup.history.selected.tooltip'], self.i18n['version.{}'.format('updated'if row == 0 else 'outdated')].capitalize())
+
+                    item.setToolTip(tip)
+
+                self.table_history.setCellWidget(row, col, item)
+
+    def _load_next_page(self, value: Optional[int] = None):
+        scroll_bar = self.table_history.verticalScrollBar()
+        value = scroll_bar.value() if value is None else value
+
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep() and not self._loading_page \
+                and self.table_history.rowCount() < self.history.total:
+            self._loading_page = True
+            self.thread_load_page.offset = self.table_history.rowCount()
+            self.thread_load_page.start()
+
+    def _add_page(self, history: Optional[PackageHistory]):
+        self._loading_page = False
+
+        if history and history.history:
+            self._add_rows(history.history)
+            self._load_next_page()  # the table may not be scrollable yet
+        else:  # nothing else can be loaded
+            self.history.total = self.table_history.rowCount()
+
+    def showEvent(self, event: QShowEvent):
+        super(HistoryDialog, self).showEvent(event)
+
+        if self.thread_load_page:
+            self._load_next_page()
+
+    def closeEvent(self, event: QCloseEvent):
+        if self.thread_load_page and self.thread_load_page.isRunning():
+            self.thread_load_page.wait()
+
+        super(HistoryDialog, self).closeEvent(event)
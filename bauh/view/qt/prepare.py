@@ -1,10 +1,10 @@
-import datetime
 import operator
 import time
 from functools import reduce
-from typing import Tuple, Optional
+from threading import Event
+from typing import Tuple, Optional, Dict
 
-from PyQt5.QtCore import QSize, Qt, QThread, pyqtSignal, QCoreApplication, QMutex
+from PyQt5.QtCore import QSize, Qt, QThread, pyqtSignal, QCoreApplication, QMutex, QTimer
 from PyQt5.QtGui import QIcon, QCursor, QCloseEvent, QShowEvent
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy, QTableWidget, QHeaderView, QPushButton, \
     QProgressBar, QPlainTextEdit, QToolButton, QHBoxLayout
@@ -14,6 +14,7 @@ from bauh.api.abstract.context import ApplicationContext
 from bauh.api.abstract.controller import SoftwareManager, SoftwareAction
 from bauh.api.abstract.handler import TaskManager
 from bauh.api import user
+from bauh.view.core.controller import GenericSoftwareManager
 from bauh.view.qt.components import new_spacer, QCustomToolbar
 from bauh.view.qt.qt_utils import centralize, get_current_screen_geometry
 from bauh.view.qt.root import RootDialog
@@ -34,35 +35,37 @@ class Prepare(QThread, TaskManager):
         self.manager = manager
         self.i18n = i18n
         self.context = context
-        self.waiting_password = False
         self.password_response = None
+        self._password_replied = Event()
         self._tasks_added = set()
         self._tasks_finished = set()
         self._add_lock = QMutex()
         self._finish_lock = QMutex()
+        self.timings = {}
 
     def ask_password(self) -> Tuple[bool, Optional[str]]:
-        self.waiting_password = True
+        self._password_replied.clear()
         self.signal_ask_password.emit()
-
-        while self.waiting_password:
-            self.msleep(100)  # waiting for user input
-
+        self._password_replied.wait()  # waiting for user input
         return self.password_response
 
     def set_password_reply(self, valid: bool, password: str):
         self.password_response = valid, password
-        self.waiting_password = False
+        self._password_replied.set()
 
     def run(self):
         root_pwd = None
         if not user.is_root() and self.manager.requires_root(SoftwareAction.PREPARE, None):
+            ti = time.time()
             ok, root_pwd = self.ask_password()
+            self.timings['root password'] = time.time() - ti
 
             if not ok:
                 QCoreApplication.exit(1)
 
+        ti = time.time()
         self.manager.prepare(self, root_pwd, None)
+        self.timings['prepare'] = time.time() - ti
         self.signal_started.emit(len(self._tasks_added))
 
     def update_progress(self, task_id: str, progress: float, substatus: str):
@@ -103,49 +106,11 @@ class Prepare(QThread, TaskManager):
         self._finish_lock.unlock()
 
 
-class CheckFinished(QThread):
-    signal_finished = pyqtSignal()
-
-    def __init__(self):
-        super(CheckFinished, self).__init__()
-        self.total = 0
-        self.finished = 0
-
-    def run(self):
-        while True:
-            if self.finished == self.total:
-                break
-
-            self.msleep(5)
-
-        self.signal_finished.emit()
-
-    def update(self, finished: int):
-        if finished is not None:
-            self.finished = finished
-
-
-class EnableSkip(QThread):
-
-    signal_timeout = pyqtSignal()
-
-    def run(self):
-        ti = datetime.datetime.now()
-
-        while True:
-            if datetime.datetime.now() >= ti + datetime.timedelta(seconds=10):
-                self.signal_timeout.emit()
-                break
-
-            self.msleep(100)
-
-
 class PreparePanel(QWidget, TaskManager):
 
-    signal_status = pyqtSignal(int)
     signal_password_response = pyqtSignal(bool, str)
 
-    def __init__(self, context: ApplicationContext, manager: SoftwareManager,
+    def __init__(self, context: ApplicationContext, manager: GenericSoftwareManager,
                  i18n: I18n, manage_window: QWidget, app_config: dict, force_suggestions: bool = False):
         super(PreparePanel, self).__init__(flags=Qt.CustomizeWindowHint | Qt.WindowTitleHint)
         self.i18n = i18n
@@ -161,10 +126,22 @@ class PreparePanel(QWidget, TaskManager):
         self.output = {}
         self.added_tasks = 0
         self.ftasks = 0
+        self.total_tasks = None  # only known when all tasks are registered
+        self.all_finished = False
+        self.pending_updates: Dict[str, Tuple[float, str]] = {}
         self.started_at = None
+        self.shown_at = None
+        self.interactive_at = None
         self.self_close = False
         self.force_suggestions = force_suggestions
 
+        if force_suggestions:
+            self.initial_operation = 'list_suggestions'
+        elif app_config['boot']['load_apps']:
+            self.initial_operation = 'read_installed'
+        else:
+            self.initial_operation = 'search'
+
         self.prepare_thread = Prepare(self.context, manager, self.i18n)
         self.prepare_thread.signal_register.connect(self.register_task)
         self.prepare_thread.signal_update.connect(self.update_progress)
@@ -174,12 +151,16 @@ class PreparePanel(QWidget, TaskManager):
         self.prepare_thread.signal_output.connect(self.update_output)
         self.signal_password_response.connect(self.prepare_thread.set_password_reply)
 
-        self.check_thread = CheckFinished()
-        self.signal_status.connect(self.check_thread.update)
-        self.check_thread.signal_finished.connect(self.finish)
+        # progress updates are applied at most once per frame
+        self.updates_timer = QTimer()
+        self.updates_timer.setSingleShot(True)
+        self.updates_timer.setInterval(16)
+        self.updates_timer.timeout.connect(self._apply_pending_updates)
 
-        self.skip_thread = EnableSkip()
-        self.skip_thread.signal_timeout.connect(self._enable_skip_button)
+        self.skip_timer = QTimer()
+        self.skip_timer.setSingleShot(True)
+        self.skip_timer.setInterval(10000)
+        self.skip_timer.timeout.connect(self._enable_skip_button)
 
         self.progress_thread = AnimateProgress()
         self.progress_thread.signal_change.connect(self._change_progress)
@@ -247,7 +228,7 @@ class PreparePanel(QWidget, TaskManager):
         self.bt_bar.add_widget(new_spacer())
 
         self.bt_skip = QPushButton(self.i18n['prepare_panel.bt_skip.label'].capitalize())
-        self.bt_skip.clicked.connect(self.finish)
+        self.bt_skip.clicked.connect(self.skip)
         self.bt_skip.setEnabled(False)
         self.bt_skip.setCursor(QCursor(Qt.WaitCursor))
         self.bt_bar.add_widget(self.bt_skip)
@@ -289,6 +270,10 @@ class PreparePanel(QWidget, TaskManager):
 
     def showEvent(self, event: Optional[QShowEvent]) -> None:
         super().showEvent(event)
+
+        if self.shown_at is None:
+            self.shown_at = time.time()
+
         self.prepare_thread.start()
         screen_size = get_current_screen_geometry()
         self.setMinimumWidth(int(screen_size.width() * 0.25))
@@ -298,14 +283,15 @@ class PreparePanel(QWidget, TaskManager):
 
     def start(self, tasks: int):
         self.started_at = time.time()
-        self.check_thread.total = tasks
-        self.check_thread.start()
-        self.skip_thread.start()
+        self.total_tasks = tasks
+        self.skip_timer.start()
 
         self.progress_thread.start()
 
         self.bt_close.setVisible(True)
         self.progress_bar.setVisible(True)
+        self._check_interactive()
+        self._check_finished()
 
     def closeEvent(self, ev: QCloseEvent):
         if not self.self_close:
@@ -388,21 +374,40 @@ class PreparePanel(QWidget, TaskManager):
                            'progress': 0,
                            'lb_sub': lb_sub,
                            'finished': False,
-                           'row': task_row}
+                           'row': task_row,
+                           'registered_at': time.time()}
 
     def update_progress(self, task_id: str, progress: float, substatus: str):
-        task = self.tasks[task_id]
+        self.pending_updates[task_id] = (progress, substatus)
 
-        if progress != task['progress']:
-            task['progress'] = progress
-            task['lb_prog'].setText('{0:.2f}'.format(progress) + '%')
+        if not self.updates_timer.isActive():
+            self.updates_timer.start()
 
-        if substatus:
-            task['lb_sub'].setText('({})'.format(substatus))
-        else:
-            task['lb_sub'].setText('')
+    def _apply_pending_updates(self):
+        if not self.pending_updates:
+            return
 
-        self._resize_columns()
+        updates, self.pending_updates = self.pending_updates, {}
+        resize = False
+
+        for task_id, (progress, substatus) in updates.items():
+            task = self.tasks[task_id]
+
+            if progress != task['progress']:
+                task['progress'] = progress
+                lb_prog = task['lb_prog']
+                prog_text = '{0:.2f}'.format(progress) + '%'
+                resize = resize or len(prog_text) != len(lb_prog.text())
+                lb_prog.setText(prog_text)
+
+            sub_text = '({})'.format(substatus) if substatus else ''
+
+            if sub_text != task['lb_sub'].text():
+                task['lb_sub'].setText(sub_text)
+                resize = True
+
+        if resize:  # only when the labels width may have changed
+            self._resize_columns()
 
     def update_output(self, task_id: str, output: str):
         full_output = self.output.get(task_id)
@@ -421,6 +426,7 @@ class PreparePanel(QWidget, TaskManager):
             self.textarea_details.appendPlainText(output)
 
     def finish_task(self, task_id: str):
+        self._apply_pending_updates()
         task = self.tasks[task_id]
 
         for key in ('lb_prog', 'lb_status', 'lb_sub'):
@@ -431,14 +437,51 @@ class PreparePanel(QWidget, TaskManager):
             label.update()
 
         task['finished'] = True
+        task['finished_at'] = time.time()
         self._resize_columns()
 
         self.ftasks += 1
-        self.signal_status.emit(self.ftasks)
+        self._check_interactive()
+        self._check_finished()
+
+    def _check_finished(self):
+        if not self.all_finished and self.total_tasks is not None and self.ftasks >= self.total_tasks:
+            self.all_finished = True
+            self.finish()
+
+    def _check_interactive(self):
+        if self.interactive_at is None and self.started_at is not None and self.isVisible() \
+                and self.manager.is_prepared_for(self.initial_operation):
+            self._show_manage_window()
+
+    def _log_phases(self):
+        phases = ', '.join('{0}: {1:.4f}'.format(phase, duration) for phase, duration in self.prepare_thread.timings.items())
+        self.context.logger.info("Time to interactive: {0:.4f} seconds ({1}). Pending tasks: {2}"
+                                 .format(self.interactive_at - self.shown_at, phases, self.added_tasks - self.ftasks))
+
+    def _log_tasks(self):
+        for task_id, task in sorted(self.tasks.items(), key=lambda t: t[1].get('finished_at', 0)):
+            if task.get('finished_at'):
+                self.context.logger.info("Task '{0}' took {1:.4f} seconds".format(task_id, task['finished_at'] - task['registered_at']))
+            else:
+                self.context.logger.info("Task '{0}' did not finish".format(task_id))
+
+    def skip(self):
+        self.manager.skip_prepare()
+        self.finish()
 
     def finish(self):
         now = time.time()
         self.context.logger.info("{0} tasks finished in {1:.9f} seconds".format(self.ftasks, (now - self.started_at)))
+        self._log_tasks()
+
+        if self.isVisible():
+            self._show_manage_window()
+
+    def _show_manage_window(self):
+        self.interactive_at = time.time()
+        self._log_phases()
+
         if self.isVisible():
             self.manage_window.show()
 
@@ -1,16 +1,20 @@
 import logging
+import time
 import traceback
 from io import BytesIO
-from threading import Thread
-from typing import List, Dict
+from itertools import count
+from queue import PriorityQueue
+from threading import Thread, Lock
+from typing import List, Dict, Optional, Set, Union
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QPixmap, QCursor
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QBuffer, QIODevice
+from PyQt5.QtGui import QIcon, QPixmap, QCursor, QImage
 from PyQt5.QtWidgets import QDialog, QLabel, QPushButton, QVBoxLayout, QProgressBar, QApplication, QWidget, \
     QSizePolicy, QHBoxLayout
 
 from bauh.api.abstract.cache import MemoryCache
 from bauh.api.http import HttpClient
+from bauh.view.core.screenshots import ScreenshotsDiskCache
 from bauh.view.qt import qt_utils
 from bauh.view.qt.components import new_spacer
 from bauh.view.qt.thread import AnimateProgress
@@ -18,17 +22,170 @@ from bauh.view.qt.view_model import PackageView
 from bauh.view.util.translation import I18n
 
 
+class ScreenshotsService(QObject):
+    """
+    Downloads screenshots on a bounded pool of threads (the visible ones first). Images are decoded and scaled
+    by the workers, and stored scaled on the disk cache.
+    """
+
+    PRIORITY_VISIBLE = 0
+    PRIORITY_PREFETCH = 1
+
+    signal_progress = pyqtSignal(str, float)  # url, percentage
+    signal_loaded = pyqtSignal(str, QImage)
+    signal_failed = pyqtSignal(str, str)  # url, i18n key of the error message
+
+    def __init__(self, http_client: HttpClient, disk_cache: ScreenshotsDiskCache, logger: logging.Logger,
+                 max_workers: int = 2, max_width: int = 800, max_height: int = 600, progress_interval: float = 0.1):
+        super(ScreenshotsService, self).__init__()
+        self.http_client = http_client
+        self.disk_cache = disk_cache
+        self.logger = logger
+        self.max_workers = max_workers
+        self.max_width = max_width
+        self.max_height = max_height
+        self.progress_interval = progress_interval
+        self._queue = PriorityQueue()
+        self._seq = count()
+        self._lock = Lock()
+        self._queued: Dict[str, int] = {}  # url -> highest priority queued
+        self._running: Set[str] = set()
+        self._workers: List[Thread] = []
+
+    def request(self, url: str, priority: int = PRIORITY_VISIBLE):
+        with self._lock:
+            if url in self._running:
+                return
+
+            queued_priority = self._queued.get(url)
+
+            if queued_priority is not None and queued_priority <= priority:
+                return
+
+            self._queued[url] = priority
+            self._queue.put((priority, next(self._seq), url))
+
+            if len(self._workers) < self.max_workers:
+                worker = Thread(target=self._work, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+
+    def _work(self):
+        while True:
+            priority, _, url = self._queue.get()
+
+            with self._lock:
+                if self._queued.get(url) != priority:  # outdated entry (re-queued with a higher priority or already loaded)
+                    continue
+
+                del self._queued[url]
+                self._running.add(url)
+
+            try:
+                self._load(url)
+            except Exception:
+                self.logger.error(f"Unexpected exception while loading screenshot '{url}'")
+                traceback.print_exc()
+                self.signal_failed.emit(url, 'screenshots.download.no_response')
+            finally:
+                with self._lock:
+                    self._running.discard(url)
+
+    def _load(self, url: str):
+        cached = self.disk_cache.get(url)
+
+        if cached:
+            img = QImage.fromData(cached)
+
+            if not img.isNull():
+                self.logger.info(f"Screenshot loaded from the disk cache ({url})")
+                self.signal_loaded.emit(url, img)
+                return
+
+        content = self._download(url)
+
+        if content is None:
+            return
+
+        img = QImage.fromData(content)
+
+        if img.isNull():
+            self.logger.warning(f"Could not decode screenshot '{url}'")
+            self.signal_failed.emit(url, 'screenshots.download.no_content')
+            return
+
+        if img.height() > self.max_height or img.width() > self.max_width:
+            img = img.scaled(self.max_width, self.max_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        self.signal_loaded.emit(url, img)
+
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+
+        if img.save(buffer, 'PNG' if img.hasAlphaChannel() else 'JPG', 90):
+            self.disk_cache.add(url, bytes(buffer.data()))
+
+        buffer.close()
+
+    def _download(self, url: str) -> Optional[bytes]:
+        self.logger.info(f"Downloading screenshot from {url}")
+
+        try:
+            res = self.http_client.get(url=url, stream=True)
+        except Exception:
+            self.logger.error(f"Unexpected exception while downloading screenshot from '{url}'")
+            traceback.print_exc()
+            self.signal_failed.emit(url, 'screenshots.download.no_response')
+            return
+
+        if not res:
+            self.logger.info(f"Could not retrieve screenshot from '{url}'")
+            self.signal_failed.emit(url, 'screenshots.download.no_response')
+            return
+
+        try:
+            content_length = int(res.headers.get("content-length", 0))
+        except Exception:
+            content_length = 0
+            self.logger.warning(f"Could not retrieve the content-length for file '{url}'")
+
+        if content_length <= 0:
+            self.logger.warning(f"Screenshot has no content ({url})")
+            self.signal_failed.emit(url, 'screenshots.download.no_content')
+            return
+
+        byte_stream = BytesIO()
+        total_downloaded, last_progress = 0, 0
+
+        try:
+            for data in res.iter_content(chunk_size=64 * 1024):
+                byte_stream.write(data)
+                total_downloaded += len(data)
+
+                now = time.monotonic()
+                if now - last_progress >= self.progress_interval:
+                    last_progress = now
+                    self.signal_progress.emit(url, (total_downloaded / content_length) * 100)
+        except Exception:
+            self.logger.error(f"Unexpected exception while downloading screenshot from '{url}'")
+            traceback.print_exc()
+            self.signal_failed.emit(url, 'screenshots.download.no_response')
+            return
+
+        self.logger.info(f"Screenshot successfully downloaded ({url})")
+        return byte_stream.getvalue()
+
+
 class ScreenshotsDialog(QDialog):
 
-    def __init__(self, pkg: PackageView, http_client: HttpClient, icon_cache: MemoryCache, i18n: I18n, screenshots: List[QPixmap], logger: logging.Logger):
+    def __init__(self, pkg: PackageView, service: ScreenshotsService, icon_cache: MemoryCache, i18n: I18n, screenshots: List[str], logger: logging.Logger):
         super(ScreenshotsDialog, self).__init__()
         self.setWindowTitle(str(pkg))
         self.screenshots = screenshots
         self.logger = logger
-        self.loaded_imgs = []
-        self.download_threads = []
+        self.loaded_imgs: Dict[int, Union[QPixmap, str]] = dict()
         self.i18n = i18n
-        self.http_client = http_client
+        self.service = service
         self.progress_bar = QProgressBar()
         self.progress_bar.setObjectName('progress_screenshots')
         self.progress_bar.setCursor(QCursor(Qt.WaitCursor))
@@ -102,17 +259,66 @@ class ScreenshotsDialog(QDialog):
         self.layout().addWidget(self.container_buttons)
 
         self.img_idx = 0
-        self.max_img_width = 800
-        self.max_img_height = 600
-
-        for idx, s in enumerate(self.screenshots):
-            t = Thread(target=self._download_img, args=(idx, s), daemon=True)
-            t.start()
+        self.service.signal_progress.connect(self._update_download_progress)
+        self.service.signal_loaded.connect(self._add_img)
+        self.service.signal_failed.connect(self._add_error)
 
-        self.resize(self.max_img_width + 5, self.max_img_height + 5)
+        self.resize(self.service.max_width + 5, self.service.max_height + 5)
         self._load_img(self.img_idx)
+        self._request_imgs()
         qt_utils.centralize(self)
 
+    def done(self, result: int):
+        for signal, slot in ((self.service.signal_progress, self._update_download_progress),
+                             (self.service.signal_loaded, self._add_img),
+                             (self.service.signal_failed, self._add_error)):
+            try:
+                signal.disconnect(slot)
+            except TypeError:  # already disconnected
+                pass
+
+        super(ScreenshotsDialog, self).done(result)
+
+    def _request_imgs(self):
+        """
+        requests the visible image and prefetches the next one
+        """
+        for idx, priority in ((self.img_idx, ScreenshotsService.PRIORITY_VISIBLE),
+                              (self.img_idx + 1, ScreenshotsService.PRIORITY_PREFETCH)):
+            if idx < len(self.screenshots) and idx not in self.loaded_imgs:
+                self.service.request(self.screenshots[idx], priority)
+
+    def _indexes_of(self, url: str) -> List[int]:
+        return [idx for idx, s in enumerate(self.screenshots) if s == url]
+
+    def _update_download_progress(self, url: str, progress: float):
+        for idx in self._indexes_of(url):
+            self.download_progress[idx] = progress
+
+            if idx == self.img_idx:
+                self._load_img(idx)
+
+    def _add_img(self, url: str, img: QImage):
+        idxs = self._indexes_of(url)
+
+        if idxs:
+            pixmap = QPixmap.fromImage(img)
+
+            for idx in idxs:
+                self.loaded_imgs[idx] = pixmap
+
+            if self.img_idx in idxs:
+                self._load_img(self.img_idx)
+
+    def _add_error(self, url: str, i18n_key: str):
+        idxs = self._indexes_of(url)
+
+        for idx in idxs:
+            self.loaded_imgs[idx] = self.i18n[i18n_key]
+
+        if self.img_idx in idxs:
+            self._load_img(self.img_idx)
+
     def _update_progress(self, val: int):
         self.progress_bar.setValue(val)
 
@@ -120,9 +326,9 @@ class ScreenshotsDialog(QDialog):
         if img_idx != self.img_idx:
             return
 
-        if len(self.loaded_imgs) > self.img_idx:
-            img = self.loaded_imgs[self.img_idx]
+        img = self.loaded_imgs.get(self.img_idx)
 
+        if img is not None:
             if isinstance(img, QPixmap):
                 self.img_label.setText(f'{self.img_idx + 1}/{len(self.screenshots)}')
                 self.img.setText('')
@@ -151,66 +357,12 @@ class ScreenshotsDialog(QDialog):
             self.bt_back.setEnabled(self.img_idx != 0)
             self.bt_next.setEnabled(self.img_idx != len(self.screenshots) - 1)
 
-    def _handle_download_exception(self, idx: int, url: str):
-        self.logger.error(f"Unexpected exception while downloading screenshot from '{url}'")
-        traceback.print_exc()
-        self.loaded_imgs.append(self.i18n["screenshots.download.no_response"])
-        self._load_img(idx)
-
-    def _download_img(self, idx: int, url: str):
-        self.logger.info(f"Downloading image [{idx}] from {url}")
-
-        try:
-            res = self.http_client.get(url=url, stream=True)
-        except Exception:
-            self._handle_download_exception(idx, url)
-            return
-
-        if not res:
-            self.logger.info(f"Could not retrieve image [{idx}] from '{url}'")
-            self.loaded_imgs.append(self.i18n["screenshots.download.no_response"])
-            self._load_img(idx)
-            return
-
-        try:
-            content_length = int(res.headers.get("content-length", 0))
-        except Exception:
-            content_length = 0
-            self.logger.warning(f"Could not retrieve the content-length for file '{url}'")
-
-        if content_length <= 0:
-            self.logger.warning(f"Image [{idx}] has no content ({url})")
-            self.loaded_imgs.append(self.i18n['screenshots.download.no_content'])
-            self._load_img(idx)
-        else:
-            byte_stream = BytesIO()
-
-            total_downloaded = 0
-            try:
-                for data in res.iter_content(chunk_size=1024):
-                    byte_stream.write(data)
-                    total_downloaded += len(data)
-                    self.download_progress[idx] = (total_downloaded / content_length) * 100
-                    self._load_img(idx)
-            except Exception:
-                self._handle_download_exception(idx, url)
-                return
-
-            self.logger.info(f"Image [{idx}] successfully downloaded ({url})")
-            pixmap = QPixmap()
-            pixmap.loadFromData(byte_stream.getvalue())
-
-            if pixmap.size().height() > self.max_img_height or pixmap.size().width() > self.max_img_width:
-                pixmap = pixmap.scaled(self.max_img_width, self.max_img_height, Qt.KeepAspectRatio,
-                                       Qt.SmoothTransformation)
-
-            self.loaded_imgs.append(pixmap)
-            self._load_img(idx)
-
     def back(self):
         self.img_idx -= 1
         self._load_img(self.img_idx)
+        self._request_imgs()
 
     def next(self):
         self.img_idx += 1
         self._load_img(self.img_idx)
+        self._request_imgs()
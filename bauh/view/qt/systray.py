@@ -1,7 +1,6 @@
 import json
 import logging
 import os
-import shutil
 import sys
 import traceback
 from io import StringIO
@@ -16,7 +15,7 @@ from PyQt5.QtWidgets import QSystemTrayIcon, QMenu
 from bauh import __app_name__, ROOT_DIR
 from bauh.api.abstract.model import PackageUpdate
 from bauh.api.http import HttpClient
-from bauh.commons import system
+from bauh.commons import system, capabilities
 from bauh.context import generate_i18n
 from bauh.view.core.tray_client import TRAY_CHECK_FILE
 from bauh.view.core.update import check_for_update
@@ -45,7 +44,7 @@ def get_cli_path() -> str:
         if os.path.exists(cli_path):
             return cli_path
     else:
-        return shutil.which(CLI_NAME)
+        return capabilities.registry.which(CLI_NAME)
 
 
 def list_updates(logger: logging.Logger) -> List[PackageUpdate]:
@@ -9,6 +9,7 @@ from io import StringIO
 from logging import Logger
 from pathlib import Path
 from queue import Queue
+from threading import Event
 from typing import List, Type, Set, Tuple, Optional, Pattern
 
 import requests
@@ -31,7 +32,9 @@ from bauh.commons.regex import RE_URL
 from bauh.commons.system import ProcessHandler, SimpleProcess
 from bauh.commons.view_utils import get_human_size_str
 from bauh.view.core import timeshift
+from bauh.view.core.console import ConsoleOutputBuffer
 from bauh.view.core.config import CoreConfigManager, BACKUP_REMOVE_METHODS, BACKUP_DEFAULT_REMOVE_METHOD
+from bauh.view.core.controller import GenericSoftwareManager
 from bauh.view.qt import commons
 from bauh.view.qt.commons import sort_packages, PackageFilters
 from bauh.view.qt.qt_utils import get_current_screen_geometry
@@ -57,10 +60,12 @@ class AsyncAction(QThread, ProcessWatcher):
     def __init__(self, i18n: I18n, root_password: Optional[Tuple[bool, str]] = None):
         super(AsyncAction, self).__init__()
         self.i18n = i18n
-        self.wait_confirmation = False
         self.confirmation_res = None
         self.root_password = root_password
         self.stop = False
+        self._user_replied = Event()
+        self._user_interaction_cancelled = False
+        self.output: Optional[ConsoleOutputBuffer] = None  # if defined, the output is buffered instead of emitted
 
     def request_confirmation(self, title: str, body: str, components: List[ViewComponent] = None,
                              confirmation_label: str = None, deny_label: str = None, deny_button: bool = True,
@@ -69,7 +74,11 @@ class AsyncAction(QThread, ProcessWatcher):
                              min_width: Optional[int] = None,
                              min_height: Optional[int] = None,
                              max_width: Optional[int] = None) -> bool:
-        self.wait_confirmation = True
+        self._user_replied.clear()
+
+        if self._user_interaction_cancelled:
+            return False
+
         self.signal_confirmation.emit({'title': title, 'body': body, 'components': components,
                                        'confirmation_label': confirmation_label, 'deny_label': deny_label,
                                        'deny_button': deny_button, 'window_cancel': window_cancel,
@@ -79,7 +88,11 @@ class AsyncAction(QThread, ProcessWatcher):
         return self.confirmation_res
 
     def request_root_password(self) -> Tuple[bool, Optional[str]]:
-        self.wait_confirmation = True
+        self._user_replied.clear()
+
+        if self._user_interaction_cancelled:
+            return False, None
+
         self.signal_root_password.emit()
         self.wait_user()
         res = self.root_password
@@ -88,19 +101,31 @@ class AsyncAction(QThread, ProcessWatcher):
 
     def confirm(self, res: bool):
         self.confirmation_res = res
-        self.wait_confirmation = False
+        self._user_replied.set()
 
     def set_root_password(self, valid: bool, password: str):
         self.root_password = (valid, password)
-        self.wait_confirmation = False
+        self._user_replied.set()
 
     def wait_user(self):
-        while self.wait_confirmation:
-            self.msleep(10)
+        self._user_replied.wait()  # blocks until the dialog returns (or the interaction is cancelled)
+
+    def cancel_user_interaction(self):
+        """
+        releases the thread waiting for the user (e.g: the window is closing). Current and next
+        requests are denied.
+        """
+        self._user_interaction_cancelled = True
+        self.confirmation_res = False
+        self.root_password = (False, None)
+        self._user_replied.set()
 
     def print(self, msg: str):
         if msg:
-            self.signal_output.emit(msg)
+            if self.output is not None:
+                self.output.append(msg)
+            else:
+                self.signal_output.emit(msg)
 
     def show_message(self, title: str, body: str, type_: MessageType = MessageType.INFO):
         self.signal_message.emit({'title': title, 'body': body, 'type': type_})
@@ -701,15 +726,21 @@ class ShowPackageInfo(AsyncAction):
 
 class ShowPackageHistory(AsyncAction):
 
-    def __init__(self, manager: SoftwareManager, i18n: I18n, pkg: PackageView = None):
+    def __init__(self, manager: SoftwareManager, i18n: I18n, pkg: PackageView = None, page_size: int = 20):
         super(ShowPackageHistory, self).__init__(i18n=i18n)
         self.pkg = pkg
         self.manager = manager
+        self.page_size = page_size
 
     def run(self):
         if self.pkg:
             try:
-                self.notify_finished({'history': self.manager.get_history(self.pkg.model)})
+                history = self.manager.get_history_page(self.pkg.model, 0, self.page_size)
+
+                if history is None:  # paging not supported
+                    history = self.manager.get_history(self.pkg.model)
+
+                self.notify_finished({'history': history})
             except (requests.exceptions.ConnectionError, NoInternetException) as e:
                 self.notify_finished({'error': self.i18n['internet.required']})
             finally:
@@ -718,7 +749,9 @@ class ShowPackageHistory(AsyncAction):
 
 class SearchPackages(AsyncAction):
 
-    def __init__(self, i18n: I18n, manager: SoftwareManager):
+    signal_partial = pyqtSignal(list)  # packages found so far (while some managers are still searching)
+
+    def __init__(self, i18n: I18n, manager: GenericSoftwareManager):
         super(SearchPackages, self).__init__(i18n=i18n)
         self.word = None
         self.manager = manager
@@ -728,8 +761,14 @@ class SearchPackages(AsyncAction):
 
         if self.word:
             try:
-                res = self.manager.search(words=self.word, disk_loader=None, limit=-1, is_url=False)
-                search_res['pkgs_found'] = sort_packages((*(res.installed or ()), *(res.new or ())), self.word)
+                found = []
+                for man_res in self.manager.search_stream(words=self.word):
+                    found.extend((*(man_res.installed or ()), *(man_res.new or ())))
+
+                    if found:
+                        self.signal_partial.emit(sort_packages(found, self.word))
+
+                search_res['pkgs_found'] = sort_packages(found, self.word)
             except NoInternetException:
                 search_res['error'] = 'internet.required'
             finally:
@@ -916,14 +955,22 @@ class NotifyInstalledLoaded(QThread):
 
 class FindSuggestions(AsyncAction):
 
-    def __init__(self, i18n: I18n, man: SoftwareManager):
+    signal_partial = pyqtSignal(list)  # suggestions found so far (while some managers are still loading them)
+
+    def __init__(self, i18n: I18n, man: GenericSoftwareManager):
         super(FindSuggestions, self).__init__(i18n=i18n)
         self.man = man
         self.filter_installed = False
 
     def run(self):
-        sugs = self.man.list_suggestions(limit=-1, filter_installed=self.filter_installed)
-        self.notify_finished({'pkgs_found': [s.package for s in sugs] if sugs is not None else [], 'error': None})
+        sugs = []
+        try:
+            for man_sugs in self.man.list_suggestions_stream(filter_installed=self.filter_installed):
+                sugs.extend(man_sugs)
+                sugs.sort(key=lambda s: s.priority.value, reverse=True)
+                self.signal_partial.emit([s.package for s in sugs])
+        finally:
+            self.notify_finished({'pkgs_found': [s.package for s in sugs], 'error': None})
 
 
 class ListWarnings(QThread):
@@ -951,7 +998,6 @@ class LaunchPackage(AsyncAction):
     def run(self):
         if self.pkg:
             try:
-                super(LaunchPackage, self).msleep(250)
                 self.manager.launch(self.pkg.model)
                 self.notify_finished(True)
             except Exception:
@@ -1035,7 +1081,7 @@ class CustomAction(AsyncAction):
             res['success'] = False
             res['error'] = 'internet.required'
             res['error_type'] = MessageType.WARNING
-            self.signal_output.emit(self.i18n['internet.required'])
+            self.print(self.i18n['internet.required'])
 
         self.notify_finished(res)
         self.pkg = None
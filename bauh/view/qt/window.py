@@ -6,7 +6,7 @@ import time
 from pathlib import Path
 from typing import List, Type, Set, Tuple, Optional, Dict, Any
 
-from PyQt5.QtCore import QEvent, Qt, pyqtSignal, QRect
+from PyQt5.QtCore import QEvent, Qt, pyqtSignal, QRect, QTimer
 from PyQt5.QtGui import QIcon, QWindowStateChangeEvent, QCursor, QCloseEvent, QShowEvent
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QCheckBox, QHeaderView, QToolBar, \
     QLabel, QPlainTextEdit, QProgressBar, QPushButton, QComboBox, QApplication, QListView, QSizePolicy, \
@@ -24,6 +24,8 @@ from bauh.commons.html import bold
 from bauh.context import set_theme
 from bauh.stylesheet import read_all_themes_metadata, ThemeMetadata
 from bauh.view.core.config import CoreConfigManager
+from bauh.view.core.console import ConsoleOutputBuffer
+from bauh.view.core.screenshots import ScreenshotsDiskCache
 from bauh.view.core.tray_client import notify_tray
 from bauh.view.qt import dialog, commons, qt_utils
 from bauh.view.qt.about import AboutDialog
@@ -36,7 +38,7 @@ from bauh.view.qt.history import HistoryDialog
 from bauh.view.qt.info import InfoDialog
 from bauh.view.qt.qt_utils import get_current_screen_geometry
 from bauh.view.qt.root import RootDialog
-from bauh.view.qt.screenshots import ScreenshotsDialog
+from bauh.view.qt.screenshots import ScreenshotsDialog, ScreenshotsService
 from bauh.view.qt.settings import SettingsWindow
 from bauh.view.qt.thread import UpgradeSelected, RefreshApps, UninstallPackage, DowngradePackage, ShowPackageInfo, \
     ShowPackageHistory, SearchPackages, InstallPackage, AnimateProgress, NotifyPackagesReady, FindSuggestions, \
@@ -50,6 +52,7 @@ from bauh.view.util import util, resource
 from bauh.view.util.translation import I18n
 
 DARK_ORANGE = '#FF4500'
+CONSOLE_MAX_LINES = 5000
 
 
 # action ids
@@ -119,6 +122,8 @@ class ManageWindow(QWidget):
         self.config = config
         self.context = context
         self.http_client = http_client
+        self.screenshots_service = ScreenshotsService(http_client=http_client, logger=logger,
+                                                      disk_cache=ScreenshotsDiskCache(logger))
 
         self.icon_app = icon
         self.setWindowIcon(self.icon_app)
@@ -332,6 +337,13 @@ class ManageWindow(QWidget):
         self.layout.addWidget(self.textarea_details)
         self.textarea_details.setVisible(False)
         self.textarea_details.setReadOnly(True)
+        self.textarea_details.setMaximumBlockCount(CONSOLE_MAX_LINES)
+
+        # the actions output is buffered and displayed in batches (the full output is kept on disk)
+        self.console_output = ConsoleOutputBuffer()
+        self.timer_console = QTimer(self)
+        self.timer_console.setInterval(100)
+        self.timer_console.timeout.connect(self._drain_console_output)
 
         self.toolbar_substatus = QToolBar()
         self.toolbar_substatus.setObjectName('toolbar_substatus')
@@ -345,6 +357,7 @@ class ManageWindow(QWidget):
         self.layout.addWidget(self.toolbar_substatus)
         self._change_label_substatus('')
 
+        self._interactive_actions: List[AsyncAction] = []  # actions that may wait for the user
         self.thread_update = self._bind_async_action(UpgradeSelected(manager=self.manager, i18n=self.i18n,
                                                                      internet_checker=context.internet_checker,
                                                                      parent_widget=self),
@@ -354,8 +367,10 @@ class ManageWindow(QWidget):
         self.thread_show_info = self._bind_async_action(ShowPackageInfo(i18n, self.manager), finished_call=self._finish_show_info)
         self.thread_show_history = self._bind_async_action(ShowPackageHistory(self.manager, self.i18n), finished_call=self._finish_show_history)
         self.thread_search = self._bind_async_action(SearchPackages(i18n, self.manager), finished_call=self._finish_search, only_finished=True)
+        self.thread_search.signal_partial.connect(self._show_search_partial)
         self.thread_downgrade = self._bind_async_action(DowngradePackage(self.manager, self.i18n), finished_call=self._finish_downgrade)
         self.thread_suggestions = self._bind_async_action(FindSuggestions(i18n=i18n, man=self.manager), finished_call=self._finish_load_suggestions, only_finished=True)
+        self.thread_suggestions.signal_partial.connect(self._show_search_partial)
         self.thread_launch = self._bind_async_action(LaunchPackage(i18n, self.manager), finished_call=self._finish_launch_package, only_finished=False)
         self.thread_custom_action = self._bind_async_action(CustomAction(manager=self.manager, i18n=self.i18n), finished_call=self._finish_execute_custom_action)
         self.thread_screenshots = self._bind_async_action(ShowScreenshots(i18n, self.manager), finished_call=self._finish_show_screenshots)
@@ -562,8 +577,9 @@ class ManageWindow(QWidget):
         action.signal_finished.connect(finished_call)
 
         if not only_finished:
+            self._interactive_actions.append(action)
             action.signal_confirmation.connect(self._ask_confirmation)
-            action.signal_output.connect(self._update_action_output)
+            action.output = self.console_output
             action.signal_message.connect(self._show_message)
             action.signal_status.connect(self._change_label_status)
             action.signal_substatus.connect(self._change_label_substatus)
@@ -752,6 +768,7 @@ class ManageWindow(QWidget):
     def _handle_console_option(self, enable: bool):
         if enable:
             self.textarea_details.clear()
+            self.console_output.reset()
 
         self.comp_manager.set_component_visible(CHECK_DETAILS, enable)
         self.check_details.setChecked(False)
@@ -1256,7 +1273,7 @@ class ManageWindow(QWidget):
             self._write_operation_logs('upgrade', custom_log_file=f"{UpgradeSelected.UPGRADE_LOGS_DIR}/{res['id']}.log")
             sum_log_file = UpgradeSelected.SUMMARY_FILE.format(res['id'])
             summ_msg = '* ' + self.i18n['console.upgrade_summary'].format(path=f'"{sum_log_file}"')
-            self.textarea_details.appendPlainText(summ_msg)
+            self._update_action_output(summ_msg)
 
         if res['success']:
             self.comp_manager.remove_saved_state(ACTION_UPGRADE)
@@ -1284,9 +1301,20 @@ class ManageWindow(QWidget):
             self.comp_manager.set_component_visible(CHECK_DETAILS, False)
 
     def _update_action_output(self, output: str):
-        self.textarea_details.appendPlainText(output)
+        self.console_output.append(output)
+        self._drain_console_output()
+
+    def _drain_console_output(self):
+        lines, skipped = self.console_output.drain()
+
+        if skipped:
+            self.textarea_details.appendPlainText(self.i18n['console.output_skipped'].format(n=skipped))
+
+        if lines:
+            self.textarea_details.appendPlainText('\n'.join(lines))
 
     def _begin_action(self, action_label: str, action_id: int = None):
+        self.timer_console.start()
         self.thread_animate_progress.stop = False
         self.thread_animate_progress.start()
         self.progress_bar.setVisible(True)
@@ -1305,6 +1333,8 @@ class ManageWindow(QWidget):
             self.comp_manager.set_component_visible(BT_CUSTOM_ACTIONS, bool(self.custom_actions))
 
     def _finish_action(self, action_id: int = None):
+        self.timer_console.stop()
+        self._drain_console_output()
         self.thread_animate_progress.stop = True
         self.thread_animate_progress.wait(msecs=1000)
 
@@ -1391,7 +1421,7 @@ class ManageWindow(QWidget):
 
         if res.get('screenshots'):
             diag = ScreenshotsDialog(pkg=res['pkg'],
-                                     http_client=self.http_client,
+                                     service=self.screenshots_service,
                                      icon_cache=self.icon_cache,
                                      logger=self.logger,
                                      i18n=self.i18n,
@@ -1414,14 +1444,15 @@ class ManageWindow(QWidget):
 
         if res.get('error'):
             self._handle_console_option(True)
-            self.textarea_details.appendPlainText(res['error'])
+            self._update_action_output(res['error'])
             self.check_details.setChecked(True)
         elif not res['history'].history:
             dialog.show_message(title=self.i18n['action.history.no_history.title'],
                                 body=self.i18n['action.history.no_history.body'].format(bold(res['history'].pkg.name)),
                                 type_=MessageType.WARNING)
         else:
-            dialog_history = HistoryDialog(res['history'], self.icon_cache, self.i18n)
+            dialog_history = HistoryDialog(res['history'], self.icon_cache, self.i18n, manager=self.manager,
+                                           page_size=self.thread_show_history.page_size)
             dialog_history.exec_()
 
     def search(self):
@@ -1438,6 +1469,16 @@ class ManageWindow(QWidget):
             self.thread_search.word = word
             self.thread_search.start()
 
+    def _show_search_partial(self, pkgs: List[SoftwarePackage]):
+        """
+        displays the packages found so far (the table remains disabled until the search/suggestions loading is finished)
+        """
+        self.table_apps.stop_file_downloader()
+        to_display = pkgs[0:self.display_limit] if self.display_limit and self.display_limit > 0 else pkgs
+        self._update_table(pkgs_info={'pkgs_displayed': [PackageView(model=p, i18n=self.i18n) for p in to_display],
+                                      'not_installed': 1})
+        self._set_table_enabled(False)
+
     def _finish_search(self, res: dict):
         self._finish_action()
         self.search_performed = True
@@ -1481,9 +1522,7 @@ class ManageWindow(QWidget):
     def _write_operation_logs(self, type_: str, pkg: Optional[PackageView] = None,
                               custom_log_file: Optional[str] = None):
 
-        console_output = self.textarea_details.toPlainText()
-
-        if console_output:
+        if self.console_output.has_output():
             if custom_log_file:
                 log_dir = os.path.dirname(custom_log_file)
                 log_file = custom_log_file
@@ -1501,14 +1540,13 @@ class ManageWindow(QWidget):
                 return
 
             try:
-                with open(log_file, 'w+') as f:
-                    f.write(console_output)
+                self.console_output.save(log_file)
             except OSError:
                 self.logger.error(f"Could not write the operation log to file '{log_file}'")
                 return
 
             log_msg = '\n* ' + self.i18n['console.operation_log'].format(path=f'"{log_file}"')
-            self.textarea_details.appendPlainText(log_msg)
+            self._update_action_output(log_msg)
 
     def _finish_install(self, res: dict):
         self._finish_action(action_id=ACTION_INSTALL)
@@ -1820,6 +1858,9 @@ class ManageWindow(QWidget):
         # needs to be stopped to avoid a Qt exception/crash
         self.table_apps.stop_file_downloader(wait=True)
 
+        for action in self._interactive_actions:  # releasing the threads waiting for a dialog reply
+            action.cancel_user_interaction()
+
     @property
     def can_open_urls(self) -> bool:
         if self._can_open_urls is None:
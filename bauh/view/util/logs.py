@@ -1,22 +1,107 @@
+import atexit
+import json
 import logging
+import os
+import time
+import traceback
 from logging import INFO
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from queue import Queue
+from typing import Optional
 
 FORMAT = '%(asctime)s %(levelname)s [%(module_path)s:%(lineno)s - %(funcName)s()] - %(message)s'
+FILE_MAX_SIZE = 5 * 1024 * 1024  # bytes
+FILE_BACKUPS = 3
 
 
-class FilePathFilter(logging.Filter):
+def get_module_path(pathname: str) -> str:
+    return pathname.split('site-packages/')[1] if 'site-packages' in pathname else str(pathname)
 
-    def filter(self, record):
-        record.module_path = record.pathname.split('site-packages/')[1] if 'site-packages' in record.pathname else str(record.pathname)
-        return True
 
+class TextFormatter(logging.Formatter):
 
-def new_logger(name: str, enabled: bool) -> logging.Logger:
-    instance = logging.Logger(name, level=INFO)
-    instance.addFilter(FilePathFilter())
-    stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(logging.Formatter(FORMAT))
-    instance.addHandler(stream_handler)
+    def format(self, record: logging.LogRecord) -> str:
+        record.module_path = get_module_path(record.pathname)
+        return super(TextFormatter, self).format(record)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats each record as a JSON object (one per line). Timing fields:
+    'ts': record creation timestamp, 'uptime': seconds since the logging started,
+    'delay': seconds between the record creation and its formatting
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {'ts': round(record.created, 6),
+                'time': self.formatTime(record),
+                'level': record.levelname,
+                'logger': record.name,
+                'module': get_module_path(record.pathname),
+                'line': record.lineno,
+                'func': record.funcName,
+                'thread': record.threadName,
+                'uptime': round(record.relativeCreated / 1000, 3),
+                'delay': round(time.time() - record.created, 6),
+                'msg': record.getMessage()}
+
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+
+        if record.stack_info:
+            data['stack'] = self.formatStack(record.stack_info)
+
+        return json.dumps(data, ensure_ascii=False)
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    The records are consumed by a listener of the same process, so the message formatting
+    is left to the listener thread (it does not happen in the thread logging it).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def new_logger(name: str, enabled: bool, file_path: Optional[str] = None, json_format: bool = False,
+               stream: bool = True, file_max_size: int = FILE_MAX_SIZE, file_backups: int = FILE_BACKUPS) -> logging.Logger:
+    """
+    :param enabled: if disabled, the level checks discard all records before anything else
+    :param file_path: if defined, the records are also written to this file (rotated when 'file_max_size' is reached)
+    :param json_format: if the records should be written as JSON lines
+    :param stream: if the records should be written to stderr
+    :return: a logger whose records are written by a background listener thread
+    """
+    instance = logging.Logger(name, level=INFO if enabled else logging.CRITICAL + 1)
     instance.disabled = not enabled
 
+    if not enabled:
+        return instance
+
+    formatter = JsonLinesFormatter() if json_format else TextFormatter(FORMAT)
+    handlers = []
+
+    if stream:
+        handlers.append(logging.StreamHandler())
+
+    if file_path:
+        try:
+            Path(os.path.dirname(os.path.abspath(file_path))).mkdir(parents=True, exist_ok=True)
+            handlers.append(RotatingFileHandler(file_path, maxBytes=file_max_size, backupCount=file_backups,
+                                                encoding='utf-8', delay=True))
+        except OSError:
+            traceback.print_exc()
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue = Queue(-1)
+    instance.addHandler(LocalQueueHandler(queue))
+
+    listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # flushing the records still queued
+
     return instance
@@ -0,0 +1,95 @@
+import os
+import time
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from bauh.commons.capabilities import CapabilityRegistry
+
+
+class CapabilityRegistryTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.bin_dir = f'{self.tmp_dir.name}/bin'
+        os.mkdir(self.bin_dir)
+        self.env = patch.dict(os.environ, {'PATH': self.bin_dir})
+        self.env.start()
+        self.registry = CapabilityRegistry()
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp_dir.cleanup()
+
+    def add_binary(self, name: str, content: str = '#!/bin/sh\n') -> str:
+        file_path = f'{self.bin_dir}/{name}'
+
+        with open(f'{file_path}.tmp', 'w+') as f:
+            f.write(content)
+
+        os.chmod(f'{file_path}.tmp', 0o755)
+        os.replace(f'{file_path}.tmp', file_path)  # like package managers do
+        return file_path
+
+    def touch_bin_dir(self):
+        # ensuring a different modification time even on filesystems with low timestamp resolution
+        stat = os.stat(self.bin_dir)
+        os.utime(self.bin_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    def test_which__must_resolve_the_binary_only_once_while_PATH_does_not_change(self):
+        file_path = self.add_binary('flatpak')
+
+        with patch('shutil.which', return_value=file_path) as which:
+            self.assertEqual(file_path, self.registry.which('flatpak'))
+            self.assertEqual(file_path, self.registry.which('flatpak'))
+            self.assertTrue(self.registry.is_available('flatpak'))
+
+        which.assert_called_once_with('flatpak')
+
+    def test_which__must_detect_binaries_installed_later(self):
+        self.assertIsNone(self.registry.which('flatpak'))
+
+        file_path = self.add_binary('flatpak')
+        self.touch_bin_dir()
+
+        self.assertEqual(file_path, self.registry.which('flatpak'))
+
+    def test_which__must_detect_removed_binaries(self):
+        file_path = self.add_binary('flatpak')
+        self.assertEqual(file_path, self.registry.which('flatpak'))
+
+        os.remove(file_path)
+        self.assertIsNone(self.registry.which('flatpak'))
+
+    def test_probe__must_probe_only_once_while_the_binary_does_not_change(self):
+        file_path = self.add_binary('flatpak')
+        probe = Mock(return_value=(1, 12))
+
+        self.assertEqual((1, 12), self.registry.probe('flatpak', 'version', probe))
+        self.assertEqual((1, 12), self.registry.probe('flatpak', 'version', probe))
+        probe.assert_called_once_with(file_path)
+
+    def test_probe__must_probe_again_when_the_binary_changes(self):
+        self.add_binary('flatpak')
+        probe = Mock(side_effect=[(1, 12), (1, 14)])
+
+        self.assertEqual((1, 12), self.registry.probe('flatpak', 'version', probe))
+
+        self.add_binary('flatpak', '#!/bin/sh\necho upgraded\n')
+        self.touch_bin_dir()
+        self.assertEqual((1, 14), self.registry.probe('flatpak', 'version', probe))
+
+    def test_probe__must_return_None_for_not_available_binaries(self):
+        probe = Mock()
+        self.assertIsNone(self.registry.probe('flatpak', 'version', probe))
+        probe.assert_not_called()
+
+    def test_get_state__must_keep_the_state_for_the_given_time(self):
+        probe = Mock(side_effect=[True, False])
+
+        self.assertTrue(self.registry.get_state('snapd', probe, max_age=60))
+        self.assertTrue(self.registry.get_state('snapd', probe, max_age=60))
+        probe.assert_called_once()
+
+        with patch('time.monotonic', return_value=time.monotonic() + 61):
+            self.assertFalse(self.registry.get_state('snapd', probe, max_age=60))
@@ -0,0 +1,113 @@
+import os
+from datetime import datetime, timedelta
+from tempfile import TemporaryDirectory
+from threading import Event
+from unittest import TestCase
+
+from bauh.commons.freshness import FreshnessRegistry, RefreshScheduler
+
+
+class FreshnessRegistryTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = f'{self.tmp_dir.name}/freshness.json'
+        self.registry = FreshnessRegistry(self.file_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_is_expired__true_when_the_job_has_never_run(self):
+        self.assertTrue(self.registry.is_expired('job', period=timedelta(hours=1)))
+
+    def test_is_expired__false_when_the_period_has_not_passed(self):
+        self.registry.register_run('job', timestamp=1000)
+        self.assertFalse(self.registry.is_expired('job', period=timedelta(seconds=60), now=1059))
+
+    def test_is_expired__true_when_the_period_has_passed(self):
+        self.registry.register_run('job', timestamp=1000)
+        self.assertTrue(self.registry.is_expired('job', period=timedelta(seconds=60), now=1060))
+
+    def test_is_expired__daily_must_expire_when_the_day_changes(self):
+        last_run = datetime(2023, 5, 10, 23, 50).timestamp()
+        self.registry.register_run('job', timestamp=last_run)
+        self.assertFalse(self.registry.is_expired('job', daily=True, now=last_run + 60))
+        self.assertTrue(self.registry.is_expired('job', daily=True, now=last_run + 60 * 20))
+
+    def test_is_expired__must_read_the_legacy_file_when_no_state_is_registered(self):
+        legacy_file = f'{self.tmp_dir.name}/job.ts'
+
+        with open(legacy_file, 'w+') as f:
+            f.write('1000.5')
+
+        self.assertFalse(self.registry.is_expired('job', period=timedelta(seconds=60), legacy_file=legacy_file,
+                                                  now=1030))
+
+    def test_register_run__must_persist_the_state_to_the_file(self):
+        self.registry.register_run('job', timestamp=1000, etag='abc')
+
+        other_registry = FreshnessRegistry(self.file_path)
+        self.assertEqual(1000, other_registry.get_last_run('job'))
+        self.assertEqual('abc', other_registry.get_etag('job'))
+
+    def test_register_run__must_keep_the_jobs_registered_by_other_instances(self):
+        other_registry = FreshnessRegistry(self.file_path)
+        self.assertIsNone(other_registry.get_last_run('job_1'))  # state loaded before the other instance writes
+
+        self.registry.register_run('job_1', timestamp=1000)
+        other_registry.register_run('job_2', timestamp=2000)
+
+        self.assertEqual(1000, FreshnessRegistry(self.file_path).get_last_run('job_1'))
+        self.assertEqual(2000, self.registry.get_last_run('job_2'))
+
+    def test_register_run__must_write_the_legacy_file_when_defined(self):
+        legacy_file = f'{self.tmp_dir.name}/job.ts'
+        self.registry.register_run('job', timestamp=1000, legacy_file=legacy_file)
+
+        self.assertTrue(os.path.isfile(legacy_file))
+
+        with open(legacy_file) as f:
+            self.assertEqual(1000, float(f.read()))
+
+
+class RefreshSchedulerTest(TestCase):
+
+    def test_trigger__must_coalesce_triggers_of_an_active_job(self):
+        scheduler = RefreshScheduler(max_workers=1)
+        release = Event()
+
+        job, scheduled = scheduler.trigger('job', lambda: release.wait(5))
+        self.assertTrue(scheduled)
+
+        same_job, scheduled = scheduler.trigger('job', lambda: None)
+        self.assertFalse(scheduled)
+        self.assertIs(job, same_job)
+
+        release.set()
+        self.assertTrue(job.wait(5))
+        self.assertFalse(scheduler.is_active('job'))
+
+    def test_trigger__must_run_pending_jobs_by_priority(self):
+        scheduler = RefreshScheduler(max_workers=1)
+        release, executed = Event(), []
+
+        blocker, _ = scheduler.trigger('blocker', lambda: release.wait(5))
+        low, _ = scheduler.trigger('low', lambda: executed.append('low'), priority=10)
+        high, _ = scheduler.trigger('high', lambda: executed.append('high'), priority=1)
+
+        release.set()
+
+        for job in (blocker, low, high):
+            self.assertTrue(job.wait(5))
+
+        self.assertEqual(['high', 'low'], executed)
+
+    def test_trigger__must_keep_the_task_error(self):
+        scheduler = RefreshScheduler()
+
+        def fail():
+            raise ValueError()
+
+        job, _ = scheduler.trigger('job', fail)
+        self.assertTrue(job.wait(5))
+        self.assertIsInstance(job.error, ValueError)
@@ -0,0 +1,59 @@
+from threading import Event
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from bauh.commons.internet import InternetChecker
+
+
+class InternetCheckerTest(TestCase):
+
+    def test_is_available__false_when_offline(self):
+        with patch('socket.gethostbyname') as gethostbyname:
+            self.assertFalse(InternetChecker(offline=True).is_available())
+
+        gethostbyname.assert_not_called()
+
+    @patch('socket.gethostbyname', return_value='127.0.0.1')
+    def test_is_available__must_resolve_the_defined_host_only_once_while_the_state_is_valid(self, gethostbyname: Mock):
+        checker = InternetChecker(offline=False, host='test.host', expiration=60)
+
+        for _ in range(3):
+            self.assertTrue(checker.is_available())
+
+        gethostbyname.assert_called_once_with('test.host')
+
+    @patch('socket.gethostbyname', side_effect=OSError)
+    def test_is_available__false_when_the_host_cannot_be_resolved(self, gethostbyname: Mock):
+        self.assertFalse(InternetChecker(offline=False, expiration=60).is_available())
+        gethostbyname.assert_called_once()
+
+    def test_is_available__must_return_the_expired_state_while_checking_again_in_background(self):
+        checker = InternetChecker(offline=False, expiration=60)
+
+        with patch('socket.gethostbyname', return_value='127.0.0.1'):
+            self.assertTrue(checker.is_available())
+
+        resolving, release = Event(), Event()
+
+        def unresolvable(_: str):
+            resolving.set()
+            release.wait(5)
+            raise OSError()
+
+        checker.expiration = 0
+
+        with patch('socket.gethostbyname', side_effect=unresolvable):
+            self.assertTrue(checker.is_available())  # expired state
+            self.assertTrue(resolving.wait(5))
+            release.set()
+            self.assertTrue(checker.refresh().wait(5))
+
+        checker.expiration = 60
+        self.assertFalse(checker.is_available())
+
+    def test_is_available__false_when_the_first_check_times_out(self):
+        release = Event()
+
+        with patch('socket.gethostbyname', side_effect=lambda _: release.wait(5)):
+            self.assertFalse(InternetChecker(offline=False, timeout=0.01).is_available())
+            release.set()
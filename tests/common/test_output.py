@@ -0,0 +1,89 @@
+import time
+from typing import List
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+from bauh.commons.output import OutputHandlerThread
+
+
+class EchoOutputHandler(OutputHandlerThread):
+
+    def __init__(self, watcher: Mock, min_interval: float, stop_at: str = None):
+        super(EchoOutputHandler, self).__init__(watcher=watcher, min_interval=min_interval)
+        self.handled: List[str] = []
+        self.stop_at = stop_at
+
+    def _handle(self, line: str) -> bool:
+        self.handled.append(line)
+        self.change_substatus(line)
+        return line != self.stop_at
+
+
+class OutputHandlerThreadTest(TestCase):
+
+    def test_run__must_handle_all_queued_lines_before_stopping(self):
+        handler = EchoOutputHandler(Mock(), min_interval=0)
+        handler.start()
+
+        for idx in range(5000):
+            handler.handle(str(idx))
+
+        handler.stop_working()
+        handler.join(5)
+
+        self.assertFalse(handler.is_alive())
+        self.assertEqual([str(idx) for idx in range(5000)], handler.handled)
+
+    def test_change_substatus__must_not_repeat_the_same_substatus(self):
+        watcher = Mock()
+        handler = EchoOutputHandler(watcher, min_interval=0)
+        handler.start()
+
+        for line in ('a', 'a', 'b', 'b', 'a'):
+            handler.handle(line)
+
+        handler.stop_working()
+        handler.join(5)
+
+        self.assertEqual([call('a'), call('b'), call('a')], watcher.change_substatus.call_args_list)
+
+    def test_change_substatus__must_only_display_the_latest_substatus_within_the_interval(self):
+        watcher = Mock()
+        handler = EchoOutputHandler(watcher, min_interval=60)
+        handler.start()
+
+        for line in ('a', 'b', 'c'):
+            handler.handle(line)
+
+        handler.stop_working()
+        handler.join(5)
+
+        self.assertEqual([call('a'), call('c')], watcher.change_substatus.call_args_list)
+
+    def test_run__must_display_a_pending_substatus_when_the_interval_expires(self):
+        watcher = Mock()
+        handler = EchoOutputHandler(watcher, min_interval=0.05)
+        handler.start()
+
+        handler.handle('a')
+        handler.handle('b')
+        time.sleep(0.5)
+
+        self.assertEqual([call('a'), call('b')], watcher.change_substatus.call_args_list)
+
+        handler.stop_working()
+        handler.join(5)
+
+    def test_handle__must_ignore_lines_after_the_parser_finishes(self):
+        handler = EchoOutputHandler(Mock(), min_interval=0, stop_at='b')
+        handler.start()
+
+        for line in ('a', 'b', 'c'):
+            handler.handle(line)
+
+        handler.join(5)
+        handler.handle('d')
+        handler.stop_working()
+
+        self.assertFalse(handler.is_alive())
+        self.assertEqual(['a', 'b'], handler.handled)
@@ -0,0 +1,52 @@
+from threading import Event, Barrier
+from unittest import TestCase
+
+from bauh.commons.suggestions import SuggestionsDataLoader
+
+
+class SuggestionsDataLoaderTest(TestCase):
+
+    def setUp(self):
+        self.loader = SuggestionsDataLoader('test', max_workers=2)
+
+    def test_submit__must_not_load_more_than_the_maximum_number_of_workers_concurrently(self):
+        release, running, max_running = Event(), [], []
+
+        def load(idx: int):
+            running.append(idx)
+            max_running.append(len(running))
+            release.wait(5)
+            running.remove(idx)
+
+        loads = [self.loader.submit(load, idx) for idx in range(6)]
+        release.set()
+        self.loader.wait(loads, timeout=5)
+
+        self.assertTrue(all(f.done() for f in loads))
+        self.assertLessEqual(max(max_running), 2)
+
+    def test_cancel__must_cancel_the_loads_not_started(self):
+        release, started, loaded = Event(), Barrier(3), []
+
+        def load(idx: int):
+            started.wait(5)
+            release.wait(5)
+            loaded.append(idx)
+
+        loads = [self.loader.submit(load, idx) for idx in range(5)]
+        started.wait(5)  # the first two loads are running
+        self.assertEqual(3, self.loader.cancel())
+
+        release.set()
+        self.loader.wait(loads, timeout=5)
+
+        self.assertEqual({0, 1}, set(loaded))
+        self.assertEqual(0, self.loader.cancel())
+
+    def test_submit__must_not_propagate_load_errors(self):
+        def load():
+            raise ValueError()
+
+        future = self.loader.submit(load)
+        self.loader.wait((future,), timeout=5)
+        self.assertIsNone(future.result())
@@ -0,0 +1,55 @@
+import subprocess
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.commons.system import read_output_lines, ProcessHandler, SystemProcess
+
+
+def new_process(script: str) -> subprocess.Popen:
+    return subprocess.Popen(['sh', '-c', script], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            stdin=subprocess.DEVNULL)
+
+
+class ReadOutputLinesTest(TestCase):
+
+    def test__must_read_both_streams_in_arrival_order(self):
+        proc = new_process('echo a; sleep 0.1; echo b >&2; sleep 0.1; printf c')
+        self.assertEqual([(b'a', False), (b'b', True), (b'c', False)], list(read_output_lines(proc)))
+        proc.wait()
+
+    def test__must_not_block_when_stderr_is_filled_before_stdout(self):
+        # more than a pipe buffer on stderr before anything on stdout
+        proc = new_process('head -c 200000 /dev/zero | tr "\\0" "e" >&2; echo out')
+        lines = list(read_output_lines(proc))
+        proc.wait()
+
+        self.assertIn((b'out', False), lines)
+        self.assertEqual(200000, sum(len(line) for line, from_stderr in lines if from_stderr))
+
+    def test__must_ignore_streams_not_requested(self):
+        proc = new_process('echo a; echo b >&2')
+        self.assertEqual([(b'b', True)], list(read_output_lines(proc, stdout=False)))
+        proc.wait()
+
+
+class ProcessHandlerHandleTest(TestCase):
+
+    def test__must_notify_the_watcher_about_every_line(self):
+        watcher = Mock()
+        self.assertTrue(ProcessHandler(watcher).handle(SystemProcess(new_process('echo a; echo b'))))
+        self.assertEqual(['a', 'b'], [c[0][0] for c in watcher.print.call_args_list[1:]])
+
+    def test__must_fail_when_there_is_error_output(self):
+        error_output = StringIO()
+        proc = new_process('echo a; echo error >&2; echo b')
+        self.assertFalse(ProcessHandler(Mock()).handle(SystemProcess(proc), error_output=error_output))
+        self.assertEqual('error', error_output.getvalue())
+
+    def test__must_not_fail_for_error_output_when_it_should_not_be_checked(self):
+        proc = new_process('echo error >&2')
+        self.assertTrue(ProcessHandler(Mock()).handle(SystemProcess(proc, check_error_output=False)))
+
+    def test__must_succeed_when_a_success_phrase_is_printed(self):
+        proc = new_process('echo error >&2; echo done')
+        self.assertTrue(ProcessHandler(Mock()).handle(SystemProcess(proc, success_phrases=['done'])))
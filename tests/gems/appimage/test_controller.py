@@ -0,0 +1,57 @@
+import os
+from fnmatch import fnmatch
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from bauh.gems.appimage.controller import AppImageManager
+
+
+class AppImageManagerExtractMetadataTest(TestCase):
+
+    def setUp(self):
+        self.manager = AppImageManager(Mock())
+        self.dir = TemporaryDirectory()
+        self.files = {'app.desktop': '[Desktop Entry]\nName=App\nIcon=app\nExec=app\n',
+                      'app.png': '-> usr/share/icons/hicolor/256x256/apps/app.png',
+                      'usr/share/icons/hicolor/256x256/apps/app.png': 'icon',
+                      'usr/lib/libapp.so': 'lib'}
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _extract(self, file_path: str, out_dir: str, handler: Mock, pattern: str = None) -> str:
+        """
+        simulates the AppImage runtime extraction ('*' does not match '/')
+        """
+        for path, content in self.files.items():
+            if not pattern or (fnmatch(path, pattern) and path.count('/') == pattern.count('/')):
+                final_path = f'{out_dir}/squashfs-root/{path}'
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+
+                if content.startswith('-> '):
+                    os.symlink(content[3:], final_path)
+                else:
+                    with open(final_path, 'w+') as f:
+                        f.write(content)
+
+        return ''
+
+    def test__must_only_extract_the_desktop_entry_and_the_linked_icon(self):
+        with patch.object(self.manager, '_extract', side_effect=self._extract) as extract:
+            self.manager._extract_metadata('/app.AppImage', self.dir.name, Mock())
+
+        self.assertEqual(['*.desktop', 'app.*', 'usr/share/icons/hicolor/256x256/apps/app.png'],
+                         [c[0][3] for c in extract.call_args_list])
+        self.assertFalse(os.path.exists(f'{self.dir.name}/squashfs-root/usr/lib/libapp.so'))
+        self.assertTrue(os.path.isfile(f'{self.dir.name}/squashfs-root/app.png'))
+
+    def test__must_extract_everything_when_the_desktop_entry_is_not_in_the_root_folder(self):
+        self.files['usr/share/applications/app.desktop'] = self.files.pop('app.desktop')
+
+        with patch.object(self.manager, '_extract', side_effect=self._extract) as extract:
+            self.manager._extract_metadata('/app.AppImage', self.dir.name, Mock())
+
+        self.assertEqual(2, extract.call_count)
+        self.assertEqual(3, len(extract.call_args_list[1][0]))  # no pattern
+        self.assertTrue(os.path.exists(f'{self.dir.name}/squashfs-root/usr/lib/libapp.so'))
@@ -1,6 +1,8 @@
+import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
-from bauh.gems.appimage.util import replace_desktop_entry_exec_command
+from bauh.gems.appimage.util import replace_desktop_entry_exec_command, get_desktop_entry_icon, get_link_target
 
 
 class TestUtil(TestCase):
@@ -309,3 +311,44 @@ X-AppImage-Version=bionic-0.16.0-83-dev-0ca783e
         """
 
         self.assertEqual(expected, res)
+
+
+class GetDesktopEntryIconTest(TestCase):
+
+    def test__must_return_the_icon_name(self):
+        self.assertEqual('my-app', get_desktop_entry_icon('[Desktop Entry]\nName=MyApp\nIcon = my-app \nExec=myapp\n'))
+
+    def test__must_return_none_when_the_icon_is_a_path(self):
+        self.assertIsNone(get_desktop_entry_icon('[Desktop Entry]\nIcon=/usr/share/icons/my-app.png\n'))
+
+    def test__must_return_none_when_there_is_no_icon(self):
+        self.assertIsNone(get_desktop_entry_icon('[Desktop Entry]\nName=MyApp\n'))
+
+
+class GetLinkTargetTest(TestCase):
+
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.root = f'{self.dir.name}/squashfs-root'
+        os.makedirs(f'{self.root}/usr/share/icons')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test__must_return_the_target_path_relative_to_the_root_dir(self):
+        os.symlink('usr/share/icons/app.png', f'{self.root}/app.png')
+        os.symlink('../../../app.svg', f'{self.root}/usr/share/icons/app.svg')
+
+        self.assertEqual('usr/share/icons/app.png', get_link_target(self.root, f'{self.root}/app.png'))
+        self.assertEqual('app.svg', get_link_target(self.root, f'{self.root}/usr/share/icons/app.svg'))
+
+    def test__must_return_none_for_targets_outside_the_root_dir(self):
+        os.symlink('/usr/share/icons/app.png', f'{self.root}/app.png')
+        os.symlink('../app.svg', f'{self.root}/app.svg')
+
+        self.assertIsNone(get_link_target(self.root, f'{self.root}/app.png'))
+        self.assertIsNone(get_link_target(self.root, f'{self.root}/app.svg'))
+
+    def test__must_return_none_for_regular_files(self):
+        open(f'{self.root}/app.png', 'w').close()
+        self.assertIsNone(get_link_target(self.root, f'{self.root}/app.png'))
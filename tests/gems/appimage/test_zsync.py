@@ -0,0 +1,153 @@
+import hashlib
+import os
+import random
+import struct
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from bauh import __app_name__
+from bauh.gems.appimage import zsync
+
+
+def gen_elf(update_info: bytes) -> bytes:
+    names = b'\x00.shstrtab\x00.upd_info\x00'
+    upd_info = update_info.ljust(1024, b'\x00')
+    names_offset = 64
+    info_offset = names_offset + len(names)
+    sh_offset = info_offset + len(upd_info)
+
+    header = b'\x7fELF' + bytes([2, 1, 1]) + bytes(9)
+    header += struct.pack('<HHIQQQIHHHHHH', 2, 62, 1, 0, 0, sh_offset, 0, 64, 0, 0, 64, 3, 1)
+
+    sections = bytes(64)
+    sections += struct.pack('<IIQQQQIIQQ', 1, 3, 0, 0, names_offset, len(names), 0, 0, 1, 0)
+    sections += struct.pack('<IIQQQQIIQQ', 11, 7, 0, 0, info_offset, len(upd_info), 0, 0, 1, 0)
+    return header + names + upd_info + sections
+
+
+def gen_control(data: bytes, blocksize: int, rsum_bytes: int = 2, checksum_bytes: int = 5) -> bytes:
+    """
+    the same output of 'zsyncmake' (the MD4 checksums are zeroed if hashlib does not support it)
+    """
+    header = f'zsync: 0.6.2\nFilename: app-2.AppImage\nBlocksize: {blocksize}\nLength: {len(data)}\n' \
+             f'Hash-Lengths: 2,{rsum_bytes},{checksum_bytes}\nURL: app-2.AppImage\n' \
+             f'SHA-1: {hashlib.sha1(data).hexdigest()}\n\n'
+
+    entries = []
+    for idx in range(0, len(data), blocksize):
+        block = data[idx: idx + blocksize].ljust(blocksize, b'\x00')
+        checksum = zsync.md4(block)[:checksum_bytes] if zsync.MD4_AVAILABLE else bytes(checksum_bytes)
+        entries.append(zsync.calc_rsum(block).to_bytes(4, 'big')[4 - rsum_bytes:] + checksum)
+
+    return header.encode() + b''.join(entries)
+
+
+class ReadUpdateInfoTest(TestCase):
+
+    def test__must_return_the_content_of_the_upd_info_section(self):
+        with TemporaryDirectory() as dir_path:
+            file_path = f'{dir_path}/app.AppImage'
+
+            with open(file_path, 'wb+') as f:
+                f.write(gen_elf(b'gh-releases-zsync|user|app|latest|app-*-x86_64.AppImage.zsync'))
+
+            self.assertEqual('gh-releases-zsync|user|app|latest|app-*-x86_64.AppImage.zsync',
+                             zsync.read_update_info(file_path))
+
+    def test__must_return_none_for_files_without_update_info(self):
+        with TemporaryDirectory() as dir_path:
+            file_path = f'{dir_path}/app.AppImage'
+
+            with open(file_path, 'wb+') as f:
+                f.write(gen_elf(b''))
+
+            self.assertIsNone(zsync.read_update_info(file_path))
+
+
+class GetControlUrlTest(TestCase):
+
+    def test__must_return_the_url_defined_for_zsync(self):
+        self.assertEqual('https://host/app.AppImage.zsync',
+                         zsync.get_control_url('zsync|https://host/app.AppImage.zsync', 'https://host/app-2.AppImage'))
+
+    def test__must_return_the_download_url_zsync_file_for_github_releases(self):
+        self.assertEqual('https://github.com/user/app/releases/download/2/app-2.AppImage.zsync',
+                         zsync.get_control_url('gh-releases-zsync|user|app|latest|app-*.AppImage.zsync',
+                                               'https://github.com/user/app/releases/download/2/app-2.AppImage'))
+
+    def test__must_return_none_for_unsupported_formats(self):
+        self.assertIsNone(zsync.get_control_url('bintray-zsync|user|repo|app|app-_latestVersion.zsync',
+                                                'https://host/app-2.AppImage'))
+
+
+class DeltaUpdateTest(TestCase):
+
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        rand = random.Random(7)
+        self.old = bytes(rand.getrandbits(8) for _ in range(300 * 1024))
+        # new version: some bytes inserted (shifting the remaining content), a changed region and a new tail
+        self.new = self.old[:50000] + bytes(rand.getrandbits(8) for _ in range(3000)) + self.old[50000:200000] \
+            + bytes(rand.getrandbits(8) for _ in range(10000)) + self.old[210000:] + b'tail'
+
+        self.old_path = f'{self.dir.name}/app-1.AppImage'
+        with open(self.old_path, 'wb+') as f:
+            f.write(self.old)
+
+        self.new_path = f'{self.dir.name}/app-2.AppImage'
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test__must_build_the_new_file_only_fetching_the_missing_ranges(self):
+        control = zsync.parse_control(gen_control(self.new, 2048))
+        self.assertIsNotNone(control)
+
+        found = zsync.map_local_blocks(control, self.old_path, chunk_size=32 * 1024)
+        ranges = zsync.gen_missing_ranges(control, found)
+        self.assertLess(zsync.count_bytes(ranges), 30000)
+
+        fetched = []
+
+        def fetch_range(first: int, last: int) -> bytes:
+            fetched.append((first, last))
+            return self.new[first: last + 1]
+
+        self.assertTrue(zsync.build_file(control, self.old_path, self.new_path, found, fetch_range, Mock()))
+        self.assertEqual(ranges, fetched)
+
+        with open(self.new_path, 'rb') as f:
+            self.assertEqual(self.new, f.read())
+
+    def test__must_fail_when_the_built_file_checksum_does_not_match(self):
+        control = zsync.parse_control(gen_control(self.new, 2048))
+        found = zsync.map_local_blocks(control, self.old_path)
+
+        self.assertFalse(zsync.build_file(control, self.old_path, self.new_path, found,
+                                          lambda first, last: bytes(last - first + 1), Mock()))
+
+    def test__must_fail_when_a_range_cannot_be_fetched(self):
+        control = zsync.parse_control(gen_control(self.new, 2048))
+        found = zsync.map_local_blocks(control, self.old_path)
+
+        self.assertFalse(zsync.build_file(control, self.old_path, self.new_path, found, lambda first, last: None, Mock()))
+
+    def test__must_fail_when_no_sha1_is_defined_even_if_md4_is_available(self):
+        control = zsync.parse_control(gen_control(self.new, 2048))
+        control.sha1 = None
+        found = zsync.map_local_blocks(control, self.old_path)
+        fetch_range = Mock(side_effect=lambda first, last: bytes(last - first + 1))  # corrupted ranges
+
+        with patch(f'{__app_name__}.gems.appimage.zsync.MD4_AVAILABLE', True):
+            self.assertFalse(zsync.can_verify(control))
+            self.assertFalse(zsync.build_file(control, self.old_path, self.new_path, found, fetch_range, Mock()))
+
+        fetch_range.assert_not_called()
+        self.assertFalse(os.path.exists(self.new_path))
+
+    def test_map_local_blocks__must_find_the_same_blocks_when_scanning_with_several_processes(self):
+        control = zsync.parse_control(gen_control(self.new, 2048))
+
+        self.assertEqual(zsync.map_local_blocks(control, self.old_path, chunk_size=32 * 1024),
+                         zsync.map_local_blocks(control, self.old_path, chunk_size=32 * 1024, workers=2))
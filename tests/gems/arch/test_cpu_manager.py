@@ -0,0 +1,77 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock, call
+
+from bauh import __app_name__
+from bauh.gems.arch import cpu_manager
+
+
+class SetGovernorTest(TestCase):
+
+    @patch(f'{__app_name__}.gems.arch.cpu_manager.shutil.which', return_value='/usr/bin/tee')
+    @patch(f'{__app_name__}.gems.arch.cpu_manager.new_root_subprocess')
+    def test__must_write_all_cpus_files_with_a_single_privileged_call(self, new_root_subprocess: Mock, which: Mock):
+        new_root_subprocess.return_value.communicate.return_value = (b'', b'')
+        new_root_subprocess.return_value.returncode = 0
+
+        self.assertTrue(cpu_manager.set_governor('performance', '123', Mock(), {2, 0}))
+
+        new_root_subprocess.assert_called_once_with(('sh', '-c', "printf %s performance | /usr/bin/tee "
+                                                                 "/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor "
+                                                                 "/sys/devices/system/cpu/cpu2/cpufreq/scaling_governor "
+                                                                 "> /dev/null"), root_password='123')
+
+
+@patch(f'{__app_name__}.gems.arch.cpu_manager.set_governor')
+@patch(f'{__app_name__}.gems.arch.cpu_manager.current_governors')
+class PerformanceModeTest(TestCase):
+
+    def tearDown(self):
+        cpu_manager._perf_refs, cpu_manager._perf_holds, cpu_manager._perf_prev_governors = 0, 0, None
+
+    def test_acquire__must_only_change_the_cpus_not_in_performance_mode(self, current_governors: Mock, set_governor: Mock):
+        current_governors.return_value = {'powersave': {0, 1}, 'performance': {2}}
+        logger = Mock()
+
+        cpu_manager.acquire_performance_mode(None, logger)
+        set_governor.assert_called_once_with(governor='performance', root_password=None, logger=logger, cpu_idxs={0, 1})
+
+    def test_release__must_only_restore_the_governors_after_the_last_build(self, current_governors: Mock,
+                                                                          set_governor: Mock):
+        current_governors.return_value = {'powersave': {0, 1}}
+        logger = Mock()
+
+        cpu_manager.acquire_performance_mode(None, logger)
+        cpu_manager.acquire_performance_mode(None, logger)  # overlapping build
+        self.assertEqual(1, set_governor.call_count)
+
+        current_governors.return_value = {'performance': {0, 1}}
+        cpu_manager.release_performance_mode(None, logger)
+        self.assertEqual(1, set_governor.call_count)
+
+        cpu_manager.release_performance_mode(None, logger)
+        self.assertEqual(2, set_governor.call_count)
+        set_governor.assert_called_with(governor='powersave', root_password=None, logger=logger, cpu_idxs={0, 1})
+
+    def test_keep__must_not_restore_the_governors_between_consecutive_builds(self, current_governors: Mock,
+                                                                            set_governor: Mock):
+        current_governors.return_value = {'powersave': {0, 1}}
+        logger = Mock()
+
+        with cpu_manager.keep_performance_mode(None, logger):
+            for _ in range(3):
+                cpu_manager.acquire_performance_mode(None, logger)
+                current_governors.return_value = {'performance': {0, 1}}
+                cpu_manager.release_performance_mode(None, logger)
+
+            self.assertEqual([call(governor='performance', root_password=None, logger=logger, cpu_idxs={0, 1})],
+                             set_governor.call_args_list)
+
+        self.assertEqual(2, set_governor.call_count)
+        set_governor.assert_called_with(governor='powersave', root_password=None, logger=logger, cpu_idxs={0, 1})
+
+    def test_keep__must_not_change_the_governors_when_nothing_is_built(self, current_governors: Mock, set_governor: Mock):
+        with cpu_manager.keep_performance_mode(None, Mock()):
+            pass
+
+        current_governors.assert_not_called()
+        set_governor.assert_not_called()
@@ -0,0 +1,70 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock, MagicMock, call
+
+from bauh import __app_name__
+from bauh.gems.arch.dependencies import DependenciesAnalyser
+
+
+def aur_data(name: str, deps: set) -> dict:
+    return {'v': '1.0.0', 'b': name, 'r': 'aur', 'p': {name, f'{name}=1.0.0'}, 'd': deps, 'c': set(), 'ds': None,
+            's': None}
+
+
+class DependenciesAnalyserGetMissingPackagesTest(TestCase):
+
+    def setUp(self):
+        self.aur_client = MagicMock()
+        self.analyser = DependenciesAnalyser(aur_client=self.aur_client, i18n=MagicMock(), logger=Mock())
+
+    @patch(f'{__app_name__}.gems.arch.dependencies.pacman')
+    def test__must_resolve_each_level_with_a_single_query_per_origin(self, pacman: Mock):
+        pacman.check_missing.side_effect = lambda names: {n for n in names if n != 'installed'}
+        pacman.map_repositories.side_effect = lambda names: {n: 'extra' for n in names if n.startswith('repo')}
+        pacman.map_updates_data.side_effect = lambda names: {n: {'d': {'repo_c>=1.0', 'installed'} if n == 'repo_a' else None}
+                                                             for n in names}
+        self.aur_client.gen_updates_data.side_effect = lambda names: ((n, aur_data(n, {'repo_d'}))
+                                                                      for n in names if n.startswith('aur'))
+
+        res = self.analyser.get_missing_packages({'repo_a', 'aur_b', 'installed'})
+
+        self.assertEqual([('repo_c', 'extra'), ('repo_d', 'extra'), ('aur_b', 'aur'), ('repo_a', 'extra')], res)
+
+        self.assertEqual([call({'repo_a', 'aur_b', 'installed'}), call({'repo_c', 'repo_d'})],
+                         pacman.check_missing.call_args_list)
+        self.assertEqual([call({'repo_a', 'aur_b'}), call({'repo_c', 'repo_d'})],
+                         pacman.map_repositories.call_args_list)
+        self.aur_client.gen_updates_data.assert_called_once_with({'aur_b'})
+        pacman.guess_repository.assert_not_called()
+
+    @patch(f'{__app_name__}.gems.arch.dependencies.pacman')
+    def test__must_stop_when_a_dependency_cannot_be_found(self, pacman: Mock):
+        pacman.check_missing.side_effect = lambda names: {*names}
+        pacman.map_repositories.return_value = {}
+        pacman.guess_repository.return_value = None
+        self.aur_client.gen_updates_data.return_value = iter(())
+
+        res = self.analyser.get_missing_packages({'unknown'})
+
+        self.assertEqual([('unknown', '')], res)
+        pacman.map_updates_data.assert_not_called()
+
+
+class DependenciesAnalyserMapMissingDepsTest(TestCase):
+
+    def setUp(self):
+        self.aur_client = MagicMock()
+        self.analyser = DependenciesAnalyser(aur_client=self.aur_client, i18n=MagicMock(), logger=Mock())
+
+    @patch(f'{__app_name__}.gems.arch.dependencies.pacman')
+    def test__must_request_the_AUR_data_of_a_whole_level_at_once(self, pacman: Mock):
+        self.aur_client.gen_updates_data.side_effect = lambda names: [(n, aur_data(n, set())) for n in names]
+
+        res = self.analyser.map_missing_deps(pkgs_data={'a': {'d': {'aur_b', 'aur_c'}}},
+                                             provided_map={}, remote_provided_map={}, remote_repo_map={},
+                                             aur_index={'aur_b', 'aur_c'}, deps_checked=set(), deps_data={},
+                                             sort=False, watcher=Mock(), automatch_providers=True)
+
+        self.assertEqual({('aur_b', 'aur'), ('aur_c', 'aur')}, set(res))
+        self.aur_client.gen_updates_data.assert_called_once_with({'aur_b', 'aur_c'})
+        self.aur_client.search.assert_not_called()
+        pacman.find_one_match.assert_has_calls([call('aur_b'), call('aur_c')], any_order=True)
@@ -0,0 +1,26 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from bauh import __app_name__
+from bauh.gems.arch import gpg
+
+LIST_KEYS_OUTPUT = """tru::1:1639000000:0:3:1:5
+pub:-:4096:1:E6F7A8B9C0D1E2F3:1500000000:::-:::scESC::::::23::0:
+fpr:::::::::5A2E9EC9C7D7E8F1A2B3C4D5E6F7A8B9C0D1E2F3:
+uid:-::::1500000000::ABCDEF::Xpto <xpto@xpto.com>::::::::::0:
+"""
+
+
+class ListImportedKeysTest(TestCase):
+
+    @patch(f'{__app_name__}.gems.arch.gpg.run_cmd', return_value=LIST_KEYS_OUTPUT)
+    def test__must_return_the_keys_matching_the_listed_fingerprints(self, run_cmd: Mock):
+        res = gpg.list_imported_keys({'5a2e9ec9c7d7e8f1a2b3c4d5e6f7a8b9c0d1e2f3', 'E6F7A8B9C0D1E2F3',
+                                      'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'})
+        self.assertEqual({'5a2e9ec9c7d7e8f1a2b3c4d5e6f7a8b9c0d1e2f3', 'E6F7A8B9C0D1E2F3'}, res)
+        run_cmd.assert_called_once()
+
+    @patch(f'{__app_name__}.gems.arch.gpg.run_cmd')
+    def test__must_ignore_invalid_keys(self, run_cmd: Mock):
+        self.assertEqual(set(), gpg.list_imported_keys({'abc; rm -rf ~', 'xpto'}))
+        run_cmd.assert_not_called()
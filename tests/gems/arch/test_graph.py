@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from bauh.gems.arch.exceptions import PackageNotFoundException, PackageInHoldException
+from bauh.gems.arch.graph import ReverseDependencyGraph
+
+
+class ReverseDependencyGraphTest(TestCase):
+
+    def setUp(self):
+        # app -> lib-a -> base (explicitly installed) ; app -> sh (provided by bash and dash) ; tool -> lib-b -> base
+        self.graph = ReverseDependencyGraph(pkgs_data={
+            'app': {'p': {'app'}, 'd': {'lib-a', 'sh'}},
+            'lib-a': {'p': {'lib-a', 'liba.so'}, 'd': {'base'}},
+            'base': {'p': {'base'}, 'd': set(), 'e': True},
+            'bash': {'p': {'bash', 'sh'}, 'd': set()},
+            'dash': {'p': {'dash', 'sh'}, 'd': set()},
+            'tool': {'p': {'tool'}, 'd': {'liba.so', 'lib-b'}},
+            'lib-b': {'p': {'lib-b'}, 'd': {'base'}},
+            'glibc': {'p': {'glibc'}, 'd': set()}
+        }, hold={'glibc'})
+
+    def test_map_all_required_by__must_return_the_transitive_dependents(self):
+        self.assertEqual({'lib-a', 'lib-b', 'app', 'tool'}, self.graph.map_all_required_by({'base'}))
+
+    def test_map_all_required_by__must_not_traverse_ignored_packages(self):
+        self.assertEqual({'lib-b', 'tool'}, self.graph.map_all_required_by({'base'}, to_ignore={'lib-a'}))
+
+    def test_list_hard_requirements__must_return_the_packages_broken_by_the_removal(self):
+        self.assertEqual({'app', 'tool'}, self.graph.list_hard_requirements({'lib-a'}))
+
+    def test_list_hard_requirements__must_not_return_dependents_still_satisfied_by_another_provider(self):
+        self.assertEqual(set(), self.graph.list_hard_requirements({'bash'}))
+        self.assertEqual({'app'}, self.graph.list_hard_requirements({'bash', 'dash'}))
+
+    def test_list_hard_requirements__must_consider_assumed_installed_names(self):
+        self.assertEqual({'app'}, self.graph.list_hard_requirements({'lib-a'}, assume_installed={'liba.so=1.0'}))
+
+    def test_list_hard_requirements__must_raise_an_exception_for_not_installed_packages(self):
+        self.assertRaises(PackageNotFoundException, self.graph.list_hard_requirements, {'xpto'})
+
+    def test_list_hard_requirements__must_raise_an_exception_when_a_hold_package_must_be_removed(self):
+        self.assertRaises(PackageInHoldException, self.graph.list_hard_requirements, {'glibc'})
+
+    def test_list_post_uninstall_unneeded__must_return_dependencies_not_required_anymore(self):
+        self.assertEqual({'lib-b'}, self.graph.list_post_uninstall_unneeded({'tool'}))
+        self.assertEqual({'lib-a', 'lib-b'}, self.graph.list_post_uninstall_unneeded({'tool', 'app'}))
+
+    def test_list_post_uninstall_unneeded__must_not_return_explicitly_installed_packages(self):
+        self.assertNotIn('base', self.graph.list_post_uninstall_unneeded({'tool', 'app'}))
+
+    def test_list_post_uninstall_unneeded__must_return_the_single_provider_of_a_virtual_dependency(self):
+        graph = ReverseDependencyGraph(pkgs_data={
+            'app': {'p': {'app'}, 'd': {'libz.so'}},
+            'zlib': {'p': {'zlib', 'libz.so'}, 'd': set()}
+        })
+        self.assertEqual({'zlib'}, graph.list_post_uninstall_unneeded({'app'}))
@@ -0,0 +1,26 @@
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+from bauh.gems.arch.output import TransactionStatusHandler
+
+
+class TransactionStatusHandlerTest(TestCase):
+
+    def test_run__must_stop_after_all_packages_are_performed(self):
+        i18n = {'manage_window.status.installing': 'installing', 'finishing': 'finishing'}
+        watcher = Mock()
+        handler = TransactionStatusHandler(watcher=watcher, i18n=i18n, names={'vim', 'git'}, logger=Mock(),
+                                           percentage=False, downloading=2)
+        handler._min_interval = 0
+        handler.start()
+
+        for line in ('installing vim...', 'installing git...', ':: Running post-transaction hooks...', 'other'):
+            handler.handle(line)
+
+        handler.join(5)
+        handler.stop_working()
+
+        self.assertFalse(handler.is_alive())
+        self.assertEqual([call('[1/2] Installing vim...'),
+                          call('[2/2] Installing git...'),
+                          call('Finishing')], watcher.change_substatus.call_args_list)
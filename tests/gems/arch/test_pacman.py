@@ -96,3 +96,31 @@ Required By     : None
         res = pacman.map_optional_deps(('package-test',), remote=False, not_installed=True)
         run_cmd.assert_called_once_with('pacman -Qi package-test')
         self.assertEqual({'package-test': {'pipewire-alsa': '', 'pipewire': ''}}, res)
+
+    def test_list_hold_packages(self):
+        self.assertEqual({'pacman', 'glibc', 'manjaro-system'},
+                         pacman.list_hold_packages(FILE_DIR + '/resources/pacman.conf'))
+
+    @patch(f'{__app_name__}.gems.arch.pacman.run_cmd', return_value="""
+Name            : package-a
+Version         : 1.0.0-1
+Provides        : liba.so=1-64  package-alias
+Depends On      : glibc  python>=3.10  sh
+                  zlib
+Required By     : None
+Install Reason  : Explicitly installed
+
+Name            : package-b
+Version         : 2.0.0-1
+Provides        : None
+Depends On      : None
+Required By     : None
+Install Reason  : Installed as a dependency for another package
+""")
+    def test_map_local_dependencies_data(self, run_cmd: Mock):
+        res = pacman.map_local_dependencies_data()
+        run_cmd.assert_called_once_with('pacman -Qi', print_error=False)
+
+        self.assertEqual({'package-a': {'p': {'package-a', 'liba.so', 'package-alias'},
+                                        'd': {'glibc', 'python', 'sh', 'zlib'}, 'e': True},
+                          'package-b': {'p': {'package-b'}, 'd': set(), 'e': False}}, res)
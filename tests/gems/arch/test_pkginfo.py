@@ -0,0 +1,111 @@
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from bauh import __app_name__
+from bauh.gems.arch import pkginfo
+from bauh.gems.arch.pkginfo import PkgInfoIndex
+
+PKGINFO = """# Generated by makepkg 6.0.1
+pkgname = xpto
+pkgver = 1.0.0-1
+builddate = 1639000000
+depend = glibc
+depend = gcc-libs
+"""
+
+
+def new_package_file(dir_path: str, name: str, mode: str, pkginfo_content: str = PKGINFO) -> str:
+    file_path = f'{dir_path}/{name}'
+
+    with tarfile.open(file_path, mode) as tar:
+        for member_name, content in (('.BUILDINFO', 'format = 2\n'), ('.PKGINFO', pkginfo_content),
+                                     ('usr/bin/xpto', '#!/bin/sh\n')):
+            data = content.encode()
+            info = tarfile.TarInfo(member_name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+    return file_path
+
+
+class ReadPkgInfoTest(TestCase):
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test__must_read_the_fields_of_xz_files(self):
+        info = pkginfo.read_pkginfo(new_package_file(self.dir_path, 'xpto-1.0.0-1-x86_64.pkg.tar.xz', 'w:xz'))
+        self.assertEqual({'pkgname': 'xpto', 'pkgver': '1.0.0-1', 'builddate': '1639000000', 'depend': 'glibc'}, info)
+
+    def test__must_read_the_fields_of_gz_files(self):
+        info = pkginfo.read_pkginfo(new_package_file(self.dir_path, 'xpto-1.0.0-1-x86_64.pkg.tar.gz', 'w:gz'))
+        self.assertEqual('1639000000', info['builddate'])
+
+    def test__must_return_none_for_unsupported_extensions(self):
+        self.assertIsNone(pkginfo.read_pkginfo(f'{self.dir_path}/xpto-1.0.0-1-x86_64.pkg.tar.abc'))
+
+    def test__must_return_none_for_invalid_files(self):
+        file_path = f'{self.dir_path}/xpto-1.0.0-1-x86_64.pkg.tar.xz'
+
+        with open(file_path, 'w+') as f:
+            f.write('xpto')
+
+        self.assertIsNone(pkginfo.read_pkginfo(file_path))
+
+
+class PkgInfoIndexTest(TestCase):
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.index_file = f'{self.dir_path}/index/pkginfo_index.json'
+        self.index = PkgInfoIndex(logger=Mock(), file_path=self.index_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_get_build_date__must_not_read_indexed_files_again(self):
+        file_path = new_package_file(self.dir_path, 'xpto-1.0.0-1-x86_64.pkg.tar.xz', 'w:xz')
+        self.assertEqual(1639000000, self.index.get_build_date(file_path))
+        self.index.save()
+
+        index = PkgInfoIndex(logger=Mock(), file_path=self.index_file)
+
+        with patch(f'{__app_name__}.gems.arch.pkginfo.read_pkginfo') as read_pkginfo:
+            self.assertEqual(1639000000, index.get_build_date(file_path))
+            read_pkginfo.assert_not_called()
+
+    def test_get_build_date__must_read_modified_files_again(self):
+        file_path = new_package_file(self.dir_path, 'xpto-1.0.0-1-x86_64.pkg.tar.xz', 'w:xz')
+        self.assertEqual(1639000000, self.index.get_build_date(file_path))
+
+        new_package_file(self.dir_path, 'xpto-1.0.0-1-x86_64.pkg.tar.xz', 'w:xz',
+                         pkginfo_content=PKGINFO.replace('1639000000', '1640000000000'))
+        self.assertEqual(1640000000000, self.index.get_build_date(file_path))
+
+    def test_get_build_date__must_return_none_for_missing_files(self):
+        self.assertIsNone(self.index.get_build_date(f'{self.dir_path}/xpto-1.0.0-1-x86_64.pkg.tar.xz'))
+
+    def test_save__must_remove_the_entries_of_missing_files(self):
+        file_path_1 = new_package_file(self.dir_path, 'xpto-1.0.0-1-x86_64.pkg.tar.xz', 'w:xz')
+        file_path_2 = new_package_file(self.dir_path, 'xpto-1.0.1-1-x86_64.pkg.tar.gz', 'w:gz')
+        self.index.get_build_date(file_path_1)
+        self.index.get_build_date(file_path_2)
+
+        os.remove(file_path_1)
+        self.index.save()
+
+        with open(self.index_file) as f:
+            self.assertEqual({file_path_2}, set(json.load(f).keys()))
+
+    def test_save__must_not_write_the_index_when_not_changed(self):
+        self.index.save()
+        self.assertFalse(os.path.exists(self.index_file))
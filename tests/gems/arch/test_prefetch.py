@@ -0,0 +1,189 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from threading import Event
+from typing import Optional
+from unittest import TestCase
+from unittest.mock import Mock
+
+import requests
+
+from bauh.gems.arch import prefetch
+from bauh.gems.arch.aur import URL_SRC_INFO
+from bauh.gems.arch.prefetch import SourcesPrefetcher, SourceFile
+
+SRCINFO = """pkgbase = xpto
+\tpkgdesc = xpto
+\tpkgver = 1.0.0
+\tpkgrel = 1
+\tarch = x86_64
+\tsource = xpto-1.0.0.tar.gz::{url_1}
+\tsource = git+https://github.com/xpto/xpto.git
+\tsource = {url_2}
+\tsource = xpto.desktop
+\tvalidpgpkeys = 5A2E9EC9C7D7E8F1A2B3C4D5E6F7A8B9C0D1E2F3
+\tsha256sums = {sum_1}
+\tsha256sums = SKIP
+\tsha256sums = {sum_2}
+\tsha256sums = SKIP
+\tsource_x86_64 = https://xpto.com/xpto-x86_64.bin
+\tsha512sums_x86_64 = abc
+
+pkgname = xpto
+\tsource = https://xpto.com/ignored.tar.gz
+"""
+
+
+class MapSourcesTest(TestCase):
+
+    def test__must_map_the_downloadable_sources_of_the_package_base_with_their_checksums(self):
+        fields = prefetch.map_srcinfo_fields(SRCINFO.format(url_1='https://xpto.com/v1.0.0.tar.gz', sum_1='AB12',
+                                                            url_2='http://xpto.com/xpto.patch?raw=1', sum_2='cd34'))
+        self.assertEqual(['5A2E9EC9C7D7E8F1A2B3C4D5E6F7A8B9C0D1E2F3'], fields['validpgpkeys'])
+
+        expected = [SourceFile(name='xpto-1.0.0.tar.gz', url='https://xpto.com/v1.0.0.tar.gz', algorithm='sha256',
+                               checksum='ab12'),
+                    SourceFile(name='xpto.patch', url='http://xpto.com/xpto.patch?raw=1', algorithm='sha256',
+                               checksum='cd34'),
+                    SourceFile(name='xpto-x86_64.bin', url='https://xpto.com/xpto-x86_64.bin', algorithm='sha512',
+                               checksum='abc')]
+        self.assertEqual(expected, prefetch.map_sources(fields, x86_64=True))
+
+    def test__must_not_map_the_x86_64_sources_for_other_architectures(self):
+        fields = prefetch.map_srcinfo_fields(SRCINFO.format(url_1='https://xpto.com/v1.0.0.tar.gz', sum_1='ab12',
+                                                            url_2='https://xpto.com/xpto.patch', sum_2='cd34'))
+        self.assertEqual(['xpto-1.0.0.tar.gz', 'xpto.patch'],
+                         [s.name for s in prefetch.map_sources(fields, x86_64=False)])
+
+    def test__must_not_map_local_sources(self):
+        fields = prefetch.map_srcinfo_fields(SRCINFO.format(url_1='file:///etc/shadow', sum_1='SKIP',
+                                                            url_2='ftp://xpto.com/xpto.patch', sum_2='cd34'))
+        self.assertEqual([], prefetch.map_sources(fields, x86_64=False))
+
+    def test__must_not_verify_skipped_checksums(self):
+        fields = prefetch.map_srcinfo_fields(SRCINFO.format(url_1='https://xpto.com/v1.0.0.tar.gz', sum_1='SKIP',
+                                                            url_2='https://xpto.com/xpto.patch', sum_2='cd34'))
+        self.assertIsNone(prefetch.map_sources(fields, x86_64=False)[0].algorithm)
+
+
+class SourcesPrefetcherTest(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.project_dir = f'{self.temp_dir}/project'
+        self.storage_dir = f'{self.temp_dir}/storage'
+        os.makedirs(self.project_dir)
+
+        self.srcinfo = None
+        self.remote_files = {}
+        self.http_client = Mock()
+        self.http_client.get.side_effect = self.http_get
+        self.prefetcher = SourcesPrefetcher(http_client=self.http_client, logger=Mock(), x86_64=False,
+                                            storage_dir=self.storage_dir, max_workers=2)
+
+    def tearDown(self):
+        self.prefetcher.clean()
+        shutil.rmtree(self.temp_dir)
+
+    def http_get(self, url: str, stream: bool = False) -> Optional[Mock]:
+        if url.startswith(URL_SRC_INFO):
+            return Mock(text=self.srcinfo)
+
+        content = self.remote_files.get(url)
+
+        if content is not None:
+            return Mock(status_code=200, iter_content=Mock(return_value=[content]))
+
+    def new_remote_file(self, name: str, content: bytes) -> str:
+        self.remote_files[f'https://xpto.com/{name}'] = content
+        return hashlib.sha256(content).hexdigest()
+
+    def prepare_srcinfo(self, sum_1: str, sum_2: str) -> str:
+        srcinfo = SRCINFO.format(url_1='https://xpto.com/v1.0.0.tar.gz', sum_1=sum_1,
+                                 url_2='https://xpto.com/xpto.patch', sum_2=sum_2)
+        self.srcinfo = srcinfo
+
+        with open(f'{self.project_dir}/.SRCINFO', 'w+') as f:
+            f.write(srcinfo)
+
+        return srcinfo
+
+    def test_prefetch__must_return_the_valid_pgp_keys_of_each_package_base(self):
+        self.prepare_srcinfo(sum_1='SKIP', sum_2='SKIP')
+
+        keys = self.prefetcher.prefetch(['xpto'])
+        self.assertEqual({'xpto': {'5A2E9EC9C7D7E8F1A2B3C4D5E6F7A8B9C0D1E2F3'}}, keys)
+
+        self.assertEqual({}, self.prefetcher.prefetch(['xpto']))  # already prefetched
+        srcinfo_calls = [c for c in self.http_client.get.call_args_list if c[0][0].startswith(URL_SRC_INFO)]
+        self.assertEqual(1, len(srcinfo_calls))
+
+    def test_prefetch__must_ignore_connection_errors(self):
+        self.http_client.get.side_effect = requests.exceptions.ConnectionError()
+
+        self.assertEqual({}, self.prefetcher.prefetch(['xpto']))
+        self.assertEqual(0, self.prefetcher.retrieve('xpto', self.project_dir))
+
+    def test_retrieve__must_move_the_verified_files_to_the_project_dir(self):
+        sum_1 = self.new_remote_file('v1.0.0.tar.gz', b'xpto source')
+        self.new_remote_file('xpto.patch', b'xpto patch')
+        self.prepare_srcinfo(sum_1=sum_1, sum_2='0' * 64)  # patch checksum does not match
+
+        self.prefetcher.prefetch(['xpto'])
+        self.assertEqual(1, self.prefetcher.retrieve('xpto', self.project_dir))
+        self.http_client.get.assert_any_call('https://xpto.com/v1.0.0.tar.gz', stream=True)
+
+        with open(f'{self.project_dir}/xpto-1.0.0.tar.gz', 'rb') as f:
+            self.assertEqual(b'xpto source', f.read())
+
+        self.assertFalse(os.path.exists(f'{self.project_dir}/xpto.patch'))
+
+    def test_retrieve__must_not_move_files_no_longer_declared(self):
+        sum_1 = self.new_remote_file('v1.0.0.tar.gz', b'xpto source')
+        self.new_remote_file('xpto.patch', b'xpto patch')
+        self.prepare_srcinfo(sum_1=sum_1, sum_2='SKIP')
+        self.prefetcher.prefetch(['xpto'])
+
+        with open(f'{self.project_dir}/.SRCINFO', 'w+') as f:  # e.g: the PKGBUILD was edited
+            f.write(SRCINFO.format(url_1='https://xpto.com/v1.0.0.tar.gz', sum_1='SKIP',
+                                   url_2='https://xpto.com/xpto.patch', sum_2='SKIP'))
+
+        self.assertEqual(1, self.prefetcher.retrieve('xpto', self.project_dir))
+        self.assertEqual({'.SRCINFO', 'xpto.patch'}, set(os.listdir(self.project_dir)))
+
+    def test_retrieve__must_return_zero_for_unknown_package_bases(self):
+        self.assertEqual(0, self.prefetcher.retrieve('abc', self.project_dir))
+
+    def test_clean__must_remove_the_files_not_retrieved(self):
+        self.new_remote_file('v1.0.0.tar.gz', b'xpto source')
+        self.prepare_srcinfo(sum_1='SKIP', sum_2='SKIP')  # 'xpto.patch' is not available
+
+        self.prefetcher.prefetch(['xpto'])
+        self.prefetcher.clean()
+
+        self.assertEqual([], os.listdir(self.storage_dir))
+
+    def test_clean__must_abort_the_running_downloads(self):
+        started = Event()
+
+        def endless_content(chunk_size: int):
+            deadline = time.time() + 10
+
+            while time.time() < deadline:
+                started.set()
+                yield b'x'
+                time.sleep(0.01)
+
+        self.prepare_srcinfo(sum_1='SKIP', sum_2='SKIP')
+        self.http_client.get.side_effect = lambda url, stream=False: Mock(text=self.srcinfo) \
+            if url.startswith(URL_SRC_INFO) else Mock(status_code=200, iter_content=endless_content)
+
+        self.prefetcher.prefetch(['xpto'])
+        self.assertTrue(started.wait(5))
+
+        ti = time.time()
+        self.prefetcher.clean()
+        self.assertLess(time.time() - ti, 5)
+        self.assertEqual([], os.listdir(self.storage_dir))
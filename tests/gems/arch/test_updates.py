@@ -4,6 +4,7 @@ from unittest.mock import patch, Mock, MagicMock
 from bauh import __app_name__
 from bauh.api.abstract.controller import UpgradeRequirement
 from bauh.gems.arch.dependencies import DependenciesAnalyser
+from bauh.gems.arch.graph import ReverseDependencyGraph
 from bauh.gems.arch.model import ArchPackage
 from bauh.gems.arch.updates import UpdatesSummarizer
 from bauh.view.util.translation import I18n
@@ -1315,6 +1316,7 @@ class UpdatesSummarizerGetUpgradeRequirementsTest(TestCase):
         self.assertEqual([UpgradeRequirement(pkg=pkg_a, required_size=1, extra_size=0)], res.to_upgrade)
         self.assertEqual([UpgradeRequirement(pkg=pkg_b, extra_size=1, reason=" 'C'")], res.to_remove)
 
+    @patch(f"{__app_name__}.gems.arch.dependencies.get_installed_graph")
     @patch(f"{__app_name__}.gems.arch.dependencies.pacman")
     @patch(f"{__app_name__}.gems.arch.updates.pacman")
     def test__return_as_to_remove_when_to_update_conflicts_with_to_install_and_it_has_deps(self, *mocks: Mock):
@@ -1388,7 +1390,10 @@ class UpdatesSummarizerGetUpgradeRequirementsTest(TestCase):
                                                                    'r': "community",
                                                                    'des': "C"}
                                                              }
-        pacman_dependencies.map_required_by.return_value = {"B": {"D"}}
+        get_installed_graph = mocks[2]
+        get_installed_graph.return_value = ReverseDependencyGraph({"A": {"p": {"A"}, "d": set()},
+                                                                   "B": {"p": {"B"}, "d": set()},
+                                                                   "D": {"p": {"D"}, "d": {"B"}}})
 
         pacman.map_installed.return_value = {"A": pkg_a.version, "B": pkg_b.version, "D": "0.7.0"}
         pacman.map_required_by.return_value = {**{c: set() for c in ("A", "C", "D")}, "B": {"D"}}
@@ -1404,8 +1409,8 @@ class UpdatesSummarizerGetUpgradeRequirementsTest(TestCase):
                        'map_required_by', 'map_required_dependencies'):
             getattr(pacman, method).assert_called()
 
-        for method in ('map_updates_data', 'map_required_by'):
-            getattr(pacman_dependencies, method).assert_called()
+        pacman_dependencies.map_updates_data.assert_called()
+        get_installed_graph.assert_called()
 
         self.assertFalse(res.cannot_upgrade)
 
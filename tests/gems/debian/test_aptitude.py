@@ -1,10 +1,12 @@
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, call
 
 from bauh import __app_name__
 from bauh.commons import system
+from bauh.commons.html import bold
 from bauh.commons.system import USE_GLOBAL_INTERPRETER
-from bauh.gems.debian.aptitude import Aptitude, map_package_name
+from bauh.gems.debian.aptitude import Aptitude, map_package_name, AptitudeOutputHandler, \
+    AptitudeOutputHandlerFactory, AptitudeAction
 from bauh.gems.debian.model import DebianPackage
 
 
@@ -196,3 +198,25 @@ Description: GNU C compiler
         }
 
         self.assertEqual(to_remove, {*transaction.to_remove})
+
+
+class AptitudeOutputHandlerTest(TestCase):
+
+    def test_run__must_display_the_progress_of_the_unpacked_targets(self):
+        i18n = {'debian.output.unpacking': 'Unpacking {pkg}', 'debian.output.finishing': 'Finishing'}
+        watcher = Mock()
+        handler = AptitudeOutputHandler(i18n=i18n, targets=('gimp', 'vim'), watcher=watcher,
+                                        re_download=AptitudeOutputHandlerFactory(i18n).re_download,
+                                        action=AptitudeAction.INSTALL)
+        handler._min_interval = 0
+        handler.start()
+
+        for line in ('Unpacking gimp:amd64 (2.10) ...', 'Unpacking vim (8.2) ...', 'Setting up vim (8.2) ...'):
+            handler.handle(line)
+
+        handler.stop_working()
+        handler.join(5)
+
+        self.assertEqual([call(f"(50.00%) [1/2] Unpacking {bold('gimp')}"),
+                          call(f"(100.00%) [2/2] Unpacking {bold('vim')}"),
+                          call('Finishing')], watcher.change_substatus.call_args_list)
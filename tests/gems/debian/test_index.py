@@ -4,6 +4,7 @@ from unittest import TestCase
 from unittest.mock import Mock, patch, call
 
 from bauh import __app_name__
+from bauh.commons.freshness import FreshnessRegistry
 from bauh.gems.debian.index import ApplicationsMapper, ApplicationIndexer
 from bauh.gems.debian.model import DebianApplication
 from tests.gems.debian import DEBIAN_TESTS_DIR
@@ -115,8 +116,10 @@ class ApplicationIndexerTest(TestCase):
     def setUp(self):
         self.update_idx_file_path = f'{DEBIAN_TESTS_DIR}/resources/apps_idx.json'
         self.update_idx_ts_file_path = f'{self.update_idx_file_path}.ts'
+        self.freshness_file_path = f'{DEBIAN_TESTS_DIR}/resources/freshness.json'
         self.app_indexer = ApplicationIndexer(logger=Mock(),
-                                              index_file_path=self.update_idx_file_path)
+                                              index_file_path=self.update_idx_file_path,
+                                              registry=FreshnessRegistry(self.freshness_file_path))
 
         if os.path.exists(self.update_idx_file_path):
             os.remove(self.update_idx_file_path)
@@ -128,6 +131,10 @@ class ApplicationIndexerTest(TestCase):
         if os.path.exists(self.update_idx_ts_file_path):
             os.remove(self.update_idx_ts_file_path)
 
+        for file_path in (self.freshness_file_path, f'{self.freshness_file_path}.lock'):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
     def test_update_index(self):
         apps = {
             DebianApplication(name='firefox', exe_path='firefox %u', icon_path='firefox',
@@ -0,0 +1,82 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.gems.debian.aptitude import AptitudeAction
+from bauh.gems.debian.model import DebianTransaction, DebianPackage
+from bauh.gems.debian.transaction import TransactionPlanner, TransactionPlan
+
+
+class TransactionPlanTest(TestCase):
+
+    def test_get_data__must_return_only_the_requested_attributes(self):
+        plan = TransactionPlan(transaction=Mock(), packages_data={'vim': {'section': 'editors', 'depends': ('libc6',)}})
+        self.assertEqual({'section': 'editors'}, plan.get_data('vim', attrs=('section', 'maintainer')))
+        self.assertEqual({'section': 'editors', 'depends': ('libc6',)}, plan.get_data('vim'))
+        self.assertIsNone(plan.get_data('git'))
+
+
+class TransactionPlannerTest(TestCase):
+
+    def setUp(self):
+        self.status_file = tempfile.NamedTemporaryFile(delete=False)
+        self.status_file.close()
+        self.transaction = DebianTransaction(to_install=(DebianPackage(name='libx', version='1.0', latest_version='1.0'),),
+                                             to_upgrade=(DebianPackage(name='vim', version='8.1', latest_version='8.2'),),
+                                             to_remove=(DebianPackage(name='old', version='0.1', latest_version='0.1'),))
+        self.aptitude = Mock()
+        self.aptitude.simulate_upgrade.return_value = self.transaction
+        self.aptitude.show.return_value = {'vim': {'compressed size': 10}}
+        self.planner = TransactionPlanner(aptitude=self.aptitude, logger=Mock(), state_paths=(self.status_file.name,))
+
+    def tearDown(self):
+        os.remove(self.status_file.name)
+
+    def test_plan__must_simulate_and_show_all_packages_with_a_single_call(self):
+        plan = self.planner.plan(AptitudeAction.UPGRADE, ('vim',))
+
+        self.assertEqual(self.transaction, plan.transaction)
+        self.aptitude.simulate_upgrade.assert_called_once_with(['vim'])
+        self.aptitude.show.assert_not_called()  # only when the data is required
+
+        self.assertEqual({'compressed size': 10}, plan.get_data('vim'))
+        self.assertEqual({'compressed size': 10}, plan.get_data('vim'))
+        self.aptitude.show.assert_called_once()
+        self.assertEqual(['libx=1.0', 'vim=8.2', 'old'], self.aptitude.show.call_args[1]['pkgs'])
+
+    def test_plan__must_reuse_the_plan_of_the_same_packages_while_the_state_is_not_modified(self):
+        plan = self.planner.plan(AptitudeAction.UPGRADE, ('vim', 'git'))
+        plan.get_data('vim')
+        self.assertEqual(plan, self.planner.plan(AptitudeAction.UPGRADE, ('git', 'vim')))
+        plan.get_data('vim')
+
+        self.aptitude.simulate_upgrade.assert_called_once()
+        self.aptitude.show.assert_called_once()
+
+    def test_plan__must_resolve_again_when_the_state_is_modified(self):
+        self.planner.plan(AptitudeAction.UPGRADE, ('vim',))
+
+        stat = os.stat(self.status_file.name)
+        os.utime(self.status_file.name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+        self.planner.plan(AptitudeAction.UPGRADE, ('vim',))
+        self.assertEqual(2, self.aptitude.simulate_upgrade.call_count)
+
+    def test_plan__must_resolve_again_after_invalidation(self):
+        self.planner.plan(AptitudeAction.UPGRADE, ('vim',))
+        self.planner.invalidate()
+        self.planner.plan(AptitudeAction.UPGRADE, ('vim',))
+        self.assertEqual(2, self.aptitude.simulate_upgrade.call_count)
+
+    def test_plan__must_not_reuse_plans_of_different_actions(self):
+        self.aptitude.simulate_removal.return_value = self.transaction
+        self.planner.plan(AptitudeAction.UPGRADE, ('vim',))
+        self.planner.plan(AptitudeAction.REMOVE, ('vim',), purge=True)
+
+        self.aptitude.simulate_removal.assert_called_once_with(['vim'], purge=True)
+
+    def test_plan__must_return_None_when_the_transaction_cannot_be_resolved(self):
+        self.aptitude.simulate_installation.return_value = None
+        self.assertIsNone(self.planner.plan(AptitudeAction.INSTALL, ('vim',)))
+        self.aptitude.show.assert_not_called()
@@ -1,6 +1,9 @@
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, MagicMock, patch
 
+from bauh import __app_name__
+from bauh.api.abstract.controller import UpgradeRequirement, UpgradeRequirements
+from bauh.gems.flatpak import VERSION_1_12
 from bauh.gems.flatpak.controller import FlatpakManager
 from bauh.gems.flatpak.model import FlatpakApplication
 
@@ -119,3 +122,64 @@ class FlatpakManagerSortUpdateOrderTest(TestCase):
         self.assertEqual(gnome_platform.id, sorted_list[3].id)
         self.assertEqual('org.gnome.gedit', sorted_list[4].id)
         self.assertEqual('com.spotify.Client', sorted_list[5].id)
+
+
+def new_req(id_: str, installation: str = 'user', runtime: bool = False, update_component: bool = False) -> UpgradeRequirement:
+    return UpgradeRequirement(pkg=FlatpakApplication(id=id_, name=id_, ref=f'{id_}/x86_64/stable', origin='flathub',
+                                                     installation=installation, runtime=runtime,
+                                                     update_component=update_component))
+
+
+class FlatpakManagerUpgradeTest(TestCase):
+
+    def setUp(self):
+        context = Mock()
+        context.i18n = MagicMock()
+        self.manager = FlatpakManager(context)
+        self.manager._make_exports_dir = Mock(return_value=True)
+
+    def test_group_upgrades__must_group_contiguous_upgrades_by_installation_and_operation(self):
+        reqs = [new_req('org.Platform', 'system', runtime=True), new_req('org.Platform2', 'system', runtime=True),
+                new_req('org.GL', 'user', runtime=True), new_req('org.App', 'user'),
+                new_req('org.App2', 'system')]
+
+        groups = self.manager._group_upgrades(reqs, VERSION_1_12)
+        self.assertEqual([[reqs[0], reqs[1]], [reqs[2], reqs[3]], [reqs[4]]], groups)
+
+    def test_group_upgrades__must_not_group_upgrades_separated_by_other_operations(self):
+        reqs = [new_req('org.Platform', runtime=True), new_req('org.New', runtime=True, update_component=True),
+                new_req('org.App')]
+
+        groups = self.manager._group_upgrades(reqs, VERSION_1_12)
+        self.assertEqual([[reqs[0]], [reqs[1]], [reqs[2]]], groups)
+
+    @patch(f'{__app_name__}.gems.flatpak.controller.flatpak')
+    @patch(f'{__app_name__}.gems.flatpak.controller.ProcessHandler')
+    def test_upgrade__must_update_the_refs_of_an_installation_with_a_single_transaction(self, handler: Mock,
+                                                                                          flatpak: Mock):
+        flatpak.get_version.return_value = VERSION_1_12
+        handler.return_value.handle_simple.return_value = (True, '')
+        reqs = [new_req('org.Platform', runtime=True), new_req('org.App')]
+
+        self.assertTrue(self.manager.upgrade(UpgradeRequirements(None, None, reqs, None), None, Mock()))
+
+        flatpak.update_several.assert_called_once_with(app_refs=['org.Platform/x86_64/stable', 'org.App/x86_64/stable'],
+                                                       installation='user', related=False, deps=False,
+                                                       version=VERSION_1_12)
+        flatpak.update.assert_not_called()
+        handler.return_value.handle_simple.assert_called_once()
+
+    @patch(f'{__app_name__}.gems.flatpak.controller.flatpak')
+    @patch(f'{__app_name__}.gems.flatpak.controller.ProcessHandler')
+    def test_upgrade__must_retry_individually_only_the_refs_not_upgraded(self, handler: Mock, flatpak: Mock):
+        flatpak.get_version.return_value = VERSION_1_12
+        output_handler = flatpak.TransactionOutputHandler.return_value
+        output_handler.list_not_finished.return_value = ['org.App/x86_64/stable']
+        handler.return_value.handle_simple.side_effect = [(False, ''), (True, '')]
+        reqs = [new_req('org.Platform', runtime=True), new_req('org.App')]
+
+        self.assertTrue(self.manager.upgrade(UpgradeRequirements(None, None, reqs, None), None, Mock()))
+
+        output_handler.list_not_finished.assert_called_once_with(False)
+        flatpak.update.assert_called_once_with(app_ref='org.App/x86_64/stable', installation='user', related=False,
+                                               deps=False, version=VERSION_1_12)
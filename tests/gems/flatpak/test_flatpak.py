@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest import TestCase
 from unittest.mock import patch, Mock
 
@@ -21,3 +23,74 @@ class FlatpakTest(TestCase):
         handle_simple.assert_called_once()
 
         self.assertEqual({'org.xpto.Xnote': 4300000}, download_size)
+
+    @patch(f'{__app_name__}.gems.flatpak.flatpak.run_cmd', return_value="""
+        ID: org.xpto.Xnote
+       Ref: app/org.xpto.Xnote/x86_64/stable
+    Commit: 6b7cd53bbc8b2ab7c2fc63da2b8d50c7c2e8ccaf
+    Parent: 1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d7e8f9a0b
+   Subject: Update to 1.2
+      Date: 2021-12-06 09:51:00 +0000
+    """)
+    def test_get_remote_commit__must_return_the_commit_and_its_parent(self, run_cmd: Mock):
+        commit = flatpak.get_remote_commit('org.xpto.Xnote/x86_64/stable', 'flathub', 'user', commit='6b7cd53')
+
+        run_cmd.assert_called_once_with('flatpak remote-info flathub org.xpto.Xnote/x86_64/stable --user '
+                                        '--commit=6b7cd53', print_error=False)
+        self.assertEqual({'commit': '6b7cd53bbc8b2ab7c2fc63da2b8d50c7c2e8ccaf',
+                          'parent': '1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d7e8f9a0b',
+                          'subject': 'Update to 1.2', 'date': '2021-12-06 09:51:00 +0000'}, commit)
+
+    @patch(f'{__app_name__}.gems.flatpak.flatpak.run_cmd', return_value=None)
+    def test_get_remote_commit__must_return_None_when_the_remote_cannot_be_reached(self, run_cmd: Mock):
+        self.assertIsNone(flatpak.get_remote_commit('org.xpto.Xnote/x86_64/stable', 'flathub', 'user'))
+        run_cmd.assert_called_once()
+
+    def test_get_deployed_commit__must_read_the_active_deployment(self):
+        commit = 'a' * 64
+
+        with tempfile.TemporaryDirectory() as installation_dir:
+            app_dir = f'{installation_dir}/app/org.xpto.Xnote/x86_64/stable'
+            os.makedirs(f'{app_dir}/{commit}')
+            os.symlink(commit, f'{app_dir}/active')
+
+            with patch(f'{__app_name__}.gems.flatpak.flatpak.USER_INSTALLATION_DIR', installation_dir):
+                self.assertEqual(commit, flatpak.get_deployed_commit('org.xpto.Xnote/x86_64/stable', 'user', False))
+                self.assertEqual(commit, flatpak.get_deployed_commit('app/org.xpto.Xnote/x86_64/stable', 'user',
+                                                                     False))
+                self.assertIsNone(flatpak.get_deployed_commit('org.xpto.Xnote/x86_64/stable', 'user', True))
+
+
+class TransactionOutputHandlerTest(TestCase):
+
+    def setUp(self):
+        self.refs = ['org.Platform/x86_64/20.08', 'org.App/x86_64/stable', 'org.Tool/x86_64/stable']
+        self.on_step = Mock()
+        self.handler = flatpak.TransactionOutputHandler(refs=self.refs, on_step=self.on_step)
+
+        for line in ('Looking for updates…',
+                     '\tID\tBranch\tOp\tRemote\tDownload',
+                     '1.\t \torg.Platform\t20.08\tu\tflathub\t< 100 MB',
+                     '2.\t \torg.App\tstable\tu\tflathub\t< 4.3 MB',
+                     '3.\t \torg.Tool\tstable\tu\tflathub\t< 1 MB'):
+            self.handler.handle(line)
+
+    def test_handle__must_notify_the_ref_being_processed(self):
+        self.handler.handle('Updating 2/3…')
+        self.on_step.assert_called_once_with('org.App/x86_64/stable', 2, 3)
+
+    def test_list_not_finished__must_return_nothing_when_succeeded(self):
+        self.assertEqual([], self.handler.list_not_finished(True))
+
+    def test_list_not_finished__must_return_the_failed_and_not_processed_refs(self):
+        self.handler.handle('Updating 1/3…')
+        self.handler.handle('Updating 2/3…')
+        self.handler.handle('Updating 3/3…')
+        self.handler.handle('Error: Failed to update org.App: some reason')
+
+        self.assertEqual(['org.App/x86_64/stable', 'org.Tool/x86_64/stable'], self.handler.list_not_finished(False))
+
+    def test_list_not_finished__must_return_all_refs_when_the_output_cannot_be_followed(self):
+        handler = flatpak.TransactionOutputHandler(refs=self.refs)
+        handler.handle('something unexpected')
+        self.assertEqual(self.refs, handler.list_not_finished(False))
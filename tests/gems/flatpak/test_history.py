@@ -0,0 +1,95 @@
+import json
+import shutil
+import tempfile
+import time
+from typing import Optional
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from bauh import __app_name__
+from bauh.gems.flatpak.history import CommitHistoryCache
+
+REF = 'org.xpto.Xnote/x86_64/stable'
+
+
+def new_commit(commit: str, parent: Optional[str] = None) -> dict:
+    data = {'commit': commit, 'subject': f'subject {commit}', 'date': '2021-12-06 09:51:00 +0000'}
+
+    if parent:
+        data['parent'] = parent
+
+    return data
+
+
+@patch(f'{__app_name__}.gems.flatpak.history.flatpak')
+class CommitHistoryCacheTest(TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = CommitHistoryCache(logger=Mock(), cache_dir=self.cache_dir, check_interval=60,
+                                        max_new_commits=2)
+        self.file_path = self.cache.get_file_path(REF, 'flathub', 'user')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def write_cache(self, commits: list, checked: float):
+        self.cache._write(self.file_path, commits)
+
+        with open(self.file_path) as f:
+            data = json.load(f)
+
+        data['checked'] = checked
+
+        with open(self.file_path, 'w') as f:
+            json.dump(data, f)
+
+    def test_get_commits__must_retrieve_and_cache_the_full_log_when_not_cached(self, flatpak: Mock):
+        flatpak.get_app_commits_log.return_value = [new_commit('c2'), new_commit('c1')]
+
+        self.assertEqual([new_commit('c2'), new_commit('c1')], self.cache.get_commits(REF, 'flathub', 'user'))
+        self.assertEqual([new_commit('c2'), new_commit('c1')], self.cache.get_commits(REF, 'flathub', 'user', 'c1'))
+
+        flatpak.get_app_commits_log.assert_called_once_with(REF, 'flathub', 'user')
+        flatpak.get_remote_commit.assert_not_called()
+
+    def test_get_commits__must_check_the_remote_when_the_current_commit_is_not_cached(self, flatpak: Mock):
+        self.write_cache([new_commit('c1')], checked=time.time())
+        flatpak.get_remote_commit.side_effect = lambda ref, origin, inst, commit=None: \
+            new_commit('c2', parent='c1') if commit is None else None
+
+        commits = self.cache.get_commits(REF, 'flathub', 'user', current_commit='c2')
+
+        self.assertEqual(['c2', 'c1'], [c['commit'] for c in commits])
+        flatpak.get_app_commits_log.assert_not_called()
+
+    def test_get_commits__must_walk_the_new_commits_until_the_newest_known(self, flatpak: Mock):
+        self.write_cache([new_commit('c1')], checked=0)
+        remote = {None: new_commit('c3', parent='c2'), 'c2': new_commit('c2', parent='c1')}
+        flatpak.get_remote_commit.side_effect = lambda ref, origin, inst, commit=None: remote[commit]
+
+        self.assertEqual(['c3', 'c2', 'c1'], [c['commit'] for c in self.cache.get_commits(REF, 'flathub', 'user')])
+        self.assertEqual(['c3', 'c2', 'c1'], [c['commit'] for c in self.cache.get_commits(REF, 'flathub', 'user')])
+        self.assertEqual(2, flatpak.get_remote_commit.call_count)
+        flatpak.get_app_commits_log.assert_not_called()
+
+    def test_get_commits__must_retrieve_the_full_log_when_there_are_too_many_new_commits(self, flatpak: Mock):
+        self.write_cache([new_commit('c1')], checked=0)
+        remote = {None: new_commit('c4', parent='c3'), 'c3': new_commit('c3', parent='c2'),
+                  'c2': new_commit('c2', parent='c1')}
+        flatpak.get_remote_commit.side_effect = lambda ref, origin, inst, commit=None: remote[commit]
+        flatpak.get_app_commits_log.return_value = [new_commit(c) for c in ('c4', 'c3', 'c2', 'c1')]
+
+        self.assertEqual(['c4', 'c3', 'c2', 'c1'], [c['commit'] for c in self.cache.get_commits(REF, 'flathub', 'user')])
+        flatpak.get_app_commits_log.assert_called_once()
+
+    def test_get_commits__must_return_the_cached_log_when_the_remote_cannot_be_reached(self, flatpak: Mock):
+        self.write_cache([new_commit('c1')], checked=0)
+        flatpak.get_remote_commit.return_value = None
+
+        self.assertEqual([new_commit('c1')], self.cache.get_commits(REF, 'flathub', 'user'))
+        flatpak.get_app_commits_log.assert_not_called()
+
+    def test_get_commits__must_return_None_when_nothing_could_be_retrieved(self, flatpak: Mock):
+        flatpak.get_app_commits_log.return_value = None
+        self.assertIsNone(self.cache.get_commits(REF, 'flathub', 'user'))
@@ -0,0 +1,48 @@
+from unittest import TestCase
+from unittest.mock import Mock, MagicMock
+
+from bauh.gems.snap.snapd import SnapdClient, URL_BASE
+
+
+def new_response(result: list) -> Mock:
+    res = Mock(status_code=200)
+    res.json.return_value = {'status-code': 200, 'result': result}
+    return res
+
+
+class SnapdClientTest(TestCase):
+
+    def setUp(self):
+        self.client = SnapdClient(Mock())
+        self.client.session = MagicMock()
+
+    def test_list_all_snaps__must_reuse_the_cached_response_while_not_expired(self):
+        self.client.session.get.return_value = new_response([{'name': 'core'}])
+
+        self.assertEqual([{'name': 'core'}], self.client.list_all_snaps())
+        self.assertEqual([{'name': 'core'}], self.client.list_all_snaps())
+        self.client.session.get.assert_called_once_with(url=f'{URL_BASE}/snaps', params=None)
+
+    def test_list_all_snaps__must_request_again_after_the_cache_is_invalidated(self):
+        self.client.session.get.return_value = new_response([{'name': 'core'}])
+
+        self.client.list_all_snaps()
+        self.client.invalidate_cache()
+        self.client.list_all_snaps()
+        self.assertEqual(2, self.client.session.get.call_count)
+
+    def test_list_all_snaps__must_not_cache_when_ttl_is_zero(self):
+        self.client.cache_ttl = 0
+        self.client.session.get.return_value = new_response([{'name': 'core'}])
+
+        self.client.list_all_snaps()
+        self.client.list_all_snaps()
+        self.assertEqual(2, self.client.session.get.call_count)
+
+    def test_list_commands__must_filter_the_cached_apps_by_snap_name(self):
+        self.client.session.get.return_value = new_response([{'snap': 'vlc', 'name': 'vlc'},
+                                                             {'snap': 'core', 'name': 'core.x'}])
+
+        self.assertEqual([{'snap': 'vlc', 'name': 'vlc'}], self.client.list_commands('vlc'))
+        self.assertEqual([{'snap': 'core', 'name': 'core.x'}], self.client.list_commands('core'))
+        self.client.session.get.assert_called_once_with(url=f'{URL_BASE}/apps', params=None)
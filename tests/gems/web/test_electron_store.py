@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.gems.web import electron_store
+
+
+class ElectronStoreTest(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store_dir = f'{self.temp_dir}/store'
+        self.logger = Mock()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def gen_app(self, app_id: str, app_content: bytes) -> str:
+        app_dir = f'{self.temp_dir}/installed/{app_id}'
+        os.makedirs(f'{app_dir}/resources/app')
+
+        with open(f'{app_dir}/{app_id}', 'wb') as f:
+            f.write(b'electron binary')
+
+        os.chmod(f'{app_dir}/{app_id}', 0o755)
+
+        with open(f'{app_dir}/libffmpeg.so', 'wb') as f:
+            f.write(b'ffmpeg')
+
+        with open(f'{app_dir}/resources/app/package.json', 'wb') as f:
+            f.write(app_content)
+
+        return app_dir
+
+    def link(self, app_id: str, app_dir: str):
+        return electron_store.link_app(app_id=app_id, app_dir=app_dir, key='1.0.0-x64', logger=self.logger,
+                                       store_dir=self.store_dir)
+
+    def test_gen_key__must_consider_the_version_and_architecture(self):
+        self.assertEqual('11.0.1-x64', electron_store.gen_key('11.0.1', x86_64=True))
+        self.assertEqual('11.0.1-ia32', electron_store.gen_key('11.0.1', x86_64=False))
+        self.assertEqual('11.0.1-x64-wvvmp', electron_store.gen_key('11.0.1', x86_64=True, widevine=True))
+
+    def test_link_app__must_hardlink_identical_files_of_different_apps(self):
+        app_a, app_b = self.gen_app('a', b'{"name": "a"}'), self.gen_app('b', b'{"name": "bb"}')
+
+        self.assertEqual((34, 0), self.link('a', app_a))
+        self.assertEqual((35, 21), self.link('b', app_b))
+
+        self.assertTrue(os.path.samefile(f'{app_a}/a', f'{app_b}/b'))  # the renamed Electron binary
+        self.assertTrue(os.path.samefile(f'{app_a}/libffmpeg.so', f'{app_b}/libffmpeg.so'))
+
+        self.assertFalse(os.path.samefile(f'{app_a}/resources/app/package.json',
+                                          f'{app_b}/resources/app/package.json'))
+        self.assertEqual(0o755, os.stat(f'{app_b}/b').st_mode & 0o777)
+        self.assertEqual({'a', 'b'}, electron_store.read_refs(f'{self.store_dir}/1.0.0-x64'))
+
+    def test_link_app__must_not_link_identical_files_with_different_permissions(self):
+        app_a, app_b = self.gen_app('a', b'a'), self.gen_app('b', b'b')
+        os.chmod(f'{app_b}/b', 0o700)
+
+        self.link('a', app_a)
+        self.link('b', app_b)
+
+        self.assertFalse(os.path.samefile(f'{app_a}/a', f'{app_b}/b'))
+        self.assertTrue(os.path.samefile(f'{app_a}/libffmpeg.so', f'{app_b}/libffmpeg.so'))
+
+    def test_release_app__must_remove_only_the_files_not_used_anymore(self):
+        app_a, app_b = self.gen_app('a', b'a'), self.gen_app('b', b'b')
+
+        with open(f'{app_a}/only_a.pak', 'wb') as f:
+            f.write(b'only a')
+
+        self.link('a', app_a)
+        self.link('b', app_b)
+
+        objects_dir = f'{self.store_dir}/1.0.0-x64/{electron_store.OBJECTS_DIR}'
+        self.assertEqual(3, len(os.listdir(objects_dir)))
+
+        shutil.rmtree(app_a)
+        self.assertEqual('1.0.0-x64', electron_store.release_app('a', self.logger, store_dir=self.store_dir))
+
+        self.assertEqual(2, len(os.listdir(objects_dir)))
+        self.assertEqual({'b'}, electron_store.read_refs(f'{self.store_dir}/1.0.0-x64'))
+
+    def test_release_app__must_remove_the_distribution_when_no_app_references_it(self):
+        app_a = self.gen_app('a', b'a')
+        self.link('a', app_a)
+
+        shutil.rmtree(app_a)
+        electron_store.release_app('a', self.logger, store_dir=self.store_dir)
+
+        self.assertFalse(os.path.exists(f'{self.store_dir}/1.0.0-x64'))
+
+    def test_release_app__must_return_None_for_apps_not_referenced(self):
+        self.assertIsNone(electron_store.release_app('a', self.logger, store_dir=self.store_dir))
@@ -0,0 +1,28 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.gems.web.environment import EnvironmentUpdater
+
+NODE_URL = 'https://nodejs.org/dist/v16.13.1/node-v16.13.1-linux-x64.tar.gz'
+SHASUMS = """a3721f87cecc0b52b0be8587c20776ac7305db413751db02c55aa2bffac15198  node-v16.13.1-linux-arm64.tar.gz
+85c3cd9e5e5e2f3f4e6a8a4d3ef4c0b2e7a1cbd25c5e0d8f7a8a4e2f6d0c2a1b  node-v16.13.1-linux-x64.tar.gz
+"""
+
+
+class EnvironmentUpdaterTest(TestCase):
+
+    def setUp(self):
+        self.http_client = Mock()
+        self.updater = EnvironmentUpdater(logger=Mock(), http_client=self.http_client, file_downloader=Mock(),
+                                          i18n=Mock())
+
+    def test_get_nodejs_sha256__must_return_the_checksum_listed_for_the_file(self):
+        self.http_client.get.return_value = Mock(text=SHASUMS)
+
+        res = self.updater._get_nodejs_sha256(NODE_URL)
+        self.assertEqual('85c3cd9e5e5e2f3f4e6a8a4d3ef4c0b2e7a1cbd25c5e0d8f7a8a4e2f6d0c2a1b', res)
+        self.http_client.get.assert_called_once_with('https://nodejs.org/dist/v16.13.1/SHASUMS256.txt')
+
+    def test_get_nodejs_sha256__must_return_none_when_the_checksums_file_is_not_available(self):
+        self.http_client.get.side_effect = Exception()
+        self.assertIsNone(self.updater._get_nodejs_sha256(NODE_URL))
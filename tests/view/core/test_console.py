@@ -0,0 +1,52 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bauh.view.core.console import ConsoleOutputBuffer
+
+
+class ConsoleOutputBufferTest(TestCase):
+
+    def setUp(self):
+        self.buffer = ConsoleOutputBuffer(max_pending=3)
+
+    def test_drain__must_return_the_pending_lines_only_once(self):
+        self.buffer.append('a')
+        self.buffer.append('b')
+
+        self.assertEqual((['a', 'b'], 0), self.buffer.drain())
+        self.assertEqual(([], 0), self.buffer.drain())
+
+    def test_drain__must_return_the_newest_lines_and_how_many_were_skipped(self):
+        for line in ('a', 'b', 'c', 'd', 'e'):
+            self.buffer.append(line)
+
+        self.assertEqual((['c', 'd', 'e'], 2), self.buffer.drain())
+
+    def test_save__must_write_the_full_output(self):
+        for line in ('a', 'b', 'c', 'd', 'e'):
+            self.buffer.append(line)
+
+        self.buffer.drain()
+        self.buffer.append('f')
+
+        with TemporaryDirectory() as tmp_dir:
+            file_path = f'{tmp_dir}/output.log'
+            self.buffer.save(file_path)
+
+            with open(file_path) as f:
+                self.assertEqual('a\nb\nc\nd\ne\nf\n', f.read())
+
+    def test_reset__must_discard_the_output(self):
+        self.buffer.append('a')
+        self.assertTrue(self.buffer.has_output())
+
+        self.buffer.reset()
+        self.assertFalse(self.buffer.has_output())
+        self.assertEqual(([], 0), self.buffer.drain())
+
+        self.buffer.append('b')
+
+        with TemporaryDirectory() as tmp_dir:
+            self.buffer.save(f'{tmp_dir}/output.log')
+            self.assertEqual(2, os.path.getsize(f'{tmp_dir}/output.log'))
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import re
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import Mock, MagicMock, patch
+
+from bauh import __app_name__
+from bauh.api.http import HttpClient
+from bauh.view.core.downloader import SelfFileDownloader
+
+CONTENT = os.urandom(1024 * 1024 + 123)
+SEGMENT = 262175  # 4 segments
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FileHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        range_header = self.headers.get('Range')
+        server.requested_ranges.append(range_header)
+
+        if range_header and server.ranges:
+            first, last = re.match(r'bytes=(\d+)-(\d*)', range_header).groups()
+            first, last = int(first), int(last) if last else len(CONTENT) - 1
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {first}-{last}/{len(CONTENT)}')
+        else:
+            first, last = 0, len(CONTENT) - 1
+            self.send_response(200)
+
+        self.send_header('Content-Length', str(last - first + 1))
+        self.send_header('ETag', server.etag)
+        self.end_headers()
+
+        body = CONTENT[first:last + 1]
+
+        if server.drop_after is not None and range_header != 'bytes=0-':
+            body = body[:server.drop_after]  # simulating a dropped connection
+
+        self.wfile.write(body)
+
+
+class SelfFileDownloaderTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.output_path = f'{self.tmp_dir.name}/file.AppImage'
+        self.server = ThreadingServer(('127.0.0.1', 0), FileHandler)
+        self.server.requested_ranges, self.server.ranges, self.server.etag = [], True, '"v1"'
+        self.server.drop_after = None
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/file.AppImage'
+        self.downloader = SelfFileDownloader(logger=Mock(), i18n=MagicMock(), check_ssl=False,
+                                             http_client=HttpClient(logger=Mock(), sleep=0),
+                                             segment_min_size=256 * 1024, chunk_size=16 * 1024, max_attempts=1)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def download(self, **kwargs) -> bool:
+        return self.downloader.download(file_url=self.url, watcher=Mock(), output_path=self.output_path,
+                                        cwd=self.tmp_dir.name, **kwargs)
+
+    def read_output(self) -> bytes:
+        with open(self.output_path, 'rb') as f:
+            return f.read()
+
+    def test_download__must_download_concurrent_segments_when_ranges_are_supported(self):
+        self.assertTrue(self.download(sha256=hashlib.sha256(CONTENT).hexdigest()))
+        self.assertEqual(CONTENT, self.read_output())
+        self.assertEqual(['bytes=0-', *(f'bytes={i * SEGMENT}-{min((i + 1) * SEGMENT, len(CONTENT)) - 1}'
+                                        for i in range(4))],
+                         sorted(self.server.requested_ranges))
+        self.assertEqual(['file.AppImage'], os.listdir(self.tmp_dir.name))
+
+    def test_download__must_download_the_whole_file_when_ranges_are_not_supported(self):
+        self.server.ranges = False
+        self.assertTrue(self.download())
+        self.assertEqual(CONTENT, self.read_output())
+        self.assertEqual(['bytes=0-', None], self.server.requested_ranges)
+
+    def test_download__must_resume_from_the_partial_file(self):
+        self.server.drop_after = 100000
+        self.assertFalse(self.download())
+        self.assertFalse(os.path.exists(self.output_path))
+        self.assertTrue(os.path.exists(f'{self.output_path}.part.state'))
+
+        self.server.drop_after = None
+        self.server.requested_ranges.clear()
+        self.assertTrue(self.download())
+        self.assertEqual(CONTENT, self.read_output())
+
+        resumed = sorted(tuple(int(n) for n in r.split('=')[1].split('-')) for r in self.server.requested_ranges[1:])
+        self.assertEqual(4, len(resumed))
+
+        for i, (first, last) in enumerate(resumed):  # only what was not received before
+            self.assertGreater(first, i * SEGMENT)
+            self.assertEqual(min((i + 1) * SEGMENT, len(CONTENT)) - 1, last)
+
+        self.assertEqual(['file.AppImage'], os.listdir(self.tmp_dir.name))
+
+    @patch(f'{__app_name__}.view.core.downloader.os.fsync', side_effect=OSError)
+    def test_download__must_not_record_progress_not_flushed_to_the_disk(self, fsync: Mock):
+        self.assertFalse(self.download())
+        fsync.assert_called()
+
+        with open(f'{self.output_path}.part.state') as f:
+            self.assertEqual([0, 0, 0, 0], [s[2] for s in json.load(f)['segments']])
+
+    def test_download__must_restart_when_the_remote_file_has_changed(self):
+        self.server.drop_after = 100000
+        self.assertFalse(self.download())
+
+        self.server.drop_after, self.server.etag = None, '"v2"'
+        self.server.requested_ranges.clear()
+        self.assertTrue(self.download())
+        self.assertEqual(CONTENT, self.read_output())
+        self.assertIn(f'bytes=0-{SEGMENT - 1}', self.server.requested_ranges)
+
+    def test_download__must_fail_and_discard_the_file_when_the_checksum_differs(self):
+        self.assertFalse(self.download(sha256=hashlib.sha256(b'xpto').hexdigest()))
+        self.assertEqual([], os.listdir(self.tmp_dir.name))
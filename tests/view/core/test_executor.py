@@ -0,0 +1,97 @@
+import logging
+from threading import Event, Thread
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.view.core.executor import ManagersExecutor
+
+
+class ManagerA(Mock):
+    pass
+
+
+class ManagerB(Mock):
+    pass
+
+
+class ManagersExecutorTest(TestCase):
+
+    def setUp(self):
+        self.executor = ManagersExecutor(max_workers=4, logger=logging.getLogger(__name__),
+                                         timeouts={'slow': 0.05})
+        self.man_a, self.man_b = ManagerA(), ManagerB()
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_run__must_yield_each_result_as_soon_as_it_is_ready(self):
+        release_b = Event()
+        results = self.executor.run('test', {self.man_a: lambda: 'a',
+                                             self.man_b: lambda: release_b.wait(5) and 'b'})
+
+        self.assertEqual((self.man_a, 'a'), next(results))  # 'b' is still running
+        release_b.set()
+        self.assertEqual((self.man_b, 'b'), next(results))
+        self.assertRaises(StopIteration, next, results)
+
+    def test_run__must_not_yield_failed_tasks(self):
+        def fail():
+            raise Exception()
+
+        results = list(self.executor.run('test', {self.man_a: fail, self.man_b: lambda: 'b'}))
+        self.assertEqual([(self.man_b, 'b')], results)
+
+        metrics = self.executor.get_metrics()['test']
+        self.assertEqual(1, metrics['ManagerA']['failures'])
+        self.assertEqual(0, metrics['ManagerB']['failures'])
+        self.assertEqual(1, metrics['ManagerB']['calls'])
+
+    def test_run__must_stop_waiting_when_the_operation_times_out(self):
+        release = Event()
+        results = list(self.executor.run('slow', {self.man_a: lambda: 'a',
+                                                  self.man_b: lambda: release.wait(5) and 'b'}))
+        release.set()
+
+        self.assertEqual([(self.man_a, 'a')], results)
+        self.assertEqual(1, self.executor.get_metrics()['slow']['ManagerB']['timeouts'])
+
+    def test_run__must_call_on_done_only_when_the_timed_out_tasks_finish(self):
+        release, done = Event(), Event()
+        results = list(self.executor.run('slow', {self.man_a: lambda: 'a',
+                                                  self.man_b: lambda: release.wait(5) and 'b'},
+                                         on_done=done.set))
+
+        self.assertEqual([(self.man_a, 'a')], results)
+        self.assertFalse(done.is_set())  # 'b' is still running
+
+        release.set()
+        self.assertTrue(done.wait(5))
+
+    def test_run__must_call_on_done_before_returning_when_all_tasks_finish(self):
+        on_done = Mock()
+        results = list(self.executor.run('test', {self.man_a: lambda: 'a'}, on_done=on_done))
+
+        self.assertEqual([(self.man_a, 'a')], results)
+        on_done.assert_called_once()
+
+    def test_run__a_new_exclusive_operation_must_cancel_the_current_one(self):
+        started, release = Event(), Event()
+
+        def first_task():
+            started.set()
+            release.wait(5)
+            return 'first'
+
+        first_results = []
+        first = Thread(target=lambda: first_results.extend(self.executor.run('search', {self.man_a: first_task},
+                                                                             exclusive=True)))
+        first.start()
+        self.assertTrue(started.wait(5))
+
+        second_results = list(self.executor.run('search', {self.man_b: lambda: 'second'}, exclusive=True))
+        first.join(5)
+        release.set()
+
+        self.assertFalse(first.is_alive())
+        self.assertEqual([], first_results)
+        self.assertEqual([(self.man_b, 'second')], second_results)
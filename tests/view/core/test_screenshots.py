@@ -0,0 +1,41 @@
+import os
+import time
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.view.core.screenshots import ScreenshotsDiskCache
+
+
+class ScreenshotsDiskCacheTest(TestCase):
+
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.cache = ScreenshotsDiskCache(logger=Mock(), cache_dir=f'{self.dir.name}/screenshots', max_size=10)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_get__must_return_the_content_added_for_the_url(self):
+        self.assertTrue(self.cache.add('https://img/1.png', b'1234'))
+        self.assertEqual(b'1234', self.cache.get('https://img/1.png'))
+        self.assertIsNone(self.cache.get('https://img/2.png'))
+
+    def test_add__must_remove_the_least_recently_used_files_when_the_max_size_is_exceeded(self):
+        self.cache.add('https://img/1.png', b'1234')
+        self.cache.add('https://img/2.png', b'5678')
+
+        past = time.time() - 60
+        os.utime(self.cache.get_path('https://img/1.png'), (past, past))
+        os.utime(self.cache.get_path('https://img/2.png'), (past - 60, past - 60))
+
+        self.cache.get('https://img/2.png')  # marked as recently used
+        self.cache.add('https://img/3.png', b'9012')
+
+        self.assertIsNone(self.cache.get('https://img/1.png'))
+        self.assertEqual(b'5678', self.cache.get('https://img/2.png'))
+        self.assertEqual(b'9012', self.cache.get('https://img/3.png'))
+
+    def test_add__must_not_store_content_bigger_than_the_max_size(self):
+        self.assertFalse(self.cache.add('https://img/1.png', b'12345678901'))
+        self.assertIsNone(self.cache.get('https://img/1.png'))
@@ -0,0 +1,99 @@
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.api.abstract.handler import TaskManager
+from bauh.view.core.tasks import PrepareTasksTracker, TrackedTaskManager
+
+
+class PrepareTasksTrackerTest(TestCase):
+
+    def setUp(self):
+        self.tracker = PrepareTasksTracker()
+        self.manager = Mock()
+        self.manager.get_deferrable_prepare_tasks.return_value = None
+
+    def test_is_ready__true_for_managers_not_being_prepared(self):
+        self.assertTrue(self.tracker.is_ready(self.manager, 'read_installed'))
+
+    def test_is_ready__false_while_the_manager_is_registering_tasks(self):
+        self.tracker.start_preparing(self.manager)
+        self.assertFalse(self.tracker.is_ready(self.manager, 'read_installed'))
+
+        self.tracker.set_prepared(self.manager)
+        self.assertTrue(self.tracker.is_ready(self.manager, 'read_installed'))
+
+    def test_is_ready__false_while_a_required_task_is_not_finished(self):
+        self.tracker.start_preparing(self.manager)
+        self.tracker.register(self.manager, 'index')
+        self.tracker.set_prepared(self.manager)
+        self.assertFalse(self.tracker.is_ready(self.manager, 'read_installed'))
+
+        self.tracker.finish(self.manager, 'index')
+        self.assertTrue(self.tracker.is_ready(self.manager, 'read_installed'))
+
+    def test_is_ready__must_ignore_deferrable_tasks(self):
+        self.manager.get_deferrable_prepare_tasks.side_effect = lambda op: {'optimizer'} if op == 'read_installed' else None
+
+        self.tracker.start_preparing(self.manager)
+        self.tracker.register(self.manager, 'optimizer')
+        self.tracker.set_prepared(self.manager)
+
+        self.assertTrue(self.tracker.is_ready(self.manager, 'read_installed'))
+        self.assertFalse(self.tracker.is_ready(self.manager, 'install'))
+
+    def test_is_ready__true_for_any_operation_after_released(self):
+        self.tracker.start_preparing(self.manager)
+        self.tracker.register(self.manager, 'index')
+        self.tracker.release()
+        self.assertTrue(self.tracker.is_ready(self.manager, 'read_installed'))
+
+    def test_is_ready__must_only_consider_the_tasks_finished_by_the_manager(self):
+        other_manager = Mock()
+        self.tracker.start_preparing(self.manager)
+        self.tracker.register(self.manager, 'index')
+        self.tracker.set_prepared(self.manager)
+
+        self.tracker.finish(other_manager, 'index')
+        self.assertFalse(self.tracker.is_ready(self.manager, 'read_installed'))
+
+    def test_get_pending__must_return_the_required_tasks_not_finished(self):
+        self.tracker.start_preparing(self.manager)
+        self.assertIsNone(self.tracker.get_pending(self.manager, 'read_installed'))
+
+        self.tracker.register(self.manager, 'index')
+        self.tracker.register(self.manager, 'sync')
+        self.tracker.set_prepared(self.manager)
+        self.tracker.finish(self.manager, 'sync')
+        self.assertEqual({'index'}, self.tracker.get_pending(self.manager, 'read_installed'))
+
+    def test_wait__must_return_when_the_required_tasks_finish(self):
+        self.tracker.start_preparing(self.manager)
+        self.tracker.register(self.manager, 'index')
+        self.tracker.set_prepared(self.manager)
+
+        Thread(target=self.tracker.finish, args=(self.manager, 'index')).start()
+        self.assertTrue(self.tracker.wait(self.manager, 'read_installed', timeout=5))
+
+    def test_wait__must_return_false_on_timeout(self):
+        self.tracker.start_preparing(self.manager)
+        self.assertFalse(self.tracker.wait(self.manager, 'read_installed', timeout=0.01))
+
+
+class TrackedTaskManagerTest(TestCase):
+
+    def test_must_forward_calls_and_track_the_task(self):
+        taskman, tracker, manager = Mock(spec=TaskManager), PrepareTasksTracker(), Mock()
+        manager.get_deferrable_prepare_tasks.return_value = None
+        tracked = TrackedTaskManager(taskman, tracker, manager)
+
+        tracked.register_task('index', 'Indexing', None)
+        taskman.register_task.assert_called_once_with('index', 'Indexing', None)
+        self.assertFalse(tracker.is_ready(manager, 'search'))
+
+        tracked.update_progress('index', 50, None)
+        taskman.update_progress.assert_called_once_with('index', 50, None)
+
+        tracked.finish_task('index')
+        taskman.finish_task.assert_called_once_with('index')
+        self.assertTrue(tracker.is_ready(manager, 'search'))
@@ -0,0 +1,39 @@
+from threading import Thread, Timer, Event
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.view.qt.thread import AsyncAction
+
+
+class AsyncActionTest(TestCase):
+
+    def setUp(self):
+        self.action = AsyncAction(i18n=Mock())
+        self.action.signal_confirmation = Mock()
+        self.action.signal_root_password = Mock()
+
+    def test_request_confirmation__must_wait_for_the_user_reply(self):
+        self.action.signal_confirmation.emit.side_effect = lambda _: Timer(0.05, self.action.confirm, (True,)).start()
+        self.assertTrue(self.action.request_confirmation(title='title', body='body'))
+
+    def test_request_root_password__must_wait_for_the_user_reply(self):
+        self.action.signal_root_password.emit.side_effect = lambda: Timer(0.05, self.action.set_root_password,
+                                                                          (True, '123')).start()
+        self.assertEqual((True, '123'), self.action.request_root_password())
+        self.assertIsNone(self.action.root_password)
+
+    def test_cancel_user_interaction__must_deny_the_pending_and_next_requests(self):
+        res, requested = [], Event()
+        self.action.signal_confirmation.emit.side_effect = lambda _: requested.set()
+        waiting = Thread(target=lambda: res.append(self.action.request_confirmation(title='title', body='body')))
+        waiting.start()
+
+        self.assertTrue(requested.wait(5))
+        self.action.cancel_user_interaction()
+        waiting.join(5)
+
+        self.assertFalse(waiting.is_alive())
+        self.assertEqual([False], res)
+        self.assertFalse(self.action.request_confirmation(title='title', body='body'))
+        self.assertEqual((False, None), self.action.request_root_password())
+        self.assertEqual(1, self.action.signal_confirmation.emit.call_count)
@@ -0,0 +1,76 @@
+import json
+import logging
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock
+
+from bauh.view.util import logs
+
+
+class NewLoggerTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = f'{self.tmp_dir.name}/logs/bauh.log'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def wait_records(self, logger: logging.Logger):
+        for handler in logger.handlers:
+            handler.queue.join()  # the records are written by the listener thread
+
+    def read_lines(self, logger: logging.Logger) -> list:
+        self.wait_records(logger)
+
+        with open(self.file_path) as f:
+            return f.read().splitlines()
+
+    def test__disabled_loggers_must_not_create_records(self):
+        logger = logs.new_logger('test', enabled=False, file_path=self.file_path)
+        record = Mock()
+        logger.makeRecord = record
+
+        logger.info('test')
+
+        record.assert_not_called()
+        self.assertFalse(os.path.exists(self.file_path))
+
+    def test__must_write_text_records_to_the_file(self):
+        logger = logs.new_logger('test', enabled=True, stream=False, file_path=self.file_path)
+        logger.info('hello %s', 'world')
+
+        lines = self.read_lines(logger)
+        self.assertEqual(1, len(lines))
+        self.assertIn('INFO [', lines[0])
+        self.assertTrue(lines[0].endswith('test__must_write_text_records_to_the_file()] - hello world'))
+
+    def test__must_write_json_lines_with_timing_fields(self):
+        logger = logs.new_logger('test', enabled=True, stream=False, file_path=self.file_path, json_format=True)
+        logger.warning('hello %s', 'world')
+
+        try:
+            raise ValueError('xpto')
+        except ValueError:
+            logger.exception('failed')
+
+        records = [json.loads(line) for line in self.read_lines(logger)]
+        self.assertEqual(2, len(records))
+        self.assertEqual('WARNING', records[0]['level'])
+        self.assertEqual('hello world', records[0]['msg'])
+
+        for field in ('ts', 'uptime', 'delay', 'thread', 'module', 'line', 'func'):
+            self.assertIn(field, records[0])
+
+        self.assertIn('ValueError: xpto', records[1]['exc'])
+
+    def test__must_rotate_the_file(self):
+        logger = logs.new_logger('test', enabled=True, stream=False, file_path=self.file_path, file_max_size=200,
+                                 file_backups=2)
+
+        for i in range(20):
+            logger.info(f'message {i}')
+
+        self.read_lines(logger)
+        self.assertEqual({'bauh.log', 'bauh.log.1', 'bauh.log.2'}, set(os.listdir(os.path.dirname(self.file_path))))